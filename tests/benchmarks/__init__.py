@@ -0,0 +1 @@
+"""Benchmarks of thoth-storages, run them as modules, for example ``python3 -m tests.benchmarks.codec``."""
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark encoding of documents as stored on Ceph.
+
+Compare bytes stored and encode/decode time of the legacy indented JSON format and the codec
+with and without compression on documents available in tests/data/result.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from thoth.storages import codec
+
+_RESULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "data", "result")
+_ROUNDS = int(os.getenv("THOTH_BENCHMARK_ROUNDS", 20))
+
+
+def _load_documents() -> List[Any]:
+    """Load all the documents available in the test data directory."""
+    documents = []
+    for root, _, files in os.walk(_RESULT_DIR):
+        for file_name in sorted(files):
+            with open(os.path.join(root, file_name)) as document_file:
+                documents.append(json.load(document_file))
+
+    return documents
+
+
+def _legacy_encode(document: Any) -> bytes:
+    """Encode the document as done before introduction of the codec."""
+    return json.dumps(document, sort_keys=True, separators=(",", ": "), indent=2).encode()
+
+
+def _legacy_decode(blob: bytes) -> Any:
+    """Decode the document as done before introduction of the codec."""
+    return json.loads(blob.decode())
+
+
+def _measure(documents: List[Any], encode: Callable[[Any], bytes], decode: Callable[[bytes], Any]) -> Dict[str, Any]:
+    """Measure size and time spent on encoding and decoding the given documents."""
+    blobs = [encode(document) for document in documents]
+
+    start = time.monotonic()
+    for _ in range(_ROUNDS):
+        for document in documents:
+            encode(document)
+    encode_time = (time.monotonic() - start) / _ROUNDS
+
+    start = time.monotonic()
+    for _ in range(_ROUNDS):
+        for blob in blobs:
+            decode(blob)
+    decode_time = (time.monotonic() - start) / _ROUNDS
+
+    return {
+        "bytes": sum(len(blob) for blob in blobs),
+        "encode_seconds": encode_time,
+        "decode_seconds": decode_time,
+    }
+
+
+def main() -> int:
+    """Run the benchmark and print results as JSON to standard output."""
+    documents = _load_documents()
+    results = {
+        "documents": len(documents),
+        "rounds": _ROUNDS,
+        "orjson": codec.orjson is not None,
+        "formats": {"legacy": _measure(documents, _legacy_encode, _legacy_decode)},
+    }
+
+    compressions = [""] + sorted(codec.COMPRESSIONS)
+    if codec.zstandard is None:
+        compressions.remove(codec.COMPRESSION_ZSTD)
+
+    for compression in compressions:
+        results["formats"][compression or "compact"] = _measure(
+            documents, lambda document: codec.encode_document(document, compression), codec.decode_document
+        )
+
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark hot paths of the graph database adapter.
+
+A throwaway database (THOTH_BENCHMARK_DATABASE) is created on the PostgreSQL instance configured using
+KNOWLEDGE_GRAPH_* environment variables and seeded with a synthetic dependency graph of the configured size.
+Dependencies are skewed towards popular packages as in real-world dependency graphs. Latency and throughput
+of resolver lookups and of syncing synthetic documents of each kind are measured, results are printed as JSON
+to standard output. The database is not dropped if it exists already, unless THOTH_BENCHMARK_DROP_DATABASE=1.
+
+Results of two runs can be compared by passing their files::
+
+  python3 -m tests.benchmarks.graph_adapter compare base.json new.json
+"""
+
+import copy
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from sqlalchemy import event
+from sqlalchemy_utils import database_exists
+from sqlalchemy_utils import drop_database
+
+from thoth.storages import __version__ as thoth_storages_version
+from thoth.storages import GraphDatabase
+from thoth.storages.graph import SyntheticDataGenerator
+from thoth.storages.graph.models import DependsOn
+from thoth.storages.graph.models import PythonPackageIndex
+from thoth.storages.graph.models import PythonPackageVersion
+from thoth.storages.graph.models import PythonPackageVersionEntity
+
+_DATABASE = os.getenv("THOTH_BENCHMARK_DATABASE", "thoth_benchmark")
+# Drop the database if it exists already, databases not created by the benchmark are not dropped otherwise.
+_DROP_DATABASE = bool(int(os.getenv("THOTH_BENCHMARK_DROP_DATABASE", 0)))
+_KEEP_DATABASE = bool(int(os.getenv("THOTH_BENCHMARK_KEEP_DATABASE", 0)))
+_ROUNDS = int(os.getenv("THOTH_BENCHMARK_ROUNDS", 5))
+_LOOKUPS = int(os.getenv("THOTH_BENCHMARK_LOOKUPS", 100))
+_TRANSITIVE_LOOKUPS = int(os.getenv("THOTH_BENCHMARK_TRANSITIVE_LOOKUPS", 10))
+_SEED = int(os.getenv("THOTH_BENCHMARK_SEED", 42))
+_PACKAGES = int(os.getenv("THOTH_BENCHMARK_GRAPH_PACKAGES", 1000))
+_VERSIONS = int(os.getenv("THOTH_BENCHMARK_GRAPH_VERSIONS", 5))
+_DEPENDENCIES = int(os.getenv("THOTH_BENCHMARK_GRAPH_DEPENDENCIES", 5))
+# The higher the skew is, the more dependencies point to the most popular packages.
+_SKEW = float(os.getenv("THOTH_BENCHMARK_GRAPH_SKEW", 2.0))
+_INSERT_BATCH_SIZE = 5000
+# Number of packages in synthetic documents synced, the number of documents of each kind is derived from it.
+_SYNC_PACKAGES = int(os.getenv("THOTH_BENCHMARK_SYNC_PACKAGES", 20))
+
+_INDEX_URL = "https://pypi.org/simple"
+_ENVIRONMENT = {"os_name": "rhel", "os_version": "8", "python_version": "3.8"}
+# Synthetic documents are served from an index of their own so that they do not interfere with the seeded graph.
+_SYNC_INDEX_URL = "https://synthetic.example.com/simple"
+# Sync methods and arguments they are benchmarked with, keyed by methods of SyntheticDataGenerator generating
+# documents, in the order documents are synced.
+_SYNC_METHODS: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {
+    "iter_solver_documents": [
+        ("sync_solver_result", {"force": True, "bulk": False}),
+        ("sync_solver_result", {"force": True, "bulk": True}),
+    ],
+    "iter_analysis_documents": [("sync_analysis_result", {})],
+    "iter_adviser_documents": [("sync_adviser_result", {})],
+    "iter_inspection_documents": [("sync_inspection_result", {})],
+    "iter_provenance_checker_documents": [("sync_provenance_checker_result", {})],
+    "iter_dependency_monkey_documents": [("sync_dependency_monkey_result", {})],
+    "iter_revsolver_documents": [("sync_revsolver_result", {})],
+    "iter_security_indicator_documents": [("sync_security_indicator_aggregated_result", {})],
+}
+
+
+def _insert(graph: GraphDatabase, model: Any, rows: List[Dict[str, Any]]) -> None:
+    """Insert the given rows in batches."""
+    with graph._engine.begin() as connection:
+        for idx in range(0, len(rows), _INSERT_BATCH_SIZE):
+            connection.execute(model.__table__.insert().values(rows[idx : idx + _INSERT_BATCH_SIZE]))
+
+
+def _seed(graph: GraphDatabase) -> Dict[str, int]:
+    """Seed the database with a synthetic dependency graph, popular packages have lower indexes."""
+    rng = random.Random(_SEED)
+    versions = [
+        (f"package-{package}", f"{version}.0.0") for package in range(_PACKAGES) for version in range(_VERSIONS)
+    ]
+
+    _insert(graph, PythonPackageIndex, [{"id": 1, "url": _INDEX_URL, "enabled": True, "verify_ssl": True}])
+    _insert(
+        graph,
+        PythonPackageVersionEntity,
+        [
+            {"id": idx, "package_name": name, "package_version": version, "python_package_index_id": 1}
+            for idx, (name, version) in enumerate(versions, start=1)
+        ],
+    )
+    _insert(
+        graph,
+        PythonPackageVersion,
+        [
+            {
+                "id": idx,
+                "package_name": name,
+                "package_version": version,
+                "entity_id": idx,
+                "python_package_index_id": 1,
+                "is_missing": False,
+                "provides_source_distro": True,
+                **_ENVIRONMENT,
+            }
+            for idx, (name, version) in enumerate(versions, start=1)
+        ],
+    )
+
+    depends_on = []
+    for package in range(1, _PACKAGES):
+        for version in range(_VERSIONS):
+            # Dependencies point to packages with lower indexes so that the graph has no cycles.
+            dependencies = {int(package * rng.random() ** _SKEW) for _ in range(min(_DEPENDENCIES, package))}
+            for dependency in dependencies:
+                depends_on.append(
+                    {
+                        "version_id": package * _VERSIONS + version + 1,
+                        "entity_id": dependency * _VERSIONS + rng.randrange(_VERSIONS) + 1,
+                        "version_range": "*",
+                        "marker": None,
+                        "extra": None,
+                        "marker_evaluation_result": True,
+                    }
+                )
+
+    _insert(graph, DependsOn, depends_on)
+
+    with graph._engine.begin() as connection:
+        for table in ("python_package_index", "python_package_version_entity", "python_package_version"):
+            connection.execute(f"SELECT setval('{table}_id_seq', (SELECT MAX(id) FROM {table}))")
+        connection.execute("ANALYZE")
+
+    return {"python_package_versions": len(versions), "depends_on": len(depends_on)}
+
+
+def _measure(graph: GraphDatabase, func: Callable[..., Any], calls: List[Tuple[tuple, dict]]) -> Dict[str, Any]:
+    """Measure latency of calls of the given function with the given arguments, caches are cleared before each call."""
+    statements = 0
+
+    def _count_statements(*_: Any) -> None:
+        nonlocal statements
+        statements += 1
+
+    timings = []
+    event.listen(graph._engine, "before_cursor_execute", _count_statements)
+    try:
+        for args, kwargs in calls:
+            graph.cache_clear()
+            start = time.monotonic()
+            func(*args, **kwargs)
+            timings.append(time.monotonic() - start)
+    finally:
+        event.remove(graph._engine, "before_cursor_execute", _count_statements)
+
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "calls_per_second": len(timings) / sum(timings) if sum(timings) else None,
+        "median_seconds": statistics.median(timings),
+        "p95_seconds": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "max_seconds": timings[-1],
+        "statements_per_call": statements / len(timings),
+    }
+
+
+def _benchmark_lookups(graph: GraphDatabase, seeded: Dict[str, int]) -> Dict[str, Any]:
+    """Benchmark resolver lookups on randomly picked package versions."""
+    rng = random.Random(_SEED)
+    sample = rng.sample(range(seeded["python_package_versions"]), min(_LOOKUPS, seeded["python_package_versions"]))
+    packages = [(f"package-{idx // _VERSIONS}", f"{idx % _VERSIONS}.0.0") for idx in sample]
+    # Less popular packages have larger dependency graphs.
+    transitive = sorted(packages, key=lambda package: -int(package[0].rsplit("-", maxsplit=1)[1]))[:_TRANSITIVE_LOOKUPS]
+
+    return {
+        "get_depends_on": _measure(
+            graph, graph.get_depends_on, [((name, version, _INDEX_URL), _ENVIRONMENT) for name, version in packages]
+        ),
+        "get_python_package_version_records": _measure(
+            graph,
+            graph.get_python_package_version_records,
+            [((name, version, None), _ENVIRONMENT) for name, version in packages],
+        ),
+        "retrieve_transitive_dependencies_python": _measure(
+            graph,
+            graph.retrieve_transitive_dependencies_python,
+            [((name, version, _INDEX_URL), {**_ENVIRONMENT, "recursive_query": False}) for name, version in transitive],
+        ),
+        "retrieve_transitive_dependencies_python[recursive_query]": _measure(
+            graph,
+            graph.retrieve_transitive_dependencies_python,
+            [((name, version, _INDEX_URL), {**_ENVIRONMENT, "recursive_query": True}) for name, version in transitive],
+        ),
+        "retrieve_transitive_dependencies_python_multi": _measure(
+            graph,
+            graph.retrieve_transitive_dependencies_python_multi,
+            [(tuple((name, version, _INDEX_URL) for name, version in transitive), _ENVIRONMENT)],
+        ),
+    }
+
+
+def _benchmark_syncs(graph: GraphDatabase) -> Dict[str, Any]:
+    """Benchmark syncing synthetic documents of each kind, the first sync of the documents is reported separately."""
+    generator = SyntheticDataGenerator(
+        seed=_SEED,
+        packages=_SYNC_PACKAGES,
+        versions=2,
+        adviser_runs=_SYNC_PACKAGES,
+        package_extracts=max(1, _SYNC_PACKAGES // 10),
+        inspections=max(1, _SYNC_PACKAGES // 10),
+        other_runs=_SYNC_PACKAGES,
+        index_url=_SYNC_INDEX_URL,
+    )
+    results: Dict[str, Any] = {}
+    for generator_method_name, methods in _SYNC_METHODS.items():
+        documents = list(getattr(generator, generator_method_name)())
+        for method_name, kwargs in methods:
+            name = method_name + "".join(f"[{key}={value}]" for key, value in sorted(kwargs.items()) if key != "force")
+            method = getattr(graph, method_name)
+            start = time.monotonic()
+            for document in documents:
+                method(copy.deepcopy(document), **kwargs)
+            first = time.monotonic() - start
+
+            results[name] = {
+                "documents": len(documents),
+                "first_seconds": first,
+                **_measure(graph, method, [((copy.deepcopy(document),), kwargs) for document in documents] * _ROUNDS),
+            }
+
+    for method_name in sorted(
+        name for name in dir(GraphDatabase) if name.startswith("sync_") and name.endswith("_result")
+    ):
+        if not any(method_name == name.split("[", maxsplit=1)[0] for name in results):
+            results[method_name] = {"skipped": "no synthetic documents available"}
+
+    return results
+
+
+def _compare(base: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare median latencies of two runs, ratios higher than 1 mean the new run is slower."""
+    comparison: Dict[str, Any] = {}
+    for section in ("lookups", "sync"):
+        for name, measurement in new.get(section, {}).items():
+            base_measurement = base.get(section, {}).get(name, {})
+            if "median_seconds" in measurement and base_measurement.get("median_seconds"):
+                comparison[f"{section}.{name}"] = {
+                    "base_median_seconds": base_measurement["median_seconds"],
+                    "new_median_seconds": measurement["median_seconds"],
+                    "ratio": measurement["median_seconds"] / base_measurement["median_seconds"],
+                }
+
+    return comparison
+
+
+def main() -> int:
+    """Run the benchmark (or compare results of two runs) and print results as JSON to standard output."""
+    arguments = sys.argv[1:]
+    if arguments:
+        if len(arguments) != 3 or arguments[0] != "compare":
+            sys.exit("Usage: graph_adapter [compare BASE.json NEW.json]")
+
+        with open(arguments[1]) as base_file, open(arguments[2]) as new_file:
+            json.dump(_compare(json.load(base_file), json.load(new_file)), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    os.environ["KNOWLEDGE_GRAPH_DATABASE"] = _DATABASE
+    graph = GraphDatabase()
+    url = graph.construct_connection_string()
+    if database_exists(url):
+        if not _DROP_DATABASE:
+            sys.exit(f"Database {_DATABASE!r} exists, set THOTH_BENCHMARK_DROP_DATABASE=1 to drop it")
+
+        drop_database(url)
+
+    graph.connect()
+    try:
+        # Creates the database.
+        graph.initialize_schema()
+
+        start = time.monotonic()
+        seeded = _seed(graph)
+        seed_seconds = time.monotonic() - start
+
+        results = {
+            "datetime": datetime.utcnow().isoformat(),
+            "thoth_storages_version": thoth_storages_version,
+            "python_version": platform.python_version(),
+            "postgresql_version": graph._engine.execute("SHOW server_version").scalar(),
+            "configuration": {
+                "rounds": _ROUNDS,
+                "lookups": _LOOKUPS,
+                "transitive_lookups": _TRANSITIVE_LOOKUPS,
+                "seed": _SEED,
+                "packages": _PACKAGES,
+                "versions": _VERSIONS,
+                "dependencies": _DEPENDENCIES,
+                "skew": _SKEW,
+            },
+            "graph": {**seeded, "seed_seconds": seed_seconds},
+            "lookups": _benchmark_lookups(graph, seeded),
+            "sync": _benchmark_syncs(graph),
+        }
+    finally:
+        graph.disconnect()
+        if not _KEEP_DATABASE:
+            drop_database(url)
+
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
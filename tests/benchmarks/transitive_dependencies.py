@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark retrieval of transitive dependencies from the graph database.
+
+Compare the graph traversal issuing queries package by package with the recursive query on the database
+configured using KNOWLEDGE_GRAPH_* environment variables. Packages are passed as arguments in form of
+``package_name package_version index_url`` triplets, if none are passed, packages with most dependencies
+are used. Both methods are checked to return the same dependencies.
+"""
+
+import collections
+import json
+import os
+import sys
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from sqlalchemy import event
+
+from thoth.storages import GraphDatabase
+
+_ROUNDS = int(os.getenv("THOTH_BENCHMARK_ROUNDS", 3))
+_PACKAGES = int(os.getenv("THOTH_BENCHMARK_PACKAGES", 5))
+_OS_NAME = os.getenv("THOTH_BENCHMARK_OS_NAME") or None
+_OS_VERSION = os.getenv("THOTH_BENCHMARK_OS_VERSION") or None
+_PYTHON_VERSION = os.getenv("THOTH_BENCHMARK_PYTHON_VERSION") or None
+
+
+def _get_packages(graph: GraphDatabase) -> List[Tuple[str, str, str]]:
+    """Get packages with most direct dependencies stored in the database."""
+    with graph._engine.connect() as connection:
+        rows = connection.execute(
+            "SELECT python_package_version.package_name, python_package_version.package_version, "
+            "python_package_index.url FROM python_package_version "
+            "JOIN python_package_index ON python_package_index.id = python_package_version.python_package_index_id "
+            "JOIN depends_on ON depends_on.version_id = python_package_version.id "
+            "GROUP BY 1, 2, 3 ORDER BY COUNT(*) DESC LIMIT %s",
+            (_PACKAGES,),
+        )
+        return [tuple(row) for row in rows]
+
+
+def _measure(graph: GraphDatabase, package_tuple: Tuple[str, str, str], recursive_query: bool) -> Dict[str, Any]:
+    """Measure time and number of statements issued to retrieve transitive dependencies of the given package."""
+    statements = 0
+
+    def _count_statements(*_: Any) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(graph._engine, "before_cursor_execute", _count_statements)
+    try:
+        timings = []
+        for _ in range(_ROUNDS):
+            # Results of queries issued by the traversal are cached, measure cold runs.
+            for cached_method in graph._CACHED_METHODS:
+                cached_method.cache_clear()
+
+            start = time.monotonic()
+            result = graph.retrieve_transitive_dependencies_python(
+                *package_tuple,
+                os_name=_OS_NAME,
+                os_version=_OS_VERSION,
+                python_version=_PYTHON_VERSION,
+                recursive_query=recursive_query,
+            )
+            timings.append(time.monotonic() - start)
+    finally:
+        event.remove(graph._engine, "before_cursor_execute", _count_statements)
+
+    return {
+        "result": collections.Counter(result),
+        "dependencies": len(result),
+        "seconds": min(timings),
+        "statements": statements // _ROUNDS,
+    }
+
+
+def main() -> int:
+    """Run the benchmark and print results as JSON to standard output."""
+    graph = GraphDatabase()
+    graph.connect()
+
+    arguments = sys.argv[1:]
+    if len(arguments) % 3:
+        sys.exit("Packages are expected as package_name package_version index_url triplets")
+
+    package_tuples = [tuple(arguments[i : i + 3]) for i in range(0, len(arguments), 3)]  # Ignore PycodestyleBear (E203)
+    package_tuples = package_tuples or _get_packages(graph)
+
+    results: Dict[str, Any] = {"rounds": _ROUNDS, "packages": []}
+    for package_tuple in package_tuples:
+        traversal = _measure(graph, package_tuple, recursive_query=False)
+        recursive = _measure(graph, package_tuple, recursive_query=True)
+        results["packages"].append(
+            {
+                "package": list(package_tuple),
+                "dependencies": traversal["dependencies"],
+                "match": traversal.pop("result") == recursive.pop("result"),
+                "traversal": traversal,
+                "recursive_query": recursive,
+            }
+        )
+
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if all(item["match"] for item in results["packages"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
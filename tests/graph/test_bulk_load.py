@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test loading documents in bulk using COPY."""
+
+import copy
+
+import pytest
+
+from thoth.storages.exceptions import BulkLoadError
+from thoth.storages.exceptions import SolverNotRunError
+from thoth.storages.graph import BulkLoader
+from thoth.storages.graph import SyntheticDataGenerator
+from thoth.storages.graph.bulk_load import _format_value
+from thoth.storages.graph.bulk_load import _Table
+from thoth.storages.graph.models import AdviserRun
+
+from ..base import ThothStoragesTest
+from ..utils import dump_graph_database
+from ..utils import requires_graph_database
+from ..utils import throwaway_graph_database
+
+
+class _Cursor:
+    """A cursor recording statements executed and data copied."""
+
+    def __init__(self, non_empty_tables=(), rows=None):
+        self.non_empty_tables = non_empty_tables
+        self.rows = rows or {}
+        self.statements = []
+        self.copied = {}
+        self._result = None
+
+    def execute(self, statement, parameters=None):
+        """Record the statement executed."""
+        self.statements.append(statement)
+        self._result = []
+        if statement.startswith("SELECT EXISTS"):
+            self._result = [(any(f'FROM "{table}"' in statement for table in self.non_empty_tables),)]
+
+        for prefix, rows in self.rows.items():
+            if statement.strip().startswith(prefix) and (parameters is None or parameters == rows[0]):
+                self._result = rows[1]
+
+    def fetchone(self):
+        """Get result of the last statement."""
+        return self._result[0]
+
+    def fetchall(self):
+        """Get result of the last statement."""
+        return self._result
+
+    def copy_expert(self, statement, file):
+        """Record data copied."""
+        table = statement.split('"')[1]
+        self.copied[table[len("staging_") :]] = (statement, file.read())  # Ignore PycodestyleBear (E203)
+
+
+class _Graph:
+    """A graph database adapter handing out a connection with the given cursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+        self._engine = self
+
+    def is_connected(self):
+        """The adapter is always connected."""
+        return True
+
+    def raw_connection(self):
+        """Hand out the connection."""
+        return self
+
+    def cursor(self):
+        """Get the cursor."""
+        return self._cursor
+
+    def commit(self):
+        """Record a commit."""
+        self.commits += 1
+
+    def close(self):
+        """Close the connection."""
+
+
+def _documents(**kwargs):
+    """Generate documents of a small size."""
+    generator = SyntheticDataGenerator(
+        **{"packages": 10, "versions": 2, "adviser_runs": 5, "package_extracts": 2, "inspections": 2, **kwargs}
+    )
+    return list(generator.iter_documents())
+
+
+class TestBulkLoader(ThothStoragesTest):
+    """Test loading documents in bulk using COPY."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            (None, "\\N"),
+            (True, "t"),
+            (False, "f"),
+            (42, "42"),
+            (0.5, "0.5"),
+            ("a\tb\nc\\d\re", "a\\tb\\nc\\\\d\\re"),
+        ],
+    )
+    def test_format_value(self, value, expected):
+        """Test formatting values in the COPY text format."""
+        assert _format_value(value) == expected
+
+    def test_add_document(self):
+        """Test documents are transformed into rows, rows are not duplicated if a document is added again."""
+        documents = _documents()
+        loader = BulkLoader()
+        for document in documents:
+            loader.add_document(document)
+
+        assert loader.documents == {"solver": 40, "package-extract": 2, "adviser": 5, "inspection": len(documents) - 47}
+        row_counts = loader.row_counts()
+        assert row_counts["python_package_version"] == 40
+        assert row_counts["ecosystem_solver"] == 2
+        assert row_counts["solved"] == 40
+        assert row_counts["adviser_run"] == 5
+
+        for document in documents[:40]:
+            loader.add_solver_result(copy.deepcopy(document))
+
+        assert loader.row_counts() == row_counts
+
+    def test_rollback(self):
+        """Test rows of a document which cannot be transformed are discarded."""
+        documents = _documents()
+        adviser_document = next(d for d in documents if d.get("metadata", {}).get("analyzer") == "thoth-adviser")
+        loader = BulkLoader()
+
+        # Packages locked are not solved yet.
+        with pytest.raises(SolverNotRunError):
+            loader.add_adviser_result(adviser_document)
+
+        assert loader.row_counts() == {}
+        assert loader.documents == {}
+
+        for document in documents:
+            loader.add_document(document)
+
+        row_counts = loader.row_counts()
+        inspection_document = copy.deepcopy(documents[-1])
+        inspection_document["specification"]["script"] = "./script.py"
+        with pytest.raises(BulkLoadError):
+            loader.add_inspection_result(inspection_document)
+
+        broken_document = copy.deepcopy(adviser_document)
+        broken_document["metadata"]["document_id"] = "adviser-broken"
+        broken_document["result"]["report"]["products"][0]["project"]["requirements_locked"]["default"][
+            "package-unknown"
+        ] = {"version": "==1.0.0", "index": "pypi", "hashes": ["sha256:" + "0" * 64]}
+        with pytest.raises(SolverNotRunError):
+            loader.add_adviser_result(broken_document)
+
+        assert loader.row_counts() == row_counts
+
+        # Ids are assigned from where they were before the rollback.
+        adviser_document = copy.deepcopy(adviser_document)
+        adviser_document["metadata"]["document_id"] = "adviser-new"
+        loader.add_adviser_result(adviser_document)
+        assert loader.row_counts()["adviser_run"] == row_counts["adviser_run"] + 1
+        assert loader._tables["adviser_run"].find(adviser_document_id="adviser-new") == row_counts["adviser_run"] + 1
+
+    def test_re_run(self):
+        """Test a successful re-run of an adviser run marks the initial run as not needing a re-run."""
+        documents = _documents(adviser_runs=100, error_ratio=0.2)
+        loader = BulkLoader()
+        for document in documents:
+            loader.add_document(document)
+
+        adviser_runs = loader._tables["adviser_run"]
+        re_run_adviser_ids = {
+            adviser_runs.get_row(entity_id)["re_run_adviser_id"] for entity_id in range(1, adviser_runs.next_id)
+        }
+        re_run_adviser_ids.discard(None)
+        assert re_run_adviser_ids
+
+        for entity_id in range(1, adviser_runs.next_id):
+            row = adviser_runs.get_row(entity_id)
+            assert row["need_re_run"] == (
+                row["adviser_error"] and row["adviser_document_id"] not in re_run_adviser_ids
+            ), row
+
+    def test_find(self):
+        """Test finding the first entity matching column values, also after rows are added, updated and rolled back."""
+        table = _Table(AdviserRun, set())
+        first_id = table.get_or_create(adviser_document_id="adviser-1", need_re_run=True)
+        assert table.find(adviser_document_id="adviser-1") == first_id
+        assert table.find(adviser_document_id="adviser-2") is None
+
+        second_id = table.get_or_create(adviser_document_id="adviser-2", need_re_run=True)
+        table.get_or_create(adviser_document_id="adviser-1", need_re_run=False)
+        table.commit()
+        assert table.find(adviser_document_id="adviser-2") == second_id
+        assert table.find(adviser_document_id="adviser-1") == first_id
+        assert table.find(adviser_document_id="adviser-1", need_re_run=True) == first_id
+
+        table.update(first_id, need_re_run=False)
+        assert table.find(adviser_document_id="adviser-1", need_re_run=True) is None
+        assert table.find(adviser_document_id="adviser-1", need_re_run=False) == first_id
+
+        table.get_or_create(adviser_document_id="adviser-3", need_re_run=True)
+        table.rollback()
+        assert table.find(adviser_document_id="adviser-3") is None
+        assert table.find(adviser_document_id="adviser-1", need_re_run=True) == first_id
+
+    def test_load(self):
+        """Test rows are copied into staging tables and merged in the order of foreign keys, sequences are adjusted."""
+        loader = BulkLoader()
+        for document in _documents():
+            loader.add_document(document)
+
+        cursor = _Cursor(rows={"SELECT id, package_name": (None, [])})
+        graph = _Graph(cursor)
+        row_counts = loader.load(graph)
+        loader.close()
+
+        assert row_counts["python_package_version"] == 40
+        assert "python_package_version_entity_rules_association" not in row_counts
+        assert list(cursor.copied).index("python_package_index") < list(cursor.copied).index("python_package_version")
+        assert list(cursor.copied).index("python_package_version") < list(cursor.copied).index("solved")
+        assert set(cursor.copied) == set(row_counts)
+
+        statement, data = cursor.copied["adviser_run"]
+        assert statement.startswith('COPY "staging_adviser_run" (')
+        assert '"limit"' in statement
+        assert len(data.splitlines()) == row_counts["adviser_run"]
+
+        _, data = cursor.copied["python_package_index"]
+        assert data.split("\t") == ["1", "https://pypi.org/simple", "\\N", "t", "f", "t\n"]
+
+        assert 'CREATE TEMPORARY TABLE "staging_solved" (LIKE "solved") ON COMMIT DROP' in cursor.statements
+        merged = [statement.split('"')[1] for statement in cursor.statements if statement.startswith("INSERT INTO")]
+        assert merged == list(cursor.copied)
+        assert (
+            "SELECT setval(pg_get_serial_sequence('python_package_version', 'id'), MAX(id)) "
+            'FROM "python_package_version"' in cursor.statements
+        )
+        assert 'ANALYZE "solved"' in cursor.statements
+        assert graph.commits == 2
+
+    def test_load_indexes(self):
+        """Test secondary indexes are dropped before rows are merged and rebuilt afterwards."""
+        loader = BulkLoader()
+        for document in _documents():
+            loader.add_document(document)
+
+        index_definition = "CREATE INDEX solved_document_id_idx ON public.solved USING btree (document_id)"
+        cursor = _Cursor(
+            rows={
+                "SELECT id, package_name": (None, []),
+                "SELECT index_class.relname": (('"solved"',), [("solved_document_id_idx", index_definition)]),
+            }
+        )
+        loader.load(_Graph(cursor))
+
+        drop = cursor.statements.index('DROP INDEX "solved_document_id_idx"')
+        merge = next(i for i, statement in enumerate(cursor.statements) if statement.startswith('INSERT INTO "solved"'))
+        create = cursor.statements.index(index_definition)
+        assert drop < merge < create
+        assert cursor.statements.count(index_definition) == 1
+
+    def test_load_rules(self):
+        """Test rules present in the database are assigned to Python package version entities loaded."""
+        loader = BulkLoader()
+        for document in _documents():
+            loader.add_document(document)
+
+        rules = [(1, "package-0", "<1.0.0"), (2, "package-1", ""), (3, "package-1", None), (4, "package-2", ">=5")]
+        cursor = _Cursor(rows={"SELECT id, package_name": (None, rules)})
+        row_counts = loader.load(_Graph(cursor))
+
+        # Rules are matched regardless of index, entities with no version match only rules for any version.
+        expected = [
+            f"{entity_id}\t{rule_id}"
+            for entity, entity_id in loader._tables["python_package_version_entity"].iter_entities()
+            for rule_id in {"package-0": [1] if entity["package_version"] == "0.0.0" else [], "package-1": [2, 3]}.get(
+                entity["package_name"], []
+            )
+        ]
+        _, data = cursor.copied["python_package_version_entity_rules_association"]
+        assert sorted(data.splitlines()) == sorted(expected)
+        assert row_counts["python_package_version_entity_rules_association"] == len(expected) >= 5
+
+    def test_load_not_empty(self):
+        """Test rows are not loaded into tables which are not empty."""
+        loader = BulkLoader()
+        for document in _documents():
+            loader.add_document(document)
+
+        cursor = _Cursor(non_empty_tables=("solved",), rows={"SELECT id, package_name": (None, [])})
+        with pytest.raises(BulkLoadError):
+            loader.load(_Graph(cursor))
+
+        assert cursor.copied == {}
+
+    def test_prepare(self):
+        """Test Python package indexes present in the database are reused, ids of new rows continue after them."""
+        loader = BulkLoader()
+        indexes = [(3, "https://pypi.org/simple"), (7, "https://example.com/simple")]
+        loader.prepare(_Graph(_Cursor(rows={"SELECT id, url": (None, indexes)})))
+        for document in _documents():
+            loader.add_document(document)
+
+        assert loader._python_package_index("https://pypi.org/simple") == 3
+        assert "python_package_index" not in loader.row_counts()
+
+        with loader._document(None):
+            assert loader._python_package_index("https://example.org/simple") == 8
+
+        cursor = _Cursor(non_empty_tables=("python_package_index",), rows={"SELECT id, package_name": (None, [])})
+        loader.load(_Graph(cursor))
+        loader.close()
+        assert cursor.copied["python_package_index"][1].startswith("8\thttps://example.org/simple\t")
+
+    def test_prepare_not_empty(self):
+        """Test documents are not transformed if any document was synced into the database."""
+        with pytest.raises(BulkLoadError):
+            BulkLoader().prepare(_Graph(_Cursor(non_empty_tables=("adviser_run",))))
+
+
+@requires_graph_database
+class TestBulkLoaderSync(ThothStoragesTest):
+    """Compare rows loaded using COPY with rows written by syncing documents one by one."""
+
+    def test_load_sync(self):
+        """Test loading documents writes the same rows to each table as the sync_* methods."""
+        generator = SyntheticDataGenerator(packages=20, adviser_runs=10, package_extracts=3, inspections=3)
+        with throwaway_graph_database("sync") as sync_graph, throwaway_graph_database("copy") as copy_graph:
+            for document in generator.iter_solver_documents():
+                sync_graph.sync_solver_result(copy.deepcopy(document))
+            for document in generator.iter_adviser_documents():
+                sync_graph.sync_adviser_result(copy.deepcopy(document))
+            for document in generator.iter_analysis_documents():
+                sync_graph.sync_analysis_result(copy.deepcopy(document))
+            for document in generator.iter_inspection_documents():
+                sync_graph.sync_inspection_result(copy.deepcopy(document))
+
+            generator.load(copy_graph)
+
+            expected = dump_graph_database(sync_graph)
+            assert expected["adviser_run"]
+            assert expected["inspection_run"]
+            assert dump_graph_database(copy_graph) == expected
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Test queries retrieving dependencies of multiple packages return the same results as queries package by package."""
+
+import pytest
+
+from thoth.storages.exceptions import NotFoundError
+from thoth.storages.graph import BulkLoader
+from thoth.storages.graph import SyntheticDataGenerator
+from thoth.storages.graph import postgres
+
+from ..base import ThothStoragesTest
+from ..utils import requires_graph_database
+from ..utils import throwaway_graph_database
+
+_GENERATOR = SyntheticDataGenerator(packages=30, versions=2, dependencies=3, error_ratio=0.1)
+_ENVIRONMENT = {"os_name": "rhel", "os_version": "8", "python_version": "3.8"}
+# Package versions not solved at all and package versions solved only in the first solver environment.
+_NOT_SOLVED = {"package-3===1.0.0", "package-7===0.0.0"}
+_NOT_SOLVED_PY36 = {"package-1===0.0.0", "package-2===1.0.0"}
+_PACKAGE_TUPLES = [
+    (_GENERATOR.package_name(package), _GENERATOR.package_version(version), _GENERATOR.index_url)
+    for package in (29, 24, 22, 15, 12, 8, 0)
+    for version in range(_GENERATOR.versions)
+]
+_QUERY_KWARGS = [
+    _ENVIRONMENT,
+    {**_ENVIRONMENT, "extras": frozenset((None,))},
+    {**_ENVIRONMENT, "extras": frozenset((None, "test")), "marker_evaluation_result": True},
+    {"python_version": "3.6"},
+    {"marker_evaluation_result": False},
+    {},
+]
+
+
+@requires_graph_database
+class TestDependencies(ThothStoragesTest):
+    """Test retrieving dependencies of packages from a database with solver documents loaded."""
+
+    @pytest.fixture(name="graph", scope="class")
+    def _fixture_graph(self):
+        """Load solver documents, leave some of the package versions not solved."""
+        with throwaway_graph_database("dependencies") as graph:
+            loader = BulkLoader()
+            try:
+                loader.prepare(graph)
+                for document in _GENERATOR.iter_solver_documents():
+                    requirement = document["metadata"]["arguments"]["python"]["requirements"]
+                    python_version = document["result"]["environment"]["python_version"]
+                    if requirement in _NOT_SOLVED or (python_version == "3.6" and requirement in _NOT_SOLVED_PY36):
+                        continue
+
+                    loader.add_document(document)
+
+                loader.load(graph)
+            finally:
+                loader.close()
+
+            yield graph
+
+    @pytest.mark.parametrize("kwargs", _QUERY_KWARGS)
+    def test_retrieve_transitive_dependencies_python_recursive(self, graph, kwargs):
+        """Test the recursive query returns the same dependency tuples as traversing the graph package by package."""
+        dependency_tuples = set()
+        for package_tuple in _PACKAGE_TUPLES:
+            expected = graph.retrieve_transitive_dependencies_python(*package_tuple, recursive_query=False, **kwargs)
+            result = graph.retrieve_transitive_dependencies_python(*package_tuple, recursive_query=True, **kwargs)
+            assert sorted(result, key=repr) == sorted(expected, key=repr), package_tuple
+            dependency_tuples.update(dependency_tuple for _, dependency_tuple in expected)
+
+        assert dependency_tuples
+        if "marker_evaluation_result" not in kwargs:
+            # Dependencies not solved are reported as well.
+            assert any(dependency_tuple[2] is None for dependency_tuple in dependency_tuples)
+
+    @pytest.mark.parametrize("batch_size,workers", [(1, 1), (3, 2), (1000, 1)])
+    def test_retrieve_transitive_dependencies_python_multi(self, graph, monkeypatch, batch_size, workers):
+        """Test traversing the graph in batches gives the same result as traversing it for each package alone."""
+        monkeypatch.setattr(postgres, "_TRANSITIVE_DEPENDENCIES_BATCH_SIZE", batch_size)
+        batches = []
+        get_dependencies_python_batch = graph._get_dependencies_python_batch
+
+        def _get_dependencies_python_batch(package_tuples, **kwargs):
+            batches.append(package_tuples)
+            return get_dependencies_python_batch(package_tuples, **kwargs)
+
+        monkeypatch.setattr(graph, "_get_dependencies_python_batch", _get_dependencies_python_batch)
+        package_tuples = _PACKAGE_TUPLES + [("Package_29", "0.0.0", _GENERATOR.index_url)]
+        result = graph.retrieve_transitive_dependencies_python_multi(*package_tuples, **_ENVIRONMENT, workers=workers)
+
+        assert set(result) == set(package_tuples)
+        for package_tuple in _PACKAGE_TUPLES:
+            expected = graph.retrieve_transitive_dependencies_python(*package_tuple, **_ENVIRONMENT)
+            assert sorted(result[package_tuple], key=repr) == sorted(expected, key=repr), package_tuple
+
+        assert result[("Package_29", "0.0.0", _GENERATOR.index_url)] == result[_PACKAGE_TUPLES[0]]
+        # Packages are shared by dependency graphs of the given packages, each of them is queried once.
+        assert all(len(batch) <= batch_size for batch in batches)
+        queried = [package_tuple for batch in batches for package_tuple in batch]
+        assert len(queried) == len(set(queried))
+        shared = set.intersection(*({dependency for _, dependency in result[t]} for t in _PACKAGE_TUPLES[:2]))
+        assert shared
+        if batch_size == 1:
+            assert len(batches) == len(queried)
+
+    @pytest.mark.parametrize("kwargs", _QUERY_KWARGS + [{**_ENVIRONMENT, "is_missing": False}])
+    def test_get_depends_on_many(self, graph, kwargs):
+        """Test dependencies retrieved using a single query are the same as the ones retrieved package by package."""
+        package_tuples = _PACKAGE_TUPLES + [
+            ("Package_29", "0.0.0", _GENERATOR.index_url),
+            ("package-3", "1.0.0", _GENERATOR.index_url),
+            ("package-unknown", "1.0.0", _GENERATOR.index_url),
+        ]
+        graph.cache_clear()
+        result = graph.get_depends_on_many(package_tuples, **kwargs)
+        graph.cache_clear()
+
+        expected = {}
+        for package_tuple in package_tuples:
+            try:
+                expected[package_tuple] = graph.get_depends_on(*package_tuple, **kwargs)
+            except NotFoundError:
+                pass
+
+        assert ("package-3", "1.0.0", _GENERATOR.index_url) not in expected
+        assert set(result) == set(expected)
+        for package_tuple, dependencies in expected.items():
+            assert {extra: sorted(items) for extra, items in result[package_tuple].items()} == {
+                extra: sorted(items) for extra, items in dependencies.items()
+            }, package_tuple
+
+        # Results are served from the cache of get_depends_on.
+        graph.cache_clear()
+        graph.get_depends_on_many(package_tuples, **kwargs)
+        for package_tuple in expected:
+            assert graph.get_depends_on(*package_tuple, **kwargs) == result[package_tuple]
+
+        assert graph.get_depends_on.cache_info().misses == 0
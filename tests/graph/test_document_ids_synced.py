@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Test retrieving document ids already synced out of the given ones."""
+
+import pytest
+
+from thoth.storages.graph import SyntheticDataGenerator
+from thoth.storages.graph import postgres
+
+from ..base import ThothStoragesTest
+from ..utils import requires_graph_database
+from ..utils import throwaway_graph_database
+
+_GENERATOR = SyntheticDataGenerator(packages=10, versions=2, adviser_runs=5, package_extracts=5, other_runs=5)
+# Generator methods of documents, methods syncing them and methods retrieving document ids synced, solver
+# documents are synced first as other documents refer to packages solved.
+_DOCUMENT_TYPES = [
+    ("iter_solver_documents", "sync_solver_result", "get_solver_document_ids_synced"),
+    ("iter_adviser_documents", "sync_adviser_result", "get_adviser_document_ids_synced"),
+    ("iter_analysis_documents", "sync_analysis_result", "get_analysis_document_ids_synced"),
+    (
+        "iter_provenance_checker_documents",
+        "sync_provenance_checker_result",
+        "get_provenance_checker_document_ids_synced",
+    ),
+    ("iter_dependency_monkey_documents", "sync_dependency_monkey_result", "get_dependency_monkey_document_ids_synced"),
+    (
+        "iter_security_indicator_documents",
+        "sync_security_indicator_aggregated_result",
+        "get_si_aggregated_document_ids_synced",
+    ),
+]
+
+
+@requires_graph_database
+class TestDocumentIdsSynced(ThothStoragesTest):
+    """Test retrieving document ids already synced against a database with documents synced."""
+
+    @pytest.fixture(name="synced", scope="class")
+    def _fixture_synced(self):
+        """Sync documents of all the types, retrieve the adapter together with document ids synced per type."""
+        with throwaway_graph_database("document_ids_synced") as graph:
+            synced = {}
+            for generator_method_name, sync_method_name, method_name in _DOCUMENT_TYPES:
+                synced[method_name] = set()
+                for document in getattr(_GENERATOR, generator_method_name)():
+                    getattr(graph, sync_method_name)(document)
+                    synced[method_name].add(document["metadata"]["document_id"])
+
+            yield graph, synced
+
+    @pytest.mark.parametrize("method_name", [method_name for _, _, method_name in _DOCUMENT_TYPES])
+    def test_get_document_ids_synced(self, synced, method_name):
+        """Test exactly the document ids synced are returned, ids of other document types are not."""
+        graph, synced = synced
+        expected = synced[method_name]
+        other = set.union(*(document_ids for name, document_ids in synced.items() if name != method_name))
+        assert expected
+        assert getattr(graph, method_name)([]) == set()
+        assert getattr(graph, method_name)(iter(sorted(expected))) == expected
+
+        document_ids = sorted(expected) + sorted(other) + [f"{document_id}-not-synced" for document_id in expected]
+        assert getattr(graph, method_name)(document_ids) == expected
+        assert getattr(graph, method_name)(other) == set()
+
+    @pytest.mark.parametrize("method_name", [method_name for _, _, method_name in _DOCUMENT_TYPES])
+    def test_get_document_ids_synced_chunks(self, synced, monkeypatch, method_name):
+        """Test document ids spanning multiple chunks are checked, ids repeated in chunks are reported once."""
+        graph, synced = synced
+        expected = synced[method_name]
+        monkeypatch.setattr(postgres, "_DOCUMENT_ID_QUERY_CHUNK_SIZE", 2)
+
+        document_ids = [document_id for document_id in sorted(expected) for _ in range(3)]
+        document_ids.insert(len(document_ids) // 2, "not-synced")
+        assert len(document_ids) > 2 * postgres._DOCUMENT_ID_QUERY_CHUNK_SIZE
+        assert getattr(graph, method_name)(document_ids) == expected
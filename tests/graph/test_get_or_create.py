@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Test the get_or_create cache kept within a session and its invalidation."""
+
+import pytest
+
+from thoth.storages.graph import models_base
+from thoth.storages.graph.models import DependsOn
+from thoth.storages.graph.models import PythonPackageVersionEntity
+from thoth.storages.graph.models_base import BaseExtension
+from thoth.storages.graph.models_base import _get_or_create_cache_key
+
+from ..base import ThothStoragesTest
+from ..utils import requires_graph_database
+from ..utils import throwaway_graph_database
+
+
+def _get_or_create(session, package_version="1.0.0"):
+    """Get or create a package entity with the given version."""
+    return PythonPackageVersionEntity.get_or_create(
+        session, package_name="flask", package_version=package_version, python_package_index_id=None
+    )
+
+
+class TestGetOrCreateCacheKey(ThothStoragesTest):
+    """Test computing keys to the get_or_create cache."""
+
+    def test_key(self):
+        """Test keys do not depend on the order of arguments, types of values are distinguished."""
+        key = _get_or_create_cache_key(PythonPackageVersionEntity, {"package_name": "flask", "package_version": "1"})
+        assert key == _get_or_create_cache_key(
+            PythonPackageVersionEntity, {"package_version": "1", "package_name": "flask"}
+        )
+        assert _get_or_create_cache_key(PythonPackageVersionEntity, {"id": 1}) != _get_or_create_cache_key(
+            PythonPackageVersionEntity, {"id": True}
+        )
+
+    def test_not_cached(self):
+        """Test association tables, instances not flushed and unhashable values are not cached."""
+        assert _get_or_create_cache_key(DependsOn, {"entity_id": 1, "version_id": 2}) is None
+        entity = PythonPackageVersionEntity(package_name="flask", package_version="1.0.0")
+        assert _get_or_create_cache_key(PythonPackageVersionEntity, {"entity": entity}) is None
+        assert _get_or_create_cache_key(PythonPackageVersionEntity, {"package_name": {1, 2}}) is None
+
+
+@requires_graph_database
+class TestGetOrCreateCache(ThothStoragesTest):
+    """Test the get_or_create cache against a database."""
+
+    @pytest.fixture(name="graph", scope="class")
+    def _fixture_graph(self):
+        """Create an empty database."""
+        with throwaway_graph_database("get_or_create") as graph:
+            yield graph
+
+    def test_hit(self, graph):
+        """Test repeated calls within a session are served from the cache, sessions do not share the cache."""
+        with graph._session_scope() as session:
+            info = BaseExtension.get_or_create_cache_info()
+            instance, existed = _get_or_create(session)
+            assert not existed
+            assert _get_or_create(session) == (instance, True)
+            assert BaseExtension.get_or_create_cache_info() == {"hits": info["hits"] + 1, "misses": info["misses"] + 1}
+            entity_id = instance.id
+            session.commit()
+
+        with graph._session_scope() as session:
+            info = BaseExtension.get_or_create_cache_info()
+            instance, existed = _get_or_create(session)
+            assert existed
+            assert instance.id == entity_id
+            assert BaseExtension.get_or_create_cache_info()["misses"] == info["misses"] + 1
+            session.delete(instance)
+
+    def test_disabled(self, graph, monkeypatch):
+        """Test nothing is remembered if the cache is turned off."""
+        monkeypatch.setattr(models_base, "_GET_OR_CREATE_CACHE", False)
+        with graph._session_scope() as session:
+            info = BaseExtension.get_or_create_cache_info()
+            instance, _ = _get_or_create(session)
+            assert _get_or_create(session) == (instance, True)
+            assert models_base._GET_OR_CREATE_CACHE_INFO_KEY not in session.info
+            assert BaseExtension.get_or_create_cache_info() == info
+            session.rollback()
+
+    def test_nested_rollback(self, graph):
+        """Test entities created in a nested transaction rolled back are not served from the cache."""
+        with graph._session_scope() as session:
+            session.begin_nested()
+            instance, existed = _get_or_create(session)
+            assert not existed
+            session.rollback()
+
+            assert models_base._GET_OR_CREATE_CACHE_INFO_KEY not in session.info
+            new_instance, existed = _get_or_create(session)
+            assert not existed
+            assert new_instance is not instance
+            session.rollback()
+
+    def test_bulk_delete(self, graph):
+        """Test entities deleted in bulk are not served from the cache."""
+        with graph._session_scope() as session:
+            instance, _ = _get_or_create(session)
+            session.query(PythonPackageVersionEntity).filter_by(package_name="flask").delete()
+
+            new_instance, existed = _get_or_create(session)
+            assert not existed
+            assert new_instance.id != instance.id
+            session.rollback()
+
+    def test_delete(self, graph):
+        """Test entities deleted are not served from the cache, other entities are cached again."""
+        with graph._session_scope() as session:
+            instance, _ = _get_or_create(session)
+            other_instance, _ = _get_or_create(session, package_version="2.0.0")
+            session.delete(instance)
+            session.flush()
+
+            new_instance, existed = _get_or_create(session)
+            assert not existed
+            assert new_instance.id != instance.id
+            assert _get_or_create(session, package_version="2.0.0") == (other_instance, True)
+            session.rollback()
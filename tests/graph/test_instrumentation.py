@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test instrumentation of graph database adapter method calls."""
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy import event
+
+from thoth.storages.graph.instrumentation import QueryInstrumentation
+from thoth.storages.graph.instrumentation import render_prometheus
+from thoth.storages.exceptions import NotFoundError
+from thoth.storages.graph import postgres
+from thoth.storages.graph.postgres import instrument_methods
+
+from ..base import ThothStoragesTest
+from ..utils import requires_graph_database
+from ..utils import throwaway_graph_database
+
+
+@instrument_methods(exclude=("stats",))
+class _Adapter:
+    """An adapter issuing statements on an in-memory database."""
+
+    def __init__(self, instrumentation=None):
+        """Create an adapter with the given instrumentation."""
+        self._query_instrumentation = instrumentation
+        self._engine = create_engine("sqlite://")
+        if instrumentation is not None:
+            instrumentation.register(self._engine)
+
+    def get_numbers(self, count):
+        """Get numbers, issue one statement per number."""
+        return [self._engine.execute(f"SELECT {number}").scalar() for number in range(count)]
+
+    def get_numbers_sum(self, count):
+        """Get sum of numbers, numbers are retrieved by another instrumented method."""
+        return sum(self.get_numbers(count))
+
+    def iter_numbers(self, count):
+        """Iterate over numbers."""
+        for number in range(count):
+            yield self._engine.execute(f"SELECT {number}").scalar()
+
+    def get_error(self):
+        """Raise an error."""
+        raise ValueError
+
+    def stats(self):
+        """A method which is not instrumented."""
+        return self._engine.execute("SELECT 1").scalar()
+
+
+def _get_samples(families, family_name, method):
+    """Get samples of the given metric family for the given method, keyed by their names and le labels."""
+    return {
+        (sample["name"], sample["labels"].get("le")): sample["value"]
+        for sample in families[family_name]["samples"]
+        if sample["labels"]["method"] == method
+    }
+
+
+class TestQueryInstrumentation(ThothStoragesTest):
+    """Test instrumentation of graph database adapter method calls."""
+
+    def test_not_enabled(self):
+        """Test methods are called as they are if instrumentation is not enabled."""
+        adapter = _Adapter()
+        assert adapter.get_numbers_sum(3) == 3
+        assert list(adapter.iter_numbers(2)) == [0, 1]
+
+    def test_call(self):
+        """Test calls are recorded with statements issued, including statements issued by nested calls."""
+        instrumentation = QueryInstrumentation()
+        adapter = _Adapter(instrumentation)
+
+        assert adapter.get_numbers_sum(3) == 3
+        assert adapter.get_numbers(1) == [0]
+        assert adapter.stats() == 1
+
+        families = instrumentation.export()
+        assert set(families) == {
+            "thoth_storages_graph_calls_total",
+            "thoth_storages_graph_call_errors_total",
+            "thoth_storages_graph_slow_calls_total",
+            "thoth_storages_graph_call_rows_total",
+            "thoth_storages_graph_call_duration_seconds",
+            "thoth_storages_graph_call_statements",
+        }
+        assert families["thoth_storages_graph_call_statements"]["type"] == "histogram"
+
+        calls = {
+            sample["labels"]["method"]: sample["value"]
+            for sample in families["thoth_storages_graph_calls_total"]["samples"]
+        }
+        assert calls == {"get_numbers": 2, "get_numbers_sum": 1}
+
+        statements = _get_samples(families, "thoth_storages_graph_call_statements", "get_numbers")
+        assert statements[("thoth_storages_graph_call_statements_bucket", "1")] == 1
+        assert statements[("thoth_storages_graph_call_statements_bucket", "2")] == 1
+        assert statements[("thoth_storages_graph_call_statements_bucket", "5")] == 2
+        assert statements[("thoth_storages_graph_call_statements_bucket", "+Inf")] == 2
+        assert statements[("thoth_storages_graph_call_statements_sum", None)] == 4
+        assert statements[("thoth_storages_graph_call_statements_count", None)] == 2
+
+        statements = _get_samples(families, "thoth_storages_graph_call_statements", "get_numbers_sum")
+        assert statements[("thoth_storages_graph_call_statements_sum", None)] == 3
+
+        duration = _get_samples(families, "thoth_storages_graph_call_duration_seconds", "get_numbers_sum")
+        assert duration[("thoth_storages_graph_call_duration_seconds_count", None)] == 1
+
+    def test_call_error(self):
+        """Test calls raising an exception are recorded."""
+        instrumentation = QueryInstrumentation()
+        adapter = _Adapter(instrumentation)
+
+        with pytest.raises(ValueError):
+            adapter.get_error()
+
+        families = instrumentation.export()
+        assert _get_samples(families, "thoth_storages_graph_call_errors_total", "get_error") == {
+            ("thoth_storages_graph_call_errors_total", None): 1
+        }
+
+    def test_iterate(self):
+        """Test a generator is recorded as one call, also if it is not exhausted."""
+        instrumentation = QueryInstrumentation()
+        adapter = _Adapter(instrumentation)
+
+        assert list(adapter.iter_numbers(3)) == [0, 1, 2]
+        iterator = adapter.iter_numbers(3)
+        assert next(iterator) == 0
+        # Statements issued by the consumer are not attributed to the generator.
+        assert adapter.get_numbers(1) == [0]
+        iterator.close()
+
+        families = instrumentation.export()
+        statements = _get_samples(families, "thoth_storages_graph_call_statements", "iter_numbers")
+        assert statements[("thoth_storages_graph_call_statements_sum", None)] == 4
+        assert statements[("thoth_storages_graph_call_statements_count", None)] == 2
+        assert _get_samples(families, "thoth_storages_graph_call_errors_total", "iter_numbers") == {
+            ("thoth_storages_graph_call_errors_total", None): 0
+        }
+
+    def test_slow_call(self, caplog):
+        """Test slow calls are logged with statements issued, only the outermost call is logged."""
+        instrumentation = QueryInstrumentation(slow_call_threshold=1e-9)
+        adapter = _Adapter(instrumentation)
+
+        with caplog.at_level(logging.WARNING, logger="thoth.storages.graph.instrumentation"):
+            adapter.get_numbers_sum(2)
+
+        assert len(caplog.records) == 1
+        assert "Slow call of get_numbers_sum" in caplog.records[0].getMessage()
+        assert "SELECT 1" in caplog.records[0].getMessage()
+
+        families = instrumentation.export()
+        assert _get_samples(families, "thoth_storages_graph_slow_calls_total", "get_numbers") == {
+            ("thoth_storages_graph_slow_calls_total", None): 1
+        }
+
+    def test_slow_call_statement_rewritten(self, caplog):
+        """Test statements rewritten by other listeners, such as prepared statements, are logged as issued."""
+        instrumentation = QueryInstrumentation(slow_call_threshold=1e-9)
+        adapter = _Adapter()
+
+        def rewrite(connection, cursor, statement, parameters, context, executemany):
+            return f"{statement} -- rewritten", parameters
+
+        event.listen(adapter._engine, "before_cursor_execute", rewrite, retval=True)
+        adapter._query_instrumentation = instrumentation
+        instrumentation.register(adapter._engine)
+
+        with caplog.at_level(logging.WARNING, logger="thoth.storages.graph.instrumentation"):
+            adapter.get_numbers(1)
+
+        assert "SELECT 0 -- parameters" in caplog.records[0].getMessage()
+        assert "rewritten" not in caplog.records[0].getMessage()
+
+    def test_render_prometheus(self):
+        """Test rendering metrics in the Prometheus text exposition format."""
+        instrumentation = QueryInstrumentation()
+        adapter = _Adapter(instrumentation)
+        adapter.get_numbers(1)
+
+        text = render_prometheus(instrumentation.export(), extra_labels={"instance": 'a"b'})
+        assert "# TYPE thoth_storages_graph_calls_total counter\n" in text
+        assert 'thoth_storages_graph_calls_total{instance="a\\"b",method="get_numbers"} 1\n' in text
+        assert (
+            'thoth_storages_graph_call_duration_seconds_bucket{instance="a\\"b",method="get_numbers",le="+Inf"} 1\n'
+            in text
+        )
+
+
+@requires_graph_database
+class TestQueryInstrumentationPrepared(ThothStoragesTest):
+    """Test instrumentation of the graph database adapter executing prepared statements."""
+
+    def test_slow_call_prepared(self, caplog, monkeypatch):
+        """Test statements executed as prepared statements are logged as SQL, not as EXECUTE statements."""
+        monkeypatch.setattr(postgres, "_SLOW_CALL_THRESHOLD", 1e-9)
+        with throwaway_graph_database("instrumentation") as graph:
+            graph.disconnect()
+            graph._prepared_statements = True
+            graph._instrumentation = True
+            graph.connect()
+
+            with caplog.at_level(logging.WARNING, logger="thoth.storages.graph.instrumentation"):
+                with pytest.raises(NotFoundError):
+                    graph.has_python_solver_error(
+                        "flask",
+                        "1.0.0",
+                        "https://pypi.org/simple",
+                        os_name="rhel",
+                        os_version="8",
+                        python_version="3.8",
+                    )
+
+            assert graph._prepared_statement_stats["executed"] == 1
+            message = caplog.records[-1].getMessage()
+            assert "Slow call of has_python_solver_error" in message
+            assert "FROM python_package_version" in message
+            assert "EXECUTE thoth_" not in message
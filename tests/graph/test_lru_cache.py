@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the in-memory cache of graph database adapter methods and its invalidation."""
+
+import contextlib
+
+import attr
+import pytest
+from flexmock import flexmock
+
+from thoth.storages.graph import GraphDatabase
+from thoth.storages.graph.models import ProvenanceCheckerRun
+from thoth.storages.graph.postgres import invalidates_cache
+from thoth.storages.graph.postgres import lru_cache
+
+from ..base import ThothStoragesTest
+
+
+@attr.s()
+class _GraphDatabase(GraphDatabase):
+    """A graph database adapter with methods not querying the database."""
+
+    calls = attr.ib(factory=list)
+
+    @lru_cache(maxsize=3, tables=("depends_on",), key_argument="package_name")
+    def get_dependencies(self, package_name, package_version=None, *, os_name=None):
+        self.calls.append((package_name, package_version, os_name))
+        return [package_name, package_version, os_name]
+
+    @lru_cache(maxsize=3, tables=("solved",))
+    def get_solved_count(self, os_name):
+        self.calls.append(os_name)
+        return 42
+
+    @invalidates_cache(tables=("depends_on",), key_argument="package_name")
+    def sync_dependencies(self, package_name):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _fixture_cached_methods():
+    """Do not share cached methods with other tests, cached methods are kept per class."""
+    flexmock(GraphDatabase, _CACHED_METHODS=[])
+
+
+class TestLRUCache(ThothStoragesTest):
+    """Test the in-memory cache of graph database adapter methods."""
+
+    def test_cache(self):
+        """Test results are cached, least recently used entries are evicted."""
+        graph = _GraphDatabase()
+        for package_name in ("flask", "selinon", "flask", "thoth-common", "requests", "flask"):
+            assert graph.get_dependencies(package_name) == [package_name, None, None]
+
+        assert [call[0] for call in graph.calls] == ["flask", "selinon", "thoth-common", "requests"]
+        assert graph.get_dependencies.cache_info()._asdict() == {
+            "hits": 2,
+            "misses": 4,
+            "maxsize": 3,
+            "currsize": 3,
+            "invalidations": 0,
+        }
+
+        graph.get_dependencies("selinon")
+        assert graph.calls[-1] == ("selinon", None, None)
+
+    def test_cache_put(self):
+        """Test storing results computed elsewhere."""
+        graph = _GraphDatabase()
+        _GraphDatabase.get_dependencies.cache_put(graph, ["cached"], "flask", "1.0.0", os_name="rhel")
+
+        assert graph.get_dependencies("flask", "1.0.0", os_name="rhel") == ["cached"]
+        assert graph.calls == []
+
+    def test_invalidate_keys(self):
+        """Test only entries computed for the keys written are invalidated."""
+        graph = _GraphDatabase()
+        graph.get_dependencies("Flask", "1.0.0")
+        graph.get_dependencies("flask", os_name="rhel")
+        graph.get_dependencies("selinon")
+        graph.get_solved_count("rhel")
+
+        assert graph.cache_invalidate(("depends_on",), ["FLASK"]) == 2
+        assert graph.get_dependencies.cache_info().currsize == 1
+        assert graph.get_dependencies.cache_info().invalidations == 2
+        assert graph.get_solved_count.cache_info().currsize == 1
+
+        graph.calls.clear()
+        graph.get_dependencies("selinon")
+        graph.get_dependencies("Flask", "1.0.0")
+        assert graph.calls == [("Flask", "1.0.0", None)]
+
+    def test_invalidate_tables(self):
+        """Test methods not reading the tables written are not invalidated, methods not tracking keys are."""
+        graph = _GraphDatabase()
+        graph.get_dependencies("flask")
+        graph.get_solved_count("rhel")
+        graph.get_solved_count("fedora")
+
+        assert graph.cache_invalidate(("solved",), ["flask"]) == 2
+        assert graph.get_dependencies.cache_info().currsize == 1
+        assert graph.get_solved_count.cache_info().currsize == 0
+        assert graph.stats()["memory_cache_info"]["get_solved_count"]["invalidations"] == 2
+
+    def test_invalidates_cache(self):
+        """Test methods writing tables publish keys written."""
+        graph = _GraphDatabase()
+        graph.get_dependencies("flask")
+        graph.get_dependencies("selinon")
+
+        graph.sync_dependencies("Flask")
+
+        assert graph.get_dependencies.cache_info().currsize == 1
+        graph.get_dependencies("selinon")
+        assert graph.calls == [("flask", None, None), ("selinon", None, None)]
+
+    def test_invalidate_while_computing(self):
+        """Test results computed while the cache is invalidated are not stored."""
+        graph = _GraphDatabase()
+
+        def _get_dependencies(self, package_name, package_version=None, *, os_name=None):
+            self.cache_invalidate(("depends_on",), [package_name])
+            return []
+
+        graph.get_dependencies("selinon")
+        graph.get_dependencies.cache_clear()
+        graph.get_dependencies._func = _get_dependencies
+        graph.get_dependencies("flask")
+
+        assert graph.get_dependencies.cache_info().currsize == 0
+
+    def test_invalidate_solver_legacy(self):
+        """Test packages of legacy solver documents stating errors under the package key are invalidated."""
+        graph = _GraphDatabase()
+        flexmock(graph).should_receive("_sync_solver_result").once()
+        flexmock(graph).should_receive("cache_invalidate").with_args(object, {"flask", "selinon", "click"}).once()
+
+        graph.sync_solver_result(
+            {
+                "result": {
+                    "tree": [{"package_name": "flask", "dependencies": [{"package_name": "click"}]}],
+                    "errors": [{"package": "selinon", "version": "1.0.0", "index": "https://pypi.org/simple"}],
+                    "unresolved": [],
+                }
+            }
+        )
+
+    def test_invalidate_entities(self):
+        """Test entities written by a sync, for example packages missing in a provenance check, are invalidated."""
+        graph = _GraphDatabase()
+        session = flexmock(info={}, begin=lambda subtransactions: contextlib.nullcontext())
+        flexmock(graph).should_receive("_session_scope").and_return(contextlib.nullcontext(session))
+        flexmock(graph).should_receive("_create_python_software_stack").and_return(flexmock(id=1))
+        flexmock(ProvenanceCheckerRun).should_receive("get_or_create").and_return(flexmock(id=1), False)
+        flexmock(graph).should_receive("get_python_rule_all").and_return([])
+
+        def _create_python_package_version(session, package_name, package_version, **kwargs):
+            graph._refresh_rules_python_entity(
+                session, flexmock(package_name=package_name, package_version="1.0.0", index=None)
+            )
+
+        graph._create_python_package_version = _create_python_package_version
+        flexmock(graph).should_call("cache_invalidate").with_args(
+            ("python_package_version_entity", "python_package_version_entity_rules_association"), {"flask"}
+        ).once()
+
+        graph.sync_provenance_checker_result(
+            {
+                "metadata": {
+                    "document_id": "provenance-checker-1234",
+                    "datetime": "2026-01-01T00:00:00",
+                    "analyzer": "thoth-adviser",
+                    "analyzer_version": "1.0.0",
+                    "arguments": {"thoth-adviser": {"verbose": False, "metadata": {"origin": "thoth"}}},
+                },
+                "result": {
+                    "error": False,
+                    "parameters": {"project": {}},
+                    "report": [
+                        {
+                            "id": "MISSING-PACKAGE",
+                            "package_name": "flask",
+                            "package_version": "==1.0.0",
+                            "source": {"url": "https://pypi.org/simple"},
+                        }
+                    ],
+                },
+            }
+        )
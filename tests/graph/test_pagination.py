@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test keyset pagination of graph database query results."""
+
+import contextlib
+
+import pytest
+from flexmock import flexmock
+
+from thoth.storages.graph import GraphDatabase
+from thoth.storages.graph.models import PythonPackageVersion
+
+from ..base import ThothStoragesTest
+
+
+class TestPagination(ThothStoragesTest):
+    """Test keyset pagination of graph database query results."""
+
+    def test_cursor(self):
+        """Test cursors are opaque strings carrying key of the last row."""
+        cursor = GraphDatabase._encode_cursor(42)
+        assert isinstance(cursor, str)
+        assert GraphDatabase._decode_cursor(cursor) == 42
+
+    @pytest.mark.parametrize("cursor", ["foo", "", GraphDatabase._encode_cursor(1)[:-2]])
+    def test_cursor_invalid(self, cursor):
+        """Test an error is raised on invalid cursors."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            GraphDatabase._decode_cursor(cursor)
+
+    @pytest.mark.parametrize(
+        "rows,next_cursor",
+        [
+            ([("flask", "1.1.2", 4), ("flask", "1.1.1", 7)], GraphDatabase._encode_cursor(7)),
+            ([("flask", "1.1.2", 4)], None),
+        ],
+    )
+    def test_get_page(self, rows, next_cursor):
+        """Test rows following the cursor are retrieved, a cursor is returned only if there can be more rows."""
+        query = flexmock()
+        query.should_receive("add_columns").with_args(PythonPackageVersion.id).and_return(query).once()
+        query.should_receive("filter").and_return(query).once()
+        query.should_receive("order_by").with_args(PythonPackageVersion.id).and_return(query).once()
+        query.should_receive("limit").with_args(2).and_return(query).once()
+        query.should_receive("all").and_return(rows).once()
+
+        result = GraphDatabase()._get_page(query, PythonPackageVersion.id, GraphDatabase._encode_cursor(3), 2)
+        assert result == ([row[:-1] for row in rows], next_cursor)
+
+    def test_iter_chunks(self):
+        """Test each chunk is retrieved by a query of its own in a session closed before the chunk is yielded."""
+        pages = [[("a", 1), ("b", 2)], [("c", 5), ("d", 6)], [("e", 8)]]
+        sessions = []
+
+        @contextlib.contextmanager
+        def _session_scope():
+            sessions.append("open")
+            yield len(sessions)
+            sessions[-1] = "closed"
+
+        def _construct_query(session):
+            assert sessions[-1] == "open"
+            query = flexmock()
+            query.should_receive("add_columns").with_args(PythonPackageVersion.id).and_return(query).once()
+            if session > 1:
+                key = pages[session - 2][-1][-1]
+
+                def _filter(criterion):
+                    assert criterion.compare(PythonPackageVersion.id > key)
+                    return query
+
+                query.should_receive("filter").replace_with(_filter).once()
+            query.should_receive("order_by").with_args(PythonPackageVersion.id).and_return(query).once()
+            query.should_receive("limit").with_args(2).and_return(query).once()
+            query.should_receive("all").and_return(pages[session - 1]).once()
+            return query
+
+        graph = GraphDatabase()
+        flexmock(graph).should_receive("_session_scope").replace_with(_session_scope)
+        chunks = []
+        for chunk, cursor in graph._iter_chunks(_construct_query, PythonPackageVersion.id, None, 2):
+            assert sessions[-1] == "closed"
+            chunks.append((chunk, GraphDatabase._decode_cursor(cursor)))
+
+        assert chunks == [([("a",), ("b",)], 2), ([("c",), ("d",)], 6), ([("e",)], 8)]
+        assert sessions == ["closed"] * 3
+
+    def test_iter_unsolved_python_package_versions_all(self):
+        """Test unsolved package versions are streamed in the order of the query unless randomized."""
+        session = flexmock()
+        query = flexmock()
+        query.should_receive("order_by").never()
+        query.should_receive("distinct").and_return(query).once()
+        query.should_receive("yield_per").and_return(iter([("flask", "1.1.2", "https://pypi.org/simple")])).once()
+
+        graph = GraphDatabase()
+        flexmock(graph).should_receive("_session_scope").replace_with(lambda: contextlib.nullcontext(session))
+        flexmock(graph).should_receive("_construct_unsolved_python_package_versions_all_query").and_return(query)
+        result = list(graph.iter_unsolved_python_package_versions_all(distinct=True))
+        assert result == [("flask", "1.1.2", "https://pypi.org/simple")]
+
+    def test_iter_unsolved_python_package_versions_all_randomize_distinct(self):
+        """Test results cannot be randomized and distinct at the same time."""
+        with pytest.raises(ValueError):
+            next(GraphDatabase().iter_unsolved_python_package_versions_all(randomize=True, distinct=True))
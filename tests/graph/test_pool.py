@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test connection pooling configuration and statistics."""
+
+import sqlite3
+
+import pytest
+from flexmock import flexmock
+from sqlalchemy import exc
+
+from thoth.storages.graph import GraphDatabase
+from thoth.storages.graph import postgres
+from thoth.storages.graph.pool import InstrumentedNullPool
+from thoth.storages.graph.pool import InstrumentedQueuePool
+
+from ..base import ThothStoragesTest
+
+
+class TestPool(ThothStoragesTest):
+    """Test connection pooling configuration and statistics."""
+
+    def test_engine_options_default(self):
+        """Test pooling is configured based on environment variables by default."""
+        flexmock(postgres, _POOL_SIZE=20, _POOL_PRE_PING=True, _STATEMENT_TIMEOUT=0)
+        options = GraphDatabase()._get_engine_options()
+
+        assert options == {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": 20,
+            "max_overflow": postgres._POOL_MAX_OVERFLOW,
+            "pool_timeout": postgres._POOL_TIMEOUT,
+            "pool_recycle": postgres._POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }
+
+    def test_engine_options(self):
+        """Test configuring pooling using constructor arguments."""
+        flexmock(postgres, _POOL_SIZE=20, _STATEMENT_TIMEOUT=1000)
+        options = GraphDatabase(
+            pool_size=2, max_overflow=0, pool_recycle=3600, statement_timeout=500
+        )._get_engine_options()
+
+        assert options["pool_size"] == 2
+        assert options["max_overflow"] == 0
+        assert options["pool_recycle"] == 3600
+        assert options["connect_args"] == {"options": "-c statement_timeout=500"}
+
+    def test_engine_options_external_pooler(self):
+        """Test no connections are kept and no startup options are sent if an external pooler is used."""
+        flexmock(postgres, _EXTERNAL_POOLER=True, _STATEMENT_TIMEOUT=1000)
+        assert GraphDatabase()._get_engine_options() == {"poolclass": InstrumentedNullPool}
+        assert GraphDatabase(external_pooler=False)._get_engine_options()["poolclass"] == InstrumentedQueuePool
+
+    def test_checkout_stats(self):
+        """Test checkouts waiting for a connection and timing out are recorded."""
+        pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.1)
+        connection = pool.connect()
+
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+
+        connection.close()
+        pool.connect().close()
+
+        stats = pool.checkout_stats()
+        assert stats["checkouts"] == 2
+        assert stats["waits"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["checked_in"] == 1
+        assert stats["checked_out"] == 0
+        assert stats["checkout_time_max"] >= stats["checkout_time_avg"] > 0.0
+
+    def test_construct_prepared_statement(self):
+        """Test statements are converted to prepared statements with positional parameters."""
+        name, prepare_statement, execute_statement = GraphDatabase._construct_prepared_statement(
+            "SELECT a FROM t WHERE b = %(b_1)s AND c LIKE 'x%%' AND d = %(d_1)s OR b IS %(b_1)s LIMIT %(param_1)s"
+        )
+
+        assert name.startswith("thoth_")
+        assert prepare_statement == (
+            f"PREPARE {name} AS SELECT a FROM t WHERE b = $1 AND c LIKE 'x%' AND d = $2 OR b IS $1 LIMIT $3"
+        )
+        assert execute_statement == f"EXECUTE {name} (%(b_1)s, %(d_1)s, %(param_1)s)"
+
+        name, _, execute_statement = GraphDatabase._construct_prepared_statement("SELECT 1")
+        assert execute_statement == f"EXECUTE {name}"
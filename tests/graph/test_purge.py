@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test purging documents in chunks."""
+
+import logging
+
+import pytest
+from flexmock import flexmock
+from moto import mock_s3
+
+from thoth.storages import AdvisersResultsStore
+from thoth.storages import CephStore
+from thoth.storages.exceptions import DeleteError
+from thoth.storages.graph import GraphDatabase
+from thoth.storages.graph import postgres
+
+from ..base import ThothStoragesTest
+from ..test_ceph import CEPH_INIT_ENV
+from ..test_ceph import CEPH_INIT_KWARGS
+
+_DOCUMENT_IDS = [f"adviser-{idx}" for idx in range(5)]
+_TARGET_PREFIX = "some-prefix/thoth-test-deployment/adviser-purge-1/"
+
+
+@pytest.fixture(name="store")
+def _fixture_store(monkeypatch):
+    """Retrieve a connected adapter to adviser results with documents to be purged."""
+    for name, value in {**CEPH_INIT_ENV, "THOTH_S3_ENDPOINT_URL": CEPH_INIT_KWARGS["host"]}.items():
+        monkeypatch.setenv(name, value)
+
+    flexmock(postgres, _PURGE_CHUNK_SIZE=2)
+    mock_s3().start()
+    try:
+        store = AdvisersResultsStore(deployment_name="thoth-test-deployment", prefix="some-prefix")
+        store.connect()
+        store.ceph._create_bucket_if_needed()
+        for document_id in _DOCUMENT_IDS:
+            store.ceph.store_document({"document_id": document_id}, document_id)
+
+        yield store
+    finally:
+        mock_s3().stop()
+
+
+def _iter_document_ids(cursor, chunk_size):
+    """Iterate over document ids in chunks, cursor is the index of the last document id yielded."""
+    start = int(cursor) + 1 if cursor is not None else 0
+    for idx in range(start, len(_DOCUMENT_IDS), chunk_size):
+        chunk = _DOCUMENT_IDS[idx : idx + chunk_size]
+        yield chunk, str(idx + len(chunk) - 1)
+
+
+class TestPurge(ThothStoragesTest):
+    """Test purging documents in chunks."""
+
+    def test_purge(self, store):
+        """Test documents are archived and deleted, database records are deleted per chunk."""
+        deleted = []
+
+        def _delete_results(document_ids):
+            deleted.append(document_ids)
+            return len(document_ids)
+
+        assert GraphDatabase()._purge_documents(store, "adviser", "1", _iter_document_ids, _delete_results) == 5
+
+        assert deleted == [_DOCUMENT_IDS[:2], _DOCUMENT_IDS[2:4], _DOCUMENT_IDS[4:]]
+        assert list(store.ceph.get_document_listing()) == []
+
+        target_store = CephStore(_TARGET_PREFIX)
+        target_store.connect()
+        assert sorted(target_store.get_document_listing()) == sorted(_DOCUMENT_IDS + ["purge-progress"])
+        assert target_store.retrieve_document(_DOCUMENT_IDS[0]) == {"document_id": _DOCUMENT_IDS[0]}
+        progress = target_store.retrieve_document("purge-progress")
+        assert progress["cursor"] == "4"
+        assert progress["purged"] == 5
+
+    def test_purge_resume(self, store):
+        """Test an interrupted purge is resumed after the last chunk purged."""
+        deleted = []
+        interrupted = []
+
+        def _delete_results(document_ids):
+            if len(deleted) == 1 and not interrupted:
+                interrupted.append(document_ids)
+                raise ConnectionError
+
+            deleted.append(document_ids)
+            return len(document_ids)
+
+        graph = GraphDatabase()
+        with pytest.raises(ConnectionError):
+            graph._purge_documents(store, "adviser", "1", _iter_document_ids, _delete_results)
+
+        # Documents of the interrupted chunk are archived, records in the database are not deleted yet.
+        assert list(store.ceph.get_document_listing()) == _DOCUMENT_IDS[4:]
+
+        assert graph._purge_documents(store, "adviser", "1", _iter_document_ids, _delete_results) == 3
+
+        assert deleted == [_DOCUMENT_IDS[:2], _DOCUMENT_IDS[2:4], _DOCUMENT_IDS[4:]]
+        assert list(store.ceph.get_document_listing()) == []
+        target_store = CephStore(_TARGET_PREFIX)
+        target_store.connect()
+        assert len(list(target_store.get_document_listing())) == 6
+        assert target_store.retrieve_document("purge-progress")["purged"] == 5
+
+    def test_purge_delete_error(self, store):
+        """Test a purge is stopped if documents cannot be moved, database records are kept."""
+        flexmock(store.ceph).should_receive("delete_many").and_return(
+            {_DOCUMENT_IDS[1]: "AccessDenied: Access Denied"}
+        ).once()
+        deleted = []
+
+        with pytest.raises(DeleteError, match="can be resumed using purge id '1'"):
+            GraphDatabase()._purge_documents(store, "adviser", "1", _iter_document_ids, deleted.append)
+
+        assert deleted == []
+
+    def test_purge_id_logged(self, store, caplog):
+        """Test the purge id generated is logged on start and on failure together with the purge prefix."""
+        flexmock(postgres).should_receive("datetime2datetime_str").and_return("1")
+
+        def _delete_results(document_ids):
+            raise ConnectionError
+
+        with caplog.at_level(logging.INFO, logger="thoth.storages.graph.postgres"):
+            with pytest.raises(ConnectionError):
+                GraphDatabase()._purge_documents(store, "adviser", None, _iter_document_ids, _delete_results)
+
+        messages = [(record.levelno, record.getMessage()) for record in caplog.records]
+        assert messages == [
+            (
+                logging.INFO,
+                f"Purging adviser documents to {_TARGET_PREFIX!r} with purge id '1', "
+                "pass the purge id to resume the purge if interrupted",
+            ),
+            (logging.ERROR, f"Purge of adviser documents to {_TARGET_PREFIX!r} failed, pass purge id '1' to resume it"),
+        ]
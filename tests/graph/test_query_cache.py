@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the query cache shared across processes."""
+
+import pickle
+import time
+
+import pytest
+from flexmock import flexmock
+
+from thoth.storages.graph import postgres
+from thoth.storages.graph import query_cache
+from thoth.storages.graph.query_cache import FileQueryCache
+from thoth.storages.graph.query_cache import RedisQueryCache
+from thoth.storages.graph.query_cache import get_query_cache
+
+from ..base import ThothStoragesTest
+
+
+class _RedisStandIn:
+    """A local stand-in for a Redis client."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expiration = self.data.get(key, (None, None))
+        if expiration is not None and expiration < time.time():
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, time.time() + ex if ex else None)
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self.set(key, str(value).encode())
+        return value
+
+
+class _Adapter:
+    """An adapter using the lru_cache decorator of the graph database adapter."""
+
+    _CACHED_METHODS = []
+
+    def __init__(self, query_cache):
+        self._query_cache = query_cache
+        self.calls = []
+
+    @postgres.lru_cache(maxsize=8, shared_namespace="solver")
+    def get_dependencies(self, package_name, *, extras=None):
+        self.calls.append((package_name, extras))
+        return {None: [(package_name.upper(), "1.0.0")]}
+
+
+@pytest.fixture(params=["file", "redis"], name="cache")
+def _fixture_cache(request, tmp_path):
+    """Create a query cache using each of the backends."""
+    if request.param == "file":
+        return FileQueryCache(str(tmp_path), ttl=60)
+
+    return RedisQueryCache(_RedisStandIn(), ttl=60)
+
+
+class TestQueryCache(ThothStoragesTest):
+    """Test the query cache shared across processes."""
+
+    def test_lookup(self, cache):
+        """Test results are computed once and shared by caches using the same storage."""
+        computed = []
+
+        def compute():
+            computed.append(1)
+            return [("selinon", "1.0.0", None)]
+
+        args = ("selinon",)
+        kwargs = {"extras": frozenset((None, "postgresql"))}
+        assert cache.lookup("solver", "get_depends_on", args, kwargs, compute) == [("selinon", "1.0.0", None)]
+        assert cache.lookup("solver", "get_depends_on", args, kwargs, compute) == [("selinon", "1.0.0", None)]
+        assert len(computed) == 1
+
+        # Order of items in sets does not matter.
+        kwargs = {"extras": frozenset(("postgresql", None))}
+        assert cache.lookup("solver", "get_depends_on", args, kwargs, compute) == [("selinon", "1.0.0", None)]
+        assert len(computed) == 1
+
+        assert cache.stats()["methods"] == {"get_depends_on": {"hits": 2, "misses": 1, "errors": 0}}
+
+    def test_lookup_types(self, cache):
+        """Test tuples, lists and dictionaries with keys which are not strings are retrieved as stored."""
+        result = {None: [("flask", "1.0.0")], "test": [("pytest", "6.0.0"), ("mock", None)], 1: (True, 0.5, [])}
+        assert cache.lookup("solver", "get_depends_on", (), {}, lambda: result) == result
+        cached = cache.lookup("solver", "get_depends_on", (), {}, lambda: None)
+        assert cached == result
+        assert isinstance(cached[None][0], tuple)
+        assert isinstance(cached[1][2], list)
+
+    def test_lookup_not_cacheable(self, cache):
+        """Test results are computed if arguments or results cannot be cached."""
+        assert cache.lookup("solver", "f", (object(),), {}, lambda: 1) == 1
+        assert cache.lookup("solver", "f", (), {}, lambda: {1, 2}) == {1, 2}
+        assert cache.lookup("solver", "f", (), {}, lambda: 3) == 3
+        assert cache.stats()["methods"]["f"] == {"hits": 0, "misses": 2, "errors": 2}
+
+    def test_lookup_not_decodable(self, cache, monkeypatch):
+        """Test entries which are not results stored as JSON are not loaded, they are overwritten."""
+        stored = []
+        set_entry = cache._set
+        monkeypatch.setattr(cache, "_set", lambda *args: stored.append(args) or set_entry(*args))
+        assert cache.lookup("solver", "f", (), {}, lambda: 1) == 1
+
+        namespace, version, key, _, ttl = stored[0]
+        for blob in (pickle.dumps(2), b'{"set": [2]}'):
+            set_entry(namespace, version, key, blob, ttl)
+            assert cache.lookup("solver", "f", (), {}, lambda: 3) == 3
+            assert cache.lookup("solver", "f", (), {}, lambda: 4) == 3
+
+        assert cache.stats()["methods"]["f"] == {"hits": 2, "misses": 3, "errors": 2}
+
+    def test_invalidate(self, cache):
+        """Test invalidation of a namespace is seen by other processes."""
+        flexmock(query_cache, _QUERY_CACHE_VERSION_CHECK_INTERVAL=0)
+        if isinstance(cache, FileQueryCache):
+            other_cache = FileQueryCache(cache.directory)
+        else:
+            other_cache = RedisQueryCache(cache.client)
+
+        assert cache.lookup("solver", "f", (), {}, lambda: 1) == 1
+        assert cache.lookup("other", "f", (), {}, lambda: 1) == 1
+        assert other_cache.lookup("solver", "f", (), {}, lambda: 2) == 1
+
+        other_cache.invalidate("solver")
+
+        assert cache.lookup("solver", "f", (), {}, lambda: 3) == 3
+        assert cache.lookup("other", "f", (), {}, lambda: 3) == 1
+        assert cache.stats()["namespace_versions"] == {"solver": 1, "other": 0}
+
+    def test_ttl(self, cache):
+        """Test expired entries are not used."""
+        cache.ttl = 1
+        assert cache.lookup("solver", "f", (), {}, lambda: 1) == 1
+        assert cache.lookup("solver", "f", (), {}, lambda: 2) == 1
+
+        now = time.time()
+        flexmock(time).should_receive("time").and_return(now + 2)
+        assert cache.lookup("solver", "f", (), {}, lambda: 3) == 3
+
+    def test_backend_error(self, cache):
+        """Test failures of the backend are counted and results are computed."""
+        flexmock(cache).should_receive("_get").and_raise(OSError("Connection refused"))
+
+        assert cache.lookup("solver", "f", (), {}, lambda: 1) == 1
+        assert cache.stats()["methods"]["f"]["errors"] == 1
+
+    def test_lru_cache(self, cache):
+        """Test the in-memory cache of graph database methods is backed by the shared one."""
+        adapter = _Adapter(cache)
+        assert adapter.get_dependencies("flask", extras=frozenset((None,))) == {None: [("FLASK", "1.0.0")]}
+        assert adapter.get_dependencies("flask", extras=frozenset((None,))) == {None: [("FLASK", "1.0.0")]}
+        assert adapter.calls == [("flask", frozenset((None,)))]
+
+        # A new process with an empty in-memory cache.
+        other_adapter = _Adapter(cache)
+        assert other_adapter.get_dependencies("flask", extras=frozenset((None,))) == {None: [("FLASK", "1.0.0")]}
+        assert other_adapter.calls == []
+
+        cache.invalidate("solver")
+        other_adapter.get_dependencies.cache_clear()
+        assert other_adapter.get_dependencies("flask", extras=frozenset((None,))) == {None: [("FLASK", "1.0.0")]}
+        assert other_adapter.calls == [("flask", frozenset((None,)))]
+
+    def test_lru_cache_not_configured(self):
+        """Test the in-memory cache is used on its own if no shared cache is configured."""
+        adapter = _Adapter(None)
+        adapter.get_dependencies("flask")
+        adapter.get_dependencies("flask")
+        assert adapter.calls == [("flask", None)]
+
+    def test_get_query_cache(self, tmp_path):
+        """Test creating a query cache based on URL."""
+        assert get_query_cache("") is None
+        assert isinstance(get_query_cache(f"file://{tmp_path}"), FileQueryCache)
+
+        with pytest.raises(ValueError, match="Unknown query cache URL scheme"):
+            get_query_cache("memcached://localhost")
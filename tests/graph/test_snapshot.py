@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the dependency graph snapshot stored in a memory mapped file."""
+
+import json
+import os
+import weakref
+
+import pytest
+
+from thoth.storages.exceptions import NotFoundError
+from thoth.storages.graph import DependencyGraphSnapshot
+from thoth.storages.graph.snapshot import DependencyGraphSnapshotWriter
+from thoth.storages.graph.snapshot import refresh_dependency_graph_snapshot
+
+from ..base import ThothStoragesTest
+
+_PYPI = "https://pypi.org/simple"
+_ENVIRONMENT = {"os_name": "rhel", "os_version": "8", "python_version": "3.8"}
+
+
+class _GraphDatabase:
+    """A graph database adapter exporting solved packages kept in memory."""
+
+    def __init__(self):
+        self.solved = []
+        self.exports = []
+
+    def solve(self, package_name, package_version, dependencies):
+        """Store a solved package with its dependencies, each package is solved in its own transaction."""
+        self.solved.append((len(self.solved), package_name, package_version, dependencies))
+
+    def export_dependency_graph_snapshot(self, path, since=None):
+        """Export packages solved by transactions not finished before the given watermark."""
+        self.exports.append(since)
+        writer = DependencyGraphSnapshotWriter()
+        for record_id, (transaction_id, package_name, package_version, dependencies) in enumerate(self.solved):
+            if since is not None and transaction_id < since:
+                continue
+
+            writer.add_record(record_id, package_name, package_version, _PYPI, is_missing=False, **_ENVIRONMENT)
+            for dependency_name, dependency_version in dependencies:
+                writer.add_dependency(
+                    record_id, dependency_name, dependency_version, extra=None, marker_evaluation_result=True
+                )
+
+        return writer.write(path, {"watermark": len(self.solved), "since": since})
+
+
+@pytest.fixture(name="snapshot")
+def _fixture_snapshot(tmp_path):
+    """Create a snapshot of a small dependency graph."""
+    writer = DependencyGraphSnapshotWriter()
+    writer.add_record(1, "flask", "1.1.2", _PYPI, is_missing=False, **_ENVIRONMENT)
+    writer.add_record(2, "click", "7.1.2", _PYPI, is_missing=False, **_ENVIRONMENT)
+    writer.add_record(3, "jinja2", "2.11.2", _PYPI, is_missing=False, **_ENVIRONMENT)
+    writer.add_record(4, "markupsafe", "1.1.1", _PYPI, is_missing=True, **_ENVIRONMENT)
+    writer.add_record(
+        5, "flask", "1.1.2", _PYPI, is_missing=False, os_name="fedora", os_version="32", python_version="3.8"
+    )
+    writer.add_record(6, "flask", "1.1.2", None, is_missing=False, **_ENVIRONMENT)
+
+    writer.add_dependency(1, "click", "7.1.2", extra=None, marker_evaluation_result=True)
+    writer.add_dependency(1, "jinja2", "2.11.2", extra=None, marker_evaluation_result=True)
+    writer.add_dependency(1, "python-dotenv", "0.15.0", extra="dotenv", marker_evaluation_result=True)
+    writer.add_dependency(3, "markupsafe", "1.1.1", extra=None, marker_evaluation_result=True)
+    writer.add_dependency(3, "babel", "2.9.0", extra="i18n", marker_evaluation_result=False)
+    writer.add_dependency(5, "click", "7.1.2", extra=None, marker_evaluation_result=True)
+    # Dependencies of records not present are not stored.
+    writer.add_dependency(42, "click", "7.1.2", extra=None, marker_evaluation_result=True)
+
+    path = str(tmp_path / "graph.snapshot")
+    writer.write(path)
+    snapshot = DependencyGraphSnapshot(path)
+    yield snapshot
+    snapshot.close()
+
+
+class TestDependencyGraphSnapshot(ThothStoragesTest):
+    """Test the dependency graph snapshot stored in a memory mapped file."""
+
+    def test_metadata(self, snapshot):
+        """Test number of entries is stored in metadata."""
+        assert snapshot.metadata["records"] == 6
+        assert snapshot.metadata["dependencies"] == 6
+        assert "created_at" in snapshot.metadata
+
+    def test_get_depends_on(self, snapshot):
+        """Test retrieving dependencies respecting environment and extras."""
+        assert snapshot.get_depends_on("Flask", "1.1.2", _PYPI, **_ENVIRONMENT) == {
+            None: [("click", "7.1.2"), ("jinja2", "2.11.2")],
+            "dotenv": [("python-dotenv", "0.15.0")],
+        }
+        assert snapshot.get_depends_on("flask", "1.1.2", os_name="fedora") == {None: [("click", "7.1.2")]}
+        assert snapshot.get_depends_on("flask", extras=frozenset(("dotenv",))) == {
+            "dotenv": [("python-dotenv", "0.15.0")]
+        }
+        assert snapshot.get_depends_on("jinja2", "2.11.2", marker_evaluation_result=False) == {
+            "i18n": [("babel", "2.9.0")]
+        }
+        assert snapshot.get_depends_on("click", "7.1.2") == {}
+
+    def test_get_depends_on_not_found(self, snapshot):
+        """Test an error is raised if there is no record for the given package."""
+        with pytest.raises(NotFoundError):
+            snapshot.get_depends_on("flask", "0.12")
+
+        with pytest.raises(NotFoundError):
+            snapshot.get_depends_on("markupsafe", "1.1.1", is_missing=False)
+
+        with pytest.raises(NotFoundError):
+            snapshot.get_depends_on("selinon")
+
+    def test_get_python_package_version_records(self, snapshot):
+        """Test retrieving records of packages hosted on an index."""
+        records = snapshot.get_python_package_version_records("flask", "1.1.2", None, **_ENVIRONMENT)
+        assert records == [
+            {
+                "package_name": "flask",
+                "package_version": "1.1.2",
+                "index_url": _PYPI,
+                "os_name": "rhel",
+                "os_version": "8",
+                "python_version": "3.8",
+            }
+        ]
+        records = snapshot.get_python_package_version_records(
+            "flask", "1.1.2", "https://pypi.python.org/simple", os_name=None, os_version=None, python_version=None
+        )
+        assert len(records) == 2
+
+    def test_retrieve_transitive_dependencies_python(self, snapshot):
+        """Test retrieving transitive dependencies by traversing the dependency graph."""
+        result = snapshot.retrieve_transitive_dependencies_python("flask", "1.1.2", _PYPI, **_ENVIRONMENT)
+        assert sorted(result) == sorted(
+            [
+                (("flask", "1.1.2", _PYPI), ("click", "7.1.2", _PYPI)),
+                (("flask", "1.1.2", _PYPI), ("jinja2", "2.11.2", _PYPI)),
+                (("flask", "1.1.2", _PYPI), ("python-dotenv", "0.15.0", None)),
+                (("jinja2", "2.11.2", _PYPI), ("markupsafe", "1.1.1", _PYPI)),
+                (("jinja2", "2.11.2", _PYPI), ("babel", "2.9.0", None)),
+            ]
+        )
+
+        result = snapshot.retrieve_transitive_dependencies_python(
+            "flask", "1.1.2", _PYPI, extras=frozenset((None,)), marker_evaluation_result=True, **_ENVIRONMENT
+        )
+        assert sorted(result) == sorted(
+            [
+                (("flask", "1.1.2", _PYPI), ("click", "7.1.2", _PYPI)),
+                (("flask", "1.1.2", _PYPI), ("jinja2", "2.11.2", _PYPI)),
+                (("jinja2", "2.11.2", _PYPI), ("markupsafe", "1.1.1", _PYPI)),
+            ]
+        )
+
+    def test_invalid_file(self, tmp_path):
+        """Test opening a file which is not a snapshot."""
+        path = tmp_path / "graph.snapshot"
+        path.write_bytes(b"\x00" * 64)
+
+        with pytest.raises(ValueError, match="not a dependency graph snapshot"):
+            DependencyGraphSnapshot(str(path))
+
+
+class TestDependencyGraphSnapshotRefresh(ThothStoragesTest):
+    """Test incremental refresh of dependency graph snapshots kept in a directory."""
+
+    def test_refresh(self, tmp_path):
+        """Test only packages solved since the last refresh are exported, newer records override older ones."""
+        directory = str(tmp_path)
+        graph = _GraphDatabase()
+        graph.solve("flask", "1.1.2", [("click", "7.1.2")])
+        graph.solve("click", "7.1.2", [])
+
+        manifest = refresh_dependency_graph_snapshot(graph, directory)
+        assert manifest["deltas"] == []
+        assert manifest["watermark"] == 2
+
+        snapshot = DependencyGraphSnapshot(directory)
+        assert snapshot.get_depends_on("flask", "1.1.2") == {None: [("click", "7.1.2")]}
+
+        # Nothing solved in the meantime.
+        assert refresh_dependency_graph_snapshot(graph, directory) == manifest
+        assert snapshot.refresh() is False
+
+        graph.solve("flask", "1.1.2", [("click", "7.1.2"), ("jinja2", "2.11.2")])
+        manifest = refresh_dependency_graph_snapshot(graph, directory)
+        assert graph.exports[-1] == 2
+        assert len(manifest["deltas"]) == 1
+
+        # Queries are answered from the snapshot opened until it is refreshed.
+        assert snapshot.get_depends_on("flask", "1.1.2") == {None: [("click", "7.1.2")]}
+        assert snapshot.refresh() is True
+        assert snapshot.get_depends_on("flask", "1.1.2") == {None: [("click", "7.1.2"), ("jinja2", "2.11.2")]}
+        assert snapshot.get_depends_on("click", "7.1.2") == {}
+        assert len(snapshot.get_python_package_version_records("flask", "1.1.2", None, **_ENVIRONMENT)) == 1
+
+        snapshot.close()
+
+    def test_refresh_compaction(self, tmp_path):
+        """Test deltas are compacted into a new base snapshot, files not used anymore are removed."""
+        directory = str(tmp_path)
+        graph = _GraphDatabase()
+        graph.solve("flask", "1.1.2", [("click", "7.1.2")])
+        refresh_dependency_graph_snapshot(graph, directory, max_deltas=1)
+        snapshot = DependencyGraphSnapshot(directory)
+
+        graph.solve("click", "7.1.2", [])
+        assert len(refresh_dependency_graph_snapshot(graph, directory, max_deltas=1)["deltas"]) == 1
+        graph.solve("flask", "1.1.2", [])
+        manifest = refresh_dependency_graph_snapshot(graph, directory, max_deltas=1)
+
+        assert manifest["deltas"] == []
+        assert sorted(file_name for file_name in os.listdir(directory) if file_name.startswith("snapshot-")) == [
+            manifest["base"]
+        ]
+        assert graph.exports == [None, 1, 2]
+
+        # Files removed are still mapped by processes which have not refreshed yet.
+        assert snapshot.get_depends_on("flask", "1.1.2") == {None: [("click", "7.1.2")]}
+        assert snapshot.refresh() is True
+        assert snapshot.get_depends_on("flask", "1.1.2") == {}
+        assert snapshot.get_depends_on("click", "7.1.2") == {}
+        assert snapshot.metadata["watermark"] == 3
+
+        snapshot.close()
+
+    def test_refresh_close_superseded(self, tmp_path):
+        """Test files of superseded layers are unmapped once queries using them finish."""
+        directory = str(tmp_path)
+        graph = _GraphDatabase()
+        graph.solve("flask", "1.1.2", [])
+        refresh_dependency_graph_snapshot(graph, directory)
+        snapshot = DependencyGraphSnapshot(directory)
+
+        with snapshot._acquire_layers() as layers:
+            graph.solve("click", "7.1.2", [])
+            refresh_dependency_graph_snapshot(graph, directory)
+            assert snapshot.refresh() is True
+            # Used by a query in progress.
+            assert not layers[0]._mmap.closed
+
+        assert layers[0]._mmap.closed
+        superseded = weakref.ref(layers[0])
+        del layers
+        assert superseded() is None
+
+        graph.solve("jinja2", "2.11.2", [])
+        refresh_dependency_graph_snapshot(graph, directory)
+        with snapshot._acquire_layers() as layers:
+            pass
+        assert snapshot.refresh() is True
+        assert all(layer._mmap.closed for layer in layers)
+
+        snapshot.close()
+
+    def test_refresh_full(self, tmp_path):
+        """Test requesting a full export."""
+        directory = str(tmp_path)
+        graph = _GraphDatabase()
+        graph.solve("flask", "1.1.2", [])
+        refresh_dependency_graph_snapshot(graph, directory)
+        manifest = refresh_dependency_graph_snapshot(graph, directory, full=True)
+
+        assert graph.exports == [None, None]
+        assert manifest["generation"] == 1
+        assert manifest["deltas"] == []
+
+    def test_refresh_legacy_watermark(self, tmp_path):
+        """Test a full export is done if the snapshot watermark is a solver run datetime."""
+        directory = str(tmp_path)
+        graph = _GraphDatabase()
+        graph.solve("flask", "1.1.2", [])
+        manifest = refresh_dependency_graph_snapshot(graph, directory)
+        with open(os.path.join(directory, "manifest.json"), "w") as manifest_file:
+            json.dump({**manifest, "watermark": "2020-01-01T00:00:00"}, manifest_file)
+
+        manifest = refresh_dependency_graph_snapshot(graph, directory)
+        assert graph.exports == [None, None]
+        assert manifest["watermark"] == 1
+
+    def test_no_snapshot(self, tmp_path):
+        """Test opening a directory without any snapshot."""
+        with pytest.raises(FileNotFoundError):
+            DependencyGraphSnapshot(str(tmp_path))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Test syncing solver documents in bulk produces the same rows as syncing them row by row."""
+
+import copy
+
+import pytest
+
+from thoth.storages.graph.models import PythonPackageVersionEntity
+from thoth.storages.graph.models import PythonPackageVersionEntityRule
+from thoth.storages.graph.models import DependsOn
+from thoth.storages.graph.synthetic import SyntheticDataGenerator
+
+from ..base import ThothStoragesTest
+from ..utils import dump_graph_database
+from ..utils import requires_graph_database
+from ..utils import throwaway_graph_database
+
+
+def _get_solver_documents():
+    """Get solver documents with errors, unresolved and unparsed entries, also in the legacy format."""
+    documents = list(SyntheticDataGenerator(packages=12, versions=2, error_ratio=0.2).iter_solver_documents())
+
+    result = documents[0]["result"]
+    index_url = result["tree"][0]["index_url"]
+    result["errors"].append({"package": "Legacy_Error", "version": "1.0", "index": index_url, "type": "command_error"})
+    result["unresolved"].extend(
+        [
+            {"package_name": "Unresolved", "version_spec": "===1.0.0", "index_url": index_url},
+            {"package_name": "legacy-unresolved", "version_spec": "===2.0.0", "index": index_url},
+            # Not pinned, not synced.
+            {"package_name": "unpinned", "version_spec": ">=1.0", "index_url": index_url},
+        ]
+    )
+    result["unparsed"].extend([{"requirement": "Unparsed===0.1"}, {"requirement": "invalid requirement==0.1"}])
+    return documents
+
+
+@requires_graph_database
+class TestSolverSyncBulk(ThothStoragesTest):
+    """Compare rows written by the bulk solver sync with rows written by syncing records one by one."""
+
+    @pytest.fixture(name="graphs", scope="class")
+    def _fixture_graphs(self):
+        """Create two databases with the same rules, one synced row by row and one in bulk."""
+        with throwaway_graph_database("row") as row_graph, throwaway_graph_database("bulk") as bulk_graph:
+            for graph in (row_graph, bulk_graph):
+                with graph._session_scope() as session:
+                    session.add(PythonPackageVersionEntityRule(package_name="package-1", version_range=">=1.0"))
+                    session.add(PythonPackageVersionEntityRule(package_name="package-2", version_range=""))
+
+            yield row_graph, bulk_graph
+
+    def test_bulk_sync(self, graphs):
+        """Test the bulk sync writes the same rows, syncing a document again does not write anything."""
+        row_graph, bulk_graph = graphs
+        documents = _get_solver_documents()
+        for document in documents:
+            row_graph.sync_solver_result(copy.deepcopy(document), bulk=False)
+            bulk_graph.sync_solver_result(copy.deepcopy(document), bulk=True)
+
+        expected = dump_graph_database(row_graph)
+        assert expected["solved"]
+        assert expected["depends_on"]
+        assert expected["python_package_version_entity_rules_association"]
+        assert dump_graph_database(bulk_graph) == expected
+
+        for document in documents:
+            row_graph.sync_solver_result(copy.deepcopy(document), bulk=False)
+            bulk_graph.sync_solver_result(copy.deepcopy(document), bulk=True)
+
+        assert dump_graph_database(row_graph) == expected
+        assert dump_graph_database(bulk_graph) == expected
+
+    def test_force_resync(self, graphs):
+        """Test re-syncing documents synced in bulk with force."""
+        row_graph, bulk_graph = graphs
+        documents = _get_solver_documents()
+        for graph in graphs:
+            for document in documents[:4]:
+                graph.sync_solver_result(copy.deepcopy(document), force=True, bulk=graph is bulk_graph)
+
+        assert dump_graph_database(bulk_graph) == dump_graph_database(row_graph)
+
+
+@requires_graph_database
+class TestBulkModelMethods(ThothStoragesTest):
+    """Test bulk methods of models."""
+
+    @pytest.fixture(name="graph", scope="class")
+    def _fixture_graph(self):
+        """Create an empty database."""
+        with throwaway_graph_database("models") as graph:
+            yield graph
+
+    def test_bulk_get_or_create(self, graph):
+        """Test ids are returned in the order of rows, existing entities are reused, NULL values are matched."""
+        with graph._session_scope() as session:
+            existing, _ = PythonPackageVersionEntity.get_or_create(
+                session, package_name="flask", package_version="1.0.0", python_package_index_id=None
+            )
+            rows = [
+                {"package_name": "click", "package_version": "7.0", "python_package_index_id": None},
+                {"package_name": "flask", "package_version": "1.0.0", "python_package_index_id": None},
+                {"package_name": "click", "package_version": "7.0", "python_package_index_id": None},
+                {"package_name": "click", "package_version": None, "python_package_index_id": None},
+            ]
+            ids = PythonPackageVersionEntity.bulk_get_or_create(session, rows)
+
+            assert ids[1] == existing.id
+            assert ids[0] == ids[2]
+            assert len(set(ids)) == 3
+            assert PythonPackageVersionEntity.bulk_get_or_create(session, rows) == ids
+            assert session.query(PythonPackageVersionEntity).count() == 3
+            session.rollback()
+
+    def test_bulk_create_update(self, graph):
+        """Test rows present are not created again, NULL values are matched, rows are updated by id."""
+        with graph._session_scope() as session:
+            version = graph._create_python_package_version(
+                session, "flask", "1.0.0", None, os_name="rhel", os_version="8", python_version="3.8"
+            )
+            (entity_id,) = PythonPackageVersionEntity.bulk_get_or_create(
+                session, [{"package_name": "click", "package_version": "7.0", "python_package_index_id": None}]
+            )
+            DependsOn.bulk_create(session, [])
+            rows = [
+                {
+                    "version_id": version.id,
+                    "entity_id": entity_id,
+                    "version_range": "*",
+                    "marker": None,
+                    "extra": extra,
+                    "marker_evaluation_result": True,
+                }
+                for extra in (None, "test", None)
+            ]
+            DependsOn.bulk_create(session, rows)
+            DependsOn.bulk_create(session, rows)
+            assert session.query(DependsOn).count() == 2
+
+            PythonPackageVersionEntity.bulk_update(session, [{"id": entity_id, "package_version": "8.0"}])
+            assert session.query(PythonPackageVersionEntity.package_version).filter_by(id=entity_id).scalar() == "8.0"
+            session.rollback()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test generation of synthetic documents."""
+
+from collections import Counter
+
+from thoth.storages.graph import SyntheticDataGenerator
+from thoth.storages.result_schema import RESULT_SCHEMA
+
+from ..base import ThothStoragesTest
+
+
+def _generator(**kwargs):
+    """Create a generator of a small size."""
+    return SyntheticDataGenerator(
+        **{
+            "packages": 40,
+            "versions": 3,
+            "adviser_runs": 20,
+            "package_extracts": 4,
+            "inspections": 3,
+            "other_runs": 5,
+            **kwargs,
+        }
+    )
+
+
+class TestSyntheticDataGenerator(ThothStoragesTest):
+    """Test generation of synthetic documents."""
+
+    def test_result_schema(self):
+        """Test documents stored by result stores match the result schema."""
+        generator = _generator()
+        documents = [
+            *generator.iter_solver_documents(),
+            *generator.iter_adviser_documents(),
+            *generator.iter_analysis_documents(),
+            *generator.iter_provenance_checker_documents(),
+            *generator.iter_dependency_monkey_documents(),
+            *generator.iter_revsolver_documents(),
+            *generator.iter_security_indicator_documents(),
+        ]
+        assert len(documents) == 40 * 3 * 2 + 20 + 4 + 4 * 5
+        for document in documents:
+            RESULT_SCHEMA(document)
+
+    def test_deterministic(self):
+        """Test the same configuration produces the same documents."""
+        assert list(_generator().iter_documents()) == list(_generator().iter_documents())
+        assert list(_generator().iter_adviser_documents()) != list(_generator(seed=1).iter_adviser_documents())
+
+    def test_dependencies(self):
+        """Test packages depend only on more popular packages, popular packages are depended on more often."""
+
+        def popular_share(skew):
+            generator = _generator(packages=200, versions=1, skew=skew)
+            depended_on = Counter()
+            for package in range(200):
+                for dependency in generator.get_dependencies(package, 0):
+                    dependency_package = int(dependency["package_name"].rsplit("-", maxsplit=1)[1])
+                    assert dependency_package < package
+                    assert dependency["resolved_versions"][0]["versions"] == ["0.0.0"]
+                    depended_on[dependency_package] += 1
+
+            return sum(depended_on[package] for package in range(20)) / sum(depended_on.values())
+
+        # A skew of 1.0 picks dependencies uniformly.
+        assert popular_share(3.0) > popular_share(2.0) > popular_share(1.0)
+
+    def test_solver_documents(self):
+        """Test solver documents state either the package solved or an error."""
+        generator = _generator(error_ratio=0.2)
+        errors = 0
+        for document in generator.iter_solver_documents():
+            assert document["metadata"]["document_id"].startswith(("solver-rhel-8-py38-", "solver-rhel-8-py36-"))
+            assert len(document["result"]["tree"]) + len(document["result"]["errors"]) == 1
+            errors += len(document["result"]["errors"])
+
+        assert 0 < errors < 40 * 3 * 2
+
+    def test_locked_packages_solved(self):
+        """Test advised and inspected stacks lock only packages solved in the runtime environment."""
+        generator = _generator(error_ratio=0.3)
+        projects = [
+            product["project"]
+            for document in generator.iter_adviser_documents()
+            for product in document["result"]["report"]["products"]
+        ]
+        projects.extend(
+            {**document["specification"]["python"], "runtime_environment": document["result"]["runtime_environment"]}
+            for document in generator.iter_inspection_documents()
+        )
+
+        assert projects
+        for project in projects:
+            environment = [e[2] for e in generator.solver_environments].index(
+                project["runtime_environment"]["python_version"]
+            )
+            for package_name, entry in project["requirements_locked"]["default"].items():
+                package = int(package_name.rsplit("-", maxsplit=1)[1])
+                version = int(entry["version"][len("==") :].split(".")[0])  # Ignore PycodestyleBear (E203)
+                assert not generator.is_solver_error(package, version, environment)
+
+    def test_other_documents_solved(self):
+        """Test reverse solver and security-indicator documents refer to package versions solved."""
+        generator = _generator(error_ratio=0.3)
+        environments = [e[2] for e in generator.solver_environments]
+        entries = 0
+        for document in generator.iter_revsolver_documents():
+            package_name = document["metadata"]["arguments"]["app.py"]["package_name"]
+            assert document["metadata"]["arguments"]["app.py"]["package_version"] == "3.0.0"
+            for entry in document["result"]:
+                package = int(entry["package_name"].rsplit("-", maxsplit=1)[1])
+                version = int(entry["package_version"].split(".")[0])
+                dependencies = generator.get_dependencies(package, version)
+                assert package_name in {dependency["package_name"] for dependency in dependencies}
+                assert not generator.is_solver_error(package, version, environments.index(entry["python_version"]))
+                entries += 1
+
+        assert entries
+        for document in generator.iter_security_indicator_documents():
+            package = int(document["metadata"]["arguments"]["app.py"]["package_name"].rsplit("-", maxsplit=1)[1])
+            version = int(document["metadata"]["arguments"]["app.py"]["package_version"].split(".")[0])
+            assert not all(generator.is_solver_error(package, version, e) for e in range(len(environments)))
+
+    def test_re_run(self):
+        """Test failed adviser runs state unresolved packages, they are re-run later."""
+        documents = list(_generator(adviser_runs=200, error_ratio=0.2).iter_adviser_documents())
+        failed = {
+            document["metadata"]["document_id"]
+            for document in documents
+            if document["result"]["report"].get("_ERROR_DETAILS", {}).get("unresolved")
+        }
+        re_runs = {
+            document["metadata"]["arguments"]["thoth-adviser"]["metadata"]["re_run_adviser_id"]
+            for document in documents
+        }
+        re_runs.discard(None)
+        assert failed
+        assert re_runs
+        assert re_runs <= failed
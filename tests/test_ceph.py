@@ -18,13 +18,21 @@
 
 """This is the tests."""
 
+import asyncio
 import json
+import threading
+import time
+
+import botocore
 import pytest
+from flexmock import flexmock
 from moto import mock_s3
 
 from thoth.storages import AdvisersCacheStore
+from thoth.storages import ceph
 from thoth.storages import CephStore
 from thoth.storages.exceptions import NotFoundError
+from thoth.storages.local_cache import LocalCache
 
 from .base import ThothStoragesTest
 from .utils import with_adjusted_env
@@ -159,6 +167,59 @@ class TestCephStore(ThothStoragesTest):
         connected_adapter.store_document(document, key)
         assert connected_adapter.retrieve_document(key) == document
 
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    def test_store_document_compressed(self, connected_adapter, compression):
+        """Test storing compressed documents on Ceph, compressed and uncompressed documents can be retrieved."""
+        pytest.importorskip("zstandard")
+        connected_adapter.store_document({"thoth": "is not compressed"}, "plain")
+        connected_adapter.compression = compression
+        document, key = {"thoth": "is awesome! ;-)"}, "my-key"
+        connected_adapter.store_document(document, key)
+
+        assert connected_adapter.retrieve_blob(key) != connected_adapter.dict2blob(document)
+        assert connected_adapter.retrieve_document(key) == document
+        assert connected_adapter.retrieve_document("plain") == {"thoth": "is not compressed"}
+
+    def test_retrieve_document_local_cache(self, connected_adapter, tmp_path):
+        """Test documents are retrieved using the local cache."""
+        connected_adapter.local_cache = LocalCache(str(tmp_path), validate=False)
+        document, key = {"thoth": "is awesome! ;-)"}, "my-key"
+        connected_adapter.store_document(document, key)
+
+        assert connected_adapter.retrieve_document(key) == document
+        assert connected_adapter.retrieve_document(key) == document
+        assert connected_adapter.local_cache.stats()["hits"] == 1
+
+        # Storing a document drops it from the cache.
+        connected_adapter.store_document({"thoth": "is awesome even more!"}, key)
+        assert connected_adapter.retrieve_document(key) == {"thoth": "is awesome even more!"}
+
+        connected_adapter.delete(key)
+        with pytest.raises(NotFoundError):
+            connected_adapter.retrieve_document(key)
+
+        assert connected_adapter.local_cache.stats()["entries"] == 0
+
+    def test_retrieve_blob_local_cache_not_modified(self, adapter, tmp_path):
+        """Test the cached blob is used if the remote object was not modified."""
+        adapter.local_cache = LocalCache(str(tmp_path))
+        s3_object = flexmock()
+        s3_object.should_receive("get").with_args().and_return({"Body": flexmock(read=lambda: b"blob"), "ETag": '"1"'})
+        s3_object.should_receive("get").with_args(IfNoneMatch='"1"').and_raise(
+            botocore.exceptions.ClientError({"Error": {"Code": "304"}}, "GetObject")
+        )
+        adapter._s3 = flexmock(Object=lambda bucket, key: s3_object)
+
+        assert adapter.retrieve_blob("key") == b"blob"
+        assert adapter.retrieve_blob("key") == b"blob"
+        assert adapter.local_cache.stats()["hits"] == 1
+        assert adapter.local_cache.stats()["misses"] == 1
+
+    def test_init_compression_unknown(self):
+        """Test unknown compression is reported on adapter instantiation."""
+        with pytest.raises(ValueError):
+            CephStore(_BUCKET_PREFIX, **CEPH_INIT_KWARGS, compression="lzma")
+
     def test_iterate_results_empty(self, connected_adapter):
         """Test iterating over an empty set of results."""
         assert list(connected_adapter.iterate_results()) == []
@@ -176,6 +237,45 @@ class TestCephStore(ThothStoragesTest):
             else:
                 assert False, "The retrieved document was not previously stored."
 
+    def test_iterate_results_async(self, connected_adapter):
+        """Test iterating over stored documents on Ceph retrieved concurrently."""
+        documents = {f"key-{i}": {"thoth": i} for i in range(10)}
+        for document_id, document in documents.items():
+            connected_adapter.store_document(document, document_id)
+
+        async def _collect():
+            return {
+                document_id: document
+                async for document_id, document in connected_adapter.iterate_results_async(concurrency=3)
+            }
+
+        assert asyncio.run(_collect()) == documents
+
+    def test_retrieve_documents_async_bounded(self, adapter):
+        """Test the number of documents retrieved concurrently is bounded."""
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def _retrieve_document(document_id):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return {"document_id": document_id}
+
+        flexmock(adapter).should_receive("retrieve_document").replace_with(_retrieve_document)
+
+        async def _collect():
+            return [item async for item in adapter.retrieve_documents_async(map(str, range(20)), concurrency=4)]
+
+        result = asyncio.run(_collect())
+        assert sorted(result) == sorted((str(i), {"document_id": str(i)}) for i in range(20))
+        assert 1 < max_in_flight <= 4
+
     def test_retrieve_document_not_exist(self, connected_adapter):
         """Check that retrieving document that does not exists raises an exception."""
         with pytest.raises(NotFoundError):
@@ -187,6 +287,98 @@ class TestCephStore(ThothStoragesTest):
         connected_adapter.store_document({"Hello": "Thoth"}, "foo")
         assert connected_adapter.document_exists("foo") is True
 
+    def test_delete_many(self, connected_adapter):
+        """Test deleting objects in batches."""
+        for idx in range(5):
+            connected_adapter.store_document({"document_id": idx}, str(idx))
+
+        flexmock(ceph, _DELETE_OBJECTS_MAX_KEYS=2)
+        assert connected_adapter.delete_many(str(idx) for idx in range(4)) == {}
+        assert list(connected_adapter.get_document_listing()) == ["4"]
+        assert connected_adapter.delete_many(["3", "4"]) == {}
+        assert list(connected_adapter.get_document_listing()) == []
+
+    def test_delete_many_errors(self, connected_adapter):
+        """Test reporting objects which could not be deleted."""
+        flexmock(connected_adapter._s3.meta.client).should_receive("delete_objects").and_return(
+            {"Errors": [{"Key": f"{_BUCKET_PREFIX}foo", "Code": "AccessDenied", "Message": "Access Denied"}]}
+        ).once()
+        assert connected_adapter.delete_many(["foo", "bar"]) == {"foo": "AccessDenied: Access Denied"}
+
+    def test_copy(self, connected_adapter):
+        """Test copying objects server-side keeps content and metadata."""
+        connected_adapter.store_blob(b'{"foo": 42}', "foo", metadata={"compression": "gzip"})
+        target = CephStore("some-other-prefix/", **CEPH_INIT_KWARGS)
+        target.connect()
+
+        flexmock(connected_adapter._s3.meta.client).should_receive("get_object").never()
+        connected_adapter.copy("foo", target)
+        connected_adapter.copy("foo", target, "bar")
+
+        assert target.retrieve_blob("foo") == target.retrieve_blob("bar") == b'{"foo": 42}'
+        assert target.retrieve_document_attr("bar", "Metadata") == {"compression": "gzip"}
+        assert connected_adapter.document_exists("foo")
+
+    def test_copy_multipart(self, connected_adapter):
+        """Test copying objects larger than the part size in parts."""
+        blob = bytes(range(256)) * (11 * 4096)
+        connected_adapter.store_blob(blob, "foo", metadata={"compression": "zstd"})
+        target = CephStore("some-other-prefix/", **CEPH_INIT_KWARGS)
+        target.connect()
+
+        flexmock(ceph, _COPY_PART_SIZE=5 * 1024 * 1024)
+        flexmock(connected_adapter._s3.meta.client).should_call("upload_part_copy").times(3)
+        connected_adapter.copy("foo", target)
+
+        assert target.retrieve_blob("foo") == blob
+        assert target.retrieve_document_attr("foo", "Metadata") == {"compression": "zstd"}
+
+    def test_copy_not_exist(self, connected_adapter):
+        """Test copying an object which does not exist."""
+        with pytest.raises(NotFoundError):
+            connected_adapter.copy("foo", connected_adapter, "bar")
+
+    def test_move(self, connected_adapter):
+        """Test moving an object."""
+        connected_adapter.store_document({"foo": 42}, "foo")
+        connected_adapter.move("foo", connected_adapter, "bar")
+
+        assert list(connected_adapter.get_document_listing()) == ["bar"]
+        assert connected_adapter.retrieve_document("bar") == {"foo": 42}
+
+    def test_move_many(self, connected_adapter):
+        """Test moving objects in batches, objects not moved are reported."""
+        for idx in range(3):
+            connected_adapter.store_document({"document_id": idx}, str(idx))
+        target = CephStore("some-other-prefix/", **CEPH_INIT_KWARGS)
+        target.connect()
+
+        errors = connected_adapter.move_many(["0", "1", "2", "3"], target, concurrency=2)
+
+        assert list(errors) == ["3"]
+        assert isinstance(errors["3"], NotFoundError)
+        assert list(connected_adapter.get_document_listing()) == []
+        assert sorted(target.get_document_listing()) == ["0", "1", "2"]
+        assert target.retrieve_document("2") == {"document_id": 2}
+
+    def test_exists_many(self, connected_adapter):
+        """Test checking existence of objects by listing them."""
+        for document_id in ("adviser-1", "adviser-12", "adviser-2", "adviser-3", "solver-1"):
+            connected_adapter.store_document({}, document_id)
+
+        flexmock(connected_adapter._s3.meta.client).should_receive("head_object").never()
+        assert connected_adapter.exists_many(["adviser-12", "adviser-2", "adviser-21"]) == {
+            "adviser-12": True,
+            "adviser-2": True,
+            "adviser-21": False,
+        }
+        assert connected_adapter.exists_many(["adviser-1", "solver-1", "solver-2"]) == {
+            "adviser-1": True,
+            "solver-1": True,
+            "solver-2": False,
+        }
+        assert connected_adapter.exists_many([]) == {}
+
     def connect(self, adapter):
         """Test connecting to Ceph."""
         assert not adapter.is_connected()
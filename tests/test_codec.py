@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test encoding and decoding of documents stored on Ceph."""
+
+import datetime
+import enum
+import json
+import uuid
+from dataclasses import dataclass
+
+import pytest
+
+from thoth.storages import codec
+
+from .base import ThothStoragesTest
+
+
+class _Enum(enum.Enum):
+    A = "a"
+
+
+class _IntEnum(enum.IntEnum):
+    A = 1
+
+
+@dataclass
+class _Dataclass:
+    a: int
+
+
+class TestCodec(ThothStoragesTest):
+    """Test encoding and decoding of documents."""
+
+    @pytest.mark.parametrize("document,document_id", ThothStoragesTest.get_all_results())
+    @pytest.mark.parametrize("compression", ["", codec.COMPRESSION_GZIP, codec.COMPRESSION_ZSTD])
+    def test_roundtrip(self, document, document_id, compression):
+        """Test encoded documents are decoded to the very same document, also from memoryviews."""
+        if compression == codec.COMPRESSION_ZSTD:
+            pytest.importorskip("zstandard")
+
+        blob = codec.encode_document(document, compression)
+        assert codec.decode_document(blob) == document
+        assert codec.decode_document(memoryview(blob)) == document
+
+        if compression:
+            assert len(blob) < len(codec.encode_document(document))
+
+    def test_compact(self):
+        """Test documents are serialized compact with sorted keys."""
+        assert codec.encode_document({"b": [1, 2], "a": {"c": None}}) == b'{"a":{"c":null},"b":[1,2]}'
+
+    def test_decode_legacy(self):
+        """Test documents stored indented and not compressed are decoded."""
+        document = {"thoth": ["is", "awesome"], "foo": {"bar": 42}}
+        blob = json.dumps(document, sort_keys=True, separators=(",", ": "), indent=2).encode()
+        assert codec.decode_document(blob) == document
+
+    def test_json_dumps_fallback(self):
+        """Test values not supported by orjson are serialized using the standard library."""
+        document = {"big": 2**80}
+        assert codec.json_loads(codec.json_dumps(document)) == document
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+    def test_non_finite_float(self, value):
+        """Test NaN and infinity are not lost when serialized and documents stating them are deserialized."""
+        document = {"a": [1.5, {"b": value}]}
+        blob = codec.json_dumps(document)
+        assert b"null" not in blob
+        assert json.dumps(codec.json_loads(blob)) == json.dumps(document)
+
+        # Documents written by the standard library JSON serializer.
+        assert json.dumps(codec.json_loads(json.dumps(document).encode())) == json.dumps(document)
+        assert json.dumps(codec.json_loads(memoryview(json.dumps(document).encode()))) == json.dumps(document)
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    @pytest.mark.parametrize(
+        "document",
+        [
+            {"a": datetime.datetime(2020, 1, 1)},
+            {"a": [datetime.date(2020, 1, 1)]},
+            {"a": _Enum.A},
+            {"a": uuid.UUID(int=0)},
+            {"a": _Dataclass(a=1)},
+            {datetime.date(2020, 1, 1): 1},
+            {_Enum.A: 1},
+        ],
+    )
+    def test_json_dumps_not_serializable(self, monkeypatch, document, use_orjson):
+        """Test values the standard library cannot serialize are rejected regardless of orjson availability."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(codec, "orjson", None)
+
+        with pytest.raises(TypeError):
+            codec.json_dumps(document)
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_dumps_same(self, monkeypatch, use_orjson):
+        """Test documents are serialized the same way regardless of orjson availability."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(codec, "orjson", None)
+
+        document = {"b": [_IntEnum.A, None, True], "a": {2: "x", 1: 1.5}}
+        assert codec.json_dumps(document) == b'{"a":{"1":1.5,"2":"x"},"b":[1,null,true]}'
+
+    def test_unknown_compression(self):
+        """Test unknown compression is reported."""
+        with pytest.raises(ValueError):
+            codec.encode_document({}, "lzma")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Test adapter for storing graph database backups."""
+
+import pytest
+from flexmock import flexmock
+
+from thoth.storages import GraphBackupStore
+
+from .test_ceph import CEPH_INIT_KWARGS
+from .test_result_base import ResultBaseTest
+
+_DEPLOYMENT_NAME = "thoth-test-deployment"
+_BUCKET_PREFIX = "some-graph-backup"
+
+
+@pytest.fixture(name="adapter")
+def _fixture_adapter():
+    """Retrieve an adapter to graph database backups."""
+    return GraphBackupStore(deployment_name=_DEPLOYMENT_NAME, prefix=_BUCKET_PREFIX, **CEPH_INIT_KWARGS)
+
+
+class TestGraphBackupStore(ResultBaseTest):
+    """Test adapter for storing graph database backups."""
+
+    def test_rotate_backups(self, adapter):
+        """Test the oldest backups are deleted in one batch, files with unknown names are kept."""
+        flexmock(adapter, GRAPH_BACKUP_STORE_ROTATE=2)
+        flexmock(adapter).should_receive("get_document_listing").and_return(
+            [
+                "pg_dump-21-01-02-00-00-00",
+                "pg_dump-21-01-04-00-00-00",
+                "foo",
+                "pg_dump-21-01-01-00-00-00",
+                "pg_dump-21-01-03-00-00-00",
+            ]
+        )
+        flexmock(adapter.ceph).should_receive("delete").never()
+        flexmock(adapter.ceph).should_receive("delete_many").with_args(
+            ["pg_dump-21-01-02-00-00-00", "pg_dump-21-01-01-00-00-00"]
+        ).and_return({}).once()
+
+        adapter._rotate_backups()
+
+    def test_store_document(self, adapter):
+        """Test storing a dump rotates backups."""
+        flexmock(adapter).should_receive("store_file").with_args("/tmp/pg_dump.sql", str).and_return(None).once()
+        flexmock(adapter).should_receive("_rotate_backups").with_args().once()
+
+        assert adapter.store_dump("/tmp/pg_dump.sql").startswith("pg_dump-")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the local on-disk cache of blobs retrieved from Ceph."""
+
+import os
+
+import pytest
+
+from thoth.storages.exceptions import NotFoundError
+from thoth.storages.local_cache import LocalCache
+
+from .base import ThothStoragesTest
+
+
+class _Remote:
+    """A remote storage honoring ETag of the cached blob."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.fetched = []
+
+    def fetch(self, key):
+        def _fetch(etag):
+            self.fetched.append((key, etag))
+            if key not in self.objects:
+                raise NotFoundError(key)
+
+            blob, remote_etag = self.objects[key]
+            if etag == remote_etag:
+                return None
+
+            return blob, remote_etag
+
+        return _fetch
+
+
+class TestLocalCache(ThothStoragesTest):
+    """Test the local on-disk cache."""
+
+    def test_retrieve(self, tmp_path):
+        """Test blobs are cached and validated using ETag."""
+        cache = LocalCache(str(tmp_path), max_size=1024)
+        remote = _Remote({"a": (b"blob-a", "etag-a1")})
+
+        assert cache.retrieve("a", remote.fetch("a")) == b"blob-a"
+        assert cache.retrieve("a", remote.fetch("a")) == b"blob-a"
+        assert remote.fetched == [("a", None), ("a", "etag-a1")]
+
+        remote.objects["a"] = (b"blob-a-modified", "etag-a2")
+        assert cache.retrieve("a", remote.fetch("a")) == b"blob-a-modified"
+        assert cache.retrieve("a", remote.fetch("a")) == b"blob-a-modified"
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 2
+        assert stats["entries"] == 1
+
+    def test_retrieve_no_validate(self, tmp_path):
+        """Test cached blobs are not validated if turned off."""
+        cache = LocalCache(str(tmp_path), max_size=1024, validate=False)
+        remote = _Remote({"a": (b"blob-a", "etag-a1")})
+
+        assert cache.retrieve("a", remote.fetch("a")) == b"blob-a"
+        remote.objects["a"] = (b"blob-a-modified", "etag-a2")
+        assert cache.retrieve("a", remote.fetch("a")) == b"blob-a"
+        assert remote.fetched == [("a", None)]
+
+    def test_retrieve_empty(self, tmp_path):
+        """Test caching empty blobs."""
+        cache = LocalCache(str(tmp_path), max_size=1024, validate=False)
+        remote = _Remote({"a": (b"", "etag-a1")})
+
+        assert cache.retrieve("a", remote.fetch("a")) == b""
+        assert cache.retrieve("a", remote.fetch("a")) == b""
+        assert cache.stats()["hits"] == 1
+
+    def test_retrieve_view(self, tmp_path):
+        """Test cached blobs are memory mapped, views stay valid after their entries are replaced or removed."""
+        cache = LocalCache(str(tmp_path), max_size=1024)
+        remote = _Remote({"a": (b"blob-a", "etag-a1")})
+
+        assert isinstance(cache.retrieve("a", remote.fetch("a")), bytes)
+        view = cache.retrieve("a", remote.fetch("a"))
+        assert isinstance(view, memoryview)
+
+        remote.objects["a"] = (b"blob-a-modified", "etag-a2")
+        cache.retrieve("a", remote.fetch("a"))
+        cache.invalidate("a")
+        assert os.listdir(tmp_path) == []
+        assert view == b"blob-a"
+        view.release()
+
+    def test_not_found(self, tmp_path):
+        """Test entries are dropped if the remote object is removed."""
+        cache = LocalCache(str(tmp_path), max_size=1024)
+        remote = _Remote({"a": (b"blob-a", "etag-a1")})
+
+        cache.retrieve("a", remote.fetch("a"))
+        del remote.objects["a"]
+        with pytest.raises(NotFoundError):
+            cache.retrieve("a", remote.fetch("a"))
+
+        assert cache.stats()["entries"] == 0
+        assert os.listdir(tmp_path) == []
+
+    def test_eviction(self, tmp_path):
+        """Test least recently used entries are evicted."""
+        # Each entry takes 16 bytes - ETag, a new line and the blob.
+        cache = LocalCache(str(tmp_path), max_size=40)
+        remote = _Remote({key: (b"blob-" + key.encode() * 4, f"etag-{key}") for key in "abcd"})
+
+        cache.retrieve("a", remote.fetch("a"))
+        cache.retrieve("b", remote.fetch("b"))
+        cache.retrieve("a", remote.fetch("a"))
+        cache.retrieve("c", remote.fetch("c"))
+
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["size"] == 32
+        assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+
+        # Too large blobs are not cached.
+        remote.objects["d"] = (b"d" * 41, "etag-d")
+        assert cache.retrieve("d", remote.fetch("d")) == b"d" * 41
+        assert cache.stats()["entries"] == 2
+
+    def test_load(self, tmp_path):
+        """Test entries are reused across cache instances."""
+        remote = _Remote({"a": (b"blob-a", "etag-a1")})
+        LocalCache(str(tmp_path), max_size=1024).retrieve("a", remote.fetch("a"))
+        (tmp_path / ".interrupted-write").write_bytes(b"garbage")
+
+        cache = LocalCache(str(tmp_path), max_size=1024)
+        assert cache.retrieve("a", remote.fetch("a")) == b"blob-a"
+        assert cache.stats() == {"hits": 1, "misses": 0, "evictions": 0, "entries": 1, "size": 14, "max_size": 1024}
+        assert os.listdir(tmp_path) == ["a"]
+
+    def test_get_key(self):
+        """Test keys are distinct for bucket, prefix and object key."""
+        assert LocalCache.get_key("bucket", "prefix/", "key") != LocalCache.get_key("bucket", "prefix/", "key2")
+        assert LocalCache.get_key("bucket", "prefix/", "key") != LocalCache.get_key("bucket2", "prefix/", "key")
+        assert LocalCache.get_key("bucket", "prefix/", "key") != LocalCache.get_key("bucket", "prefix2/", "key")
@@ -18,9 +18,14 @@
 
 """This is the tests."""
 
+from datetime import date
+from datetime import datetime
+
 import pytest
 from flexmock import flexmock
 
+from thoth.storages import result_base
+from thoth.storages.ceph import CephStore
 from thoth.storages.result_base import ResultStorageBase
 
 from .base import StorageBaseTest
@@ -68,6 +73,23 @@ class ResultBaseTest(StorageBaseTest):
         with pytest.raises(AssertionError):
             ResultStorageBase(deployment_name=_DEPLOYMENT_NAME, prefix=_BUCKET_PREFIX, **CEPH_INIT_KWARGS)
 
+    def test_exists_many(self, adapter):
+        """Test checking existence of documents."""
+        flexmock(adapter.ceph).should_receive("exists_many").with_args(["foo"]).and_return({"foo": True}).once()
+        assert adapter.exists_many(["foo"]) == {"foo": True}
+
+    def test_requests_exist(self, adapter):
+        """Test checking existence of requests by listing them."""
+        flexmock(adapter.ceph).should_receive("exists_many").replace_with(
+            lambda request_ids: {request_id: request_id == "foo.request" for request_id in request_ids}
+        ).once()
+        assert adapter.requests_exist(["foo", "bar"]) == {"foo": True, "bar": False}
+
+    def test_delete_many(self, adapter):
+        """Test deleting documents."""
+        flexmock(adapter.ceph).should_receive("delete_many").with_args(["foo"]).and_return({}).once()
+        assert adapter.delete_many(["foo"]) == {}
+
     @staticmethod
     def store_retrieve_document_test(adapter, document, document_id):
         """Test store/retrieve roundtrip identity with the provided adapter.
@@ -87,3 +109,164 @@ class TestResultBase(ResultBaseTest):
     We cannot directly use this class to derive from in result-specific adapters as pytest will run tests multiple
     times for it due to Test prefix. This is a simple workaround to avoid running tests multiple times.
     """
+
+
+class _Datetime(datetime):
+    """A datetime with adjustable current time."""
+
+    now = datetime(2021, 1, 2, 10, 0, 0)
+
+    @classmethod
+    def utcnow(cls):
+        """Get the adjusted current time."""
+        return cls.now
+
+
+@pytest.fixture(name="indexed_adapter")
+def _fixture_indexed_adapter(monkeypatch):
+    """Retrieve a connected adapter maintaining the listing index."""
+    monkeypatch.setattr(result_base, "datetime", _Datetime)
+    monkeypatch.setattr(MyResultStorage, "SCHEMA", None)
+    adapter = MyResultStorage(
+        deployment_name=_DEPLOYMENT_NAME, prefix=_BUCKET_PREFIX, listing_index=True, **CEPH_INIT_KWARGS
+    )
+    with connected_ceph_adapter(adapter) as connected_adapter:
+        connected_adapter.listing_index.connect()
+        yield connected_adapter
+
+
+class TestListingIndex:
+    """Test listing documents using the date-partitioned listing index."""
+
+    @staticmethod
+    def _store_documents(adapter):
+        """Store documents on three days."""
+        for day, document_ids in ((1, ["foo", "bar"]), (2, ["baz"]), (3, ["qux"])):
+            _Datetime.now = datetime(2021, 1, day, 10, 0, 0)
+            for document_id in document_ids:
+                adapter.store_document({}, document_id)
+
+        adapter.store_request("foo", {})
+
+    def test_listing(self, indexed_adapter):
+        """Test documents are listed per day, requests are not indexed."""
+        self._store_documents(indexed_adapter)
+
+        flexmock(indexed_adapter.ceph).should_receive("get_document_listing").never()
+        assert list(indexed_adapter.get_document_listing()) == ["bar", "foo", "baz", "qux"]
+        assert list(indexed_adapter.get_document_listing(start_date=date(2021, 1, 2), end_date=date(2021, 1, 3))) == [
+            "baz"
+        ]
+        assert indexed_adapter.get_document_count(start_date=date(2021, 1, 1), end_date=date(2021, 1, 3)) == 3
+
+    def test_listing_days(self, indexed_adapter, monkeypatch):
+        """Test only markers of the given days are listed, listing objects of the given days are retrieved."""
+        self._store_documents(indexed_adapter)
+        _Datetime.now = datetime(2021, 1, 4, 10, 0, 0)
+        indexed_adapter.compact_listing_index()
+
+        prefixes = []
+        get_document_listing = indexed_adapter.listing_index.get_document_listing
+
+        def _get_document_listing(prefix_addition=""):
+            prefixes.append(prefix_addition)
+            return get_document_listing(prefix_addition)
+
+        monkeypatch.setattr(indexed_adapter.listing_index, "get_document_listing", _get_document_listing)
+        assert list(indexed_adapter.get_document_listing(start_date=date(2021, 1, 2), end_date=date(2021, 1, 4))) == [
+            "baz",
+            "qux",
+        ]
+        assert sorted(prefixes) == ["journal/210102/", "journal/210103/", "removed/"]
+
+    def test_store_removed_marker(self, indexed_adapter):
+        """Test markers of documents removed are deleted only if present when storing documents."""
+        self._store_documents(indexed_adapter)
+        flexmock(indexed_adapter.listing_index).should_receive("delete").never()
+        indexed_adapter.store_document({}, "foo")
+
+        indexed_adapter.delete_many(["foo"])
+        flexmock(indexed_adapter.listing_index).should_call("delete").with_args("removed/foo").once()
+        indexed_adapter.store_document({}, "foo")
+        assert "foo" in indexed_adapter.get_document_listing()
+
+    def test_compact(self, indexed_adapter):
+        """Test markers of days before today are compacted into one object per day."""
+        self._store_documents(indexed_adapter)
+
+        assert indexed_adapter.compact_listing_index() == 2
+        assert sorted(indexed_adapter.listing_index.get_document_listing()) == [
+            "days/210101",
+            "days/210102",
+            "journal/210103/qux",
+        ]
+        assert list(indexed_adapter.get_document_listing()) == ["bar", "foo", "baz", "qux"]
+
+        _Datetime.now = datetime(2021, 1, 4, 10, 0, 0)
+        indexed_adapter.store_document({}, "quux")
+        assert indexed_adapter.compact_listing_index() == 1
+        assert list(indexed_adapter.get_document_listing(start_date=date(2021, 1, 3))) == ["qux", "quux"]
+        assert list(indexed_adapter.get_document_listing(only_requests=True)) == ["foo.request"]
+
+    def test_rebuild(self, indexed_adapter):
+        """Test rebuilding the index out of documents stored."""
+        self._store_documents(indexed_adapter)
+        indexed_adapter.compact_listing_index()
+        indexed_adapter.ceph.delete("foo")
+        indexed_adapter.ceph.store_document({}, "quux")
+
+        # Documents are indexed based on their last modification.
+        _Datetime.now = datetime.utcnow()
+        assert indexed_adapter.rebuild_listing_index() == 4
+        assert list(indexed_adapter.get_document_listing()) == ["bar", "baz", "quux", "qux"]
+        assert sorted(indexed_adapter.listing_index.get_document_listing()) == [f"days/{_Datetime.now:%y%m%d}"]
+
+    def test_duplicates(self, indexed_adapter):
+        """Test a document stored on multiple days is listed and counted once."""
+        self._store_documents(indexed_adapter)
+        _Datetime.now = datetime(2021, 1, 3, 12, 0, 0)
+        indexed_adapter.store_document({}, "foo")
+
+        assert list(indexed_adapter.get_document_listing()) == ["bar", "foo", "baz", "qux"]
+        assert indexed_adapter.get_document_count() == 4
+        assert list(indexed_adapter.get_document_listing(start_date=date(2021, 1, 2))) == ["baz", "foo", "qux"]
+
+    def test_removed(self, indexed_adapter):
+        """Test documents deleted or moved away are not listed, documents stored again are."""
+        self._store_documents(indexed_adapter)
+        target = CephStore(prefix=f"{_BUCKET_PREFIX}/purged/", **CEPH_INIT_KWARGS)
+        target.connect()
+
+        assert indexed_adapter.delete_many(["bar"]) == {}
+        indexed_adapter.delete_document("qux")
+        assert indexed_adapter.move_many(["baz", "missing"], target) != {}
+        assert target.document_exists("baz")
+        assert list(indexed_adapter.get_document_listing()) == ["foo"]
+
+        indexed_adapter.store_document({}, "qux")
+        assert list(indexed_adapter.get_document_listing()) == ["foo", "qux"]
+
+    def test_compact_removed(self, indexed_adapter):
+        """Test compaction drops documents removed from listing objects and deletes their markers."""
+        self._store_documents(indexed_adapter)
+        indexed_adapter.compact_listing_index()
+        indexed_adapter.delete_many(["foo", "qux"])
+
+        assert indexed_adapter.compact_listing_index() == 0
+        assert sorted(indexed_adapter.listing_index.get_document_listing()) == ["days/210101", "days/210102"]
+        assert indexed_adapter.listing_index.retrieve_document("days/210101") == {"document_ids": ["bar"]}
+        assert list(indexed_adapter.get_document_listing()) == ["bar", "baz"]
+
+    def test_rebuild_removed(self, indexed_adapter):
+        """Test rebuilding the index deletes markers of documents removed."""
+        self._store_documents(indexed_adapter)
+        indexed_adapter.delete_many(["qux"])
+
+        assert indexed_adapter.rebuild_listing_index() == 3
+        assert list(indexed_adapter.listing_index.get_document_listing("removed/")) == []
+        assert list(indexed_adapter.get_document_listing()) == ["bar", "baz", "foo"]
+
+    def test_not_configured(self, adapter):
+        """Test an error is raised if the listing index is not configured."""
+        with pytest.raises(ValueError, match="not configured"):
+            adapter.rebuild_listing_index()
@@ -19,11 +19,13 @@
 """This is the tests."""
 
 import pytest
+from flexmock import flexmock
 
 from thoth.storages import SolverResultsStore
 
 from .test_result_base import ResultBaseTest
 from .test_ceph import CEPH_INIT_KWARGS
+from .utils import connected_ceph_adapter
 
 _DEPLOYMENT_NAME = "thoth-test-deployment"
 _BUCKET_PREFIX = "some-solver"
@@ -46,3 +48,20 @@ class TestSolverResultsStore(ResultBaseTest):
     def test_store_document(self, adapter, document, document_id):
         """Test to store document."""
         return self.store_retrieve_document_test(adapter, document, document_id)
+
+    def test_listing_index(self):
+        """Test solver documents are listed using the listing index, filtered by solver."""
+        adapter = SolverResultsStore(
+            deployment_name=_DEPLOYMENT_NAME, prefix=_BUCKET_PREFIX, listing_index=True, **CEPH_INIT_KWARGS
+        )
+        flexmock(adapter, SCHEMA=None)
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.listing_index.connect()
+            for document_id in ("-fedora-31-py38-210101-a", "-rhel-8-py36-210101-b", "-fedora-31-py38-210102-c"):
+                connected_adapter.store_document({}, document_id)
+            connected_adapter.delete_many(["-fedora-31-py38-210101-a"])
+
+            flexmock(connected_adapter.ceph).should_receive("get_document_listing").never()
+            solver_info = {"os_name": "fedora", "os_version": "31", "python_version": "3.8"}
+            assert list(connected_adapter.get_document_listing(solver_info=solver_info)) == ["-fedora-31-py38-210102-c"]
+            assert connected_adapter.get_document_count() == 2
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test syncing documents into the graph database."""
+
+import json
+import os
+import threading
+
+import pytest
+from flexmock import flexmock
+
+from thoth.storages import bulk_sync_documents
+from thoth.storages import sync
+from thoth.storages import sync_adviser_documents
+from thoth.storages.exceptions import SolverNotRunError
+from thoth.storages.graph import BulkLoader
+from thoth.storages.graph import SyntheticDataGenerator
+
+from .base import ThothStoragesTest
+
+
+@pytest.fixture(name="local_documents")
+def _fixture_local_documents(tmp_path):
+    """Store adviser documents to be synced from a local directory."""
+    document_ids = []
+    for i in range(20):
+        document_path = tmp_path / f"adviser-{i:04d}"
+        document_path.write_text(json.dumps({"metadata": {"document_id": document_path.name}}))
+        document_ids.append(str(document_path))
+
+    return document_ids
+
+
+class _GraphMock:
+    """A thread-safe stand-in for the graph database adapter."""
+
+    def __init__(self, existing=None, failing=None):
+        self.existing = set(existing or [])
+        self.failing = set(failing or [])
+        self.synced = []
+        self.synced_checks = 0
+        self._lock = threading.Lock()
+
+    def get_adviser_document_ids_synced(self, document_ids):
+        self.synced_checks += 1
+        return self.existing.intersection(document_ids)
+
+    def sync_adviser_result(self, document):
+        document_id = document["metadata"]["document_id"]
+        if document_id in self.failing:
+            raise ValueError(f"Failed to sync {document_id}")
+
+        with self._lock:
+            self.synced.append(document_id)
+
+
+class TestSync(ThothStoragesTest):
+    """Test the sync pipeline."""
+
+    @pytest.mark.parametrize("fetch_workers,write_workers", [(1, 1), (4, 1), (1, 3), (4, 3)])
+    def test_sync(self, local_documents, fetch_workers, write_workers):
+        """Test syncing documents sequentially and concurrently."""
+        flexmock(sync, _SYNC_FETCH_WORKERS=fetch_workers, _SYNC_WRITE_WORKERS=write_workers, _SYNC_QUEUE_SIZE=2)
+        graph = _GraphMock(existing={"adviser-0000", "adviser-0001"})
+
+        result = sync_adviser_documents(local_documents, graph=graph, is_local=True)
+
+        assert result == (20, 18, 2, 0)
+        assert sorted(graph.synced) == [f"adviser-{i:04d}" for i in range(2, 20)]
+
+    def test_sync_synced_chunks(self, local_documents):
+        """Test documents already synced are checked in chunks."""
+        flexmock(sync, _SYNC_LISTING_CHUNK_SIZE=8)
+        graph = _GraphMock(existing={"adviser-0000", "adviser-0009", "adviser-0019"})
+
+        result = sync_adviser_documents(local_documents, graph=graph, is_local=True)
+
+        assert result == (20, 17, 3, 0)
+        assert graph.synced_checks == 3
+
+    @pytest.mark.parametrize("fetch_workers,write_workers", [(1, 1), (4, 3)])
+    def test_sync_force(self, local_documents, fetch_workers, write_workers):
+        """Test forcing sync of documents already synced."""
+        flexmock(sync, _SYNC_FETCH_WORKERS=fetch_workers, _SYNC_WRITE_WORKERS=write_workers)
+        graph = _GraphMock(existing={"adviser-0000", "adviser-0001"})
+
+        result = sync_adviser_documents(local_documents, graph=graph, is_local=True, force=True)
+
+        assert result == (20, 20, 0, 0)
+        assert len(graph.synced) == 20
+
+    @pytest.mark.parametrize("fetch_workers,write_workers", [(1, 1), (4, 3)])
+    def test_sync_graceful(self, local_documents, fetch_workers, write_workers):
+        """Test failures are counted when syncing gracefully."""
+        flexmock(sync, _SYNC_FETCH_WORKERS=fetch_workers, _SYNC_WRITE_WORKERS=write_workers)
+        graph = _GraphMock(failing={"adviser-0003", "adviser-0010"})
+        local_documents.append("/path/to/a/document/that/does/not/exist")
+
+        result = sync_adviser_documents(local_documents, graph=graph, is_local=True, graceful=True)
+
+        assert result == (21, 18, 0, 3)
+
+    @pytest.mark.parametrize("fetch_workers,write_workers", [(1, 1), (4, 3)])
+    def test_sync_not_graceful(self, local_documents, fetch_workers, write_workers):
+        """Test the first failure is propagated if not syncing gracefully."""
+        flexmock(sync, _SYNC_FETCH_WORKERS=fetch_workers, _SYNC_WRITE_WORKERS=write_workers)
+        graph = _GraphMock(failing={"adviser-0003"})
+
+        with pytest.raises(ValueError, match="adviser-0003"):
+            sync_adviser_documents(local_documents, graph=graph, is_local=True)
+
+
+@pytest.fixture(name="local_bulk_documents")
+def _fixture_local_bulk_documents(tmp_path):
+    """Store synthetic documents to be synced in bulk from a local directory."""
+    generator = SyntheticDataGenerator(packages=10, versions=2, adviser_runs=5, package_extracts=2, inspections=2)
+    document_ids = []
+    for document in generator.iter_documents():
+        if "specification" in document:
+            inspection_path = tmp_path / document["document_id"]
+            result_path = inspection_path / "results" / str(document["result_number"])
+            result_path.mkdir(parents=True)
+            (result_path / "result").write_text(json.dumps(document["result"]))
+            (inspection_path / "build").mkdir(exist_ok=True)
+            (inspection_path / "build" / "specification").write_text(json.dumps(document["specification"]))
+            if str(inspection_path) not in document_ids:
+                document_ids.append(str(inspection_path))
+        else:
+            document_path = tmp_path / document["metadata"]["document_id"]
+            document_path.write_text(json.dumps(document))
+            document_ids.append(str(document_path))
+
+    return document_ids
+
+
+class TestBulkSync(ThothStoragesTest):
+    """Test syncing documents in bulk."""
+
+    def test_bulk_sync(self, local_bulk_documents, monkeypatch):
+        """Test documents are loaded at once, documents which cannot be loaded in bulk are synced afterwards."""
+        # Inspections stating a script cannot be loaded in bulk.
+        inspection_path = next(document_id for document_id in local_bulk_documents if "inspection-" in document_id)
+        specification_path = os.path.join(inspection_path, "build", "specification")
+        with open(specification_path) as specification_file:
+            specification = json.load(specification_file)
+        with open(specification_path, "w") as specification_file:
+            json.dump({**specification, "script": "./script.py"}, specification_file)
+
+        inspection_results = len(os.listdir(os.path.join(inspection_path, "results")))
+        graph = object()
+        loaded = {}
+
+        def load(loader, graph_loaded):
+            assert graph_loaded is graph
+            loaded.update(loader.documents)
+            return loader.row_counts()
+
+        flexmock(BulkLoader).should_receive("prepare").with_args(graph).once()
+        monkeypatch.setattr(BulkLoader, "load", load)
+
+        fallback = []
+
+        def sync_fallback(document_ids, graceful, graph, is_local):
+            assert is_local
+            fallback.extend(document_ids)
+            return inspection_results, inspection_results, 0, 0
+
+        monkeypatch.setitem(sync.HANDLERS_MAPPING, "inspection", sync_fallback)
+        monkeypatch.setitem(
+            sync.HANDLERS_MAPPING, "provenance", lambda document_ids, **kwargs: (len(document_ids), 0, 0, 0)
+        )
+
+        stats = bulk_sync_documents(
+            local_bulk_documents + ["/path/to/provenance-checker-1234"], graph=graph, is_local=True
+        )
+
+        assert loaded["solver"] == 40
+        assert loaded["package-extract"] == 2
+        assert loaded["adviser"] == 5
+        assert fallback == [inspection_path]
+        assert stats["solver"] == (40, 40, 0, 0)
+        assert stats["inspection"] == (loaded["inspection"] + inspection_results,) * 2 + (0, 0)
+        assert stats["provenance"] == (1, 0, 0, 0)
+
+    def test_bulk_sync_failed(self, local_bulk_documents):
+        """Test documents which cannot be transformed are counted as failed when syncing gracefully."""
+        flexmock(BulkLoader).should_receive("prepare").twice()
+        flexmock(BulkLoader).should_receive("load").and_return({}).once()
+        # Packages locked by advised software stacks are not solved.
+        document_ids = [document_id for document_id in local_bulk_documents if "solver-" not in document_id]
+
+        stats = bulk_sync_documents(document_ids, graph=object(), is_local=True, graceful=True)
+
+        assert stats["adviser"] == (5, 0, 0, 5)
+        assert stats["package"] == (2, 2, 0, 0)
+
+        with pytest.raises(SolverNotRunError):
+            bulk_sync_documents(document_ids, graph=object(), is_local=True)
@@ -21,7 +21,21 @@
 import os
 from contextlib import contextmanager
 
+import pytest
 from moto import mock_s3
+from sqlalchemy_utils import database_exists
+from sqlalchemy_utils import drop_database
+
+from thoth.storages import GraphDatabase
+from thoth.storages.graph.models_base import Base
+
+# Prefix of names of throwaway databases created on the PostgreSQL instance configured using KNOWLEDGE_GRAPH_*
+# environment variables, tests run against the graph database are skipped if not set.
+_TEST_DATABASE = os.getenv("THOTH_STORAGES_TEST_DATABASE")
+
+requires_graph_database = pytest.mark.skipif(
+    not _TEST_DATABASE, reason="No database configured for graph database tests (THOTH_STORAGES_TEST_DATABASE)"
+)
 
 
 def with_adjusted_env(env_dict: dict):
@@ -58,3 +72,74 @@ def connected_ceph_adapter(adapter, raw_ceph=False):
         yield adapter
     finally:
         mock_s3().stop()
+
+
+@contextmanager
+def throwaway_graph_database(name):
+    """Retrieve a connected adapter to an empty graph database created for a test, the database is dropped on exit."""
+    database = f"{_TEST_DATABASE}_{name}"
+    old_database = os.environ.get("KNOWLEDGE_GRAPH_DATABASE")
+    os.environ["KNOWLEDGE_GRAPH_DATABASE"] = database
+    try:
+        graph = GraphDatabase()
+        url = graph.construct_connection_string()
+        if database_exists(url):
+            raise RuntimeError(f"Database {database!r} already exists, refusing to use a database not created by tests")
+
+        graph.connect()
+        try:
+            # Creates the database.
+            graph.initialize_schema()
+        except Exception:
+            graph.disconnect()
+            if database_exists(url):
+                drop_database(url)
+            raise
+    finally:
+        if old_database is None:
+            os.environ.pop("KNOWLEDGE_GRAPH_DATABASE")
+        else:
+            os.environ["KNOWLEDGE_GRAPH_DATABASE"] = old_database
+
+    try:
+        yield graph
+    finally:
+        graph.disconnect()
+        drop_database(url)
+
+
+def dump_graph_database(graph):
+    """Dump rows of all tables, ids are replaced with rows they reference so that databases can be compared."""
+    tables = {table.name: table for table in Base.metadata.sorted_tables}
+    rows = {}
+    with graph._engine.connect() as connection:
+        for table_name, table in tables.items():
+            rows[table_name] = {
+                row["id"] if "id" in table.c else idx: dict(row)
+                for idx, row in enumerate(connection.execute(table.select()))
+            }
+
+    canonical = {}
+
+    def _canonicalize(table_name, row):
+        result = []
+        for column in tables[table_name].columns:
+            if column.name == "id":
+                continue
+
+            value = row[column.name]
+            foreign_keys = list(column.foreign_keys)
+            if foreign_keys and value is not None:
+                referenced = foreign_keys[0].column.table.name
+                if (referenced, value) not in canonical:
+                    canonical[(referenced, value)] = _canonicalize(referenced, rows[referenced][value])
+                value = canonical[(referenced, value)]
+
+            result.append((column.name, value))
+
+        return tuple(result)
+
+    return {
+        table_name: sorted((_canonicalize(table_name, row) for row in table_rows.values()), key=repr)
+        for table_name, table_rows in rows.items()
+    }
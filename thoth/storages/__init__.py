@@ -40,6 +40,7 @@ from .result_schema import RESULT_SCHEMA
 from .security_indicators import SIAggregatedStore, SIBanditStore, SIClocStore
 from .security_indicators import SecurityIndicatorsResultsStore
 from .solvers import SolverResultsStore
+from .sync import bulk_sync_documents
 from .sync import sync_adviser_documents
 from .sync import sync_analysis_documents
 from .sync import sync_dependency_monkey_documents
@@ -78,6 +79,7 @@ __all__ = [
     SIBanditStore.__name__,
     SIClocStore.__name__,
     SolverResultsStore.__name__,
+    bulk_sync_documents.__name__,
     sync_adviser_documents.__name__,
     sync_analysis_documents.__name__,
     sync_dependency_monkey_documents.__name__,
@@ -19,9 +19,12 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import itertools
 import os
 import typing
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 import boto3
 import botocore
@@ -31,8 +34,18 @@ from typing import Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from mypy_boto3_stubs import S3Resource
 
+from . import codec
 from .base import StorageBase
+from .exceptions import DeleteError
 from .exceptions import NotFoundError
+from .local_cache import LocalCache
+
+# Number of documents retrieved concurrently when iterating over results asynchronously.
+_ASYNC_CONCURRENCY = int(os.getenv("THOTH_CEPH_ASYNC_CONCURRENCY", 16))
+# Maximum number of objects deleted in one DeleteObjects request as limited by S3.
+_DELETE_OBJECTS_MAX_KEYS = 1000
+# Objects larger than the part size are copied server-side in parts (CopyObject is limited to 5 GiB by S3).
+_COPY_PART_SIZE = int(os.getenv("THOTH_CEPH_COPY_PART_SIZE", 256 * 1024 * 1024))
 
 
 class CephStore(StorageBase):
@@ -47,10 +60,14 @@ class CephStore(StorageBase):
         secret_key: Optional[str] = None,
         bucket: Optional[str] = None,
         region: Optional[str] = None,
+        compression: Optional[str] = None,
+        local_cache: Optional[LocalCache] = None,
     ):
         """Initialize adapter to Ceph.
 
-        Parameters not explicitly provided will be picked from env variables.
+        Parameters not explicitly provided will be picked from env variables. Documents are stored
+        compressed if compression is configured, supported values are "gzip" and "zstd". Retrieved
+        blobs are cached locally if a local cache is passed or configured using env variables.
         """
         super().__init__()
         self.host = host or os.environ["THOTH_S3_ENDPOINT_URL"]
@@ -58,18 +75,33 @@ class CephStore(StorageBase):
         self.secret_key = secret_key or os.environ["THOTH_CEPH_SECRET_KEY"]
         self.bucket = bucket or os.environ["THOTH_CEPH_BUCKET"]
         self.region = region or os.getenv("THOTH_CEPH_REGION", None)
+        self.compression = compression if compression is not None else os.getenv("THOTH_CEPH_COMPRESSION", "")
+        self.local_cache = local_cache if local_cache is not None else LocalCache.get_shared()
         self._s3: S3Resource = None
         self.prefix = prefix
 
         if not self.prefix.endswith("/"):
             self.prefix += "/"
 
+        if self.compression and self.compression not in codec.COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression {self.compression!r}, supported are: {', '.join(sorted(codec.COMPRESSIONS))}"
+            )
+
     def get_document_listing(self, prefix_addition: typing.Optional[str] = "") -> typing.Generator[str, None, None]:
         """Get listing of documents stored on the Ceph."""
-        prefix = f"{self.prefix}{prefix_addition}"
+        prefix = f"{self.prefix}{prefix_addition or ''}"
         for obj in self._s3.Bucket(self.bucket).objects.filter(Prefix=prefix).all():
             yield obj.key[len(self.prefix) :]  # Ignore PycodestyleBear (E203)
 
+    def get_document_listing_last_modified(
+        self, prefix_addition: typing.Optional[str] = ""
+    ) -> typing.Generator[typing.Tuple[str, datetime], None, None]:
+        """Get listing of documents stored on the Ceph together with datetime of their last modification."""
+        prefix = f"{self.prefix}{prefix_addition or ''}"
+        for obj in self._s3.Bucket(self.bucket).objects.filter(Prefix=prefix).all():
+            yield obj.key[len(self.prefix) :], obj.last_modified
+
     def store_file(self, document_path: str, document_id: str) -> dict:
         """Store a file on Ceph."""
         response = self._s3.Object(self.bucket, f"{self.prefix}{document_id}").upload_file(Filename=document_path)
@@ -78,32 +110,185 @@ class CephStore(StorageBase):
     @staticmethod
     def dict2blob(dictionary: dict) -> bytes:
         """Encode a dictionary to a blob so it can be stored on Ceph."""
-        return json.dumps(dictionary, sort_keys=True, separators=(",", ": "), indent=2).encode()
+        return codec.json_dumps(dictionary)
 
-    def store_blob(self, blob: bytes, object_key: str) -> dict:
+    def store_blob(self, blob: bytes, object_key: str, metadata: Optional[typing.Dict[str, str]] = None) -> dict:
         """Store a blob on Ceph."""
-        put_kwargs = {"Body": blob}
+        put_kwargs: typing.Dict[str, typing.Any] = {"Body": blob}
+        if metadata:
+            put_kwargs["Metadata"] = metadata
+        self._invalidate_local_cache(object_key)
         response = self._s3.Object(self.bucket, f"{self.prefix}{object_key}").put(**put_kwargs)
         return response
 
     def delete(self, object_key: str) -> None:
         """Delete the given object from Ceph."""
+        self._invalidate_local_cache(object_key)
         self._s3.Object(self.bucket, f"{self.prefix}{object_key}").delete()
 
+    def delete_many(self, object_keys: typing.Iterable[str]) -> typing.Dict[str, str]:
+        """Delete the given objects from Ceph in batched requests, return error messages of objects not deleted.
+
+        Objects which do not exist are not reported as errors.
+        """
+        errors = {}
+        object_keys = iter(object_keys)
+        while True:
+            batch = list(itertools.islice(object_keys, _DELETE_OBJECTS_MAX_KEYS))
+            if not batch:
+                break
+
+            for object_key in batch:
+                self._invalidate_local_cache(object_key)
+
+            response = self._s3.meta.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": f"{self.prefix}{object_key}"} for object_key in batch], "Quiet": True},
+            )
+            for error in response.get("Errors", []):
+                # Some S3 implementations report objects which do not exist as errors.
+                if error.get("Code", "NoSuchKey") == "NoSuchKey":
+                    continue
+
+                errors[error["Key"][len(self.prefix) :]] = f"{error['Code']}: {error['Message']}"
+
+        return errors
+
+    def copy(self, object_key: str, target: CephStore, target_object_key: Optional[str] = None) -> None:
+        """Copy the given object to the target store server-side, content of the object does not leave Ceph.
+
+        Objects larger than the configured part size are copied using multipart copy, object metadata are preserved.
+        """
+        target_object_key = target_object_key or object_key
+        source_key = f"{self.prefix}{object_key}"
+        key = f"{target.prefix}{target_object_key}"
+        client = self._s3.meta.client
+
+        try:
+            head = client.head_object(Bucket=self.bucket, Key=source_key)
+        except botocore.exceptions.ClientError as exc:
+            if exc.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise NotFoundError("Failed to copy object, object {!r} does not exist".format(object_key)) from exc
+            raise
+
+        target._invalidate_local_cache(target_object_key)
+        copy_source = {"Bucket": self.bucket, "Key": source_key}
+        if head["ContentLength"] <= _COPY_PART_SIZE:
+            client.copy_object(CopySource=copy_source, Bucket=target.bucket, Key=key)
+            return
+
+        upload_id = client.create_multipart_upload(
+            Bucket=target.bucket,
+            Key=key,
+            Metadata=head.get("Metadata", {}),
+            ContentType=head.get("ContentType", "binary/octet-stream"),
+        )["UploadId"]
+        try:
+            parts = []
+            for part_number, start in enumerate(range(0, head["ContentLength"], _COPY_PART_SIZE), start=1):
+                end = min(start + _COPY_PART_SIZE, head["ContentLength"]) - 1
+                response = client.upload_part_copy(
+                    Bucket=target.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    CopySource=copy_source,
+                    CopySourceRange=f"bytes={start}-{end}",
+                )
+                parts.append({"PartNumber": part_number, "ETag": response["CopyPartResult"]["ETag"]})
+
+            client.complete_multipart_upload(
+                Bucket=target.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except Exception:
+            client.abort_multipart_upload(Bucket=target.bucket, Key=key, UploadId=upload_id)
+            raise
+
+    def move(self, object_key: str, target: CephStore, target_object_key: Optional[str] = None) -> None:
+        """Move the given object to the target store server-side."""
+        self.copy(object_key, target, target_object_key)
+        self.delete(object_key)
+
+    def copy_many(
+        self, object_keys: typing.Iterable[str], target: CephStore, *, concurrency: Optional[int] = None
+    ) -> typing.Dict[str, Exception]:
+        """Copy the given objects to the target store server-side concurrently, return errors of objects not copied.
+
+        Objects which do not exist are reported with NotFoundError.
+        """
+        errors: typing.Dict[str, Exception] = {}
+
+        def _copy(object_key: str) -> None:
+            try:
+                self.copy(object_key, target)
+            except Exception as exc:
+                errors[object_key] = exc
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency or _ASYNC_CONCURRENCY, thread_name_prefix="ceph-copy"
+        ) as executor:
+            for _ in executor.map(_copy, object_keys):
+                pass
+
+        return errors
+
+    def move_many(
+        self, object_keys: typing.Iterable[str], target: CephStore, *, concurrency: Optional[int] = None
+    ) -> typing.Dict[str, Exception]:
+        """Move the given objects to the target store server-side, return errors of objects not moved.
+
+        Objects are copied concurrently and the ones copied are deleted in batched requests. Objects which
+        do not exist are reported with NotFoundError, objects copied but not deleted with DeleteError.
+        """
+        object_keys = list(object_keys)
+        errors = self.copy_many(object_keys, target, concurrency=concurrency)
+        delete_errors = self.delete_many(object_key for object_key in object_keys if object_key not in errors)
+        errors.update((object_key, DeleteError(message)) for object_key, message in delete_errors.items())
+        return errors
+
     def store_document(self, document: dict, document_id: str) -> dict:
-        """Store a document (dict) onto Ceph."""
-        blob = self.dict2blob(document)
-        return self.store_blob(blob, document_id)
+        """Store a document (dict) onto Ceph, compress it if configured so."""
+        if not self.compression:
+            return self.store_blob(self.dict2blob(document), document_id)
 
-    def retrieve_blob(self, object_key: str) -> bytes:
-        """Retrieve remote object content."""
+        blob = codec.encode_document(document, self.compression)
+        return self.store_blob(blob, document_id, metadata={codec.COMPRESSION_METADATA_KEY: self.compression})
+
+    def _invalidate_local_cache(self, object_key: str) -> None:
+        """Drop the given object from the local cache, if used."""
+        if self.local_cache is not None:
+            self.local_cache.invalidate(self.local_cache.get_key(self.bucket, self.prefix, object_key))
+
+    def _retrieve_blob_if_modified(self, object_key: str, etag: Optional[str]) -> Optional[typing.Tuple[bytes, str]]:
+        """Retrieve remote object content together with its ETag, return None if the object has the given ETag."""
+        get_kwargs = {"IfNoneMatch": etag} if etag else {}
         try:
-            return self._s3.Object(self.bucket, f"{self.prefix}{object_key}").get()["Body"].read()
+            response = self._s3.Object(self.bucket, f"{self.prefix}{object_key}").get(**get_kwargs)
         except botocore.exceptions.ClientError as exc:
             if exc.response["Error"]["Code"] in ("404", "NoSuchKey"):
                 raise NotFoundError("Failed to retrieve object, object {!r} does not exist".format(object_key)) from exc
+            if etag and exc.response["Error"]["Code"] in ("304", "NotModified"):
+                return None
             raise
 
+        return response["Body"].read(), response["ETag"]
+
+    def _retrieve_buffer(self, object_key: str) -> typing.Union[bytes, memoryview]:
+        """Retrieve remote object content, blobs served from the local cache are not copied."""
+        if self.local_cache is None:
+            result = self._retrieve_blob_if_modified(object_key, None)
+            assert result is not None
+            return result[0]
+
+        return self.local_cache.retrieve(
+            self.local_cache.get_key(self.bucket, self.prefix, object_key),
+            lambda etag: self._retrieve_blob_if_modified(object_key, etag),
+        )
+
+    def retrieve_blob(self, object_key: str) -> bytes:
+        """Retrieve remote object content, use the local cache if configured."""
+        return bytes(self._retrieve_buffer(object_key))
+
     def retrieve_document_attr(self, object_key: str, attr: str) -> typing.Any:
         """Retrieve the given attribute of a document from S3."""
         return self._s3.Object(self.bucket, f"{self.prefix}{object_key}").get()[attr]
@@ -115,8 +300,60 @@ class CephStore(StorageBase):
             yield document_id, document
 
     def retrieve_document(self, document_id: str) -> dict:
-        """Retrieve a dictionary stored as JSON from S3."""
-        return json.loads(self.retrieve_blob(document_id).decode())
+        """Retrieve a dictionary stored as JSON from S3, compressed documents are detected automatically."""
+        return codec.decode_document(self._retrieve_buffer(document_id))
+
+    async def retrieve_documents_async(
+        self, document_ids: typing.Iterable[str], *, concurrency: Optional[int] = None
+    ) -> typing.AsyncGenerator[typing.Tuple[str, dict], None]:
+        """Retrieve the given documents concurrently, yield document id and document pairs as they complete.
+
+        At most `concurrency` requests are in flight, new ones are issued only once the retrieved
+        documents are consumed so the memory footprint stays bounded regardless of the number of documents.
+        """
+        concurrency = concurrency or _ASYNC_CONCURRENCY
+        loop = asyncio.get_running_loop()
+        # One more thread to list documents while the others retrieve them.
+        executor = ThreadPoolExecutor(max_workers=concurrency + 1, thread_name_prefix="ceph-retrieve")
+        document_ids_iter = iter(document_ids)
+        pending: typing.Set[asyncio.Future] = set()
+        listing_exhausted = False
+
+        def _retrieve(document_id: str) -> typing.Tuple[str, dict]:
+            return document_id, self.retrieve_document(document_id)
+
+        try:
+            while True:
+                while not listing_exhausted and len(pending) < concurrency:
+                    document_id = await loop.run_in_executor(executor, next, document_ids_iter, None)
+                    if document_id is None:
+                        listing_exhausted = True
+                        break
+
+                    pending.add(loop.run_in_executor(executor, _retrieve, document_id))
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    async def iterate_results_async(
+        self, prefix_addition: typing.Optional[str] = None, *, concurrency: Optional[int] = None
+    ) -> typing.AsyncGenerator[typing.Tuple[str, dict], None]:
+        """Iterate over results available in the Ceph, documents are retrieved concurrently.
+
+        Documents are yielded in the order in which their retrieval completes.
+        """
+        async for item in self.retrieve_documents_async(
+            self.get_document_listing(prefix_addition=prefix_addition), concurrency=concurrency
+        ):
+            yield item
 
     def is_connected(self) -> bool:
         """Check whether adapter is connected to the remote Ceph storage."""
@@ -138,6 +375,29 @@ class CephStore(StorageBase):
             exists = True
         return exists
 
+    def exists_many(self, object_keys: typing.Iterable[str]) -> typing.Dict[str, bool]:
+        """Check if there are objects with the given keys in bucket, objects are listed instead of issuing HEADs.
+
+        Only keys under the common prefix of the given keys, between the lowest and the highest key, are listed.
+        """
+        object_keys = set(object_keys)
+        if not object_keys:
+            return {}
+
+        first, last = min(object_keys), max(object_keys)
+        prefix = f"{self.prefix}{os.path.commonprefix([first, last])}"
+        found = set()
+        # Keys are listed in lexicographical order, a proper prefix of the lowest key precedes it.
+        for obj in self._s3.Bucket(self.bucket).objects.filter(Prefix=prefix, Marker=f"{self.prefix}{first[:-1]}"):
+            object_key = obj.key[len(self.prefix) :]
+            if object_key > last:
+                break
+
+            if object_key in object_keys:
+                found.add(object_key)
+
+        return {object_key: object_key in found for object_key in object_keys}
+
     def check_connection(self) -> None:
         """Ceph Connection Check.
 
@@ -19,6 +19,8 @@
 
 import logging
 import re
+from typing import Optional
+from typing import Tuple
 
 import click
 import daiquiri
@@ -114,5 +116,157 @@ def generate_schema(schema_file: str, include=None, include_performance_models=T
     graph.write_png(schema_file)
 
 
+@cli.command("rebuild-listing-index")
+@click.option(
+    "--compact",
+    is_flag=True,
+    help="Only compact markers of documents stored before today instead of rebuilding the whole index.",
+)
+@click.argument("result_type", type=str, metavar="RESULT_TYPE")
+def rebuild_listing_index(result_type: str, compact: bool = False):
+    """Rebuild the date-partitioned listing index of results of the given type (e.g. adviser)."""
+    import thoth.storages
+    from thoth.storages.result_base import ResultStorageBase
+
+    adapters = {
+        adapter.RESULT_TYPE: adapter
+        for adapter in vars(thoth.storages).values()
+        if isinstance(adapter, type) and issubclass(adapter, ResultStorageBase) and adapter.RESULT_TYPE
+    }
+    if result_type not in adapters:
+        raise click.BadParameter(
+            f"Unknown result type {result_type!r}, available are: {', '.join(sorted(adapters))}",
+            param_hint="RESULT_TYPE",
+        )
+
+    adapter = adapters[result_type](listing_index=True)
+    adapter.connect()
+
+    if compact:
+        _LOGGER.info("Compacted listing index of %d days", adapter.compact_listing_index())
+    else:
+        _LOGGER.info("Indexed %d documents", adapter.rebuild_listing_index())
+
+
+@cli.command("generate-synthetic-data")
+@click.option("--seed", type=int, default=42, show_default=True, help="Seed of the random number generator.")
+@click.option("--packages", type=int, default=1000, show_default=True, help="Number of packages.")
+@click.option("--versions", type=int, default=5, show_default=True, help="Number of versions of each package.")
+@click.option(
+    "--dependencies",
+    type=int,
+    default=5,
+    show_default=True,
+    help="Average number of direct dependencies of a package version.",
+)
+@click.option(
+    "--skew",
+    type=float,
+    default=2.0,
+    show_default=True,
+    help="Skew towards popular packages, the higher the more dependencies point to popular packages.",
+)
+@click.option("--adviser-runs", type=int, default=1000, show_default=True, help="Number of adviser documents.")
+@click.option(
+    "--package-extracts", type=int, default=100, show_default=True, help="Number of package-extract documents."
+)
+@click.option("--inspections", type=int, default=100, show_default=True, help="Number of inspections.")
+@click.option("--days", type=int, default=30, show_default=True, help="Number of days documents are spread over.")
+@click.option(
+    "--output",
+    type=click.Path(file_okay=False, writable=True),
+    help="Write documents as JSON files into the given directory, one sub-directory per document type.",
+)
+@click.option(
+    "--load",
+    is_flag=True,
+    help="Load documents into the database configured using KNOWLEDGE_GRAPH_* environment variables, using COPY.",
+)
+def generate_synthetic_data(
+    seed: int,
+    packages: int,
+    versions: int,
+    dependencies: int,
+    skew: float,
+    adviser_runs: int,
+    package_extracts: int,
+    inspections: int,
+    days: int,
+    output: Optional[str] = None,
+    load: bool = False,
+):
+    """Generate synthetic solver, adviser, package-extract and inspection documents of a realistic scale."""
+    import json
+    import os
+
+    from thoth.storages import GraphDatabase
+    from thoth.storages.graph import SyntheticDataGenerator
+
+    if not output and not load:
+        raise click.UsageError("Nothing to do, state --output and/or --load")
+
+    generator = SyntheticDataGenerator(
+        seed=seed,
+        packages=packages,
+        versions=versions,
+        dependencies=dependencies,
+        skew=skew,
+        adviser_runs=adviser_runs,
+        package_extracts=package_extracts,
+        inspections=inspections,
+        days=days,
+    )
+
+    if output:
+        for document_type, documents in (
+            ("solver", generator.iter_solver_documents()),
+            ("analysis", generator.iter_analysis_documents()),
+            ("adviser", generator.iter_adviser_documents()),
+            ("inspection", generator.iter_inspection_documents()),
+        ):
+            os.makedirs(os.path.join(output, document_type), exist_ok=True)
+            count = 0
+            for document in documents:
+                if document_type == "inspection":
+                    file_name = f"{document['document_id']}-{document['result_number']}"
+                else:
+                    file_name = document["metadata"]["document_id"]
+
+                with open(os.path.join(output, document_type, file_name), "w") as document_file:
+                    json.dump(document, document_file)
+                count += 1
+
+            _LOGGER.info("Written %d %s documents to %r", count, document_type, output)
+
+    if load:
+        graph = GraphDatabase()
+        graph.connect()
+        rows = generator.load(graph)
+        _LOGGER.info("Loaded %d rows into %d tables", sum(rows.values()), len(rows))
+
+
+@cli.command("bulk-sync")
+@click.option("--graceful", is_flag=True, help="Do not stop on documents which cannot be synced.")
+@click.option("--local", is_flag=True, help="Document ids are paths to documents stored in local files.")
+@click.argument("document_ids", type=str, nargs=-1, metavar="DOCUMENT_ID")
+def bulk_sync(document_ids: Tuple[str, ...], graceful: bool = False, local: bool = False):
+    """Populate an empty database configured using KNOWLEDGE_GRAPH_* environment variables in bulk using COPY.
+
+    All documents stored in result stores are synced if no document id is given.
+    """
+    from thoth.storages import bulk_sync_documents
+
+    stats = bulk_sync_documents(document_ids or None, graceful=graceful, is_local=local)
+    for document_type, (processed, synced, skipped, failed) in stats.items():
+        _LOGGER.info(
+            "Documents of type %r: %d processed, %d synced, %d skipped, %d failed",
+            document_type,
+            processed,
+            synced,
+            skipped,
+            failed,
+        )
+
+
 if __name__ == "__main__":
     cli()
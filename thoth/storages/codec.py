@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Encoding and decoding of documents stored on Ceph."""
+
+import enum
+import gzip
+import json
+import logging
+import math
+import uuid
+from typing import Any
+from typing import Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+_LOGGER = logging.getLogger(__name__)
+
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSIONS = frozenset((COMPRESSION_GZIP, COMPRESSION_ZSTD))
+# Name of the object metadata entry stating compression used.
+COMPRESSION_METADATA_KEY = "thoth-compression"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _requires_json(document: Any) -> bool:
+    """Check if the given document has to be serialized using the standard library.
+
+    The orjson library silently serializes NaN and infinity as null and it serializes enums, UUIDs and
+    dictionary keys of types the standard library rejects instead of raising TypeError.
+    """
+    stack = [document]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, (enum.Enum, uuid.UUID)):
+            return True
+        elif isinstance(item, dict):
+            for key in item:
+                if isinstance(key, enum.Enum) or not isinstance(key, (str, int, float, bool, type(None))):
+                    return True
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+
+    return False
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Reject types passed through by orjson so that they are handled by the standard library."""
+    raise TypeError(f"Object of type {type(obj).__name__} is not serialized using orjson")
+
+
+def json_dumps(document: Any) -> bytes:
+    """Serialize the given document to a compact JSON, use orjson if available.
+
+    Documents are serialized the same way regardless of orjson availability, values the standard library
+    cannot serialize raise TypeError.
+    """
+    if orjson is not None and not _requires_json(document):
+        try:
+            return orjson.dumps(
+                document,
+                default=_orjson_default,
+                option=orjson.OPT_SORT_KEYS
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except TypeError as exc:
+            # For example integers not fitting into 64 bits, fallback to the standard library.
+            _LOGGER.debug("Failed to serialize document using orjson, using json instead: %s", str(exc))
+
+    return json.dumps(document, sort_keys=True, separators=(",", ":")).encode()
+
+
+def json_loads(blob: Union[bytes, memoryview]) -> Any:
+    """Deserialize the given JSON, use orjson if available."""
+    if orjson is not None:
+        try:
+            return orjson.loads(blob)
+        except orjson.JSONDecodeError as exc:
+            # For example NaN or Infinity written by the standard library, fallback to it.
+            _LOGGER.debug("Failed to deserialize document using orjson, using json instead: %s", str(exc))
+
+    return json.loads(bytes(blob).decode())
+
+
+def compress(blob: bytes, compression: str) -> bytes:
+    """Compress the given blob using the given compression."""
+    if compression == COMPRESSION_GZIP:
+        return gzip.compress(blob)
+    elif compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("Cannot compress using zstd, zstandard library is not installed")
+        return zstandard.ZstdCompressor().compress(blob)
+
+    raise ValueError(f"Unknown compression {compression!r}, supported are: {', '.join(sorted(COMPRESSIONS))}")
+
+
+def decompress(blob: Union[bytes, memoryview]) -> Union[bytes, memoryview]:
+    """Decompress the given blob, compression is detected based on the blob content.
+
+    Blobs which are not compressed are returned as they are, memoryviews are not copied.
+    """
+    # Memoryviews do not provide startswith, compare just the leading bytes.
+    magic = bytes(blob[: max(len(_GZIP_MAGIC), len(_ZSTD_MAGIC))])
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.decompress(blob)
+    elif magic.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError("Cannot decompress zstd compressed blob, zstandard library is not installed")
+        # Use a streaming reader as the content size does not need to be stored in the frame.
+        with zstandard.ZstdDecompressor().stream_reader(blob) as reader:
+            return reader.read()
+
+    return blob
+
+
+def encode_document(document: Any, compression: str = "") -> bytes:
+    """Encode the given document to a blob, compress it if requested."""
+    blob = json_dumps(document)
+    if compression:
+        blob = compress(blob, compression)
+
+    return blob
+
+
+def decode_document(blob: Union[bytes, memoryview]) -> Any:
+    """Decode the given blob to a document regardless of its format (compressed or not)."""
+    return json_loads(decompress(blob))
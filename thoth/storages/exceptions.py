@@ -26,6 +26,10 @@ class NotFoundError(ThothStorageExceptionError):
     """Raised if the given artifact cannot be found."""
 
 
+class DeleteError(ThothStorageExceptionError):
+    """Raised if the given artifacts cannot be deleted."""
+
+
 class SchemaError(ThothStorageExceptionError):
     """Raised if trying to store document with invalid schema."""
 
@@ -80,3 +84,7 @@ class NoDocumentIdError(ThothStorageExceptionError):
 
 class CudaVersionDoesNotMatchError(ThothStorageExceptionError):
     """Raised if the cuda versions from txt file and nvcc command is different."""
+
+
+class BulkLoadError(ThothStorageExceptionError):
+    """Raised if documents cannot be loaded into the database in bulk."""
@@ -18,6 +18,14 @@
 """A graph database adapter for communicating with dgraph via gRPC."""
 
 
+from .bulk_load import BulkLoader
 from .postgres import GraphDatabase
+from .snapshot import DependencyGraphSnapshot
+from .synthetic import SyntheticDataGenerator
 
-__all__ = [GraphDatabase.__name__]
+__all__ = [
+    GraphDatabase.__name__,
+    DependencyGraphSnapshot.__name__,
+    BulkLoader.__name__,
+    SyntheticDataGenerator.__name__,
+]
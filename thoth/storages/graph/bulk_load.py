@@ -0,0 +1,1209 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Load documents into the graph database in bulk using PostgreSQL COPY.
+
+Documents are transformed into rows of tables the same way the sync methods of GraphDatabase do, but without
+any database round trip. Ids of records are assigned on the client side and records are deduplicated on the
+columns the sync methods look them up by. Rows are kept in temporary files (or in memory for tables which
+are updated once their rows are created) and copied into the database once all the documents are transformed.
+
+Rows are copied into temporary staging tables with no indexes and no foreign keys first. Staging tables are
+then merged into the real tables by a single INSERT ... SELECT each, with secondary indexes of the real tables
+dropped during the merge and rebuilt once at the end instead of being maintained row by row. Everything is done
+in a single transaction, either all the rows are loaded or none.
+
+Rows of a document are discarded if the document cannot be transformed, similarly as a failing sync rolls
+back its transaction.
+"""
+
+import logging
+import re
+import tempfile
+from contextlib import contextmanager
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from packaging.specifiers import SpecifierSet
+from packaging.version import parse as parse_version
+from thoth.common import OpenShift
+from thoth.common import map_os_name
+from thoth.common.helpers import normalize_os_version
+from thoth.python import Pipfile
+from thoth.python import PipfileLock
+
+from .enums import EnvironmentTypeEnum
+from .enums import InspectionSyncStateEnum
+from .enums import SoftwareStackTypeEnum
+from .models import Advised
+from .models import AdviserRun
+from .models import DebDependency
+from .models import DebDepends
+from .models import DebPackageVersion
+from .models import DebPreDepends
+from .models import DependsOn
+from .models import DetectedSymbol
+from .models import EcosystemSolver
+from .models import ExternalHardwareInformation
+from .models import ExternalPythonRequirements
+from .models import ExternalPythonRequirementsLock
+from .models import ExternalPythonSoftwareStack
+from .models import ExternalSoftwareEnvironment
+from .models import FoundDeb
+from .models import FoundImportPackage
+from .models import FoundPythonFile
+from .models import FoundPythonInterpreter
+from .models import FoundRPM
+from .models import HardwareInformation
+from .models import HasArtifact
+from .models import HasExternalPythonRequirements
+from .models import HasExternalPythonRequirementsLock
+from .models import HasPythonRequirements
+from .models import HasPythonRequirementsLock
+from .models import HasSymbol
+from .models import HasUnresolved
+from .models import Identified
+from .models import ImportPackage
+from .models import InspectionRun
+from .models import PackageExtractRun
+from .models import PythonArtifact
+from .models import PythonFileDigest
+from .models import PythonInterpreter
+from .models import PythonPackageIndex
+from .models import PythonPackageLicense
+from .models import PythonPackageMetadata
+from .models import PythonPackageRequirement
+from .models import PythonPackageVersion
+from .models import PythonPackageVersionEntity
+from .models import PythonPackageVersionEntityRulesAssociation
+from .models import PythonRequirements
+from .models import PythonRequirementsLock
+from .models import PythonSoftwareStack
+from .models import RPMPackageVersion
+from .models import RPMRequirement
+from .models import RPMRequires
+from .models import SoftwareEnvironment
+from .models import Solved
+from .models import VersionedSymbol
+from .models_base import Base
+from .postgres import GraphDatabase
+from ..exceptions import BulkLoadError
+from ..exceptions import CudaVersionDoesNotMatchError
+from ..exceptions import NotConnectedError
+from ..exceptions import NotFoundError
+from ..exceptions import PythonIndexNotProvidedError
+from ..exceptions import SolverNotRunError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Tables which are updated once their rows are created, rows of these tables are kept in memory.
+_MUTABLE_TABLES = frozenset(("python_package_version", "adviser_run"))
+# Escaping of special characters in the COPY text format.
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+# Tables which are not empty once any document was synced into the database.
+_SYNCED_TABLES = ("python_package_version_entity", "solved", "adviser_run", "package_extract_run", "inspection_run")
+# Secondary indexes of a table, these are dropped during a load and rebuilt once rows are loaded.
+_SECONDARY_INDEXES_QUERY = """
+SELECT index_class.relname, pg_get_indexdef(index_class.oid)
+FROM pg_index
+JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid
+WHERE pg_index.indrelid = %s::regclass AND NOT pg_index.indisunique AND NOT pg_index.indisprimary
+"""
+
+
+def _format_value(value: Any) -> str:
+    """Format the given value as a column value in the COPY text format."""
+    if value is None:
+        return "\\N"
+
+    if value is True:
+        return "t"
+
+    if value is False:
+        return "f"
+
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+
+    return str(value)
+
+
+class _Table:
+    """Rows of a table collected for COPY, changes done when transforming a document can be rolled back."""
+
+    def __init__(self, model: Any, dirty: Set["_Table"]) -> None:
+        """Initialize an empty table for the given model."""
+        table = model.__table__
+        self.name = table.name
+        self.columns = tuple(column.name for column in table.columns)
+        self.primary_key = tuple(column.name for column in table.primary_key.columns)
+        self.mutable = self.name in _MUTABLE_TABLES
+        # Whether rows present in the database were registered, the table is not required to be empty then.
+        self.preloaded = False
+        self.next_id = 1
+        self.row_count = 0
+        self._column_names = frozenset(self.columns)
+        self._defaults = {
+            column.name: column.default.arg
+            for column in table.columns
+            if column.default is not None and column.default.is_scalar
+        }
+        self._dirty = dirty
+        # Ids of entities keyed by values they were looked up by, primary keys of association rows.
+        self._ids: Dict[Hashable, int] = {}
+        self._keys: Set[Tuple[Any, ...]] = set()
+        # Rows of mutable tables keyed by their ids, rows of other tables are written to a temporary file.
+        self._rows: Dict[int, List[Any]] = {}
+        # Ids of the first entities of mutable tables keyed by values of columns searched, built on the first search.
+        self._indexes: Dict[Tuple[str, ...], Dict[Tuple[Any, ...], int]] = {}
+        self._file: Optional[IO[str]] = None
+        # Changes done since the last commit.
+        self._pending: List[List[Any]] = []
+        self._created: List[Hashable] = []
+        self._updated: Dict[int, List[Any]] = {}
+        self._checkpoint = (self.next_id, self.row_count)
+
+    def _mark_dirty(self) -> None:
+        """Remember the table has uncommitted changes."""
+        if self not in self._dirty:
+            self._checkpoint = (self.next_id, self.row_count)
+            self._dirty.add(self)
+
+    def _row(self, values: Dict[str, Any]) -> List[Any]:
+        """Create a row out of the given column values, columns not stated get their defaults."""
+        unknown = values.keys() - self._column_names
+        if unknown:
+            raise KeyError(f"Unknown columns for table {self.name!r}: {sorted(unknown)!r}")
+
+        return [values[column] if column in values else self._defaults.get(column) for column in self.columns]
+
+    def _add(self, row: List[Any]) -> None:
+        """Add the given row, the row is written once changes are committed."""
+        self.row_count += 1
+        if self.mutable:
+            entity_id = row[self.columns.index("id")]
+            self._rows[entity_id] = row
+            for columns, index in self._indexes.items():
+                index.setdefault(tuple(row[self.columns.index(column)] for column in columns), entity_id)
+        else:
+            self._pending.append(row)
+
+    def preload(self, rows: Iterable[Tuple[Any, ...]], columns: Tuple[str, ...]) -> None:
+        """Register entities present in the database, rows are given as ids followed by values of the given columns.
+
+        Entities registered are not copied, ids of entities created continue after them.
+        """
+        for entity_id, *values in rows:
+            self._ids[tuple(sorted(zip(columns, values)))] = entity_id
+            self.next_id = max(self.next_id, entity_id + 1)
+
+        self._checkpoint = (self.next_id, self.row_count)
+        self.preloaded = True
+
+    def get(self, **values: Any) -> Optional[int]:
+        """Get id of an entity with the given column values, None if no such entity was created."""
+        return self._ids.get(tuple(sorted(values.items())))
+
+    def get_or_create(self, **values: Any) -> int:
+        """Get id of an entity with the given column values, create the entity if it does not exist yet."""
+        key = tuple(sorted(values.items()))
+        entity_id = self._ids.get(key)
+        if entity_id is not None:
+            return entity_id
+
+        self._mark_dirty()
+        entity_id = self.next_id
+        self.next_id += 1
+        self._add(self._row({**values, "id": entity_id}))
+        self._ids[key] = entity_id
+        self._created.append(key)
+        return entity_id
+
+    def create(self, **values: Any) -> None:
+        """Create a row of an association table, rows with a primary key already present are not created again."""
+        key = tuple(values.get(column) for column in self.primary_key)
+        if None in key:
+            raise BulkLoadError(f"No value for primary key {self.primary_key!r} of table {self.name!r}: {values!r}")
+
+        if key in self._keys:
+            return
+
+        self._mark_dirty()
+        self._add(self._row(values))
+        self._keys.add(key)
+        self._created.append(key)
+
+    def update(self, entity_id: int, **values: Any) -> None:
+        """Update columns of an entity created, only entities of mutable tables can be updated."""
+        if not self.mutable:
+            raise BulkLoadError(f"Rows of table {self.name!r} cannot be updated")
+
+        self._mark_dirty()
+        row = self._rows[entity_id]
+        self._updated.setdefault(entity_id, list(row))
+        for column, value in values.items():
+            row[self.columns.index(column)] = value
+
+        for columns in [columns for columns in self._indexes if not values.keys().isdisjoint(columns)]:
+            del self._indexes[columns]
+
+    def find(self, **values: Any) -> Optional[int]:
+        """Find the first entity of a mutable table matching the given column values.
+
+        Columns searched are indexed on the first search, the index is kept up to date as rows are added.
+        """
+        if not self.mutable:
+            raise BulkLoadError(f"Rows of table {self.name!r} cannot be searched")
+
+        columns = tuple(sorted(values))
+        index = self._indexes.get(columns)
+        if index is None:
+            index = self._indexes[columns] = {}
+            positions = [self.columns.index(column) for column in columns]
+            for entity_id in sorted(self._rows):
+                row = self._rows[entity_id]
+                index.setdefault(tuple(row[position] for position in positions), entity_id)
+
+        return index.get(tuple(values[column] for column in columns))
+
+    def iter_entities(self) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Iterate over column values entities were looked up by together with their ids."""
+        for key, entity_id in list(self._ids.items()):
+            yield dict(key), entity_id  # type: ignore
+
+    def get_row(self, entity_id: int) -> Dict[str, Any]:
+        """Get column values of an entity of a mutable table."""
+        return dict(zip(self.columns, self._rows[entity_id]))
+
+    def commit(self) -> None:
+        """Commit changes done, rows created are written to the temporary file."""
+        if self._pending:
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+
+            self._file.writelines("\t".join(_format_value(value) for value in row) + "\n" for row in self._pending)
+
+        self._pending.clear()
+        self._created.clear()
+        self._updated.clear()
+
+    def rollback(self) -> None:
+        """Discard changes done since the last commit."""
+        for key in self._created:
+            entity_id = self._ids.pop(key, None)
+            if entity_id is not None:
+                self._rows.pop(entity_id, None)
+            else:
+                self._keys.discard(key)  # type: ignore
+
+        for entity_id, row in self._updated.items():
+            if entity_id in self._rows:
+                self._rows[entity_id] = row
+
+        self.next_id, self.row_count = self._checkpoint
+        self._indexes.clear()
+        self._pending.clear()
+        self._created.clear()
+        self._updated.clear()
+
+    def copy(self, cursor: Any, table_name: str) -> None:
+        """Copy rows of the table into the given database table using the given cursor."""
+        if self.mutable:
+            self._file = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+            self._file.writelines(
+                "\t".join(_format_value(value) for value in row) + "\n" for row in self._rows.values()
+            )
+
+        if self._file is None:
+            return
+
+        self._file.seek(0)
+        columns = ", ".join(f'"{column}"' for column in self.columns)
+        cursor.copy_expert(f'COPY "{table_name}" ({columns}) FROM STDIN', self._file)
+
+    def close(self) -> None:
+        """Remove the temporary file with rows."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BulkLoader:
+    """Transform documents into rows with ids assigned on the client side and load them using COPY.
+
+    Methods adding documents mirror their counterparts in GraphDatabase, see GraphDatabase.sync_solver_result,
+    GraphDatabase.sync_adviser_result, GraphDatabase.sync_analysis_result and
+    GraphDatabase.sync_inspection_result. Parts of documents which require data not loaded by the loader
+    (performance indicators, Kebechet installations) are not supported. Rules of Python packages present in the
+    database are assigned to Python package version entities when rows are loaded.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a loader with no documents added."""
+        self._tables: Dict[str, _Table] = {}
+        self._dirty: Set[_Table] = set()
+        self.documents: Dict[str, int] = {}
+
+    def _table(self, model: Any) -> _Table:
+        """Get rows collected for the given model."""
+        table = self._tables.get(model.__tablename__)
+        if table is None:
+            table = self._tables[model.__tablename__] = _Table(model, self._dirty)
+
+        return table
+
+    @contextmanager
+    def _document(self, document_type: Optional[str]) -> Iterator[None]:
+        """Transform a document, rows of the document are discarded if the transformation fails."""
+        try:
+            yield
+        except Exception:
+            for table in self._dirty:
+                table.rollback()
+            raise
+        else:
+            for table in self._dirty:
+                table.commit()
+            if document_type is not None:
+                self.documents[document_type] = self.documents.get(document_type, 0) + 1
+        finally:
+            self._dirty.clear()
+
+    def row_counts(self) -> Dict[str, int]:
+        """Get number of rows collected per table."""
+        return {name: table.row_count for name, table in sorted(self._tables.items()) if table.row_count}
+
+    def _python_package_index(self, index_url: Optional[str]) -> Optional[int]:
+        """Get id of the given Python package index."""
+        if index_url is None:
+            return None
+
+        return self._table(PythonPackageIndex).get_or_create(url=GraphDatabase.normalize_python_index_url(index_url))
+
+    def _python_package_version_entity(
+        self, package_name: str, package_version: Optional[str], index_url: Optional[str]
+    ) -> int:
+        """Get id of a Python package version entity, see GraphDatabase._create_python_package_version."""
+        package_name = GraphDatabase.normalize_python_package_name(package_name)
+        if package_version is not None:
+            package_version = GraphDatabase.normalize_python_package_version(package_version)
+
+        return self._table(PythonPackageVersionEntity).get_or_create(
+            package_name=package_name,
+            package_version=package_version,
+            python_package_index_id=self._python_package_index(index_url),
+        )
+
+    def _python_package_version(
+        self,
+        package_name: str,
+        package_version: Optional[str],
+        index_url: Optional[str],
+        *,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+    ) -> int:
+        """Get id of a Python package version, see GraphDatabase._create_python_package_version."""
+        package_name = GraphDatabase.normalize_python_package_name(package_name)
+        if package_version is not None:
+            package_version = GraphDatabase.normalize_python_package_version(package_version)
+
+        return self._table(PythonPackageVersion).get_or_create(
+            package_name=package_name,
+            package_version=package_version,
+            python_package_index_id=self._python_package_index(index_url),
+            os_name=os_name,
+            os_version=os_version,
+            python_version=python_version,
+            entity_id=self._python_package_version_entity(package_name, package_version, index_url),
+        )
+
+    def add_solver_result(self, document: Dict[str, Any]) -> None:
+        """Add the given solver result, see GraphDatabase.sync_solver_result."""
+        solver_document_id = document["metadata"]["document_id"]
+        solver_name = solver_document_id.rsplit("-", maxsplit=2)[0]
+        solver_info = OpenShift.parse_python_solver_name(solver_name)
+        platform = document["result"].get("platform") or "linux-x86_64"
+
+        if not GraphDatabase.python_package_version_depends_on_platform_exists(platform=platform):
+            raise NotFoundError(f"No platform {platform!r} registered")
+
+        with self._document("solver"):
+            os_name = map_os_name(solver_info["os_name"])
+            os_version = normalize_os_version(solver_info["os_name"], solver_info["os_version"])
+            python_version = solver_info["python_version"]
+            ecosystem_solver_id = self._table(EcosystemSolver).get_or_create(
+                ecosystem="python",
+                solver_name=solver_name,
+                solver_version=document["metadata"]["analyzer_version"],
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+            )
+            environment = {"os_name": os_name, "os_version": os_version, "python_version": python_version}
+            solved = self._table(Solved)
+
+            def _solved(version_id: Optional[int], **flags: Any) -> None:
+                solved.create(
+                    datetime=document["metadata"]["datetime"],
+                    document_id=solver_document_id,
+                    duration=document["metadata"].get("duration"),
+                    ecosystem_solver_id=ecosystem_solver_id,
+                    version_id=version_id,
+                    **flags,
+                )
+
+            for python_package_info in document["result"]["tree"]:
+                self._add_solver_tree_entry(python_package_info, environment)
+                version_id = self._python_package_version(
+                    python_package_info["package_name"],
+                    python_package_info["package_version_requested"],
+                    python_package_info["index_url"],
+                    **environment,
+                )
+                _solved(version_id, error=False, error_unparseable=False, error_unsolvable=False)
+
+            for error_info in document["result"]["errors"]:
+                version_id = None
+                # The default value of True is due to legacy thoth-solver output.
+                if error_info.get("is_provided_package_version", True):
+                    version_id = self._python_package_version(
+                        error_info.get("package_name") or error_info["package"],
+                        error_info.get("package_version") or error_info["version"],
+                        error_info.get("index_url") or error_info["index"],
+                        **environment,
+                    )
+
+                _solved(
+                    version_id,
+                    error=True,
+                    error_unparseable=False,
+                    error_unsolvable=False,
+                    is_provided=version_id is not None,
+                )
+
+            for unsolvable in document["result"]["unresolved"]:
+                if not unsolvable["version_spec"].startswith("==="):
+                    _LOGGER.warning(
+                        "Cannot load unsolvable package %r as package is not locked to as specific version", unsolvable
+                    )
+                    continue
+
+                version_id = self._python_package_version(
+                    unsolvable["package_name"],
+                    unsolvable["version_spec"][len("===") :],  # Ignore PycodestyleBear (E203)
+                    unsolvable.get("index_url") or unsolvable["index"],
+                    **environment,
+                )
+                _solved(version_id, error=True, error_unparseable=False, error_unsolvable=True)
+
+            for unparsed in document["result"]["unparsed"]:
+                parts = unparsed["requirement"].rsplit("===", maxsplit=1)
+                if len(parts) != 2:
+                    _LOGGER.warning(
+                        "Cannot load unparsed package %r as package is not locked to as specific version", unparsed
+                    )
+                    continue
+
+                version_id = self._python_package_version(parts[0], parts[1], None, **environment)
+                _solved(version_id, error=True, error_unparseable=True, error_unsolvable=False)
+
+    def _add_solver_tree_entry(self, python_package_info: Dict[str, Any], environment: Dict[str, Any]) -> None:
+        """Add a package version stated in the tree of a solver result together with its dependencies."""
+        package_name = python_package_info["package_name"]
+        package_version = python_package_info["package_version_requested"]
+        index_url = python_package_info["index_url"]
+        importlib_metadata = dict(python_package_info["importlib_metadata"]["metadata"])
+        package_license = python_package_info["package_license"]
+
+        version_id = self._python_package_version(package_name, package_version, index_url, **environment)
+        entity_id = self._python_package_version_entity(package_name, package_version, index_url)
+
+        metadata_id = self._table(PythonPackageMetadata).get_or_create(
+            author=importlib_metadata.pop("Author", None),
+            author_email=importlib_metadata.pop("Author-email", None),
+            download_url=importlib_metadata.pop("Download-URL", None),
+            home_page=importlib_metadata.pop("Home-page", None),
+            keywords=importlib_metadata.pop("Keywords", None),
+            license=importlib_metadata.pop("License", None),
+            maintainer=importlib_metadata.pop("Maintainer", None),
+            maintainer_email=importlib_metadata.pop("Maintainer-email", None),
+            metadata_version=importlib_metadata.pop("Metadata-Version", None),
+            name=importlib_metadata.pop("Name", None),
+            summary=importlib_metadata.pop("Summary", None),
+            version=importlib_metadata.pop("Version", None),
+            requires_python=importlib_metadata.pop("Requires-Python", None),
+            description=importlib_metadata.pop("Description", None),
+            description_content_type=importlib_metadata.pop("Description-Content-Type", None),
+        )
+        for model, association_model, association_column, row in GraphDatabase._get_multi_part_keys_metadata_rows(
+            importlib_metadata
+        ):
+            self._table(association_model).create(
+                python_package_metadata_id=metadata_id,
+                **{association_column: self._table(model).get_or_create(**row)},
+            )
+
+        license_id = self._table(PythonPackageLicense).get_or_create(
+            license_name=package_license["license"].get("full_name"),
+            license_identifier=package_license["license"].get("identifier_spdx"),
+            license_version=package_license["license_version"],
+        )
+        # The license warning is never unset once a package version was synced with a warning.
+        updates: Dict[str, Any] = {"python_package_metadata_id": metadata_id, "package_license": license_id}
+        if package_license["warning"]:
+            updates["package_license_warning"] = True
+        self._table(PythonPackageVersion).update(version_id, **updates)
+
+        for sha256 in python_package_info["sha256"]:
+            artifact_id = self._table(PythonArtifact).get_or_create(artifact_hash_sha256=sha256, artifact_name=None)
+            self._table(HasArtifact).create(python_package_version_entity_id=entity_id, python_artifact_id=artifact_id)
+
+        for import_package_name in python_package_info["packages"]:
+            import_package_id = self._table(ImportPackage).get_or_create(import_package_name=import_package_name)
+            self._table(FoundImportPackage).create(
+                python_package_version_id=version_id, import_package_id=import_package_id
+            )
+
+        depends_on = self._table(DependsOn)
+        for dependency in python_package_info["dependencies"]:
+            for index_entry in dependency["resolved_versions"]:
+                for dependency_version in index_entry["versions"]:
+                    depends_on.create(
+                        version_id=version_id,
+                        entity_id=self._python_package_version_entity(
+                            dependency["package_name"], dependency_version, None
+                        ),
+                        version_range=dependency.get("required_version") or "*",
+                        marker=dependency.get("marker"),
+                        extra=dependency["extra"][0] if dependency.get("extra") else None,
+                        marker_evaluation_result=dependency.get("marker_evaluation_result", True),
+                    )
+
+    def _runtime_environment(
+        self, runtime_environment: Dict[str, Any], environment_type: str, is_external: bool
+    ) -> Tuple[int, int, Dict[str, Any]]:
+        """Get ids of hardware information and software environment, see GraphDatabase._runtime_environment_conf2models.
+
+        Column values of the software environment are returned as well.
+        """
+        hardware = runtime_environment.get("hardware", {})
+        os = runtime_environment.get("operating_system", {})
+
+        hardware_information_type = ExternalHardwareInformation if is_external else HardwareInformation
+        software_environment_type = ExternalSoftwareEnvironment if is_external else SoftwareEnvironment
+
+        hardware_information_id = self._table(hardware_information_type).get_or_create(
+            cpu_vendor=hardware.get("cpu_vendor"),
+            cpu_model=hardware.get("cpu_model"),
+            cpu_cores=hardware.get("cpu_cores"),
+            cpu_model_name=hardware.get("cpu_model_name"),
+            cpu_family=hardware.get("cpu_family"),
+            cpu_physical_cpus=hardware.get("cpu_physical_cpus"),
+            gpu_model_name=hardware.get("gpu_model_name"),
+            gpu_vendor=hardware.get("gpu_vendor"),
+            gpu_cores=hardware.get("gpu_cores"),
+            gpu_memory_size=hardware.get("gpu_memory_size"),
+            ram_size=hardware.get("ram_size"),
+        )
+        os_name = map_os_name(os.get("name"))
+        software_environment = {
+            "environment_name": runtime_environment.get("name"),
+            "python_version": runtime_environment.get("python_version"),
+            "image_name": None,
+            "image_sha": None,
+            "os_name": os_name,
+            "os_version": normalize_os_version(os_name, os.get("version")),
+            "cuda_version": runtime_environment.get("cuda_version"),
+            "environment_type": environment_type,
+        }
+        software_environment_id = self._table(software_environment_type).get_or_create(**software_environment)
+        return hardware_information_id, software_environment_id, software_environment
+
+    def _python_software_stack(
+        self,
+        software_stack_type: Optional[str] = None,
+        requirements: Optional[Dict[str, Any]] = None,
+        requirements_lock: Optional[Dict[str, Any]] = None,
+        software_environment: Optional[Dict[str, Any]] = None,
+        *,
+        performance_score: Optional[float] = None,
+        overall_score: Optional[float] = None,
+        is_external: bool = False,
+    ) -> int:
+        """Get id of a Python software stack, see GraphDatabase._create_python_software_stack."""
+        if requirements is None:
+            raise BulkLoadError("No requirements stated for the software stack")
+
+        requirement_ids = []
+        for requirement in Pipfile.from_dict(requirements).packages.packages.values():
+            requirement_ids.append(
+                self._table(PythonPackageRequirement).get_or_create(
+                    name=GraphDatabase.normalize_python_package_name(requirement.name),
+                    version_range=requirement.version,
+                    python_package_index_id=self._python_package_index(
+                        requirement.index.url if requirement.index is not None else None
+                    ),
+                    develop=requirement.develop,
+                )
+            )
+
+        requirements_hash = GraphDatabase._create_fuzzy_hash(sorted(requirement_ids))
+        if is_external:
+            requirements_id = self._table(ExternalPythonRequirements).get_or_create(requirements_hash=requirements_hash)
+            for requirement_id in requirement_ids:
+                self._table(HasExternalPythonRequirements).create(
+                    external_python_requirements_id=requirements_id, python_package_requirement_id=requirement_id
+                )
+        else:
+            requirements_id = self._table(PythonRequirements).get_or_create(requirements_hash=requirements_hash)
+            for requirement_id in requirement_ids:
+                self._table(HasPythonRequirements).create(
+                    python_requirements_id=requirements_id, python_package_requirement_id=requirement_id
+                )
+
+        software_environment = software_environment or {}
+        environment = {
+            "os_name": software_environment.get("os_name"),
+            "os_version": software_environment.get("os_version"),
+            "python_version": software_environment.get("python_version"),
+        }
+
+        if requirements_lock is None:
+            if not is_external:
+                raise BulkLoadError("No locked requirements stated for the software stack")
+
+            lock_id = self._table(ExternalPythonRequirementsLock).get_or_create(
+                requirements_lock_hash=GraphDatabase._create_fuzzy_hash([0])
+            )
+        elif is_external:
+            entity_ids = [
+                self._python_package_version_entity(
+                    package.name, package.locked_version, package.index.url if package.index else None
+                )
+                for package in PipfileLock.from_dict(requirements_lock, pipfile=None).packages.packages.values()
+            ]
+            lock_id = self._table(ExternalPythonRequirementsLock).get_or_create(
+                requirements_lock_hash=GraphDatabase._create_fuzzy_hash(sorted(entity_ids))
+            )
+            for entity_id in entity_ids:
+                self._table(HasExternalPythonRequirementsLock).create(
+                    external_python_requirements_locked_id=lock_id, python_package_version_entity_id=entity_id
+                )
+        else:
+            version_ids = []
+            for package in PipfileLock.from_dict(requirements_lock, pipfile=None).packages.packages.values():
+                if not package.index:
+                    raise PythonIndexNotProvidedError(
+                        f"Trying to sync package {package.name!r} in version {package.locked_version!r} "
+                        "which does not have corresponding Python entity record"
+                    )
+
+                package_name = GraphDatabase.normalize_python_package_name(package.name)
+                package_version = GraphDatabase.normalize_python_package_version(package.locked_version)
+                index_id = self._table(PythonPackageIndex).get(
+                    url=GraphDatabase.normalize_python_index_url(package.index.url)
+                )
+                version_id = self._table(PythonPackageVersion).get(
+                    package_name=package_name,
+                    package_version=package_version,
+                    python_package_index_id=index_id,
+                    os_name=environment["os_name"],
+                    os_version=environment["os_version"],
+                    python_version=environment["python_version"],
+                    entity_id=self._table(PythonPackageVersionEntity).get(
+                        package_name=package_name, package_version=package_version, python_package_index_id=index_id
+                    ),
+                )
+                if version_id is None:
+                    raise SolverNotRunError(
+                        f"Trying to sync package {package.name!r} in version {package.locked_version!r} "
+                        f"not solved by solver-{environment['os_name']}-{environment['os_version']}-"
+                        f"{environment['python_version']}"
+                    )
+
+                version_ids.append(version_id)
+
+            lock_id = self._table(PythonRequirementsLock).get_or_create(
+                requirements_lock_hash=GraphDatabase._create_fuzzy_hash(sorted(version_ids))
+            )
+            for version_id in version_ids:
+                self._table(HasPythonRequirementsLock).create(
+                    python_requirements_lock_id=lock_id, python_package_version_id=version_id
+                )
+
+        if is_external:
+            return self._table(ExternalPythonSoftwareStack).get_or_create(
+                external_python_requirements_id=requirements_id, external_python_requirements_lock_id=lock_id
+            )
+
+        return self._table(PythonSoftwareStack).get_or_create(
+            performance_score=performance_score,
+            overall_score=overall_score,
+            software_stack_type=software_stack_type,
+            python_requirements_id=requirements_id,
+            python_requirements_lock_id=lock_id,
+        )
+
+    def add_adviser_result(self, document: Dict[str, Any]) -> None:
+        """Add the given adviser result, see GraphDatabase.sync_adviser_result."""
+        adviser_document_id = document["metadata"]["document_id"]
+        parameters = document["result"]["parameters"]
+        cli_arguments = document["metadata"]["arguments"]["thoth-adviser"]
+        metadata = cli_arguments.get("metadata") or {}
+        runtime_environment = dict(parameters["project"].get("runtime_environment") or {})
+        source_type = metadata.get("source_type")
+        source_type = source_type.upper() if source_type else None
+        re_run_adviser_id = metadata.get("re_run_adviser_id")
+        report = document["result"].get("report") or {}
+        unresolved_packages = report.get("_ERROR_DETAILS", {}).get("unresolved", [])
+
+        if source_type == "KEBECHET" and report.get("products"):
+            raise BulkLoadError(
+                f"Adviser result {adviser_document_id!r} updates Kebechet installations, it cannot be loaded in bulk"
+            )
+
+        with self._document("adviser"):
+            hardware_information_id, software_environment_id, software_environment = self._runtime_environment(
+                runtime_environment, environment_type=EnvironmentTypeEnum.RUNTIME.value, is_external=True
+            )
+            user_software_stack_id = self._python_software_stack(
+                requirements=parameters["project"].get("requirements"),
+                requirements_lock=parameters["project"].get("requirements_locked"),
+                software_environment=software_environment,
+                is_external=True,
+            )
+
+            adviser_runs = self._table(AdviserRun)
+            if report and re_run_adviser_id and not unresolved_packages:
+                # The adviser was re-run and there are no more unresolved packages, the initial run does not need
+                # to be re-run anymore.
+                first_adviser_run_id = adviser_runs.find(adviser_document_id=re_run_adviser_id)
+                if first_adviser_run_id is not None and adviser_runs.get_row(first_adviser_run_id)["need_re_run"]:
+                    adviser_runs.update(first_adviser_run_id, need_re_run=False)
+
+            adviser_run_id = adviser_runs.get_or_create(
+                additional_stack_info=bool(document["result"].get("stack_info")),
+                advised_configuration_changes=bool(document["result"].get("advised_configuration")),
+                adviser_document_id=adviser_document_id,
+                adviser_error=document["result"]["error"],
+                adviser_name=document["metadata"]["analyzer"],
+                adviser_version=document["metadata"]["analyzer_version"],
+                count=parameters["count"],
+                datetime=document["metadata"]["datetime"],
+                debug=cli_arguments.get("verbose", False),
+                duration=document["metadata"].get("duration"),
+                limit=parameters["limit"],
+                limit_latest_versions=parameters.get("limit_latest_versions"),
+                origin=metadata.get("origin"),
+                source_type=source_type,
+                is_s2i=metadata.get("is_s2i"),
+                recommendation_type=parameters["recommendation_type"].upper(),
+                requirements_format=parameters["requirements_format"].upper(),
+                external_hardware_information_id=hardware_information_id,
+                external_build_software_environment_id=None,
+                external_run_software_environment_id=software_environment_id,
+                user_software_stack_id=user_software_stack_id,
+                need_re_run=bool(report) and bool(unresolved_packages),
+                re_run_adviser_id=re_run_adviser_id if report else None,
+            )
+
+            for product in report.get("products", []):
+                if not product.get("project", {}).get("requirements_locked"):
+                    continue
+
+                performance_score = None
+                for entry in product.get("justification", []):
+                    if "performance_score" in entry:
+                        performance_score = entry["performance_score"]
+
+                advised_software_stack_id = self._python_software_stack(
+                    software_stack_type=SoftwareStackTypeEnum.ADVISED.value,
+                    requirements=product["project"]["requirements"],
+                    requirements_lock=product["project"]["requirements_locked"],
+                    software_environment=software_environment,
+                    performance_score=performance_score,
+                    overall_score=product["score"],
+                )
+                self._table(Advised).create(
+                    adviser_run_id=adviser_run_id, python_software_stack_id=advised_software_stack_id
+                )
+
+            for unresolved in unresolved_packages:
+                self._table(HasUnresolved).create(
+                    adviser_run_id=adviser_run_id,
+                    python_package_version_entity_id=self._python_package_version_entity(unresolved, None, None),
+                )
+
+    def add_analysis_result(self, document: Dict[str, Any]) -> None:
+        """Add the given package-extract result, see GraphDatabase.sync_analysis_result."""
+        arguments = document["metadata"]["arguments"]["thoth-package-extract"]
+        environment_type = arguments["metadata"]["environment_type"].upper()
+        environment_name = document["metadata"]["arguments"]["extract-image"]["image"]
+        os_name = map_os_name(document["result"]["operating-system"]["id"])
+        os_version = normalize_os_version(os_name, document["result"]["operating-system"]["version_id"])
+        cuda_version = document["result"].get("cuda-version", {})
+        cuda_nvcc_version = cuda_version.get("nvcc_version")
+        cuda_found_in_file_version = cuda_version.get("/usr/local/cuda/version.txt")
+        if (
+            cuda_nvcc_version is not None
+            and cuda_found_in_file_version is not None
+            and cuda_nvcc_version != cuda_found_in_file_version
+        ):
+            raise CudaVersionDoesNotMatchError(
+                f"Cuda version detected by nvcc {cuda_nvcc_version!r} is different from the one found in "
+                f"/usr/local/cuda/version.txt {cuda_found_in_file_version!r}"
+            )
+
+        is_external = arguments["metadata"].get("is_external", True)
+        image_name, image_tag = environment_name, "latest"
+        parts = environment_name.rsplit(":", maxsplit=1)
+        if len(parts) == 2:
+            image_name, image_tag = parts
+
+        python_version = None
+        if not is_external:
+            python_version = image_name.rsplit("-", maxsplit=1)[-1]  # pyXX
+            if re.match(r"^py\d\d$", python_version):
+                python_version = python_version[2:3] + "." + python_version[3:]
+            else:
+                _LOGGER.warning("No Python version information found in the the image name %r", image_name)
+                python_version = None
+
+        env_vars = GraphDatabase._package_extract_get_env_vars(document)
+
+        with self._document("package-extract"):
+            software_environment_type = ExternalSoftwareEnvironment if is_external else SoftwareEnvironment
+            software_environment_id = self._table(software_environment_type).get_or_create(
+                environment_name=environment_name,
+                python_version=python_version,
+                image_name=image_name,
+                image_sha=document["result"]["layers"][-1],
+                os_name=os_name,
+                os_version=os_version,
+                thoth_image_name=env_vars.get("THOTH_S2I_NAME"),
+                thoth_image_version=env_vars.get("THOTH_S2I_VERSION"),
+                env_image_name=env_vars.get("IMAGE_NAME"),
+                env_image_tag=env_vars.get("IMAGE_TAG"),
+                cuda_version=cuda_nvcc_version or cuda_found_in_file_version,
+                environment_type=environment_type,
+            )
+            software_environment_column = (
+                "external_software_environment_id" if is_external else "software_environment_id"
+            )
+
+            package_extract_run_id = self._table(PackageExtractRun).get_or_create(
+                analysis_document_id=document["metadata"]["document_id"],
+                datetime=document["metadata"]["datetime"],
+                package_extract_version=document["metadata"]["analyzer_version"],
+                package_extract_name=document["metadata"]["analyzer"],
+                environment_type=environment_type,
+                origin=arguments["metadata"].get("origin"),
+                debug=arguments["verbose"],
+                package_extract_error=False,
+                image_tag=image_tag,
+                duration=document["metadata"].get("duration"),
+                os_id=document["result"]["operating-system"]["id"],
+                os_name=os_name,
+                os_version_id=os_version,
+                image_size=document["result"].get("image_size"),
+                **{software_environment_column: software_environment_id},
+            )
+
+            for rpm_package_info in document["result"]["rpm-dependencies"]:
+                rpm_package_version_id = self._table(RPMPackageVersion).get_or_create(
+                    package_name=rpm_package_info["name"],
+                    package_version=rpm_package_info["version"],
+                    release=rpm_package_info.get("release"),
+                    epoch=rpm_package_info.get("epoch"),
+                    arch=rpm_package_info.get("arch"),
+                    src=rpm_package_info.get("src", False),
+                    package_identifier=rpm_package_info.get("package_identifier", rpm_package_info["name"]),
+                )
+                self._table(FoundRPM).create(
+                    package_extract_run_id=package_extract_run_id, rpm_package_version_id=rpm_package_version_id
+                )
+                for dependency in rpm_package_info["dependencies"]:
+                    self._table(RPMRequires).create(
+                        rpm_package_version_id=rpm_package_version_id,
+                        rpm_requirement_id=self._table(RPMRequirement).get_or_create(rpm_requirement_name=dependency),
+                    )
+
+            for deb_package_info in document["result"]["deb-dependencies"]:
+                deb_package_version_id = self._table(DebPackageVersion).get_or_create(
+                    package_name=deb_package_info["name"],
+                    package_version=deb_package_info["version"],
+                    epoch=deb_package_info.get("epoch"),
+                    arch=deb_package_info["arch"],
+                )
+                self._table(FoundDeb).create(
+                    deb_package_version_id=deb_package_version_id, package_extract_run_id=package_extract_run_id
+                )
+
+                # Replaces are not stored by the sync either.
+                for pre_depends in deb_package_info.get("pre-depends") or []:
+                    self._table(DebPreDepends).create(
+                        deb_package_version_id=deb_package_version_id,
+                        deb_dependency_id=self._table(DebDependency).get_or_create(package_name=pre_depends["name"]),
+                        version_range=pre_depends.get("version"),
+                    )
+
+                for depends in deb_package_info.get("depends") or []:
+                    self._table(DebDepends).get_or_create(
+                        deb_package_version_id=deb_package_version_id,
+                        deb_dependency_id=self._table(DebDependency).get_or_create(package_name=depends["name"]),
+                        version_range=depends.get("version"),
+                    )
+
+            for python_package_info in document["result"].get("python-packages") or []:
+                self._table(Identified).create(
+                    package_extract_run_id=package_extract_run_id,
+                    python_package_version_entity_id=self._python_package_version_entity(
+                        python_package_info["package_name"], python_package_info["package_version"], None
+                    ),
+                    location=python_package_info["location"],
+                )
+
+            for py_file in document["result"]["python-files"]:
+                self._table(FoundPythonFile).create(
+                    package_extract_run_id=package_extract_run_id,
+                    python_file_digest_id=self._table(PythonFileDigest).get_or_create(sha256=py_file["sha256"]),
+                    file=py_file["filepath"],
+                )
+
+            for library, symbols in document["result"]["system-symbols"].items():
+                for symbol in symbols:
+                    versioned_symbol_id = self._table(VersionedSymbol).get_or_create(
+                        library_name=library, symbol=symbol
+                    )
+                    self._table(HasSymbol).create(
+                        versioned_symbol_id=versioned_symbol_id,
+                        **{software_environment_column: software_environment_id},
+                    )
+                    self._table(DetectedSymbol).create(
+                        package_extract_run_id=package_extract_run_id, versioned_symbol_id=versioned_symbol_id
+                    )
+
+            for py_interpreter in document["result"].get("python-interpreters"):
+                python_interpreter_id = self._table(PythonInterpreter).get_or_create(
+                    path=py_interpreter.get("path"),
+                    link=py_interpreter.get("link"),
+                    version=py_interpreter.get("version"),
+                )
+                self._table(FoundPythonInterpreter).create(
+                    python_interpreter_id=python_interpreter_id, package_extract_run_id=package_extract_run_id
+                )
+
+    def add_inspection_result(self, document: Dict[str, Any]) -> None:
+        """Add the given inspection result, see GraphDatabase.sync_inspection_result."""
+        inspection_specification = document["specification"]
+
+        if inspection_specification.get("script"):
+            raise BulkLoadError(
+                f"Inspection {document['document_id']!r} states a performance indicator, it cannot be loaded in bulk"
+            )
+
+        with self._document("inspection"):
+            build_requests = inspection_specification["build"]["requests"]
+            run_requests = inspection_specification["run"]["requests"]
+            runtime_environment = dict(document["result"]["runtime_environment"])
+
+            (
+                run_hardware_information_id,
+                run_software_environment_id,
+                run_software_environment,
+            ) = self._runtime_environment(
+                runtime_environment, environment_type=EnvironmentTypeEnum.RUNTIME.value, is_external=False
+            )
+            runtime_environment["hardware"] = build_requests["hardware"]
+            build_hardware_information_id, build_software_environment_id, _ = self._runtime_environment(
+                runtime_environment, environment_type=EnvironmentTypeEnum.BUILDTIME.value, is_external=False
+            )
+
+            software_stack_id = None
+            if "python" in inspection_specification:
+                software_stack_id = self._python_software_stack(
+                    software_stack_type=SoftwareStackTypeEnum.INSPECTION.value,
+                    requirements=inspection_specification["python"].get("requirements"),
+                    requirements_lock=inspection_specification["python"].get("requirements_locked"),
+                    software_environment=run_software_environment,
+                )
+
+            self._table(InspectionRun).get_or_create(
+                inspection_sync_state=InspectionSyncStateEnum.SYNCED.value,
+                inspection_document_id=document["document_id"],
+                inspection_result_number=document["result_number"],
+                datetime=inspection_specification.get("@created"),
+                amun_version=None,
+                # Memory is stored in GiB.
+                build_requests_cpu=OpenShift.parse_cpu_spec(build_requests["cpu"]),
+                build_requests_memory=OpenShift.parse_memory_spec(build_requests["memory"]) / (1024**3),
+                run_requests_cpu=OpenShift.parse_cpu_spec(run_requests["cpu"]),
+                run_requests_memory=OpenShift.parse_memory_spec(run_requests["memory"]) / (1024**3),
+                build_software_environment_id=build_software_environment_id,
+                build_hardware_information_id=build_hardware_information_id,
+                run_software_environment_id=run_software_environment_id,
+                run_hardware_information_id=run_hardware_information_id,
+                inspection_software_stack_id=software_stack_id,
+            )
+
+    def add_document(self, document: Dict[str, Any]) -> None:
+        """Add the given document, its type is derived from its document id."""
+        document_id = document["document_id"] if "specification" in document else document["metadata"]["document_id"]
+        if document_id.startswith("solver-"):
+            self.add_solver_result(document)
+        elif document_id.startswith("adviser-"):
+            self.add_adviser_result(document)
+        elif document_id.startswith("package-extract-"):
+            self.add_analysis_result(document)
+        elif document_id.startswith("inspection-"):
+            self.add_inspection_result(document)
+        else:
+            raise BulkLoadError(f"No bulk load handler defined for document {document_id!r}")
+
+    def add_rules(self, rules: Iterable[Tuple[int, str, Optional[str]]]) -> None:
+        """Assign the given rules (id, package name, version range) to Python package version entities collected.
+
+        See GraphDatabase._refresh_rules_python_entity, rules are matched by package name regardless of index.
+        """
+        rules_by_package_name: Dict[str, List[Tuple[int, Optional[str]]]] = {}
+        for rule_id, package_name, version_range in rules:
+            rules_by_package_name.setdefault(package_name, []).append((rule_id, version_range))
+
+        if not rules_by_package_name:
+            return
+
+        with self._document(None):
+            associations = self._table(PythonPackageVersionEntityRulesAssociation)
+            for entity, entity_id in self._table(PythonPackageVersionEntity).iter_entities():
+                package_rules = rules_by_package_name.get(entity["package_name"])
+                if not package_rules:
+                    continue
+
+                # Entities of unresolved packages have no version, only rules applying to any version match them.
+                version = parse_version(entity["package_version"]) if entity["package_version"] is not None else None
+                for rule_id, version_range in package_rules:
+                    if version_range:
+                        specifier = SpecifierSet(version_range)
+                        specifier.prereleases = True
+                        if version is None or version not in specifier:
+                            continue
+
+                    associations.create(
+                        python_package_version_entity_id=entity_id, python_package_version_entity_rule_id=rule_id
+                    )
+
+    @staticmethod
+    def _check_empty(cursor: Any, table_names: Iterable[str]) -> None:
+        """Check the given tables are empty."""
+        for table_name in table_names:
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM "{table_name}")')
+            if cursor.fetchone()[0]:
+                raise BulkLoadError(f"Cannot load rows into table {table_name!r} as it is not empty")
+
+    def prepare(self, graph: GraphDatabase) -> None:
+        """Check no documents were synced into the database yet and register Python package indexes present.
+
+        Call before any document is added, so that a load into a non-empty database fails early.
+        """
+        if not graph.is_connected():
+            raise NotConnectedError("Cannot prepare the bulk load: the adapter is not connected yet")
+
+        connection = graph._engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            self._check_empty(cursor, _SYNCED_TABLES)
+            cursor.execute("SELECT id, url FROM python_package_index")
+            self._table(PythonPackageIndex).preload(cursor.fetchall(), ("url",))
+        finally:
+            connection.close()
+
+    def load(self, graph: GraphDatabase) -> Dict[str, int]:
+        """Copy rows collected into the database, all the tables loaded have to be empty unless preloaded.
+
+        Rows are copied into staging tables and merged into the real tables in a single transaction. Number
+        of rows loaded per table is returned.
+        """
+        if not graph.is_connected():
+            raise NotConnectedError("Cannot load documents: the adapter is not connected yet")
+
+        connection = graph._engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT id, package_name, version_range FROM python_package_version_entity_rule")
+            self.add_rules(cursor.fetchall())
+
+            tables = [
+                self._tables[table.name]
+                for table in Base.metadata.sorted_tables
+                if table.name in self._tables and self._tables[table.name].row_count
+            ]
+            self._check_empty(cursor, (table.name for table in tables if not table.preloaded))
+
+            for table in tables:
+                _LOGGER.info("Copying %d rows into staging table of table %r", table.row_count, table.name)
+                cursor.execute(f'CREATE TEMPORARY TABLE "staging_{table.name}" (LIKE "{table.name}") ON COMMIT DROP')
+                table.copy(cursor, f"staging_{table.name}")
+
+            indexes: List[Tuple[str, str]] = []
+            for table in tables:
+                cursor.execute(_SECONDARY_INDEXES_QUERY, (f'"{table.name}"',))
+                indexes.extend(cursor.fetchall())
+
+            for index_name, _ in indexes:
+                cursor.execute(f'DROP INDEX "{index_name}"')
+
+            for table in tables:
+                _LOGGER.info("Merging %d rows into table %r", table.row_count, table.name)
+                columns = ", ".join(f'"{column}"' for column in table.columns)
+                cursor.execute(f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "staging_{table.name}"')
+                if "id" in table.columns:
+                    cursor.execute(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), MAX(id)) FROM \"{table.name}\""
+                    )
+
+            for index_name, index_definition in indexes:
+                _LOGGER.info("Rebuilding index %r", index_name)
+                cursor.execute(index_definition)
+
+            connection.commit()
+
+            # Statistics are stale after a load, keep query plans sane.
+            for table in tables:
+                cursor.execute(f'ANALYZE "{table.name}"')
+            connection.commit()
+        finally:
+            connection.close()
+
+        return {table.name: table.row_count for table in tables}
+
+    def close(self) -> None:
+        """Discard all the rows collected."""
+        for table in self._tables.values():
+            table.close()
+
+        self._tables.clear()
+        self.documents.clear()
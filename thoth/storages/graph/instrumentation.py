@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Instrumentation of graph database adapter method calls and SQL statements they issue.
+
+Statements are attributed to method calls in progress in the thread issuing them (including calls of methods
+called from other instrumented methods), metrics are exported in a shape of Prometheus metric families.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bounds of histogram buckets of call latency in seconds and of number of statements issued per call.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STATEMENTS_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500, 1000)
+# Number of statements kept per call to be logged if the call is slow.
+_SLOW_CALL_STATEMENTS = 20
+# Maximum length of a bind parameters representation logged.
+_SLOW_CALL_PARAMETERS_LENGTH = 512
+_METRIC_PREFIX = "thoth_storages_graph"
+
+
+class _Call:
+    """A method call in progress, statements issued are accumulated until the call finishes."""
+
+    __slots__ = ("method", "duration", "statements", "rows", "recorded_statements")
+
+    def __init__(self, method: str) -> None:
+        """Initialize a record of a method call."""
+        self.method = method
+        self.duration = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.recorded_statements: List[Tuple[float, str, Any]] = []
+
+
+class _Histogram:
+    """A histogram with fixed bucket upper bounds, buckets are not cumulative."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        """Initialize an empty histogram."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Observe the given value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def samples(self, name: str, labels: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Get samples of the histogram as exported to Prometheus, buckets are cumulative."""
+        result = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else str(bound)
+            result.append({"name": f"{name}_bucket", "labels": {**labels, "le": le}, "value": cumulative})
+
+        result.append({"name": f"{name}_sum", "labels": labels, "value": self.sum})
+        result.append({"name": f"{name}_count", "labels": labels, "value": cumulative})
+        return result
+
+
+class _MethodMetrics:
+    """Metrics aggregated for a method."""
+
+    __slots__ = ("calls", "errors", "slow_calls", "rows", "duration", "statements")
+
+    def __init__(self) -> None:
+        """Initialize metrics of a method not called yet."""
+        self.calls = 0
+        self.errors = 0
+        self.slow_calls = 0
+        self.rows = 0
+        self.duration = _Histogram(DURATION_BUCKETS)
+        self.statements = _Histogram(STATEMENTS_BUCKETS)
+
+
+class QueryInstrumentation:
+    """Record calls of adapter methods and SQL statements issued by them."""
+
+    def __init__(self, slow_call_threshold: float = 0.0) -> None:
+        """Initialize instrumentation, calls taking longer than the given threshold (if non-zero) are logged."""
+        self.slow_call_threshold = slow_call_threshold
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _MethodMetrics] = defaultdict(_MethodMetrics)
+
+    def _get_stack(self) -> List[_Call]:
+        """Get calls in progress in the current thread, the innermost call is the last one."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        return stack
+
+    def register(self, engine: Engine) -> None:
+        """Register listeners attributing statements issued on the given engine to calls in progress."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    @staticmethod
+    def _before_cursor_execute(connection, cursor, statement, parameters, context, executemany) -> None:
+        """Record start of a statement execution."""
+        if context is not None:
+            context.thoth_statement_start = time.monotonic()
+
+    def _after_cursor_execute(self, connection, cursor, statement, parameters, context, executemany) -> None:
+        """Attribute the statement executed to all the calls in progress."""
+        start = getattr(context, "thoth_statement_start", None)
+        duration = time.monotonic() - start if start is not None else 0.0
+        rows = max(cursor.rowcount, 0)
+        for call in self._get_stack():
+            call.statements += 1
+            call.rows += rows
+            if self.slow_call_threshold and len(call.recorded_statements) < _SLOW_CALL_STATEMENTS:
+                # Statements executed as prepared statements are rewritten by listeners, record the original one.
+                recorded_statement = context.statement if context is not None else statement
+                call.recorded_statements.append((duration, recorded_statement, parameters))
+
+    @contextmanager
+    def _activate(self, call: _Call) -> Iterator[None]:
+        """Attribute statements issued in the current thread to the given call, measure time spent."""
+        stack = self._get_stack()
+        stack.append(call)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            call.duration += time.monotonic() - start
+            stack.pop()
+
+    def _finish(self, call: _Call, error: bool) -> None:
+        """Record a finished call."""
+        slow = bool(self.slow_call_threshold) and call.duration >= self.slow_call_threshold
+        with self._lock:
+            metrics = self._metrics[call.method]
+            metrics.calls += 1
+            metrics.errors += int(error)
+            metrics.slow_calls += int(slow)
+            metrics.rows += call.rows
+            metrics.duration.observe(call.duration)
+            metrics.statements.observe(call.statements)
+
+        # Slow nested calls are reported as part of the outermost call.
+        if slow and not self._get_stack():
+            _LOGGER.warning(
+                "Slow call of %s took %.3fs, issued %d statements returning %d rows:\n%s",
+                call.method,
+                call.duration,
+                call.statements,
+                call.rows,
+                "\n".join(
+                    f"[{duration:.3f}s] {statement} -- parameters: {repr(parameters)[:_SLOW_CALL_PARAMETERS_LENGTH]}"
+                    for duration, statement, parameters in call.recorded_statements
+                ),
+            )
+
+    def call(self, method: str, func: Any, *args: Any, **kwargs: Any) -> Any:
+        """Call the given function, record it as a call of the given method."""
+        call = _Call(method)
+        error = True
+        try:
+            with self._activate(call):
+                result = func(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            self._finish(call, error)
+
+    def iterate(self, method: str, iterator: Iterator[Any]) -> Iterator[Any]:
+        """Iterate over results of a generator method, time spent in the generator is recorded as one call."""
+        call = _Call(method)
+        error = True
+        try:
+            while True:
+                with self._activate(call):
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+
+                yield item
+
+            error = False
+        except GeneratorExit:
+            # Iteration stopped by the consumer.
+            error = False
+            raise
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                with self._activate(call):
+                    close()
+
+            self._finish(call, error)
+
+    def export(self) -> Dict[str, Dict[str, Any]]:
+        """Export metrics as Prometheus metric families keyed by their names."""
+        families: Dict[str, Dict[str, Any]] = {}
+
+        def family(name: str, metric_type: str, help_: str) -> List[Dict[str, Any]]:
+            samples: List[Dict[str, Any]] = []
+            families[f"{_METRIC_PREFIX}_{name}"] = {"type": metric_type, "help": help_, "samples": samples}
+            return samples
+
+        calls = family("calls_total", "counter", "Number of adapter method calls.")
+        errors = family("call_errors_total", "counter", "Number of adapter method calls which raised an exception.")
+        slow_calls = family("slow_calls_total", "counter", "Number of adapter method calls over the slow threshold.")
+        rows = family("call_rows_total", "counter", "Number of rows returned or affected by statements issued.")
+        duration = family("call_duration_seconds", "histogram", "Latency of adapter method calls.")
+        statements = family("call_statements", "histogram", "Number of SQL statements issued per method call.")
+
+        with self._lock:
+            for method in sorted(self._metrics):
+                metrics = self._metrics[method]
+                labels = {"method": method}
+                calls.append({"name": f"{_METRIC_PREFIX}_calls_total", "labels": labels, "value": metrics.calls})
+                errors.append(
+                    {"name": f"{_METRIC_PREFIX}_call_errors_total", "labels": labels, "value": metrics.errors}
+                )
+                slow_calls.append(
+                    {"name": f"{_METRIC_PREFIX}_slow_calls_total", "labels": labels, "value": metrics.slow_calls}
+                )
+                rows.append({"name": f"{_METRIC_PREFIX}_call_rows_total", "labels": labels, "value": metrics.rows})
+                duration.extend(metrics.duration.samples(f"{_METRIC_PREFIX}_call_duration_seconds", labels))
+                statements.extend(metrics.statements.samples(f"{_METRIC_PREFIX}_call_statements", labels))
+
+        return families
+
+    def reset(self) -> None:
+        """Drop all the metrics recorded."""
+        with self._lock:
+            self._metrics.clear()
+
+
+def render_prometheus(families: Dict[str, Dict[str, Any]], extra_labels: Optional[Dict[str, str]] = None) -> str:
+    """Render the given metric families in the Prometheus text exposition format."""
+    lines = []
+    for name, family in families.items():
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for sample in family["samples"]:
+            labels = {**(extra_labels or {}), **sample["labels"]}
+            rendered_labels = ",".join(
+                '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                for key, value in labels.items()
+            )
+            lines.append(f"{sample['name']}{{{rendered_labels}}} {sample['value']}")
+
+    return "\n".join(lines) + "\n"
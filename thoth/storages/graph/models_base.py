@@ -19,13 +19,30 @@
 
 import logging
 import datetime
+import os
+import threading
 from itertools import combinations
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
 from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
 
+from sqlalchemy import event
+from sqlalchemy import inspect
 from sqlalchemy import Index
+from sqlalchemy import text
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import class_mapper
 from sqlalchemy.orm import ColumnProperty
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.state import InstanceState
+from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.exc import IntegrityError
 
 
@@ -34,23 +51,112 @@ Base = declarative_base()
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of rows queried or inserted in a single statement when working with entities in bulk.
+_BULK_CHUNK_SIZE = 1000
+# Remember entities retrieved or created by get_or_create within a session.
+_GET_OR_CREATE_CACHE = bool(int(os.getenv("THOTH_STORAGE_GET_OR_CREATE_CACHE", 1)))
+# Maximum number of entities remembered within a session, the cache is dropped once it is full.
+_GET_OR_CREATE_CACHE_SIZE = int(os.getenv("THOTH_STORAGE_GET_OR_CREATE_CACHE_SIZE", 65536))
+# Key under which the get_or_create cache is kept in session info.
+_GET_OR_CREATE_CACHE_INFO_KEY = "thoth_get_or_create_cache"
+_GET_OR_CREATE_CACHE_STATS = {"hits": 0, "misses": 0}
+_GET_OR_CREATE_CACHE_STATS_LOCK = threading.Lock()
+
+
+class _NotCacheable(Exception):
+    """Raised if the given value cannot be used in a cache key."""
+
+
+def _normalize_cache_value(value: Any) -> Hashable:
+    """Normalize the given value so that it can be used in a cache key."""
+    if isinstance(value, dict):
+        return dict, tuple(sorted((key, _normalize_cache_value(item)) for key, item in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_normalize_cache_value(item) for item in value)
+
+    state = inspect(value, raiseerr=False)
+    if isinstance(state, InstanceState):
+        # Related instances are compared based on their identity, the ones not flushed yet are not cached.
+        if state.identity is None:
+            raise _NotCacheable
+        return type(value), state.identity
+
+    try:
+        hash(value)
+    except TypeError as exc:
+        raise _NotCacheable from exc
+
+    # Keep type to distinguish for example True and 1.
+    return type(value), value
+
+
+def _get_or_create_cache_key(cls: type, kwargs: Dict[str, Any]) -> Optional[Hashable]:
+    """Get a key to the get_or_create cache, None if the given query cannot be cached.
+
+    Only entities with a surrogate id are cached. Association tables are keyed by foreign keys
+    which are not necessarily unique in the database so keeping their instances alive in the
+    session could make creation of new instances conflict in the identity map.
+    """
+    if [column.name for column in cls.__table__.primary_key.columns] != ["id"]:  # type: ignore
+        return None
+
+    try:
+        return cls, tuple((name, _normalize_cache_value(kwargs[name])) for name in sorted(kwargs))
+    except _NotCacheable:
+        return None
+
+
+def _record_get_or_create_cache_stats(hit: bool) -> None:
+    """Record a cache hit or a cache miss."""
+    with _GET_OR_CREATE_CACHE_STATS_LOCK:
+        _GET_OR_CREATE_CACHE_STATS["hits" if hit else "misses"] += 1
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _get_or_create_cache_rollback(session: Session, previous_transaction: Any) -> None:
+    """Drop the get_or_create cache on rollback, including rollback of nested transactions."""
+    session.info.pop(_GET_OR_CREATE_CACHE_INFO_KEY, None)
+
+
+@event.listens_for(Session, "after_bulk_delete")
+def _get_or_create_cache_bulk_delete(delete_context: Any) -> None:
+    """Drop the get_or_create cache if entities are deleted in bulk."""
+    delete_context.session.info.pop(_GET_OR_CREATE_CACHE_INFO_KEY, None)
+
+
+@event.listens_for(Session, "persistent_to_deleted")
+def _get_or_create_cache_delete(session: Session, instance: Any) -> None:
+    """Drop the get_or_create cache if an entity is deleted."""
+    session.info.pop(_GET_OR_CREATE_CACHE_INFO_KEY, None)
+
 
 class BaseExtension:
     """Extend base class with additional functionality."""
 
     @classmethod
     def get_or_create(cls, session, **kwargs):
-        """Query for the given entity, create if it does not exist yet."""
+        """Query for the given entity, create if it does not exist yet.
+
+        Entities retrieved or created are remembered in the session so that repeated calls with
+        the same arguments do not query the database. The cache is dropped on any rollback.
+        """
+        cache_key = _get_or_create_cache_key(cls, kwargs) if _GET_OR_CREATE_CACHE else None
+        if cache_key is not None:
+            instance = session.info.get(_GET_OR_CREATE_CACHE_INFO_KEY, {}).get(cache_key)
+            _record_get_or_create_cache_stats(hit=instance is not None)
+            if instance is not None:
+                return instance, True
+
         instance = session.query(cls).filter_by(**kwargs).first()
-        if instance:
-            return instance, True
-        else:
+        existed = True
+        if not instance:
             try:
                 session.begin_nested()
                 instance = cls(**kwargs)
                 session.add(instance)
                 session.commit()
-                return instance, False
+                existed = False
             except IntegrityError as exc:
                 session.rollback()
                 _LOGGER.warning(
@@ -59,7 +165,174 @@ class BaseExtension:
                     kwargs,
                     str(exc),
                 )
-                return session.query(cls).filter_by(**kwargs).one(), True
+                instance = session.query(cls).filter_by(**kwargs).one()
+
+        if cache_key is not None:
+            cache = session.info.setdefault(_GET_OR_CREATE_CACHE_INFO_KEY, {})
+            if len(cache) >= _GET_OR_CREATE_CACHE_SIZE:
+                cache.clear()
+            cache[cache_key] = instance
+
+        return instance, existed
+
+    @staticmethod
+    def get_or_create_cache_info() -> Dict[str, int]:
+        """Get statistics of the get_or_create cache aggregated across sessions."""
+        with _GET_OR_CREATE_CACHE_STATS_LOCK:
+            return dict(_GET_OR_CREATE_CACHE_STATS)
+
+    @classmethod
+    def _bulk_query_ids(
+        cls, session, columns: Tuple[str, ...], keys: Set[Tuple[Any, ...]]
+    ) -> Dict[Tuple[Any, ...], int]:
+        """Query ids of entities with the given column values, NULL values are matched using IS NULL."""
+        by_null_columns: Dict[Tuple[bool, ...], List[Tuple[Any, ...]]] = {}
+        for key in keys:
+            by_null_columns.setdefault(tuple(value is None for value in key), []).append(key)
+
+        result = {}
+        for null_columns, null_keys in by_null_columns.items():
+            value_columns = [getattr(cls, column) for column, is_null in zip(columns, null_columns) if not is_null]
+            null_filter = [getattr(cls, column).is_(None) for column, is_null in zip(columns, null_columns) if is_null]
+
+            for i in range(0, len(null_keys), _BULK_CHUNK_SIZE):
+                chunk = null_keys[i : i + _BULK_CHUNK_SIZE]  # Ignore PycodestyleBear (E203)
+                query = session.query(cls.id, *(getattr(cls, column) for column in columns)).filter(*null_filter)
+                if value_columns:
+                    values = [tuple(value for value in key if value is not None) for key in chunk]
+                    query = query.filter(tuple_(*value_columns).in_(values))
+
+                for row in query.all():
+                    result.setdefault(tuple(row[1:]), row[0])
+
+        return result
+
+    @classmethod
+    def bulk_get_or_create(cls, session, rows: List[Dict[str, Any]]) -> List[int]:
+        """Query for the given entities in bulk, create the ones that do not exist yet.
+
+        All the rows have to state the same columns. Ids of entities are returned in the order of rows.
+        """
+        if not rows:
+            return []
+
+        columns = tuple(rows[0])
+        keys = [tuple(row[column] for column in columns) for row in rows]
+        ids = cls._bulk_query_ids(session, columns, set(keys))
+
+        missing = [dict(zip(columns, key)) for key in dict.fromkeys(keys) if key not in ids]
+        for i in range(0, len(missing), _BULK_CHUNK_SIZE):
+            insert_stmt = (
+                insert(cls.__table__)
+                .values(missing[i : i + _BULK_CHUNK_SIZE])  # Ignore PycodestyleBear (E203)
+                .on_conflict_do_nothing()
+                .returning(cls.__table__.c.id, *(cls.__table__.c[column] for column in columns))
+            )
+            for row in session.execute(insert_stmt):
+                ids[tuple(row[1:])] = row[0]
+
+        # Rows not inserted due to a conflict, this can be due to concurrent writes to database.
+        conflicting = {key for key in keys if key not in ids}
+        if conflicting:
+            _LOGGER.warning(
+                "Conflicts when creating %d records of %s in bulk; this can be due to concurrent writes to "
+                "database, recovering",
+                len(conflicting),
+                cls.__name__,
+            )
+            ids.update(cls._bulk_query_ids(session, columns, conflicting))
+
+        try:
+            return [ids[key] for key in keys]
+        except KeyError as exc:
+            raise NoResultFound(f"No {cls.__name__} record found for {dict(zip(columns, exc.args[0]))!r}") from exc
+
+    @classmethod
+    def _bulk_values(cls, session, columns: Tuple[str, ...], rows: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        """Construct a VALUES list with the given rows, values are cast to types of the corresponding columns."""
+        dialect = session.bind.dialect
+        column_types = [cls.__table__.c[column].type.compile(dialect=dialect) for column in columns]
+
+        params = {}
+        values = []
+        for i, row in enumerate(rows):
+            placeholders = []
+            for j, (column, column_type) in enumerate(zip(columns, column_types)):
+                params[f"v{i}_{j}"] = row[column]
+                placeholders.append(f"CAST(:v{i}_{j} AS {column_type})")
+            values.append(f"({', '.join(placeholders)})")
+
+        return f"VALUES {', '.join(values)}", params
+
+    @classmethod
+    def bulk_create(cls, session, rows: Iterable[Dict[str, Any]]) -> None:
+        """Create the given entities in bulk, entities already present are not created again.
+
+        All the rows have to state the same columns, columns not stated get server-side defaults. As
+        association tables do not need to have any unique constraint, rows are inserted only if no
+        matching row is present (NULL values are matched using IS NULL).
+        """
+        rows = list({tuple(row.items()): row for row in rows}.values())
+        if not rows:
+            return
+
+        preparer = session.bind.dialect.identifier_preparer
+        table_name = preparer.format_table(cls.__table__)
+        columns = tuple(rows[0])
+        quoted_columns = ", ".join(preparer.quote(column) for column in columns)
+
+        by_null_columns: Dict[Tuple[bool, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_null_columns.setdefault(tuple(row[column] is None for column in columns), []).append(row)
+
+        for null_columns, null_rows in by_null_columns.items():
+            match = " AND ".join(
+                f"t.{preparer.quote(column)} IS NULL"
+                if is_null
+                else f"t.{preparer.quote(column)} = v.{preparer.quote(column)}"
+                for column, is_null in zip(columns, null_columns)
+            )
+
+            for i in range(0, len(null_rows), _BULK_CHUNK_SIZE):
+                values, params = cls._bulk_values(
+                    session, columns, null_rows[i : i + _BULK_CHUNK_SIZE]  # Ignore PycodestyleBear (E203)
+                )
+                session.execute(
+                    text(
+                        f"INSERT INTO {table_name} ({quoted_columns}) SELECT * FROM ({values}) AS v ({quoted_columns}) "
+                        f"WHERE NOT EXISTS (SELECT 1 FROM {table_name} AS t WHERE {match}) ON CONFLICT DO NOTHING"
+                    ),
+                    params,
+                )
+
+    @classmethod
+    def bulk_update(cls, session, rows: List[Dict[str, Any]]) -> None:
+        """Update the given entities in bulk, rows state id of the entity and columns to be updated.
+
+        All the rows have to state the same columns.
+        """
+        if not rows:
+            return
+
+        preparer = session.bind.dialect.identifier_preparer
+        table_name = preparer.format_table(cls.__table__)
+        columns = tuple(rows[0])
+        quoted_columns = ", ".join(preparer.quote(column) for column in columns)
+        assignments = ", ".join(
+            f"{preparer.quote(column)} = v.{preparer.quote(column)}" for column in columns if column != "id"
+        )
+
+        for i in range(0, len(rows), _BULK_CHUNK_SIZE):
+            values, params = cls._bulk_values(
+                session, columns, rows[i : i + _BULK_CHUNK_SIZE]  # Ignore PycodestyleBear (E203)
+            )
+            session.execute(
+                text(
+                    f"UPDATE {table_name} AS t SET {assignments} FROM ({values}) AS v ({quoted_columns}) "
+                    "WHERE t.id = v.id"
+                ),
+                params,
+            )
 
     @classmethod
     def attribute_names(cls):
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Connection pools keeping statistics about connection checkouts."""
+
+import threading
+import time
+from typing import Any
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import QueuePool
+
+
+class _CheckoutStatsMixin:
+    """Track number of checkouts, checkouts which had to wait for a connection and time spent on checkouts."""
+
+    def _init_checkout_stats(self) -> None:
+        """Initialize statistics of checkouts."""
+        self._checkout_stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._checkout_waits = 0
+        self._checkout_timeouts = 0
+        self._checkout_time = 0.0
+        self._checkout_time_max = 0.0
+
+    def _is_exhausted(self) -> bool:
+        """Check if all the connections are checked out, a checkout has to wait for a connection to be returned."""
+        return False
+
+    def _do_get(self):
+        """Check out a connection, time spent on obtaining the connection is recorded."""
+        waits = self._is_exhausted()
+        start = time.monotonic()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            with self._checkout_stats_lock:
+                self._checkout_timeouts += 1
+                self._checkout_waits += 1
+            raise
+
+        duration = time.monotonic() - start
+        with self._checkout_stats_lock:
+            self._checkouts += 1
+            self._checkout_waits += int(waits)
+            self._checkout_time += duration
+            self._checkout_time_max = max(self._checkout_time_max, duration)
+
+        return connection
+
+    def checkout_stats(self) -> Dict[str, Any]:
+        """Get statistics of connection checkouts, times are in seconds."""
+        with self._checkout_stats_lock:
+            return {
+                "checkouts": self._checkouts,
+                "waits": self._checkout_waits,
+                "timeouts": self._checkout_timeouts,
+                "checkout_time_total": self._checkout_time,
+                "checkout_time_max": self._checkout_time_max,
+                "checkout_time_avg": self._checkout_time / self._checkouts if self._checkouts else 0.0,
+            }
+
+
+class InstrumentedQueuePool(_CheckoutStatsMixin, QueuePool):
+    """A queue pool keeping statistics about connection checkouts."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the pool and its statistics."""
+        super().__init__(*args, **kwargs)
+        self._init_checkout_stats()
+
+    def _is_exhausted(self) -> bool:
+        """Check if all the connections are checked out, a checkout has to wait for a connection to be returned."""
+        return self.checkedin() == 0 and -1 < self._max_overflow <= self.overflow()
+
+    def checkout_stats(self) -> Dict[str, Any]:
+        """Get statistics of connection checkouts and the current state of the pool."""
+        return {
+            **super().checkout_stats(),
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+        }
+
+
+class InstrumentedNullPool(_CheckoutStatsMixin, NullPool):
+    """A pool opening a new connection on each checkout, used if connections are pooled by an external pooler."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the pool and its statistics."""
+        super().__init__(*args, **kwargs)
+        self._init_checkout_stats()
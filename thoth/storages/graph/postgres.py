@@ -17,12 +17,16 @@
 
 """An SQL database for storing Thoth data."""
 
+import base64
 import functools
+import hashlib
+import inspect
 import re
 import logging
 import json
 import os
 import itertools
+import threading
 import weakref
 import ssdeep
 
@@ -35,7 +39,13 @@ from typing import FrozenSet
 from typing import Dict
 from typing import Union
 from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Callable
 from collections import deque
+from collections import namedtuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime
 
@@ -45,15 +55,21 @@ from packaging.version import parse as parse_version
 from sqlalchemy import and_
 from sqlalchemy import create_engine
 from sqlalchemy import desc
+from sqlalchemy import event
 from sqlalchemy import exists
 from sqlalchemy import func
 from sqlalchemy import or_
+from sqlalchemy import literal
+from sqlalchemy import text
 from sqlalchemy import tuple_
+from sqlalchemy import Text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Query
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.expression import TextClause
 from sqlalchemy_utils import database_exists, create_database
 
 from thoth.python import PackageVersion
@@ -67,6 +83,10 @@ from thoth.common import map_os_name
 from thoth.common.enums import ThothAdviserIntegrationEnum
 
 from .models_base import BaseExtension
+from .instrumentation import QueryInstrumentation
+from .pool import InstrumentedNullPool
+from .pool import InstrumentedQueuePool
+from .query_cache import get_query_cache
 from .models import AdviserRun
 from .models import ALL_MAIN_MODELS
 from .models import CVE
@@ -166,6 +186,7 @@ from ..dependency_monkey_reports import DependencyMonkeyReportsStore
 from ..provenance import ProvenanceResultsStore
 from ..solvers import SolverResultsStore
 from ..advisers import AdvisersResultsStore
+from ..exceptions import DeleteError
 from ..exceptions import NotFoundError
 from ..exceptions import PythonIndexNotRegisteredError
 from ..exceptions import PerformanceIndicatorNotRegisteredError
@@ -202,43 +223,377 @@ _GET_PYTHON_PYTHON_PACKAGE_VERSION_SOLVER_RULES_CACHE_SIZE = int(
 )
 _GET_RPM_PACKAGE_VERSION_CACHE_SIZE = int(os.getenv("THOTH_GET_RPM_PACKAGE_VERSION_CACHE_SIZE", 1))
 _GET_PYTHON_PACKAGE_VERSION_CACHE_SIZE = int(os.getenv("THOTH_GET_PYTHON_PACKAGE_VERSION_CACHE_SIZE", 1))
-
+# Number of document ids checked for existence in a single query.
+_DOCUMENT_ID_QUERY_CHUNK_SIZE = int(os.getenv("THOTH_STORAGE_DOCUMENT_ID_QUERY_CHUNK_SIZE", 1000))
+# Sync solver results using multi-row statements per table instead of creating records one by one.
+_SOLVER_SYNC_BULK = bool(int(os.getenv("THOTH_STORAGE_SOLVER_SYNC_BULK", 0)))
+# Retrieve transitive dependencies using a single recursive query instead of traversing the graph query by query.
+_TRANSITIVE_DEPENDENCIES_RECURSIVE_QUERY = bool(
+    int(os.getenv("THOTH_STORAGE_TRANSITIVE_DEPENDENCIES_RECURSIVE_QUERY", 0))
+)
+# Number of packages whose dependencies are retrieved in a single query when traversing from multiple packages.
+_TRANSITIVE_DEPENDENCIES_BATCH_SIZE = int(os.getenv("THOTH_STORAGE_TRANSITIVE_DEPENDENCIES_BATCH_SIZE", 1000))
+# Number of threads (each using its own database session) retrieving batches of one traversal level.
+_TRANSITIVE_DEPENDENCIES_WORKERS = int(os.getenv("THOTH_STORAGE_TRANSITIVE_DEPENDENCIES_WORKERS", 1))
+# Number of rows fetched at once by iter_* methods streaming query results, document ids are iterated in such chunks.
+_STREAM_BATCH_SIZE = int(os.getenv("THOTH_STORAGE_STREAM_BATCH_SIZE", 1000))
+# Number of documents purged at once, database records of documents in a chunk are deleted in one transaction.
+_PURGE_CHUNK_SIZE = int(os.getenv("THOTH_STORAGE_PURGE_CHUNK_SIZE", 1000))
+# Number of threads copying documents of a chunk to be purged to the purge prefix.
+_PURGE_WORKERS = int(os.getenv("THOTH_STORAGE_PURGE_WORKERS", 8))
+# A document stored next to archived documents, it records progress of a purge so that it can be resumed.
+_PURGE_PROGRESS_DOCUMENT_ID = "purge-progress"
+# Number of connections kept open in the connection pool and number of connections opened on top of it on peaks.
+_POOL_SIZE = int(os.getenv("THOTH_STORAGE_POOL_SIZE", 5))
+_POOL_MAX_OVERFLOW = int(os.getenv("THOTH_STORAGE_POOL_MAX_OVERFLOW", 10))
+# Number of seconds to wait for a connection to be returned to an exhausted pool before giving up.
+_POOL_TIMEOUT = int(os.getenv("THOTH_STORAGE_POOL_TIMEOUT", 30))
+# Number of seconds after which connections are reopened (e.g. before a firewall drops them), -1 to never recycle.
+_POOL_RECYCLE = int(os.getenv("THOTH_STORAGE_POOL_RECYCLE", -1))
+# Test connections on checkout so that connections dropped by the server are replaced transparently.
+_POOL_PRE_PING = bool(int(os.getenv("THOTH_STORAGE_POOL_PRE_PING", 0)))
+# Number of milliseconds after which statements are cancelled by the server, 0 to disable the timeout.
+_STATEMENT_TIMEOUT = int(os.getenv("THOTH_STORAGE_STATEMENT_TIMEOUT", 0))
+# Connections are pooled by an external pooler in transaction mode (e.g. PgBouncer) - no connections are kept
+# open, no session state is set and no statements are prepared on server side.
+_EXTERNAL_POOLER = bool(int(os.getenv("THOTH_STORAGE_EXTERNAL_POOLER", 0)))
+# Prepare statements of hot lookup queries on server side, once per connection.
+_PREPARED_STATEMENTS = bool(int(os.getenv("THOTH_STORAGE_PREPARED_STATEMENTS", 0)))
+# Maximum number of statements prepared per connection, further statements are executed without being prepared.
+_PREPARED_STATEMENTS_MAX = int(os.getenv("THOTH_STORAGE_PREPARED_STATEMENTS_MAX", 256))
+# Record calls of public adapter methods and SQL statements they issue, exported in stats().
+_INSTRUMENTATION = bool(int(os.getenv("THOTH_STORAGE_INSTRUMENTATION", 0)))
+# Number of seconds after which instrumented calls are logged with statements they issued, 0 to disable the log.
+_SLOW_CALL_THRESHOLD = float(os.getenv("THOTH_STORAGE_SLOW_CALL_THRESHOLD", 1.0))
+
+
+# Namespace of the shared query cache holding results derived from solver data, invalidated on solver syncs.
+_QUERY_CACHE_SOLVER_NAMESPACE = "solver"
 
 _LOGGER = logging.getLogger(__name__)
+# Parameters of statements passed to psycopg2 and escaped percent signs, converted when preparing statements.
+_PYFORMAT_PARAMETER_RE = re.compile(r"%\((\w+)\)s|%%")
+# Separates positional and keyword arguments in keys of cached method results.
+_CACHE_KWARGS_MARK = object()
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "invalidations"])
+# Tables read by methods decorated using lru_cache and shared query cache namespaces they use.
+_CACHED_METHOD_TABLES: Dict[str, Tuple[FrozenSet[str], Optional[str]]] = {}
+
+
+class _CachedMethod:
+    """Results of a method of an adapter cached in memory in the least recently used manner.
+
+    Entries are tagged by the value of key_argument (if any) so that they can be invalidated selectively once
+    the given tables are written.
+    """
+
+    def __init__(
+        self,
+        adapter: "GraphDatabase",
+        func: Any,
+        maxsize: Optional[int],
+        *,
+        shared_namespace: Optional[str],
+        tables: FrozenSet[str],
+        key_argument: Optional[str],
+        signature: Optional[inspect.Signature],
+    ) -> None:
+        """Initialize cache of the given method."""
+        functools.update_wrapper(self, func)
+        # We're storing the cached method inside the instance. If we had
+        # a strong reference to the adapter the instance would never die.
+        self._adapter = weakref.ref(adapter)
+        self._func = func
+        self.maxsize = maxsize
+        self.shared_namespace = shared_namespace
+        self.tables = tables
+        self.key_argument = key_argument
+        self._signature = signature
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._entry_tags: Dict[tuple, Any] = {}
+        self._tagged_entries: Dict[Any, Set[tuple]] = {}
+        # Incremented on each invalidation so that results computed meanwhile are not stored.
+        self._generation = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _make_key(args: tuple, kwargs: Dict[str, Any]) -> tuple:
+        """Construct a key of an entry, positional and keyword arguments are distinguished as in functools."""
+        if not kwargs:
+            return args
+
+        return args + (_CACHE_KWARGS_MARK,) + tuple(kwargs.items())
+
+    def _get_tag(self, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """Get tag of the entry for the given arguments, package names are normalized."""
+        if self._signature is None:
+            return None
+
+        value = self._signature.bind(None, *args, **kwargs).arguments.get(self.key_argument)
+        if self.key_argument == "package_name" and value is not None:
+            value = PackageVersion.normalize_python_package_name(value)
+
+        return value
+
+    def __call__(self, *args, **kwargs):
+        """Get result of the method call, compute it if not cached."""
+        instrumentation = getattr(self._adapter(), "_query_instrumentation", None)
+        if instrumentation is not None:
+            return instrumentation.call(self.__name__, self._call, *args, **kwargs)
+
+        return self._call(*args, **kwargs)
+
+    def _call(self, *args, **kwargs):
+        """Get result of the method call, compute it if not cached."""
+        key = self._make_key(args, kwargs)
+        try:
+            result = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                # Evicted meanwhile by another thread.
+                pass
+            self.hits += 1
+            return result
+
+        generation = self._generation
+        adapter = self._adapter()
+        if self.shared_namespace is not None and adapter._query_cache is not None:
+            result = adapter._query_cache.lookup(
+                self.shared_namespace, self.__name__, args, kwargs, lambda: self._func(adapter, *args, **kwargs)
+            )
+        else:
+            result = self._func(adapter, *args, **kwargs)
+
+        with self._lock:
+            self.misses += 1
+            if generation == self._generation:
+                self._store(key, self._get_tag(args, kwargs), result)
+
+        return result
+
+    def _store(self, key: tuple, tag: Any, result: Any) -> None:
+        """Store the given entry, to be called with lock held."""
+        if self.maxsize == 0:
+            return
 
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if tag is not None:
+            self._entry_tags[key] = tag
+            self._tagged_entries.setdefault(tag, set()).add(key)
+
+        while self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: tuple) -> None:
+        """Remove the given entry, to be called with lock held."""
+        self._entries.pop(key, None)
+        tag = self._entry_tags.pop(key, None)
+        if tag is not None:
+            keys = self._tagged_entries[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged_entries[tag]
+
+    def put(self, result: Any, *args, **kwargs) -> None:
+        """Store the given result as if the method was called with the given arguments."""
+        with self._lock:
+            self._store(self._make_key(args, kwargs), self._get_tag(args, kwargs), result)
+
+    def invalidate(self, keys: Optional[Iterable[Any]] = None) -> int:
+        """Invalidate entries tagged by the given keys, all the entries if no keys are given or not tagged."""
+        with self._lock:
+            self._generation += 1
+            if keys is None or self._signature is None:
+                count = len(self._entries)
+                self._entries.clear()
+                self._entry_tags.clear()
+                self._tagged_entries.clear()
+            else:
+                count = 0
+                if self.key_argument == "package_name":
+                    keys = {PackageVersion.normalize_python_package_name(key) for key in keys if key is not None}
+
+                for tag in keys:
+                    for key in self._tagged_entries.get(tag, set()).copy():
+                        self._remove(key)
+                        count += 1
+
+            self.invalidations += count
+
+        return count
 
-def lru_cache(*lru_args, **lru_kwargs):
+    def cache_info(self) -> CacheInfo:
+        """Get statistics of the cache."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries), self.invalidations)
+
+    def cache_clear(self) -> None:
+        """Clear the cache and its statistics."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._entry_tags.clear()
+            self._tagged_entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+
+def lru_cache(
+    maxsize: Optional[int] = 128,
+    *,
+    shared_namespace: Optional[str] = None,
+    tables: Iterable[str] = (),
+    key_argument: Optional[str] = None,
+):
     """Implement a cache for methods.
 
-    Based on:
+    Inspired by:
       https://stackoverflow.com/questions/33672412/python-functools-lru-cache-with-class-methods-release-object
+
+    The cached method states tables it reads, writes to these tables invalidate cached results (see
+    GraphDatabase.cache_invalidate). If key_argument is set, only results computed for the keys written (e.g.
+    package names) are invalidated.
+
+    If shared_namespace is set and the adapter has a query cache configured, results not found in memory are
+    looked up in the query cache shared across processes, in the given namespace.
+
+    Results computed elsewhere can be stored in the cache using cache_put of the decorated method, keys are
+    constructed out of arguments the same way as on calls (positional and keyword arguments are distinguished).
     """
     # XXX: possibly move to another module to make it available for the whole Thoth
     def decorator(func):
+        signature = inspect.signature(func) if key_argument is not None else None
+        _CACHED_METHOD_TABLES[func.__name__] = (frozenset(tables), shared_namespace)
+
+        def get_cached_method(self):
+            cached_method = self.__dict__.get(func.__name__)
+            if cached_method is None:
+                cached_method = _CachedMethod(
+                    self,
+                    func,
+                    maxsize,
+                    shared_namespace=shared_namespace,
+                    tables=frozenset(tables),
+                    key_argument=key_argument,
+                    signature=signature,
+                )
+                setattr(self, func.__name__, cached_method)
+                self._CACHED_METHODS.append(cached_method)
+
+            return cached_method
+
+        @functools.wraps(func)
+        def wrapped_func(self, *args, **kwargs):
+            return get_cached_method(self)(*args, **kwargs)
+
+        def cache_put(self, result, *args, **kwargs):
+            """Store the given result in the cache as if the method was called with the given arguments."""
+            get_cached_method(self).put(result, *args, **kwargs)
+
+        wrapped_func.cache_put = cache_put
+        return wrapped_func
+
+    return decorator
+
+
+def invalidates_cache(tables: Iterable[str], key_argument: Optional[str] = None):
+    """Invalidate cached results of methods reading the given tables once the decorated method writes them.
+
+    If key_argument is set, only results computed for the value of the given argument are invalidated.
+    """
+    tables = frozenset(tables)
+
+    def decorator(func):
+        signature = inspect.signature(func) if key_argument is not None else None
+
         @functools.wraps(func)
         def wrapped_func(self, *args, **kwargs):
-            # We're storing the wrapped method inside the instance. If we had
-            # a strong reference to self the instance would never die.
-            self_weak = weakref.ref(self)
+            result = func(self, *args, **kwargs)
 
-            @functools.wraps(func)
-            @functools.lru_cache(*lru_args, **lru_kwargs)
-            def cached_method(*args, **kwargs):
-                return func(self_weak(), *args, **kwargs)
+            keys = None
+            if signature is not None:
+                keys = (signature.bind(self, *args, **kwargs).arguments.get(key_argument),)
 
-            setattr(self, func.__name__, cached_method)
-            self._CACHED_METHODS.append(cached_method)
-            return cached_method(*args, **kwargs)
+            self.cache_invalidate(tables, keys)
+            return result
 
         return wrapped_func
 
     return decorator
 
 
+def _instrumented(func):
+    """Record calls of the given method if instrumentation of the adapter is enabled."""
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def wrapped_generator(self, *args, **kwargs):
+            instrumentation = self._query_instrumentation
+            if instrumentation is None:
+                return func(self, *args, **kwargs)
+
+            return instrumentation.iterate(func.__name__, func(self, *args, **kwargs))
+
+        return wrapped_generator
+
+    @functools.wraps(func)
+    def wrapped_func(self, *args, **kwargs):
+        instrumentation = self._query_instrumentation
+        if instrumentation is None:
+            return func(self, *args, **kwargs)
+
+        return instrumentation.call(func.__name__, func, self, *args, **kwargs)
+
+    return wrapped_func
+
+
+def instrument_methods(exclude: Iterable[str] = ()):
+    """Instrument public methods of the decorated adapter class, see _instrumented.
+
+    Methods decorated using lru_cache are instrumented on calls of their cached method, static and class methods
+    are not instrumented.
+    """
+    exclude = frozenset(exclude)
+
+    def decorator(cls):
+        for name, value in list(vars(cls).items()):
+            if name.startswith("_") or name in exclude or not inspect.isfunction(value) or hasattr(value, "cache_put"):
+                continue
+
+            setattr(cls, name, _instrumented(value))
+
+        return cls
+
+    return decorator
+
+
+@instrument_methods(exclude=("connect", "initialize_schema", "stats", "cache_invalidate", "cache_clear"))
 @attr.s()
 class GraphDatabase(SQLBase):
     """A SQL database adapter providing graph-like operations on top of SQL queries."""
 
+    _query_cache = attr.ib(default=None)
+    # Connection pooling configuration, defaults are taken from THOTH_STORAGE_* environment variables if not set.
+    _pool_size = attr.ib(type=Optional[int], default=None)
+    _max_overflow = attr.ib(type=Optional[int], default=None)
+    _pool_timeout = attr.ib(type=Optional[int], default=None)
+    _pool_recycle = attr.ib(type=Optional[int], default=None)
+    _pool_pre_ping = attr.ib(type=Optional[bool], default=None)
+    _statement_timeout = attr.ib(type=Optional[int], default=None)
+    _external_pooler = attr.ib(type=Optional[bool], default=None)
+    _prepared_statements = attr.ib(type=Optional[bool], default=None)
+    _prepared_statement_stats = attr.ib(type=Optional[Dict[str, int]], default=None, init=False)
+    # Instrumentation of method calls, defaults to THOTH_STORAGE_INSTRUMENTATION if not set.
+    _instrumentation = attr.ib(type=Optional[bool], default=None)
+    _query_instrumentation = attr.ib(type=Optional[QueryInstrumentation], default=None, init=False)
+
     _DECLARATIVE_BASE = Base
     DEFAULT_COUNT = 100
 
@@ -291,6 +646,103 @@ class GraphDatabase(SQLBase):
         finally:
             session.close()
 
+    @staticmethod
+    def _get_option(value: Any, default: Any) -> Any:
+        """Get value of a configuration option, fall back to the default (environment) value if not set."""
+        return value if value is not None else default
+
+    def _get_statement_timeout(self) -> int:
+        """Get statement timeout in milliseconds, 0 if statements are not timed out."""
+        return int(self._get_option(self._statement_timeout, _STATEMENT_TIMEOUT))
+
+    def _is_external_pooler(self) -> bool:
+        """Check if connections are pooled by an external pooler."""
+        return bool(self._get_option(self._external_pooler, _EXTERNAL_POOLER))
+
+    def _get_engine_options(self) -> Dict[str, Any]:
+        """Get keyword arguments configuring connection pooling of the engine to be created."""
+        if self._is_external_pooler():
+            # The external pooler keeps connections open, a connection obtained from it is used per session. Poolers in
+            # transaction mode reject startup options, the statement timeout is set per transaction instead.
+            return {"poolclass": InstrumentedNullPool}
+
+        options: Dict[str, Any] = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": self._get_option(self._pool_size, _POOL_SIZE),
+            "max_overflow": self._get_option(self._max_overflow, _POOL_MAX_OVERFLOW),
+            "pool_timeout": self._get_option(self._pool_timeout, _POOL_TIMEOUT),
+            "pool_recycle": self._get_option(self._pool_recycle, _POOL_RECYCLE),
+            "pool_pre_ping": self._get_option(self._pool_pre_ping, _POOL_PRE_PING),
+        }
+
+        statement_timeout = self._get_statement_timeout()
+        if statement_timeout:
+            options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+
+        return options
+
+    @staticmethod
+    def _construct_prepared_statement(statement: str) -> Tuple[str, str, str]:
+        """Construct name of a prepared statement, statements preparing it and executing it with parameters given."""
+        name = f"thoth_{hashlib.sha1(statement.encode()).hexdigest()[:16]}"
+        parameter_names: List[str] = []
+
+        def to_positional(match):
+            if match.group(1) is None:
+                return "%"
+
+            if match.group(1) not in parameter_names:
+                parameter_names.append(match.group(1))
+
+            return f"${parameter_names.index(match.group(1)) + 1}"
+
+        prepare_statement = f"PREPARE {name} AS {_PYFORMAT_PARAMETER_RE.sub(to_positional, statement)}"
+        execute_statement = f"EXECUTE {name}"
+        if parameter_names:
+            execute_statement += f" ({', '.join(f'%({p})s' for p in parameter_names)})"
+
+        return name, prepare_statement, execute_statement
+
+    def _register_engine_listeners(self) -> None:
+        """Register listeners setting statement timeouts and preparing statements on the engine created."""
+        statement_timeout = self._get_statement_timeout()
+        if self._is_external_pooler():
+            if statement_timeout:
+
+                def set_local_statement_timeout(connection):
+                    with connection.connection.cursor() as cursor:
+                        cursor.execute(f"SET LOCAL statement_timeout = {statement_timeout}")
+
+                event.listen(self._engine, "begin", set_local_statement_timeout)
+
+            # Statements prepared on one server connection are not available on other ones the pooler hands out.
+            return
+
+        if not self._get_option(self._prepared_statements, _PREPARED_STATEMENTS):
+            return
+
+        stats = {"prepared": 0, "executed": 0}
+        self._prepared_statement_stats = stats
+
+        def execute_prepared(connection, cursor, statement, parameters, context, executemany):
+            if executemany or context is None or not context.execution_options.get("prepare"):
+                return statement, parameters
+
+            prepared = connection.info.setdefault("thoth_prepared_statements", set())
+            name, prepare_statement, execute_statement = self._construct_prepared_statement(statement)
+            if name not in prepared:
+                if len(prepared) >= _PREPARED_STATEMENTS_MAX:
+                    return statement, parameters
+
+                cursor.execute(prepare_statement)
+                prepared.add(name)
+                stats["prepared"] += 1
+
+            stats["executed"] += 1
+            return execute_statement, parameters
+
+        event.listen(self._engine, "before_cursor_execute", execute_prepared, retval=True)
+
     def connect(self) -> None:
         """Connect to the database."""
         if self.is_connected():
@@ -298,8 +750,19 @@ class GraphDatabase(SQLBase):
 
         echo = bool(int(os.getenv("THOTH_STORAGES_DEBUG_QUERIES", 0)))
         try:
-            self._engine = create_engine(self.construct_connection_string(), echo=echo)
+            self._engine = create_engine(self.construct_connection_string(), echo=echo, **self._get_engine_options())
+            self._register_engine_listeners()
+            if self._get_option(self._instrumentation, _INSTRUMENTATION):
+                if self._query_instrumentation is None:
+                    self._query_instrumentation = QueryInstrumentation(slow_call_threshold=_SLOW_CALL_THRESHOLD)
+
+                self._query_instrumentation.register(self._engine)
             self._sessionmaker = sessionmaker(bind=self._engine)
+            if self._query_cache is None:
+                url = self._engine.url
+                self._query_cache = get_query_cache(
+                    prefix=f"thoth-storages:{url.host}:{url.port or 5432}/{url.database}"
+                )
         except Exception as engine_exc:
             _LOGGER.warning("Failed to create engine: %s", str(engine_exc))
             # Drop engine and session in case of any connection issues so is_connected behaves correctly.
@@ -708,7 +1171,12 @@ class GraphDatabase(SQLBase):
 
             return [{"os_name": i[0], "os_version": i[1], "python_version": i[2]} for i in result]
 
-    @lru_cache(maxsize=_HAS_PYTHON_SOLVER_ERROR_CACHE_SIZE)
+    @lru_cache(
+        maxsize=_HAS_PYTHON_SOLVER_ERROR_CACHE_SIZE,
+        shared_namespace=_QUERY_CACHE_SOLVER_NAMESPACE,
+        tables=("python_package_version", "python_package_index", "solved"),
+        key_argument="package_name",
+    )
     def has_python_solver_error(
         self,
         package_name: str,
@@ -748,6 +1216,7 @@ class GraphDatabase(SQLBase):
                 .join(Solved)
                 .order_by(desc(Solved.datetime))
                 .with_entities(Solved.error)
+                .execution_options(prepare=True)
             )
 
             result = query.first()
@@ -817,6 +1286,70 @@ class GraphDatabase(SQLBase):
 
         return query_result
 
+    @staticmethod
+    def _encode_cursor(key: Any) -> str:
+        """Encode key of the last row retrieved into an opaque cursor."""
+        return base64.urlsafe_b64encode(json.dumps([key]).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Any:
+        """Decode key of the last row retrieved out of the given cursor."""
+        try:
+            (key,) = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError) as exc:
+            raise ValueError(f"Invalid cursor {cursor!r}: {str(exc)}") from exc
+
+        return key
+
+    def _get_page(
+        self, query: Query, key_column: Any, cursor: Optional[str], count: Optional[int]
+    ) -> Tuple[List[tuple], Optional[str]]:
+        """Retrieve a page of query results ordered by the given unique key column (keyset pagination).
+
+        Rows following the row identified by the cursor are retrieved, cursor of the next page is returned
+        together with rows; None is returned as a cursor if there are no more rows.
+        """
+        query = query.add_columns(key_column)
+        if cursor is not None:
+            query = query.filter(key_column > self._decode_cursor(cursor))
+
+        query = query.order_by(key_column)
+        if count is not None:
+            query = query.limit(count)
+
+        rows = query.all()
+        next_cursor = None
+        if count is not None and len(rows) == count:
+            next_cursor = self._encode_cursor(rows[-1][-1])
+
+        return [tuple(row[:-1]) for row in rows], next_cursor
+
+    def _iter_chunks(
+        self, construct_query: Callable[[Session], Query], key_column: Any, cursor: Optional[str], chunk_size: int
+    ) -> Iterator[Tuple[List[tuple], str]]:
+        """Iterate over query results ordered by the given unique key column in chunks (keyset pagination).
+
+        Each chunk is retrieved by a query of its own constructed in a new session, no transaction is held open
+        while the chunk is processed by the caller. Each chunk is yielded together with a cursor of its last row,
+        passing the cursor resumes iteration after the chunk.
+        """
+        while True:
+            with self._session_scope() as session:
+                query = construct_query(session).add_columns(key_column)
+                if cursor is not None:
+                    query = query.filter(key_column > self._decode_cursor(cursor))
+
+                rows = query.order_by(key_column).limit(chunk_size).all()
+
+            if not rows:
+                return
+
+            cursor = self._encode_cursor(rows[-1][-1])
+            yield [tuple(row[:-1]) for row in rows], cursor
+
+            if len(rows) < chunk_size:
+                return
+
     # Solved Python Packages
     def get_solved_python_packages_all(
         self,
@@ -840,6 +1373,40 @@ class GraphDatabase(SQLBase):
         os_version = normalize_os_version(os_name, os_version)
         return self.__class__.get_python_packages_all(**locals())
 
+    def get_solved_python_packages_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        count: Optional[int] = DEFAULT_COUNT,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+    ) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """Retrieve a page of solved Python packages with index, return also cursor of the next page.
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> graph.get_solved_python_packages_page()
+        ([('regex', 'https://pypi.org/simple'), ('tensorflow', 'https://pypi.org/simple')], 'WzJd')
+        """
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        return self.__class__.get_python_packages_page(**locals())
+
+    def iter_solved_python_packages_all(
+        self,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        distinct: bool = False,
+    ) -> Iterator[Tuple[str, str]]:
+        """Iterate over all solved Python packages with index, results are streamed using a server-side cursor."""
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        return self.__class__.iter_python_packages_all(**locals())
+
     def _construct_solved_python_packages_query(
         self,
         session: Session,
@@ -1090,6 +1657,75 @@ class GraphDatabase(SQLBase):
 
             return query.all()
 
+    def get_solved_python_package_versions_page(
+        self,
+        package_name: Optional[str] = None,
+        package_version: Optional[str] = None,
+        index_url: Optional[str] = None,
+        *,
+        cursor: Optional[str] = None,
+        count: Optional[int] = DEFAULT_COUNT,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        is_missing: Optional[bool] = None,
+    ) -> Tuple[List[Tuple[str, str, str]], Optional[str]]:
+        """Retrieve a page of solved Python package versions, return also cursor of the next page.
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> versions, cursor = graph.get_solved_python_package_versions_page()
+        >>> versions, cursor = graph.get_solved_python_package_versions_page(cursor=cursor)
+        """
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        with self._session_scope() as session:
+            query = self._construct_solved_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+                is_missing=is_missing,
+            )
+
+            return self._get_page(query, PythonPackageVersion.id, cursor, count)
+
+    def iter_solved_python_package_versions_all(
+        self,
+        package_name: Optional[str] = None,
+        package_version: Optional[str] = None,
+        index_url: Optional[str] = None,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        distinct: bool = False,
+        is_missing: Optional[bool] = None,
+    ) -> Iterator[Tuple[str, str, str]]:
+        """Iterate over all solved Python package versions, results are streamed using a server-side cursor."""
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        with self._session_scope() as session:
+            query = self._construct_solved_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+                is_missing=is_missing,
+            )
+
+            if distinct:
+                query = query.distinct()
+
+            yield from query.yield_per(_STREAM_BATCH_SIZE)
+
     def get_solved_python_package_versions_count_all(
         self,
         package_name: Optional[str] = None,
@@ -1662,7 +2298,7 @@ class GraphDatabase(SQLBase):
         os_name = map_os_name(os_name)
         os_version = normalize_os_version(os_name, os_version)
         with self._session_scope() as session:
-            query = self._construct_unsolved_python_package_versions_query(
+            query = self._construct_unsolved_python_package_versions_all_query(
                 session,
                 package_name=package_name,
                 package_version=package_version,
@@ -1672,12 +2308,6 @@ class GraphDatabase(SQLBase):
                 python_version=python_version,
             )
 
-            query = query.join(PythonPackageIndex).with_entities(
-                PythonPackageVersionEntity.package_name,
-                PythonPackageVersionEntity.package_version,
-                PythonPackageIndex.url,
-            )
-
             if randomize:
                 query = query.order_by(func.random())
 
@@ -1688,8 +2318,9 @@ class GraphDatabase(SQLBase):
 
             return query.all()
 
-    def get_unsolved_python_package_versions_count_all(
+    def _construct_unsolved_python_package_versions_all_query(
         self,
+        session: Session,
         package_name: Optional[str] = None,
         package_version: Optional[str] = None,
         index_url: Optional[str] = None,
@@ -1697,13 +2328,48 @@ class GraphDatabase(SQLBase):
         os_name: Optional[str] = None,
         os_version: Optional[str] = None,
         python_version: Optional[str] = None,
-        distinct: bool = False,
-    ) -> int:
-        """Retrieve unsolved Python package versions number in Thoth Database."""
+    ) -> Query:
+        """Construct query listing unsolved Python package versions with their index, the query is not executed."""
+        query = self._construct_unsolved_python_package_versions_query(
+            session,
+            package_name=package_name,
+            package_version=package_version,
+            index_url=index_url,
+            os_name=os_name,
+            os_version=os_version,
+            python_version=python_version,
+        )
+
+        return query.join(PythonPackageIndex).with_entities(
+            PythonPackageVersionEntity.package_name,
+            PythonPackageVersionEntity.package_version,
+            PythonPackageIndex.url,
+        )
+
+    def get_unsolved_python_package_versions_page(
+        self,
+        package_name: Optional[str] = None,
+        package_version: Optional[str] = None,
+        index_url: Optional[str] = None,
+        *,
+        cursor: Optional[str] = None,
+        count: Optional[int] = DEFAULT_COUNT,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+    ) -> Tuple[List[Tuple[str, Optional[str], Optional[str]]], Optional[str]]:
+        """Retrieve a page of unsolved Python package versions, return also cursor of the next page.
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> versions, cursor = graph.get_unsolved_python_package_versions_page()
+        >>> versions, cursor = graph.get_unsolved_python_package_versions_page(cursor=cursor)
+        """
         os_name = map_os_name(os_name)
         os_version = normalize_os_version(os_name, os_version)
         with self._session_scope() as session:
-            query = self._construct_unsolved_python_package_versions_query(
+            query = self._construct_unsolved_python_package_versions_all_query(
                 session,
                 package_name=package_name,
                 package_version=package_version,
@@ -1713,18 +2379,86 @@ class GraphDatabase(SQLBase):
                 python_version=python_version,
             )
 
-            query = query.join(PythonPackageIndex).with_entities(
-                PythonPackageVersionEntity.package_name,
-                PythonPackageVersionEntity.package_version,
-                PythonPackageIndex.url,
-            )
-
-            if distinct:
-                query = query.distinct()
-
-            return query.count()
+            return self._get_page(query, PythonPackageVersionEntity.id, cursor, count)
 
-    # SI Analyzed Python Packages
+    def iter_unsolved_python_package_versions_all(
+        self,
+        package_name: Optional[str] = None,
+        package_version: Optional[str] = None,
+        index_url: Optional[str] = None,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        distinct: bool = False,
+        randomize: bool = False,
+    ) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """Iterate over all unsolved Python package versions, results are streamed using a server-side cursor.
+
+        Randomizing the order requires the whole result to be sorted before the first row is streamed. Results
+        cannot be randomized and distinct at the same time as random values would make all the rows distinct.
+        """
+        if randomize and distinct:
+            raise ValueError("Cannot iterate over unsolved Python package versions randomized and distinct")
+
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        with self._session_scope() as session:
+            query = self._construct_unsolved_python_package_versions_all_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+            )
+
+            if randomize:
+                query = query.order_by(func.random())
+
+            if distinct:
+                query = query.distinct()
+
+            yield from query.yield_per(_STREAM_BATCH_SIZE)
+
+    def get_unsolved_python_package_versions_count_all(
+        self,
+        package_name: Optional[str] = None,
+        package_version: Optional[str] = None,
+        index_url: Optional[str] = None,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        distinct: bool = False,
+    ) -> int:
+        """Retrieve unsolved Python package versions number in Thoth Database."""
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        with self._session_scope() as session:
+            query = self._construct_unsolved_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+            )
+
+            query = query.join(PythonPackageIndex).with_entities(
+                PythonPackageVersionEntity.package_name,
+                PythonPackageVersionEntity.package_version,
+                PythonPackageIndex.url,
+            )
+
+            if distinct:
+                query = query.distinct()
+
+            return query.count()
+
+    # SI Analyzed Python Packages
 
     def _construct_si_analyzed_python_package_versions_query(self, session: Session) -> Query:
         """Construct query for packages analyzed by solver and analyzed by SI."""
@@ -1964,7 +2698,11 @@ class GraphDatabase(SQLBase):
 
         return query.count() > 0
 
-    @lru_cache(maxsize=_GET_SI_AGGREGATED_PYTHON_PACKAGE_VERSION_CACHE_SIZE)
+    @lru_cache(
+        maxsize=_GET_SI_AGGREGATED_PYTHON_PACKAGE_VERSION_CACHE_SIZE,
+        tables=("si_aggregated", "si_aggregated_run", "python_package_version_entity", "python_package_index"),
+        key_argument="package_name",
+    )
     def get_si_aggregated_python_package_version(
         self, package_name: str, package_version: str, index_url: str
     ) -> Dict[str, int]:
@@ -2053,7 +2791,12 @@ class GraphDatabase(SQLBase):
 
             return result
 
-    @lru_cache(maxsize=_GET_PYTHON_PACKAGE_VERSION_RECORDS_CACHE_SIZE)
+    @lru_cache(
+        maxsize=_GET_PYTHON_PACKAGE_VERSION_RECORDS_CACHE_SIZE,
+        shared_namespace=_QUERY_CACHE_SOLVER_NAMESPACE,
+        tables=("python_package_version", "python_package_index"),
+        key_argument="package_name",
+    )
     def get_python_package_version_records(
         self,
         package_name: str,
@@ -2100,6 +2843,7 @@ class GraphDatabase(SQLBase):
                     PythonPackageVersion.python_version,
                 )
                 .distinct()
+                .execution_options(prepare=True)
                 .all()
             )
 
@@ -2129,6 +2873,7 @@ class GraphDatabase(SQLBase):
         python_version: Optional[str] = None,
         extras: Optional[FrozenSet[Optional[str]]] = None,
         marker_evaluation_result: Optional[bool] = None,
+        recursive_query: Optional[bool] = None,
     ) -> List[
         Tuple[
             Tuple[str, str, str],
@@ -2151,11 +2896,30 @@ class GraphDatabase(SQLBase):
         Extras are taken into account only for direct dependencies. Any extras required in libraries used in
         transitive dependencies are not required as solver directly report dependencies regardless extras
         configuration - see get_depends_on docs for extras parameter values..
+
+        If recursive_query is set (defaults to THOTH_STORAGE_TRANSITIVE_DEPENDENCIES_RECURSIVE_QUERY), the whole
+        dependency graph is retrieved using a single recursive query. The very same dependency tuples are returned,
+        just in a different order.
         """
         index_url = self.normalize_python_index_url(index_url)
         package_name = self.normalize_python_package_name(package_name)
         package_version = self.normalize_python_package_version(package_version)
 
+        if recursive_query is None:
+            recursive_query = _TRANSITIVE_DEPENDENCIES_RECURSIVE_QUERY
+
+        if recursive_query:
+            return self._retrieve_transitive_dependencies_python_recursive(
+                package_name,
+                package_version,
+                index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+                extras=extras,
+                marker_evaluation_result=marker_evaluation_result,
+            )
+
         result = []
         initial_stack_entry = (extras, package_name, package_version, index_url)
         stack = deque((initial_stack_entry,))
@@ -2180,9 +2944,9 @@ class GraphDatabase(SQLBase):
 
             for configuration in configurations:
                 dependencies = self.get_depends_on(
-                    package_name=configuration["package_name"],
-                    package_version=configuration["package_version"],
-                    index_url=configuration["index_url"],
+                    configuration["package_name"],
+                    configuration["package_version"],
+                    configuration["index_url"],
                     os_name=configuration["os_name"],
                     os_version=configuration["os_version"],
                     python_version=configuration["python_version"],
@@ -2215,7 +2979,189 @@ class GraphDatabase(SQLBase):
 
         return result
 
-    @lru_cache(maxsize=_GET_PYTHON_ENVIRONMENT_MARKER_CACHE_SIZE)
+    @staticmethod
+    def _construct_transitive_dependencies_query(
+        nodes: str,
+        params: Dict[str, Any],
+        *,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+        extras: Optional[FrozenSet[Optional[str]]] = None,
+        marker_evaluation_result: Optional[bool] = None,
+    ) -> TextClause:
+        """Construct a query listing dependencies of packages stated in nodes CTE.
+
+        The nodes CTE definition can refer to dependencies of nodes using {dependencies} placeholder. Each
+        row of the query result states a package tuple and its dependency tuple, dependencies which are not
+        resolved in the environment of the package are reported with index_url set to None. Parameters of
+        the query are added to the params dictionary.
+        """
+        environment_filter = ""
+        if os_name is not None:
+            os_name = map_os_name(os_name)
+            params["os_name"] = os_name
+            environment_filter += " AND pv.os_name = :os_name"
+
+        if os_version is not None:
+            params["os_version"] = normalize_os_version(os_name, os_version)
+            environment_filter += " AND pv.os_version = :os_version"
+
+        if python_version is not None:
+            params["python_version"] = python_version
+            environment_filter += " AND pv.python_version = :python_version"
+
+        depends_on_filter = ""
+        if marker_evaluation_result is not None:
+            params["marker_evaluation_result"] = marker_evaluation_result
+            depends_on_filter += " AND depends_on.marker_evaluation_result = :marker_evaluation_result"
+
+        if extras:
+            # Extras are respected only for direct dependencies, a None in extras stands for no extra.
+            params["extras"] = [extra for extra in extras if extra is not None]
+            extras_condition = "depends_on.extra = ANY(CAST(:extras AS TEXT[]))"
+            if None in extras:
+                extras_condition = f"(depends_on.extra IS NULL OR {extras_condition})"
+
+            depends_on_filter += (
+                " AND (%s OR (nodes.package_name, nodes.package_version, nodes.index_url)"
+                " <> (:package_name, :package_version, :index_url))" % extras_condition
+            )
+
+        dependencies = f"""
+            FROM nodes
+            JOIN python_package_index AS node_index ON node_index.url = nodes.index_url
+            JOIN python_package_version AS pv
+                ON pv.python_package_index_id = node_index.id
+                AND pv.package_name = nodes.package_name
+                AND pv.package_version = nodes.package_version{environment_filter}
+            JOIN depends_on ON depends_on.version_id = pv.id{depends_on_filter}
+            JOIN python_package_version_entity AS entity ON entity.id = depends_on.entity_id
+        """
+
+        return text(
+            f"""
+            WITH {nodes.format(dependencies=dependencies)}, edges AS (
+                SELECT DISTINCT
+                    nodes.package_name,
+                    nodes.package_version,
+                    nodes.index_url,
+                    pv.os_name,
+                    pv.os_version,
+                    pv.python_version,
+                    depends_on.extra,
+                    entity.package_name AS dependency_name,
+                    entity.package_version AS dependency_version
+                {dependencies}
+            )
+            SELECT
+                edges.package_name,
+                edges.package_version,
+                edges.index_url,
+                edges.dependency_name,
+                edges.dependency_version,
+                dependency_records.url
+            FROM edges
+            LEFT JOIN LATERAL (
+                SELECT DISTINCT dependency_index.url
+                FROM python_package_version AS dependency_pv
+                JOIN python_package_index AS dependency_index
+                    ON dependency_index.id = dependency_pv.python_package_index_id
+                WHERE dependency_pv.package_name = edges.dependency_name
+                    AND dependency_pv.package_version = edges.dependency_version
+                    AND dependency_pv.os_name = edges.os_name
+                    AND dependency_pv.os_version = edges.os_version
+                    AND dependency_pv.python_version = edges.python_version
+            ) AS dependency_records ON TRUE
+            """
+        )
+
+    def _retrieve_transitive_dependencies_python_recursive(
+        self,
+        package_name: str,
+        package_version: str,
+        index_url: str,
+        *,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+        extras: Optional[FrozenSet[Optional[str]]],
+        marker_evaluation_result: Optional[bool],
+    ) -> List[Tuple[Tuple[str, str, str], Tuple[str, str, Optional[str]]]]:
+        """Get all transitive dependencies for the given (normalized) package using a recursive query.
+
+        The recursive part of the query computes all the packages reachable from the given one, each of them is
+        expanded once - the same way as the graph is traversed in retrieve_transitive_dependencies_python.
+        """
+        params: Dict[str, Any] = {
+            "package_name": package_name,
+            "package_version": package_version,
+            "index_url": index_url,
+        }
+        nodes = """RECURSIVE nodes(package_name, package_version, index_url) AS (
+                SELECT CAST(:package_name AS TEXT), CAST(:package_version AS TEXT), CAST(:index_url AS TEXT)
+                UNION
+                SELECT dependency_pv.package_name, dependency_pv.package_version, dependency_index.url
+                {dependencies}
+                JOIN python_package_version AS dependency_pv
+                    ON dependency_pv.package_name = entity.package_name
+                    AND dependency_pv.package_version = entity.package_version
+                    AND dependency_pv.os_name = pv.os_name
+                    AND dependency_pv.os_version = pv.os_version
+                    AND dependency_pv.python_version = pv.python_version
+                JOIN python_package_index AS dependency_index
+                    ON dependency_index.id = dependency_pv.python_package_index_id
+            )"""
+        query = self._construct_transitive_dependencies_query(
+            nodes,
+            params,
+            os_name=os_name,
+            os_version=os_version,
+            python_version=python_version,
+            extras=extras,
+            marker_evaluation_result=marker_evaluation_result,
+        )
+
+        with self._session_scope() as session:
+            return [(tuple(row[:3]), tuple(row[3:])) for row in session.execute(query, params)]
+
+    def _get_dependencies_python_batch(
+        self,
+        package_tuples: List[Tuple[str, str, str]],
+        *,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+    ) -> Dict[Tuple[str, str, str], List[Tuple[str, str, Optional[str]]]]:
+        """Get dependencies of the given (normalized) packages using a single query."""
+        params: Dict[str, Any] = {
+            "package_names": [package_tuple[0] for package_tuple in package_tuples],
+            "package_versions": [package_tuple[1] for package_tuple in package_tuples],
+            "index_urls": [package_tuple[2] for package_tuple in package_tuples],
+        }
+        nodes = """nodes(package_name, package_version, index_url) AS (
+                SELECT DISTINCT * FROM unnest(
+                    CAST(:package_names AS TEXT[]), CAST(:package_versions AS TEXT[]), CAST(:index_urls AS TEXT[])
+                )
+            )"""
+        query = self._construct_transitive_dependencies_query(
+            nodes, params, os_name=os_name, os_version=os_version, python_version=python_version
+        )
+
+        result: Dict[Tuple[str, str, str], List[Tuple[str, str, Optional[str]]]] = {
+            package_tuple: [] for package_tuple in package_tuples
+        }
+        with self._session_scope() as session:
+            for row in session.execute(query, params):
+                result[tuple(row[:3])].append(tuple(row[3:]))
+
+        return result
+
+    @lru_cache(
+        maxsize=_GET_PYTHON_ENVIRONMENT_MARKER_CACHE_SIZE,
+        tables=("python_package_version", "python_package_index", "depends_on", "python_package_version_entity"),
+        key_argument="package_name",
+    )
     def get_python_environment_marker(
         self,
         package_name: str,
@@ -2425,7 +3371,12 @@ class GraphDatabase(SQLBase):
         """
         return [p.value for p in PlatformEnum]
 
-    @lru_cache(maxsize=_GET_DEPENDS_ON_CACHE_SIZE)
+    @lru_cache(
+        maxsize=_GET_DEPENDS_ON_CACHE_SIZE,
+        shared_namespace=_QUERY_CACHE_SOLVER_NAMESPACE,
+        tables=("python_package_version", "python_package_index", "depends_on", "python_package_version_entity"),
+        key_argument="package_name",
+    )
     def get_depends_on(
         self,
         package_name: str,
@@ -2509,6 +3460,7 @@ class GraphDatabase(SQLBase):
                     DependsOn.extra, PythonPackageVersionEntity.package_name, PythonPackageVersionEntity.package_version
                 )
                 .distinct()
+                .execution_options(prepare=True)
                 .all()
             )
 
@@ -2526,12 +3478,131 @@ class GraphDatabase(SQLBase):
 
             return result
 
+    def get_depends_on_many(
+        self,
+        package_tuples: Iterable[Tuple[str, str, str]],
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        extras: Optional[FrozenSet[Optional[str]]] = None,
+        marker_evaluation_result: Optional[bool] = None,
+        is_missing: Optional[bool] = None,
+    ) -> Dict[Tuple[str, str, str], Dict[str, List[Tuple[str, str]]]]:
+        """Get dependencies for the given Python packages respecting environment and extras using a single query.
+
+        Packages are given as (package_name, package_version, index_url) tuples, results are the same as the ones
+        of get_depends_on called for each of them. Packages with no record in the database are not present in
+        the result (get_depends_on raises NotFoundError for them).
+
+        Results are stored in the cache of get_depends_on for calls stating the package tuple positionally and
+        environment, extras and marker evaluation result as keyword arguments (all of them or just the ones set) -
+        for example get_depends_on(*package_tuple, os_name=os_name, os_version=os_version,
+        python_version=python_version, extras=extras, marker_evaluation_result=marker_evaluation_result).
+        """
+        package_tuples = list(dict.fromkeys(package_tuples))
+        normalized_tuples = {}
+        for package_tuple in package_tuples:
+            if None in package_tuple:
+                raise ValueError(f"Package name, version and index URL have to be stated: {package_tuple!r}")
+
+            normalized_tuple = (
+                self.normalize_python_package_name(package_tuple[0]),
+                self.normalize_python_package_version(package_tuple[1]),
+                self.normalize_python_index_url(package_tuple[2]),
+            )
+            normalized_tuples.setdefault(normalized_tuple, []).append(package_tuple)
+
+        if not normalized_tuples:
+            return {}
+
+        with self._session_scope() as session:
+            query = (
+                session.query(PythonPackageVersion)
+                .join(PythonPackageIndex)
+                .filter(
+                    tuple_(
+                        PythonPackageVersion.package_name, PythonPackageVersion.package_version, PythonPackageIndex.url
+                    ).in_(list(normalized_tuples))
+                )
+            )
+
+            if os_name is not None:
+                query = query.filter(PythonPackageVersion.os_name == map_os_name(os_name))
+
+            if os_version is not None:
+                query = query.filter(
+                    PythonPackageVersion.os_version == normalize_os_version(map_os_name(os_name), os_version)
+                )
+
+            if python_version is not None:
+                query = query.filter(PythonPackageVersion.python_version == python_version)
+
+            if is_missing is not None:
+                query = query.filter(PythonPackageVersion.is_missing == is_missing)
+
+            # Outer joins keep packages which have no dependencies matching the given filters.
+            depends_on_conditions = [DependsOn.version_id == PythonPackageVersion.id]
+            if extras:
+                # We cannot use in_ here as sqlalchemy does not support None in the list.
+                depends_on_conditions.append(or_(*(DependsOn.extra == i for i in extras)))
+
+            if marker_evaluation_result is not None:
+                depends_on_conditions.append(DependsOn.marker_evaluation_result == marker_evaluation_result)
+
+            query_result = (
+                query.outerjoin(DependsOn, and_(*depends_on_conditions))
+                .outerjoin(PythonPackageVersionEntity, PythonPackageVersionEntity.id == DependsOn.entity_id)
+                .with_entities(
+                    PythonPackageVersion.package_name,
+                    PythonPackageVersion.package_version,
+                    PythonPackageIndex.url,
+                    DependsOn.extra,
+                    PythonPackageVersionEntity.package_name,
+                    PythonPackageVersionEntity.package_version,
+                )
+                .distinct()
+                .all()
+            )
+
+        normalized_result: Dict[Tuple[str, str, str], Dict[str, List[Tuple[str, str]]]] = {}
+        for package_name, package_version, index_url, extra, dependency_name, dependency_version in query_result:
+            dependencies = normalized_result.setdefault((package_name, package_version, index_url), {})
+            if dependency_name is not None:
+                dependencies.setdefault(extra, []).append((dependency_name, dependency_version))
+
+        kwargs = {
+            "os_name": os_name,
+            "os_version": os_version,
+            "python_version": python_version,
+            "extras": extras,
+            "marker_evaluation_result": marker_evaluation_result,
+        }
+        if is_missing is not None:
+            kwargs["is_missing"] = is_missing
+
+        # Keys of lru_cache differ based on keyword arguments passed, cover also calls omitting the unset ones.
+        kwargs_variants = [kwargs]
+        kwargs_set = {key: value for key, value in kwargs.items() if value is not None}
+        if kwargs_set != kwargs:
+            kwargs_variants.append(kwargs_set)
+
+        result = {}
+        for normalized_tuple, dependencies in normalized_result.items():
+            for package_tuple in normalized_tuples[normalized_tuple]:
+                result[package_tuple] = dependencies
+                for kwargs_variant in kwargs_variants:
+                    GraphDatabase.get_depends_on.cache_put(self, dependencies, *package_tuple, **kwargs_variant)
+
+        return result
+
     def retrieve_transitive_dependencies_python_multi(
         self,
         *package_tuples,
         os_name: Optional[str] = None,
         os_version: Optional[str] = None,
         python_version: Optional[str] = None,
+        workers: Optional[int] = None,
     ) -> Dict[
         Tuple[str, str, str],
         Set[
@@ -2545,15 +3616,169 @@ class GraphDatabase(SQLBase):
             ]
         ],
     ]:
-        """Get all transitive dependencies for a given set of packages by traversing the dependency graph."""
-        result = {}
-        for package_tuple in package_tuples:
-            result[package_tuple] = self.retrieve_transitive_dependencies_python(
-                *package_tuple, os_name=os_name, os_version=os_version, python_version=python_version
+        """Get all transitive dependencies for a given set of packages by traversing the dependency graph.
+
+        Packages reachable from any of the given packages are expanded once - the graph is traversed level by
+        level, dependencies of all the packages in one level are retrieved in batches of
+        THOTH_STORAGE_TRANSITIVE_DEPENDENCIES_BATCH_SIZE packages, each batch using a single query. Batches
+        are retrieved concurrently if more workers are configured (THOTH_STORAGE_TRANSITIVE_DEPENDENCIES_WORKERS).
+        The result for each package is the same as the one computed by retrieve_transitive_dependencies_python.
+        """
+        if workers is None:
+            workers = _TRANSITIVE_DEPENDENCIES_WORKERS
+
+        roots = {
+            package_tuple: (
+                self.normalize_python_package_name(package_tuple[0]),
+                self.normalize_python_package_version(package_tuple[1]),
+                self.normalize_python_index_url(package_tuple[2]),
+            )
+            for package_tuple in package_tuples
+        }
+
+        def _get_dependencies(batch: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], list]:
+            return self._get_dependencies_python_batch(
+                batch, os_name=os_name, os_version=os_version, python_version=python_version
             )
 
+        # Dependencies of packages seen during the traversal, shared by all the given packages.
+        dependencies: Dict[Tuple[str, str, str], List[Tuple[str, str, Optional[str]]]] = {}
+        frontier = list(dict.fromkeys(roots.values()))
+        executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="graph-traversal") if workers > 1 else None
+        )
+        try:
+            while frontier:
+                batches = [
+                    frontier[i : i + _TRANSITIVE_DEPENDENCIES_BATCH_SIZE]  # Ignore PycodestyleBear (E203)
+                    for i in range(0, len(frontier), _TRANSITIVE_DEPENDENCIES_BATCH_SIZE)
+                ]
+
+                if executor is not None:
+                    batch_results = executor.map(_get_dependencies, batches)
+                else:
+                    batch_results = map(_get_dependencies, batches)
+
+                for batch_result in batch_results:
+                    dependencies.update(batch_result)
+
+                frontier = list(
+                    dict.fromkeys(
+                        dependency_tuple
+                        for package_tuple in frontier
+                        for dependency_tuple in dependencies[package_tuple]
+                        if dependency_tuple[2] is not None and dependency_tuple not in dependencies
+                    )
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        result = {}
+        for package_tuple, root in roots.items():
+            result[package_tuple] = []
+            seen_tuples = {root}
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for dependency_tuple in dependencies[node]:
+                    result[package_tuple].append((node, dependency_tuple))
+                    if dependency_tuple[2] is not None and dependency_tuple not in seen_tuples:
+                        stack.append(dependency_tuple)
+                        seen_tuples.add(dependency_tuple)
+
         return result
 
+    def export_dependency_graph_snapshot(self, path: str, since: Optional[int] = None) -> Dict[str, Any]:
+        """Export Python package version records and their dependencies into a snapshot file, return its metadata.
+
+        The snapshot can be opened using DependencyGraphSnapshot which serves dependency queries used by resolvers
+        without querying the database. The snapshot file is replaced atomically. Id of the oldest transaction still
+        in progress once the export starts is stored as a watermark in the snapshot metadata. If a watermark of
+        a previous export is given as since, only records of packages written or solved by transactions which
+        did not finish before the previous export are exported (a delta snapshot). Unlike solver run datetimes,
+        transaction ids cover also documents synced late; records written by transactions in progress during
+        the previous export are exported again.
+        """
+        from .snapshot import DependencyGraphSnapshotWriter
+
+        writer = DependencyGraphSnapshotWriter()
+        with self._session_scope() as session:
+            connection = session.connection(execution_options={"stream_results": True})
+            watermark = connection.execute(text("SELECT txid_snapshot_xmin(txid_current_snapshot())")).scalar()
+
+            solved_filter = ""
+            params: Dict[str, Any] = {}
+            if since is not None and since >> 32 != watermark >> 32:
+                # Rows store 32 bit transaction ids, they cannot be compared across transaction id wraparound.
+                _LOGGER.warning("Transaction id wrapped around since watermark %d, exporting all records", since)
+                since = None
+            elif since is not None:
+                solved_filter = """
+                    WHERE pv.xmin::text::bigint >= :since OR pv.id IN (
+                        SELECT solved.version_id FROM solved WHERE solved.xmin::text::bigint >= :since
+                    )
+                """
+                params["since"] = since & 0xFFFFFFFF
+
+            records = connection.execute(
+                text(
+                    f"""
+                    SELECT
+                        pv.id, pv.package_name, pv.package_version, package_index.url,
+                        pv.os_name, pv.os_version, pv.python_version, pv.is_missing
+                    FROM python_package_version AS pv
+                    LEFT JOIN python_package_index AS package_index ON package_index.id = pv.python_package_index_id
+                    {solved_filter}
+                    """
+                ),
+                params,
+            )
+            for row in records:
+                writer.add_record(
+                    row[0],
+                    row[1],
+                    row[2],
+                    row[3],
+                    os_name=row[4],
+                    os_version=row[5],
+                    python_version=row[6],
+                    is_missing=row[7],
+                )
+
+            dependencies = connection.execute(
+                text(
+                    f"""
+                    SELECT
+                        depends_on.version_id, entity.package_name, entity.package_version,
+                        depends_on.extra, depends_on.marker_evaluation_result
+                    FROM depends_on
+                    JOIN python_package_version_entity AS entity ON entity.id = depends_on.entity_id
+                    JOIN python_package_version AS pv ON pv.id = depends_on.version_id
+                    {solved_filter}
+                    """
+                ),
+                params,
+            )
+            for row in dependencies:
+                writer.add_dependency(row[0], row[1], row[2], extra=row[3], marker_evaluation_result=row[4])
+
+        return writer.write(path, {"watermark": watermark, "since": since})
+
+    def refresh_dependency_graph_snapshot(
+        self, directory: str, *, max_deltas: Optional[int] = None, full: bool = False
+    ) -> Dict[str, Any]:
+        """Refresh dependency graph snapshot kept in the given directory incrementally, return its manifest.
+
+        Records of packages solved after the watermark of the current snapshot are exported into a delta snapshot
+        layered over the base snapshot, deltas are compacted into a new base snapshot once there are more than
+        max_deltas of them (defaults to THOTH_STORAGE_GRAPH_SNAPSHOT_MAX_DELTAS). Processes using
+        DependencyGraphSnapshot on the directory see the new snapshot once they call its refresh method.
+        """
+        from .snapshot import refresh_dependency_graph_snapshot
+
+        return refresh_dependency_graph_snapshot(self, directory, max_deltas=max_deltas, full=full)
+
     def solver_records_exist(self, solver_document: dict) -> bool:
         """Check if the given solver document record exists."""
         solver_document_id = SolverResultsStore.get_document_id(solver_document)
@@ -2564,6 +3789,25 @@ class GraphDatabase(SQLBase):
         with self._session_scope() as session:
             return session.query(Solved).filter(Solved.document_id == solver_document_id).count() > 0
 
+    def _get_document_ids_synced(self, column: Any, document_ids: Iterable[str]) -> Set[str]:
+        """Get document ids out of the given ones which are present in the database.
+
+        Document ids are checked in chunks, each chunk is checked using a single query.
+        """
+        document_ids = list(document_ids)
+        result = set()
+        with self._session_scope() as session:
+            for i in range(0, len(document_ids), _DOCUMENT_ID_QUERY_CHUNK_SIZE):
+                chunk = document_ids[i : i + _DOCUMENT_ID_QUERY_CHUNK_SIZE]  # Ignore PycodestyleBear (E203)
+                query = session.query(column).filter(column == func.any(literal(chunk, type_=ARRAY(Text)))).distinct()
+                result.update(item[0] for item in query.all())
+
+        return result
+
+    def get_solver_document_ids_synced(self, solver_document_ids: Iterable[str]) -> Set[str]:
+        """Get solver document ids out of the given ones which are already synced."""
+        return self._get_document_ids_synced(Solved.document_id, solver_document_ids)
+
     def get_solver_document_id_all(
         self,
         package_name: str,
@@ -2625,6 +3869,12 @@ class GraphDatabase(SQLBase):
                 > 0
             )
 
+    def get_dependency_monkey_document_ids_synced(self, dependency_monkey_document_ids: Iterable[str]) -> Set[str]:
+        """Get dependency monkey document ids out of the given ones which are already synced."""
+        return self._get_document_ids_synced(
+            DependencyMonkeyRun.dependency_monkey_document_id, dependency_monkey_document_ids
+        )
+
     def si_aggregated_document_id_exists(self, si_aggregated_run_document_id: str) -> bool:
         """Check if the given security indicator aggregated report record exists in the graph database."""
         with self._session_scope() as session:
@@ -2635,6 +3885,12 @@ class GraphDatabase(SQLBase):
                 > 0
             )
 
+    def get_si_aggregated_document_ids_synced(self, si_aggregated_run_document_ids: Iterable[str]) -> Set[str]:
+        """Get security indicator aggregated document ids out of the given ones which are already synced."""
+        return self._get_document_ids_synced(
+            SecurityIndicatorAggregatedRun.si_aggregated_run_document_id, si_aggregated_run_document_ids
+        )
+
     def inspection_document_id_result_number_exists(
         self, inspection_document_id: str, inspection_result_number: int
     ) -> bool:
@@ -2653,6 +3909,10 @@ class GraphDatabase(SQLBase):
         with self._session_scope() as session:
             return session.query(AdviserRun).filter(AdviserRun.adviser_document_id == adviser_document_id).count() > 0
 
+    def get_adviser_document_ids_synced(self, adviser_document_ids: Iterable[str]) -> Set[str]:
+        """Get adviser document ids out of the given ones which are already synced."""
+        return self._get_document_ids_synced(AdviserRun.adviser_document_id, adviser_document_ids)
+
     def analysis_records_exist(self, analysis_document: dict) -> bool:
         """Check whether the given analysis document records exist in the graph database."""
         analysis_document_id = AnalysisResultsStore.get_document_id(analysis_document)
@@ -2668,6 +3928,10 @@ class GraphDatabase(SQLBase):
                 > 0
             )
 
+    def get_analysis_document_ids_synced(self, analysis_document_ids: Iterable[str]) -> Set[str]:
+        """Get analysis document ids out of the given ones which are already synced."""
+        return self._get_document_ids_synced(PackageExtractRun.analysis_document_id, analysis_document_ids)
+
     def get_last_analysis_document_id(
         self, thoth_image_name: str, thoth_image_version: str, *, is_external: bool = False
     ) -> Optional[Dict[str, str]]:
@@ -2708,7 +3972,17 @@ class GraphDatabase(SQLBase):
                 > 0
             )
 
-    @lru_cache(maxsize=_GET_PYTHON_CVE_RECORDS_ALL_CACHE_SIZE)
+    def get_provenance_checker_document_ids_synced(self, provenance_checker_document_ids: Iterable[str]) -> Set[str]:
+        """Get provenance-checker document ids out of the given ones which are already synced."""
+        return self._get_document_ids_synced(
+            ProvenanceCheckerRun.provenance_checker_document_id, provenance_checker_document_ids
+        )
+
+    @lru_cache(
+        maxsize=_GET_PYTHON_CVE_RECORDS_ALL_CACHE_SIZE,
+        tables=("python_package_version_entity", "has_vulnerability", "cve"),
+        key_argument="package_name",
+    )
     def get_python_cve_records_all(self, package_name: str, package_version: Optional[str] = None) -> List[dict]:
         """Get known vulnerabilities for the given package-version."""
         package_name = self.normalize_python_package_name(package_name)
@@ -2833,6 +4107,7 @@ class GraphDatabase(SQLBase):
 
                 return False
 
+    @invalidates_cache(tables=("python_package_index", "python_package_version", "python_package_version_entity"))
     def delete_python_package_index(self, index_url: str) -> None:
         """Delete the given Python package index."""
         with self._session_scope() as session:
@@ -3242,21 +4517,10 @@ class GraphDatabase(SQLBase):
         os_name = map_os_name(os_name)
         os_version = normalize_os_version(os_name, os_version)
         with self._session_scope() as session:
-            query = (
-                session.query(PythonPackageVersion)
-                .join(PythonPackageIndex)
-                .with_entities(PythonPackageVersion.package_name, PythonPackageIndex.url)
+            query = self._construct_python_packages_all_query(
+                session, os_name=os_name, os_version=os_version, python_version=python_version
             )
 
-            if os_name is not None:
-                query = query.filter(PythonPackageVersion.os_name == os_name)
-
-            if os_version is not None:
-                query = query.filter(PythonPackageVersion.os_version == os_version)
-
-            if python_version is not None:
-                query = query.filter(PythonPackageVersion.python_version == python_version)
-
             query = query.offset(start_offset).limit(count)
 
             if distinct:
@@ -3264,23 +4528,96 @@ class GraphDatabase(SQLBase):
 
             return query.all()
 
-    @staticmethod
-    def _construct_python_packages_query(
-        session: Session,
+    def get_python_packages_page(
+        self,
         *,
+        cursor: Optional[str] = None,
+        count: Optional[int] = DEFAULT_COUNT,
         os_name: Optional[str] = None,
         os_version: Optional[str] = None,
         python_version: Optional[str] = None,
-    ) -> Query:
-        """Construct query for Python packages functions, the query is not executed."""
-        query = (
-            session.query(PythonPackageVersion)
-            .join(PythonPackageIndex)
-            .group_by(PythonPackageVersion.package_name, PythonPackageVersion.package_version, PythonPackageIndex.url)
-            .with_entities(
-                PythonPackageVersion.package_name, PythonPackageVersion.package_version, PythonPackageIndex.url
-            )
-        )
+    ) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """Retrieve a page of Python packages with index, return also cursor of the next page.
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> graph.get_python_packages_page()
+        ([('regex', 'https://pypi.org/simple'), ('tensorflow', 'https://pypi.org/simple')], 'WzJd')
+        """
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        with self._session_scope() as session:
+            query = self._construct_python_packages_all_query(
+                session, os_name=os_name, os_version=os_version, python_version=python_version
+            )
+
+            return self._get_page(query, PythonPackageVersion.id, cursor, count)
+
+    def iter_python_packages_all(
+        self,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        distinct: bool = False,
+    ) -> Iterator[Tuple[str, str]]:
+        """Iterate over all Python packages with index, results are streamed using a server-side cursor."""
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        with self._session_scope() as session:
+            query = self._construct_python_packages_all_query(
+                session, os_name=os_name, os_version=os_version, python_version=python_version
+            )
+
+            if distinct:
+                query = query.distinct()
+
+            yield from query.yield_per(_STREAM_BATCH_SIZE)
+
+    @staticmethod
+    def _construct_python_packages_all_query(
+        session: Session,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+    ) -> Query:
+        """Construct query listing Python packages with their index, the query is not executed."""
+        query = (
+            session.query(PythonPackageVersion)
+            .join(PythonPackageIndex)
+            .with_entities(PythonPackageVersion.package_name, PythonPackageIndex.url)
+        )
+
+        if os_name is not None:
+            query = query.filter(PythonPackageVersion.os_name == os_name)
+
+        if os_version is not None:
+            query = query.filter(PythonPackageVersion.os_version == os_version)
+
+        if python_version is not None:
+            query = query.filter(PythonPackageVersion.python_version == python_version)
+
+        return query
+
+    @staticmethod
+    def _construct_python_packages_query(
+        session: Session,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+    ) -> Query:
+        """Construct query for Python packages functions, the query is not executed."""
+        query = (
+            session.query(PythonPackageVersion)
+            .join(PythonPackageIndex)
+            .group_by(PythonPackageVersion.package_name, PythonPackageVersion.package_version, PythonPackageIndex.url)
+            .with_entities(
+                PythonPackageVersion.package_name, PythonPackageVersion.package_version, PythonPackageIndex.url
+            )
+        )
 
         if os_name is not None:
             query = query.filter(PythonPackageVersion.os_name == os_name)
@@ -3672,6 +5009,87 @@ class GraphDatabase(SQLBase):
 
             return query.all()
 
+    def get_python_package_versions_page(
+        self,
+        package_name: Optional[str] = None,
+        package_version: Optional[str] = None,
+        index_url: Optional[str] = None,
+        *,
+        cursor: Optional[str] = None,
+        count: Optional[int] = DEFAULT_COUNT,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        is_missing: Optional[bool] = None,
+    ) -> Tuple[List[Tuple[str, str, str]], Optional[str]]:
+        """Retrieve a page of Python package versions, return also cursor of the next page.
+
+        Unlike offset based pagination, retrieving deep pages is as fast as retrieving the first one.
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> versions, cursor = graph.get_python_package_versions_page()
+        >>> while cursor is not None:
+        ...     versions, cursor = graph.get_python_package_versions_page(cursor=cursor)
+        """
+        index_url = self.normalize_python_index_url(index_url)
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        with self._session_scope() as session:
+            query = self._construct_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+                is_missing=is_missing,
+            )
+
+            return self._get_page(query, PythonPackageVersion.id, cursor, count)
+
+    def iter_python_package_versions_all(
+        self,
+        package_name: Optional[str] = None,
+        package_version: Optional[str] = None,
+        index_url: Optional[str] = None,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        distinct: bool = False,
+        is_missing: Optional[bool] = None,
+    ) -> Iterator[Tuple[str, str, str]]:
+        """Iterate over all Python package versions, results are streamed using a server-side cursor.
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> for package_name, package_version, index_url in graph.iter_python_package_versions_all():
+        ...     print(package_name, package_version, index_url)
+        """
+        index_url = self.normalize_python_index_url(index_url)
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
+        with self._session_scope() as session:
+            query = self._construct_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+                is_missing=is_missing,
+            )
+
+            if distinct:
+                query = query.distinct()
+
+            yield from query.yield_per(_STREAM_BATCH_SIZE)
+
     def get_python_package_versions_count_all(
         self,
         package_name: Optional[str] = None,
@@ -4942,6 +6360,7 @@ class GraphDatabase(SQLBase):
         inspection_result = document["result"]
 
         with self._session_scope() as session, session.begin(subtransactions=True):
+            package_names = self._written_package_names(session)
             build_cpu = OpenShift.parse_cpu_spec(inspection_specification["build"]["requests"]["cpu"])
             build_memory = OpenShift.parse_memory_spec(inspection_specification["build"]["requests"]["memory"])
             run_cpu = OpenShift.parse_cpu_spec(inspection_specification["run"]["requests"]["cpu"])
@@ -5057,6 +6476,11 @@ class GraphDatabase(SQLBase):
                     inspection_run_id=inspection_run.id,
                 )
 
+        self._invalidate_python_package_version_entities(package_names)
+
+    @invalidates_cache(
+        tables=("cve", "has_vulnerability", "python_package_version_entity"), key_argument="package_name"
+    )
     def create_python_cve_record(
         self,
         package_name: str,
@@ -5123,6 +6547,7 @@ class GraphDatabase(SQLBase):
 
             return query_result[0][0] if query_result and query_result[0] else None
 
+    @invalidates_cache(tables=("python_package_version",), key_argument="package_name")
     def update_missing_flag_package_version(
         self, package_name: str, package_version: str, index_url: str, value: bool
     ) -> None:
@@ -5143,6 +6568,7 @@ class GraphDatabase(SQLBase):
                 .update({"is_missing": value}, synchronize_session="fetch")
             )
 
+    @invalidates_cache(tables=("python_package_version",), key_argument="package_name")
     def update_provides_source_distro_package_version(
         self, package_name: str, package_version: str, index_url: str, value: bool
     ) -> None:
@@ -5275,6 +6701,33 @@ class GraphDatabase(SQLBase):
         """
         return datetime.strptime(date_, "%d-%m-%Y")
 
+    def _construct_adviser_run_document_ids_query(
+        self,
+        session: Session,
+        initial_date: Optional[str] = None,
+        final_date: Optional[str] = None,
+        source_type: Optional[str] = None,
+        adviser_version: Optional[str] = None,
+    ) -> Query:
+        """Construct query for adviser run document ids."""
+        query = session.query(AdviserRun.adviser_document_id).with_entities(AdviserRun.adviser_document_id)
+
+        if initial_date:
+            date_filter = self._create_date_filter(initial_date)
+            query = query.filter(AdviserRun.datetime > date_filter)
+
+        if final_date:
+            date_filter = self._create_date_filter(final_date)
+            query = query.filter(AdviserRun.datetime < date_filter)
+
+        if source_type:
+            query = query.filter(AdviserRun.source_type == source_type)
+
+        if adviser_version:
+            query = query.filter(AdviserRun.adviser_version == adviser_version)
+
+        return query
+
     def get_adviser_run_document_ids_all(
         self,
         initial_date: Optional[str] = None,
@@ -5295,24 +6748,149 @@ class GraphDatabase(SQLBase):
         ['adviser-343231d']
         """
         with self._session_scope() as session:
-            query = session.query(AdviserRun.adviser_document_id).with_entities(AdviserRun.adviser_document_id)
+            query = self._construct_adviser_run_document_ids_query(
+                session, initial_date=initial_date, final_date=final_date, source_type=source_type
+            )
+
+            # query = query.offset(start_offset).limit(count)
+
+            document_ids = query.all()
+
+            return [obj[0] for obj in document_ids]
+
+    def iter_adviser_run_document_ids_all(
+        self,
+        initial_date: Optional[str] = None,
+        final_date: Optional[str] = None,
+        source_type: Optional[str] = None,
+        *,
+        adviser_version: Optional[str] = None,
+        cursor: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[Tuple[List[str], str]]:
+        """Iterate over adviser run document ids in chunks, each chunk is retrieved by a query of its own.
+
+        Each chunk is yielded together with a cursor which resumes iteration after the chunk if passed.
+
+        @params initial_date: DD-MM-YY
+        @params final_date: DD-MM-YY
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> for document_ids, cursor in graph.iter_adviser_run_document_ids_all():
+        ...     print(document_ids, cursor)
+        ['adviser-343231d'] WzFd
+        """
+        construct_query = functools.partial(
+            self._construct_adviser_run_document_ids_query,
+            initial_date=initial_date,
+            final_date=final_date,
+            source_type=source_type,
+            adviser_version=adviser_version,
+        )
+        for chunk, chunk_cursor in self._iter_chunks(
+            construct_query, AdviserRun.id, cursor, chunk_size or _STREAM_BATCH_SIZE
+        ):
+            yield [row[0] for row in chunk], chunk_cursor
+
+    def iter_package_extract_run_document_ids_all(
+        self,
+        initial_date: Optional[str] = None,
+        final_date: Optional[str] = None,
+        *,
+        package_extract_version: Optional[str] = None,
+        cursor: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[Tuple[List[str], str]]:
+        """Iterate over package-extract run document ids in chunks, each chunk is retrieved by a query of its own.
+
+        Each chunk is yielded together with a cursor which resumes iteration after the chunk if passed.
+
+        @params initial_date: DD-MM-YY
+        @params final_date: DD-MM-YY
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> for document_ids, cursor in graph.iter_package_extract_run_document_ids_all():
+        ...     print(document_ids, cursor)
+        ['package-extract-2ef02c9cea8b1ef7'] WzFd
+        """
+
+        def _construct_query(session: Session) -> Query:
+            query = session.query(PackageExtractRun.analysis_document_id).with_entities(
+                PackageExtractRun.analysis_document_id
+            )
 
             if initial_date:
                 date_filter = self._create_date_filter(initial_date)
-                query = query.filter(AdviserRun.datetime > date_filter)
+                query = query.filter(PackageExtractRun.datetime > date_filter)
 
             if final_date:
                 date_filter = self._create_date_filter(final_date)
-                query = query.filter(AdviserRun.datetime < date_filter)
+                query = query.filter(PackageExtractRun.datetime < date_filter)
 
-            if source_type:
-                query = query.filter(AdviserRun.source_type == source_type)
+            if package_extract_version:
+                query = query.filter(PackageExtractRun.package_extract_version == package_extract_version)
 
-            # query = query.offset(start_offset).limit(count)
+            return query
 
-            document_ids = query.all()
+        for chunk, chunk_cursor in self._iter_chunks(
+            _construct_query, PackageExtractRun.id, cursor, chunk_size or _STREAM_BATCH_SIZE
+        ):
+            yield [row[0] for row in chunk], chunk_cursor
 
-            return [obj[0] for obj in document_ids]
+    def _construct_solver_run_document_ids_query(
+        self,
+        session: Session,
+        initial_date: Optional[str] = None,
+        final_date: Optional[str] = None,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        has_error: bool = False,
+        unsolvable: bool = False,
+        unparseable: bool = False,
+    ) -> Query:
+        """Construct query for solver run document ids, os_name and os_version are expected to be normalized."""
+        query = session.query(Solved.document_id).with_entities(Solved.document_id)
+
+        conditions = []
+
+        if os_name or os_version or python_version:
+            conditions.append(EcosystemSolver.id == Solved.ecosystem_solver_id)
+
+        if os_name:
+            conditions.append(EcosystemSolver.os_name == os_name)
+
+        if os_version:
+            conditions.append(EcosystemSolver.os_version == os_version)
+
+        if python_version:
+            conditions.append(EcosystemSolver.python_version == python_version)
+
+        if has_error:
+            query = query.filter(Solved.error.is_(True))
+
+        if unsolvable:
+            conditions.append(Solved.error_unsolvable.is_(True))
+
+        if unparseable:
+            conditions.append(Solved.error_unparseable.is_(True))
+
+        if conditions:
+            query = query.filter(exists().where(and_(*conditions)))
+
+        if initial_date:
+            date_filter = self._create_date_filter(initial_date)
+            query = query.filter(Solved.datetime > date_filter)
+
+        if final_date:
+            date_filter = self._create_date_filter(final_date)
+            query = query.filter(Solved.datetime < date_filter)
+
+        return query
 
     def get_solver_run_document_ids_all(
         self,
@@ -5342,48 +6920,73 @@ class GraphDatabase(SQLBase):
         os_version = normalize_os_version(os_name, os_version)
 
         with self._session_scope() as session:
-            query = session.query(Solved.document_id).with_entities(Solved.document_id)
+            query = self._construct_solver_run_document_ids_query(
+                session,
+                initial_date=initial_date,
+                final_date=final_date,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+                has_error=has_error,
+                unsolvable=unsolvable,
+                unparseable=unparseable,
+            )
 
-            conditions = []
+            query = query.offset(start_offset).limit(count)
 
-            if os_name or os_version or python_version:
-                conditions.append(EcosystemSolver.id == Solved.ecosystem_solver_id)
+            document_ids = query.all()
 
-            if os_name:
-                conditions.append(EcosystemSolver.os_name == os_name)
+            return [obj[0] for obj in document_ids]
 
-            if os_version:
-                os_version = normalize_os_version(os_name, os_version)
-                conditions.append(EcosystemSolver.os_version == os_version)
+    def iter_solver_run_document_ids_all(
+        self,
+        initial_date: Optional[str] = None,
+        final_date: Optional[str] = None,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        *,
+        has_error: bool = False,
+        unsolvable: bool = False,
+        unparseable: bool = False,
+        cursor: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[Tuple[List[str], str]]:
+        """Iterate over distinct solver run document ids in chunks, each chunk is retrieved by a query of its own.
 
-            if python_version:
-                conditions.append(EcosystemSolver.python_version == python_version)
-
-            if has_error:
-                query = query.filter(Solved.error.is_(True))
-
-            if unsolvable:
-                conditions.append(Solved.error_unsolvable.is_(True))
-
-            if unparseable:
-                conditions.append(Solved.error_unparseable.is_(True))
-
-            if conditions:
-                query = query.filter(exists().where(and_(*conditions)))
+        Each chunk is yielded together with a cursor which resumes iteration after the chunk if passed.
 
-            if initial_date:
-                date_filter = self._create_date_filter(initial_date)
-                query = query.filter(Solved.datetime > date_filter)
-
-            if final_date:
-                date_filter = self._create_date_filter(final_date)
-                query = query.filter(Solved.datetime < date_filter)
+        @params initial_date: DD-MM-YY
+        @params final_date: DD-MM-YY
 
-            query = query.offset(start_offset).limit(count)
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> for document_ids, cursor in graph.iter_solver_run_document_ids_all(os_name="rhel"):
+        ...     print(document_ids, cursor)
+        ['solver-rhel-8-py38-343231d'] WyJzb2x2ZXItcmhlbC04LXB5MzgtMzQzMjMxZCJd
+        """
+        os_name = map_os_name(os_name)
+        os_version = normalize_os_version(os_name, os_version)
 
-            document_ids = query.all()
+        def _construct_query(session: Session) -> Query:
+            # Solved packages of one solver run share the document id, ids are unique once distinct.
+            return self._construct_solver_run_document_ids_query(
+                session,
+                initial_date=initial_date,
+                final_date=final_date,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+                has_error=has_error,
+                unsolvable=unsolvable,
+                unparseable=unparseable,
+            ).distinct()
 
-            return [obj[0] for obj in document_ids]
+        for chunk, chunk_cursor in self._iter_chunks(
+            _construct_query, Solved.document_id, cursor, chunk_size or _STREAM_BATCH_SIZE
+        ):
+            yield [row[0] for row in chunk], chunk_cursor
 
     def get_python_package_version_trove_classifiers_all(
         self,
@@ -5747,6 +7350,21 @@ class GraphDatabase(SQLBase):
             )
             self._python_interpreters_sync_analysis_result(session, package_extract_run, document)
 
+        self.cache_invalidate(
+            (
+                "package_extract_run",
+                "found_rpm",
+                "rpm_package_version",
+                "identified",
+                "python_package_version_entity",
+                "software_environment",
+                "external_software_environment",
+                "has_symbol",
+                "versioned_symbol",
+            ),
+            (analysis_document_id,),
+        )
+
     @staticmethod
     def _get_or_create_python_package_index(
         session: Session, index_url: str, only_if_enabled: bool = True
@@ -5892,6 +7510,11 @@ class GraphDatabase(SQLBase):
                     marker_evaluation_result=entry["marker_evaluation_result"],
                 )
 
+        self.cache_invalidate(
+            ("depends_on", "python_package_version_entity", "python_package_version_entity_rules_association"),
+            {dependency_name, *(entry["package_name"] for entry in document["result"])},
+        )
+
     def _check_package_solved(
         self, session: Session, package_name: str, package_version: str, package_index: str
     ) -> Tuple:
@@ -5968,8 +7591,49 @@ class GraphDatabase(SQLBase):
                 python_package_version_id=python_package_version_id,
             )
 
-    def sync_solver_result(self, document: dict, *, force: bool = False) -> None:
-        """Sync the given solver result to the graph database."""
+        self.cache_invalidate(("si_aggregated", "si_aggregated_run"), (package_name,))
+
+    def sync_solver_result(self, document: dict, *, force: bool = False, bulk: Optional[bool] = None) -> None:
+        """Sync the given solver result to the graph database.
+
+        In the bulk mode, rows of the document are collected per table and written using a few multi-row
+        statements. Records are created one by one if force is supplied so that old package version
+        entries can be replaced.
+
+        Cached results of queries for the packages synced are invalidated, query results derived from solver
+        data kept in the shared query cache are invalidated as a whole.
+        """
+        package_names = set()
+        for python_package_info in document["result"]["tree"]:
+            package_names.add(python_package_info["package_name"])
+            package_names.update(dependency["package_name"] for dependency in python_package_info["dependencies"])
+
+        for key in ("errors", "unresolved"):
+            # Legacy solver documents state package names under the package key.
+            package_names.update(
+                item.get("package_name") or item["package"] for item in document["result"].get(key, [])
+            )
+
+        self._sync_solver_result(document, force=force, bulk=bulk)
+
+        self.cache_invalidate(
+            (
+                "python_package_version",
+                "python_package_version_entity",
+                "python_package_index",
+                "depends_on",
+                "solved",
+                "has_artifact",
+                "python_package_version_entity_rules_association",
+            ),
+            package_names,
+        )
+
+    def _sync_solver_result(self, document: dict, *, force: bool, bulk: Optional[bool]) -> None:
+        """Sync the given solver result to the graph database, see sync_solver_result."""
+        if bulk is None:
+            bulk = _SOLVER_SYNC_BULK
+
         solver_document_id = SolverResultsStore.get_document_id(document)
         solver_name = SolverResultsStore.get_solver_name_from_document_id(solver_document_id)
         solver_info = OpenShift.parse_python_solver_name(solver_name)
@@ -5996,6 +7660,12 @@ class GraphDatabase(SQLBase):
                 python_version=python_version,
             )
 
+            if bulk and not force:
+                self._sync_solver_result_bulk(
+                    session, document, ecosystem_solver=ecosystem_solver, solver_info=solver_info
+                )
+                return
+
             for python_package_info in document["result"]["tree"]:
                 # Normalized in `_create_python_package_version'.
                 package_name = python_package_info["package_name"]
@@ -6297,6 +7967,478 @@ class GraphDatabase(SQLBase):
                     error_unsolvable=False,
                 )
 
+    @staticmethod
+    def _get_multi_part_keys_metadata_rows(
+        importlib_metadata: Dict[str, Any]
+    ) -> List[Tuple[Any, Any, str, Dict[str, Any]]]:
+        """Get rows for multi-part keys from Python Package Metadata, keys are removed from the metadata.
+
+        Each entry states the value model, the association model, the association column and the value row.
+        """
+        result = []
+        for classifier in importlib_metadata.pop("Classifier", []):
+            result.append(
+                (
+                    PythonPackageMetadataClassifier,
+                    HasMetadataClassifier,
+                    "python_package_metadata_classifier_id",
+                    {"classifier": classifier},
+                )
+            )
+
+        for platform in importlib_metadata.pop("Platform", []):
+            result.append(
+                (
+                    PythonPackageMetadataPlatform,
+                    HasMetadataPlatform,
+                    "python_package_metadata_platform_id",
+                    {"platform": platform},
+                )
+            )
+
+        for supported_platform in importlib_metadata.pop("Supported-Platform", []):
+            result.append(
+                (
+                    PythonPackageMetadataSupportedPlatform,
+                    HasMetadataSupportedPlatform,
+                    "python_package_metadata_supported_platform_id",
+                    {"supported_platform": supported_platform},
+                )
+            )
+
+        for dependency in importlib_metadata.pop("Requires-External", []):
+            result.append(
+                (
+                    PythonPackageMetadataRequiresExternal,
+                    HasMetadataRequiresExternal,
+                    "python_package_metadata_requires_external_id",
+                    {"dependency": dependency},
+                )
+            )
+
+        for project_url in importlib_metadata.pop("Project-URL", []):
+            label, url = project_url.split(",")[0].strip(), project_url.split(",")[1].strip()
+            result.append(
+                (
+                    PythonPackageMetadataProjectUrl,
+                    HasMetadataProjectUrl,
+                    "python_package_metadata_project_url_id",
+                    {"label": label, "url": url},
+                )
+            )
+
+        for optional_feature in importlib_metadata.pop("Provides-Extra", []):
+            result.append(
+                (
+                    PythonPackageMetadataProvidesExtra,
+                    HasMetadataProvidesExtra,
+                    "python_package_metadata_provides_extra_id",
+                    {"optional_feature": optional_feature},
+                )
+            )
+
+        for dist_key, distutils_type in (
+            ("Requires-Dist", MetadataDistutilsTypeEnum.REQUIRED.value),
+            ("Provides-Dist", MetadataDistutilsTypeEnum.PROVIDED.value),
+            ("Obsoletes-Dist", MetadataDistutilsTypeEnum.OBSOLETE.value),
+        ):
+            for distutils in importlib_metadata.pop(dist_key, []):
+                result.append(
+                    (
+                        PythonPackageMetadataDistutils,
+                        HasMetadataDistutils,
+                        "python_package_metadata_distutils_id",
+                        {"distutils": distutils, "distutils_type": distutils_type},
+                    )
+                )
+
+        return result
+
+    def _refresh_rules_python_entities(
+        self, session: Session, entities: Iterable[Tuple[int, str, Optional[str]]]
+    ) -> None:
+        """Add all rules that apply to the given entities (id, package name, package version) in bulk."""
+        entities = set(entities)
+        package_names = {package_name for _, package_name, _ in entities}
+        if not package_names:
+            return
+
+        rules: Dict[str, List[Tuple[int, Optional[str]]]] = {}
+        query = session.query(
+            PythonPackageVersionEntityRule.id,
+            PythonPackageVersionEntityRule.package_name,
+            PythonPackageVersionEntityRule.version_range,
+        ).filter(PythonPackageVersionEntityRule.package_name.in_(package_names))
+        for rule_id, package_name, version_range in query.all():
+            rules.setdefault(package_name, []).append((rule_id, version_range))
+
+        rows = []
+        for entity_id, package_name, package_version in entities:
+            if package_name not in rules:
+                continue
+
+            version = parse_version(package_version)
+            for rule_id, version_range in rules[package_name]:
+                specifier = SpecifierSet(version_range)
+                specifier.prereleases = True
+
+                if not version_range or version in specifier:
+                    rows.append(
+                        {
+                            "python_package_version_entity_id": entity_id,
+                            "python_package_version_entity_rule_id": rule_id,
+                        }
+                    )
+
+        PythonPackageVersionEntityRulesAssociation.bulk_create(session, rows)
+
+    def _sync_solver_result_bulk(
+        self, session: Session, document: dict, *, ecosystem_solver: EcosystemSolver, solver_info: Dict[str, Any]
+    ) -> None:
+        """Sync the given solver result, rows are collected per table and written using multi-row statements."""
+        solver_document_id = SolverResultsStore.get_document_id(document)
+        solver_datetime = document["metadata"]["datetime"]
+        solver_duration = document["metadata"].get("duration")
+
+        index_ids: Dict[str, int] = {}
+
+        def _get_index_id(index_url: Optional[str]) -> Optional[int]:
+            if index_url is None:
+                return None
+
+            index_url = self.normalize_python_index_url(index_url)
+            if index_url not in index_ids:
+                index = self._get_or_create_python_package_index(session, index_url, only_if_enabled=False)
+                index_ids[index_url] = index.id  # type: ignore
+
+            return index_ids[index_url]
+
+        # Package versions synced as (package name, package version, index id), referenced by their position.
+        versions: List[Tuple[str, Optional[str], Optional[int]]] = []
+        # Position of the package version and flags of the corresponding Solved record.
+        solved: List[Tuple[Optional[int], Dict[str, bool]]] = []
+        # Rows stated by entries in the tree, referenced by position of the entry.
+        tree_versions: List[int] = []
+        metadata_rows = []
+        license_rows = []
+        license_warnings = []
+        multi_part_rows: List[Tuple[int, Any, Any, str, Dict[str, Any]]] = []
+        artifacts: List[Tuple[int, str]] = []
+        import_packages: List[Tuple[int, str]] = []
+        # Dependency entities as (package name, package version), referenced by their position.
+        dependency_entities: List[Tuple[str, str]] = []
+        depends_on: List[Tuple[int, int, Dict[str, Any]]] = []
+
+        def _add_version(package_name: str, package_version: Optional[str], index_url: Optional[str]) -> int:
+            package_name = self.normalize_python_package_name(package_name)
+            if package_version is not None:
+                package_version = self.normalize_python_package_version(package_version)
+
+            versions.append((package_name, package_version, _get_index_id(index_url)))
+            return len(versions) - 1
+
+        for idx, python_package_info in enumerate(document["result"]["tree"]):
+            package_name = python_package_info["package_name"]
+            package_version = python_package_info["package_version_requested"]
+            index_url = python_package_info["index_url"]
+            importlib_metadata = dict(python_package_info["importlib_metadata"]["metadata"])
+            package_license = python_package_info["package_license"]
+
+            _LOGGER.info(
+                "Syncing solver result of package %r in version %r license %r from %r solved by %r",
+                package_name,
+                package_version,
+                package_license,
+                index_url,
+                solver_info,
+            )
+
+            version_idx = _add_version(package_name, package_version, index_url)
+            tree_versions.append(version_idx)
+            solved.append((version_idx, {"error": False, "error_unparseable": False, "error_unsolvable": False}))
+
+            metadata_rows.append(
+                {
+                    "author": importlib_metadata.pop("Author", None),
+                    "author_email": importlib_metadata.pop("Author-email", None),
+                    "download_url": importlib_metadata.pop("Download-URL", None),
+                    "home_page": importlib_metadata.pop("Home-page", None),
+                    "keywords": importlib_metadata.pop("Keywords", None),
+                    "license": importlib_metadata.pop("License", None),
+                    "maintainer": importlib_metadata.pop("Maintainer", None),
+                    "maintainer_email": importlib_metadata.pop("Maintainer-email", None),
+                    "metadata_version": importlib_metadata.pop("Metadata-Version", None),
+                    "name": importlib_metadata.pop("Name", None),
+                    "summary": importlib_metadata.pop("Summary", None),
+                    "version": importlib_metadata.pop("Version", None),
+                    "requires_python": importlib_metadata.pop("Requires-Python", None),
+                    "description": importlib_metadata.pop("Description", None),
+                    "description_content_type": importlib_metadata.pop("Description-Content-Type", None),
+                }
+            )
+            multi_part_rows.extend(
+                (idx, *entry) for entry in self._get_multi_part_keys_metadata_rows(importlib_metadata)
+            )
+            if importlib_metadata:
+                _LOGGER.warning(
+                    "Cannot sync the whole solver result: "
+                    f"No related columns for {list(importlib_metadata.keys())!r} "
+                    "found in PythonPackageMetadata table, the error is not fatal"
+                )
+
+            license_rows.append(
+                {
+                    "license_name": package_license["license"].get("full_name"),
+                    "license_identifier": package_license["license"].get("identifier_spdx"),
+                    "license_version": package_license["license_version"],
+                }
+            )
+            license_warnings.append(package_license["warning"])
+
+            artifacts.extend((idx, sha256) for sha256 in python_package_info["sha256"])
+            import_packages.extend((idx, package_call) for package_call in python_package_info["packages"])
+
+            for dependency in python_package_info["dependencies"]:
+                for index_entry in dependency["resolved_versions"]:
+                    for dependency_version in index_entry["versions"]:
+                        if len(dependency.get("extra") or []) > 1:
+                            # Not sure if this can happen in the ecosystem, report error
+                            # if this incident happens.
+                            _LOGGER.error(
+                                "Multiple extra detected for dependency %r in version %r required "
+                                "by %r in version %r from index %r with marker %r, only the "
+                                "first extra will be used: %r",
+                                dependency["package_name"],
+                                dependency_version,
+                                package_name,
+                                package_version,
+                                index_url,
+                                dependency.get("marker"),
+                                dependency.get("extra"),
+                            )
+
+                        dependency_entities.append(
+                            (
+                                self.normalize_python_package_name(dependency["package_name"]),
+                                self.normalize_python_package_version(dependency_version),
+                            )
+                        )
+                        depends_on.append(
+                            (
+                                version_idx,
+                                len(dependency_entities) - 1,
+                                {
+                                    "version_range": dependency.get("required_version") or "*",
+                                    "marker": dependency.get("marker"),
+                                    "extra": dependency["extra"][0] if dependency.get("extra") else None,
+                                    "marker_evaluation_result": dependency.get("marker_evaluation_result", True),
+                                },
+                            )
+                        )
+
+        for error_info in document["result"]["errors"]:
+            package_name = error_info.get("package_name") or error_info["package"]
+            package_version = error_info.get("package_version") or error_info["version"]
+            index_url = error_info.get("index_url") or error_info["index"]
+
+            _LOGGER.info(
+                "Syncing solver errors for package %r in version %r from %r found by solver %r",
+                package_name,
+                package_version,
+                index_url,
+                solver_info,
+            )
+
+            # Sync to PPV table only packages that are provided, regardless solving errors. The default
+            # value of True is due to legacy thoth-solver output.
+            version_idx = None
+            if error_info.get("is_provided_package_version", True):
+                version_idx = _add_version(package_name, package_version, index_url)
+
+            solved.append(
+                (
+                    version_idx,
+                    {
+                        "error": True,
+                        "error_unparseable": False,
+                        "error_unsolvable": False,
+                        "is_provided": version_idx is not None,
+                    },
+                )
+            )
+
+        for unsolvable in document["result"]["unresolved"]:
+            if not unsolvable["version_spec"].startswith("==="):
+                _LOGGER.warning(
+                    "Cannot sync unsolvable package %r as package is not locked to as specific version", unsolvable
+                )
+                continue
+
+            package_name = unsolvable["package_name"]
+            index_url = unsolvable.get("index_url") or unsolvable["index"]
+            package_version = unsolvable["version_spec"][len("===") :]
+
+            _LOGGER.info(
+                "Syncing unsolvable package %r in version %r from %r found by solver %r",
+                package_name,
+                package_version,
+                index_url,
+                solver_info,
+            )
+            version_idx = _add_version(package_name, package_version, index_url)
+            solved.append((version_idx, {"error": True, "error_unparseable": False, "error_unsolvable": True}))
+
+        for unparsed in document["result"]["unparsed"]:
+            parts = unparsed["requirement"].rsplit("===", maxsplit=1)
+            if len(parts) != 2:
+                _LOGGER.warning(
+                    "Cannot sync unparsed package %r as package is not locked to as specific version", unparsed
+                )
+                continue
+
+            package_name, package_version = parts
+
+            _LOGGER.info(
+                "Syncing unparsed package %r in version %r from %r", package_name, package_version, solver_info
+            )
+            version_idx = _add_version(package_name, package_version, None)
+            solved.append((version_idx, {"error": True, "error_unparseable": True, "error_unsolvable": False}))
+
+        # Entities - the ones for package versions synced followed by the dependency ones.
+        entity_keys = [
+            (package_name, package_version, index_id) for package_name, package_version, index_id in versions
+        ]
+        entity_keys.extend(
+            (package_name, package_version, None) for package_name, package_version in dependency_entities
+        )
+        entity_ids = PythonPackageVersionEntity.bulk_get_or_create(
+            session,
+            [
+                {"package_name": package_name, "package_version": package_version, "python_package_index_id": index_id}
+                for package_name, package_version, index_id in entity_keys
+            ],
+        )
+        self._refresh_rules_python_entities(
+            session, ((entity_id, key[0], key[1]) for entity_id, key in zip(entity_ids, entity_keys))
+        )
+
+        version_ids = PythonPackageVersion.bulk_get_or_create(
+            session,
+            [
+                {
+                    "package_name": package_name,
+                    "package_version": package_version,
+                    "python_package_index_id": index_id,
+                    "os_name": ecosystem_solver.os_name,
+                    "os_version": ecosystem_solver.os_version,
+                    "python_version": ecosystem_solver.python_version,
+                    "entity_id": entity_id,
+                }
+                for (package_name, package_version, index_id), entity_id in zip(versions, entity_ids)
+            ],
+        )
+
+        # Metadata and licenses of packages in the tree.
+        metadata_ids = PythonPackageMetadata.bulk_get_or_create(session, metadata_rows)
+        license_ids = PythonPackageLicense.bulk_get_or_create(session, license_rows)
+
+        by_model: Dict[Any, List[Tuple[int, Any, str, Dict[str, Any]]]] = {}
+        for idx, model, association_model, association_column, row in multi_part_rows:
+            by_model.setdefault(model, []).append((idx, association_model, association_column, row))
+
+        for model, entries in by_model.items():
+            ids = model.bulk_get_or_create(session, [row for _, _, _, row in entries])
+            entries[0][1].bulk_create(
+                session,
+                (
+                    {"python_package_metadata_id": metadata_ids[idx], association_column: value_id}
+                    for (idx, _, association_column, _), value_id in zip(entries, ids)
+                ),
+            )
+
+        # Including these values in get_or_create would cause errors as they are not part of a unique entry. The
+        # last entry wins if a package version is stated multiple times, the license warning is never unset.
+        version_updates: Dict[int, Dict[str, Any]] = {}
+        for version_idx, metadata_id, license_id, license_warning in zip(
+            tree_versions, metadata_ids, license_ids, license_warnings
+        ):
+            version_id = version_ids[version_idx]
+            license_warning = bool(license_warning) or version_updates.get(version_id, {}).get(
+                "package_license_warning"
+            )
+            version_updates[version_id] = {
+                "id": version_id,
+                "python_package_metadata_id": metadata_id,
+                "package_license": license_id,
+                "package_license_warning": license_warning,
+            }
+
+        PythonPackageVersion.bulk_update(
+            session, [row for row in version_updates.values() if row["package_license_warning"]]
+        )
+        PythonPackageVersion.bulk_update(
+            session,
+            [
+                {key: value for key, value in row.items() if key != "package_license_warning"}
+                for row in version_updates.values()
+                if not row["package_license_warning"]
+            ],
+        )
+
+        artifact_ids = PythonArtifact.bulk_get_or_create(
+            session, [{"artifact_hash_sha256": sha256, "artifact_name": None} for _, sha256 in artifacts]
+        )
+        HasArtifact.bulk_create(
+            session,
+            (
+                {
+                    "python_artifact_id": artifact_id,
+                    "python_package_version_entity_id": entity_ids[tree_versions[idx]],
+                }
+                for (idx, _), artifact_id in zip(artifacts, artifact_ids)
+            ),
+        )
+
+        import_package_ids = ImportPackage.bulk_get_or_create(
+            session, [{"import_package_name": import_package_name} for _, import_package_name in import_packages]
+        )
+        FoundImportPackage.bulk_create(
+            session,
+            (
+                {"python_package_version_id": version_ids[tree_versions[idx]], "import_package_id": import_package_id}
+                for (idx, _), import_package_id in zip(import_packages, import_package_ids)
+            ),
+        )
+
+        DependsOn.bulk_create(
+            session,
+            (
+                {
+                    "version_id": version_ids[version_idx],
+                    "entity_id": entity_ids[len(versions) + dependency_idx],
+                    **attributes,
+                }
+                for version_idx, dependency_idx, attributes in depends_on
+            ),
+        )
+
+        Solved.bulk_create(
+            session,
+            (
+                {
+                    "datetime": solver_datetime,
+                    "document_id": solver_document_id,
+                    "version_id": version_ids[version_idx] if version_idx is not None else None,
+                    "ecosystem_solver_id": ecosystem_solver.id,
+                    "duration": solver_duration,
+                    # All the rows have to state the same columns, only errors state whether the package is provided.
+                    "is_provided": None,
+                    **flags,
+                }
+                for version_idx, flags in solved
+            ),
+        )
+
     def sync_adviser_result(self, document: dict) -> None:
         """Sync adviser result into graph database."""
         adviser_document_id = AdvisersResultsStore.get_document_id(document)
@@ -6326,6 +8468,7 @@ class GraphDatabase(SQLBase):
             _LOGGER.warning("No s2i flag stated in the adviser result %r", adviser_document_id)
 
         with self._session_scope() as session, session.begin(subtransactions=True):
+            package_names = self._written_package_names(session)
             external_hardware_info, external_run_software_environment = self._runtime_environment_conf2models(
                 session,
                 runtime_environment=runtime_environment,
@@ -6497,6 +8640,8 @@ class GraphDatabase(SQLBase):
                     python_package_version_entity_id=python_package_version_entity.id,
                 )
 
+        self._invalidate_python_package_version_entities(package_names)
+
     def sync_provenance_checker_result(self, document: dict) -> None:
         """Sync provenance checker results into graph database."""
         provenance_checker_document_id = ProvenanceResultsStore.get_document_id(document)
@@ -6506,6 +8651,7 @@ class GraphDatabase(SQLBase):
             _LOGGER.warning("No origin stated in the provenance-checker result %r", provenance_checker_document_id)
 
         with self._session_scope() as session, session.begin(subtransactions=True):
+            package_names = self._written_package_names(session)
             parameters = document["result"]["parameters"]
             software_stack = self._create_python_software_stack(
                 session,
@@ -6546,6 +8692,8 @@ class GraphDatabase(SQLBase):
                         sync_only_entity=True,
                     )
 
+        self._invalidate_python_package_version_entities(package_names)
+
     def sync_dependency_monkey_result(self, document: dict) -> None:
         """Sync reports of dependency monkey runs."""
         if "ERROR" in document["result"]["report"]:
@@ -6556,6 +8704,7 @@ class GraphDatabase(SQLBase):
             return
 
         with self._session_scope() as session, session.begin(subtransactions=True):
+            package_names = self._written_package_names(session)
             parameters = document["result"]["parameters"]
 
             run_hardware_information, run_software_environment = self._runtime_environment_conf2models(
@@ -6623,7 +8772,19 @@ class GraphDatabase(SQLBase):
                         )
                         session.add(inspection_run)
 
-    @lru_cache(maxsize=_GET_PYTHON_PACKAGE_REQUIRED_SYMBOLS_CACHE_SIZE)
+        self._invalidate_python_package_version_entities(package_names)
+
+    @lru_cache(
+        maxsize=_GET_PYTHON_PACKAGE_REQUIRED_SYMBOLS_CACHE_SIZE,
+        tables=(
+            "python_package_version_entity",
+            "python_package_index",
+            "has_artifact",
+            "requires_symbol",
+            "versioned_symbol",
+        ),
+        key_argument="package_name",
+    )
     def get_python_package_required_symbols(self, package_name: str, package_version: str, index_url: str) -> List[str]:
         """Get required symbols for a Python package in a specified version."""
         package_name = self.normalize_python_package_name(package_name)
@@ -6671,7 +8832,10 @@ class GraphDatabase(SQLBase):
             # Query returns list of single tuples (empty if bad request)
             return [i[0] for i in query.all()]
 
-    @lru_cache(maxsize=_GET_S2I_ANALYZED_IMAGE_SYMBOLS)
+    @lru_cache(
+        maxsize=_GET_S2I_ANALYZED_IMAGE_SYMBOLS,
+        tables=("software_environment", "external_software_environment", "has_symbol", "versioned_symbol"),
+    )
     def get_thoth_s2i_analyzed_image_symbols_all(
         self, thoth_image_name: str, thoth_image_version: str, is_external: bool = False
     ) -> List[str]:
@@ -6784,7 +8948,42 @@ class GraphDatabase(SQLBase):
         for method in self._CACHED_METHODS:
             stats[method.__name__] = dict(method.cache_info()._asdict())
 
-        return {"memory_cache_info": stats}
+        return {
+            "memory_cache_info": stats,
+            "shared_cache_info": self._query_cache.stats() if self._query_cache is not None else None,
+            "get_or_create_cache_info": BaseExtension.get_or_create_cache_info(),
+            "pool_info": self._engine.pool.checkout_stats() if self.is_connected() else None,
+            "prepared_statement_info": dict(self._prepared_statement_stats) if self._prepared_statement_stats else None,
+            "instrumentation": self._query_instrumentation.export() if self._query_instrumentation else None,
+        }
+
+    def cache_invalidate(self, tables: Iterable[str], keys: Optional[Iterable[str]] = None) -> int:
+        """Invalidate cached results of methods reading the given tables, return number of entries invalidated.
+
+        If keys are given (package names or document ids written), only results computed for these keys are
+        invalidated in methods tracking keys. Results kept in the shared query cache are invalidated for the
+        whole namespace.
+        """
+        tables = frozenset(tables)
+        if keys is not None:
+            keys = set(keys)
+
+        count = 0
+        for method in self._CACHED_METHODS:
+            if method.tables & tables:
+                count += method.invalidate(keys)
+
+        if self._query_cache is not None:
+            shared_namespaces = {
+                shared_namespace
+                for method_tables, shared_namespace in _CACHED_METHOD_TABLES.values()
+                if shared_namespace is not None and method_tables & tables
+            }
+            for shared_namespace in shared_namespaces:
+                self._query_cache.invalidate(shared_namespace)
+
+        _LOGGER.debug("Invalidated %d cached entries reading %r (keys: %r)", count, sorted(tables), keys)
+        return count
 
     def cache_clear(self) -> None:
         """Drop cache of records."""
@@ -7171,108 +9370,147 @@ class GraphDatabase(SQLBase):
 
         return self._process_bloat_data_results(tables=tables)
 
-    def purge_solver_documents(
-        self, *, os_name: Optional[str] = None, os_version: Optional[str] = None, python_version: Optional[str] = None
+    def _purge_documents(
+        self,
+        store: Union[AdvisersResultsStore, AnalysisResultsStore, SolverResultsStore],
+        purge_name: str,
+        purge_id: Optional[str],
+        iter_document_ids: Any,
+        delete_results: Any,
     ) -> int:
-        """Store and purge to be deleted solver documents to Ceph."""
-        solver_store = SolverResultsStore()
-        solver_store.connect()
+        """Move documents to a purge prefix on Ceph and delete their database records in chunks.
+
+        Documents of a chunk are copied server-side by a pool of workers, then deleted in batched requests
+        and their database records are deleted in one transaction. A progress marker is stored on Ceph once
+        a chunk is purged, purge with the same identifier skips chunks already purged. The identifier defaults
+        to the current datetime, it is logged on start and on failure so that the purge can be resumed.
+        """
+        store.connect()
 
-        target_prefix = f"{solver_store.ceph.prefix.rsplit('/', maxsplit=2)[0]}/solver-purge-{datetime2datetime_str()}/"
+        purge_id = purge_id or datetime2datetime_str()
+        target_prefix = f"{store.ceph.prefix.rsplit('/', maxsplit=2)[0]}/{purge_name}-purge-{purge_id}/"
         target_store = CephStore(prefix=target_prefix)
         target_store.connect()
 
-        solver_document_ids = self.get_solver_run_document_ids_all(
-            os_version=os_version, os_name=os_name, python_version=python_version
+        cursor = None
+        purged = 0
+        if target_store.document_exists(_PURGE_PROGRESS_DOCUMENT_ID):
+            progress = target_store.retrieve_document(_PURGE_PROGRESS_DOCUMENT_ID)
+            cursor = progress["cursor"]
+            purged = progress["purged"]
+            _LOGGER.info("Resuming purge %r, %d documents purged so far", target_prefix, purged)
+
+        _LOGGER.info(
+            "Purging %s documents to %r with purge id %r, pass the purge id to resume the purge if interrupted",
+            purge_name,
+            target_prefix,
+            purge_id,
         )
+        deleted_documents_count = 0
+        try:
+            for document_ids, cursor in iter_document_ids(cursor=cursor, chunk_size=_PURGE_CHUNK_SIZE):
+                errors = store.move_many(document_ids, target_store, concurrency=_PURGE_WORKERS)
 
-        deleted_solver_documents_count = 0
+                failed = {
+                    document_id: error for document_id, error in errors.items() if not isinstance(error, NotFoundError)
+                }
+                # Documents not found were moved by a purge interrupted before the progress marker was stored.
+                archived = target_store.exists_many(document_id for document_id in errors if document_id not in failed)
+                for document_id, document_exists in archived.items():
+                    if not document_exists:
+                        _LOGGER.warning("Document %r to be purged was not found on Ceph", document_id)
+
+                if failed:
+                    raise DeleteError(
+                        f"Failed to move {len(failed)} documents to {target_prefix!r}, the purge can be resumed "
+                        f"using purge id {purge_id!r}: {failed}"
+                    )
 
-        for solver_document_id in solver_document_ids:
-            document = solver_store.retrieve_document(document_id=solver_document_id)
-            target_store.store_document(document, document_id=solver_document_id)
-            solver_store.ceph.delete(object_key=solver_document_id)
-            deleted_solver_documents_count += self.delete_solver_result(solver_document_id=solver_document_id)
+                deleted_documents_count += delete_results(document_ids)
+                purged += len(document_ids)
+                target_store.store_document(
+                    {"cursor": cursor, "purged": purged, "datetime": datetime2datetime_str()},
+                    document_id=_PURGE_PROGRESS_DOCUMENT_ID,
+                )
+                _LOGGER.debug("Purged %d documents to %r", purged, target_prefix)
+        except Exception:
+            _LOGGER.error(
+                "Purge of %s documents to %r failed, pass purge id %r to resume it", purge_name, target_prefix, purge_id
+            )
+            raise
 
-        return deleted_solver_documents_count
+        return deleted_documents_count
 
-    def purge_adviser_documents(
-        self, *, end_datetime: Optional[datetime] = None, adviser_version: Optional[str] = None
+    def purge_solver_documents(
+        self,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        purge_id: Optional[str] = None,
     ) -> int:
-        """Store and purge to be deleted adviser documents to Ceph."""
-        adviser_store = AdvisersResultsStore()
-        adviser_store.connect()
+        """Store and purge to be deleted solver documents to Ceph.
 
-        target_prefix = (
-            f"{adviser_store.ceph.prefix.rsplit('/', maxsplit=2)[0]}/adviser-purge-{datetime2datetime_str()}/"
+        Documents are purged in chunks, an interrupted purge is resumed if the same purge_id is passed.
+        """
+        return self._purge_documents(
+            SolverResultsStore(),
+            "solver",
+            purge_id,
+            functools.partial(
+                self.iter_solver_run_document_ids_all,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+            ),
+            self.delete_solver_results,
         )
-        target_store = CephStore(prefix=target_prefix)
-        target_store.connect()
-
-        with self._session_scope() as session:
-            query = session.query(AdviserRun.adviser_document_id).with_entities(AdviserRun.adviser_document_id)
-
-            if end_datetime:
-                date_filter = self._create_date_filter(end_datetime)
-                query = query.filter(AdviserRun.datetime < date_filter)
 
-            if adviser_version:
-                query = query.filter(AdviserRun.adviser_version == adviser_version)
-
-            adviser_document_ids = query.all()
-            adviser_document_ids = [obj[0] for obj in adviser_document_ids]
-
-        deleted_adviser_documents_count = 0
-
-        for adviser_document_id in adviser_document_ids:
-            document = adviser_store.retrieve_document(document_id=adviser_document_id)
-            target_store.store_document(document, document_id=adviser_document_id)
-            adviser_store.ceph.delete(object_key=adviser_document_id)
-            deleted_adviser_documents_count += self.delete_adviser_result(adviser_document_id=adviser_document_id)
+    def purge_adviser_documents(
+        self,
+        *,
+        end_datetime: Optional[datetime] = None,
+        adviser_version: Optional[str] = None,
+        purge_id: Optional[str] = None,
+    ) -> int:
+        """Store and purge to be deleted adviser documents to Ceph.
 
-        return deleted_adviser_documents_count
+        Documents are purged in chunks, an interrupted purge is resumed if the same purge_id is passed.
+        """
+        return self._purge_documents(
+            AdvisersResultsStore(),
+            "adviser",
+            purge_id,
+            functools.partial(
+                self.iter_adviser_run_document_ids_all, final_date=end_datetime, adviser_version=adviser_version
+            ),
+            self.delete_adviser_results,
+        )
 
     def purge_package_extract_documents(
-        self, *, end_datetime: Optional[datetime] = None, package_extract_version: Optional[str] = None
+        self,
+        *,
+        end_datetime: Optional[datetime] = None,
+        package_extract_version: Optional[str] = None,
+        purge_id: Optional[str] = None,
     ) -> int:
-        """Store and purge to be deleted package extract documents to Ceph."""
-        package_extract_store = AnalysisResultsStore()
-        package_extract_store.connect()
+        """Store and purge to be deleted package extract documents to Ceph.
 
-        target_prefix = (
-            f"{package_extract_store.ceph.prefix.rsplit('/', maxsplit=2)[0]}"
-            f"/package-extract-purge-{datetime2datetime_str()}/"
+        Documents are purged in chunks, an interrupted purge is resumed if the same purge_id is passed.
+        """
+        return self._purge_documents(
+            AnalysisResultsStore(),
+            "package-extract",
+            purge_id,
+            functools.partial(
+                self.iter_package_extract_run_document_ids_all,
+                final_date=end_datetime,
+                package_extract_version=package_extract_version,
+            ),
+            self.delete_analysis_results,
         )
-        target_store = CephStore(prefix=target_prefix)
-        target_store.connect()
-
-        with self._session_scope() as session:
-            query = session.query(PackageExtractRun.analysis_document_id).with_entities(
-                PackageExtractRun.analysis_document_id
-            )
-
-            if end_datetime:
-                date_filter = self._create_date_filter(end_datetime)
-                query = query.filter(PackageExtractRun.datetime < date_filter)
-
-            if package_extract_version:
-                query = query.filter(PackageExtractRun.package_extract_version == package_extract_version)
-
-            package_extract_document_ids = query.all()
-            package_extract_document_ids = [obj[0] for obj in package_extract_document_ids]
-
-        deleted_package_extract_documents_count = 0
-
-        for package_extract_document_id in package_extract_document_ids:
-            document = package_extract_store.retrieve_document(document_id=package_extract_document_id)
-            target_store.store_document(document, document_id=package_extract_document_id)
-            package_extract_store.ceph.delete(object_key=package_extract_document_id)
-            deleted_package_extract_documents_count += self.delete_analysis_result(
-                analysis_document_id=package_extract_document_id
-            )
-
-        return deleted_package_extract_documents_count
 
+    @invalidates_cache(tables=("ecosystem_solver", "solved"))
     def delete_solved(self, *, os_name: str, os_version: str, python_version: str) -> int:
         """Delete corresponding solver data."""
         with self._session_scope() as session:
@@ -7289,7 +9527,38 @@ class GraphDatabase(SQLBase):
     def delete_solver_result(self, solver_document_id: str) -> int:
         """Delete the corresponding solver result."""
         with self._session_scope() as session:
-            return session.query(Solved).filter(Solved.document_id == solver_document_id).delete()
+            package_names = {
+                item[0]
+                for item in session.query(Solved)
+                .filter(Solved.document_id == solver_document_id)
+                .join(PythonPackageVersion)
+                .with_entities(PythonPackageVersion.package_name)
+                .distinct()
+            }
+            deleted = session.query(Solved).filter(Solved.document_id == solver_document_id).delete()
+
+        self.cache_invalidate(("solved",), package_names)
+        return deleted
+
+    def delete_solver_results(self, solver_document_ids: List[str]) -> int:
+        """Delete solver results with the given document ids in one transaction."""
+        with self._session_scope() as session:
+            package_names = {
+                item[0]
+                for item in session.query(Solved)
+                .filter(Solved.document_id.in_(solver_document_ids))
+                .join(PythonPackageVersion)
+                .with_entities(PythonPackageVersion.package_name)
+                .distinct()
+            }
+            deleted = (
+                session.query(Solved)
+                .filter(Solved.document_id.in_(solver_document_ids))
+                .delete(synchronize_session=False)
+            )
+
+        self.cache_invalidate(("solved",), package_names)
+        return deleted
 
     def delete_adviser_run(
         self,
@@ -7317,6 +9586,15 @@ class GraphDatabase(SQLBase):
         with self._session_scope() as session:
             return session.query(AdviserRun).filter(AdviserRun.adviser_document_id == adviser_document_id).delete()
 
+    def delete_adviser_results(self, adviser_document_ids: List[str]) -> int:
+        """Delete adviser results with the given document ids in one transaction."""
+        with self._session_scope() as session:
+            return (
+                session.query(AdviserRun)
+                .filter(AdviserRun.adviser_document_id.in_(adviser_document_ids))
+                .delete(synchronize_session=False)
+            )
+
     def delete_package_extract_run(
         self,
         *,
@@ -7338,6 +9616,7 @@ class GraphDatabase(SQLBase):
         with self._session_scope() as session:
             return session.query(PackageExtractRun).filter(*delete_filter).delete()
 
+    @invalidates_cache(tables=("package_extract_run", "found_rpm", "identified"), key_argument="analysis_document_id")
     def delete_analysis_result(self, analysis_document_id: str) -> int:
         """Delete the given package-extract entry."""
         with self._session_scope() as session:
@@ -7347,6 +9626,18 @@ class GraphDatabase(SQLBase):
                 .delete()
             )
 
+    def delete_analysis_results(self, analysis_document_ids: List[str]) -> int:
+        """Delete package-extract entries with the given document ids in one transaction."""
+        with self._session_scope() as session:
+            deleted = (
+                session.query(PackageExtractRun)
+                .filter(PackageExtractRun.analysis_document_id.in_(analysis_document_ids))
+                .delete(synchronize_session=False)
+            )
+
+        self.cache_invalidate(("package_extract_run", "found_rpm", "identified"), analysis_document_ids)
+        return deleted
+
     @staticmethod
     def _refresh_python_entities_rule(session: Session, rule: PythonPackageVersionEntityRule) -> None:
         """Assign the given rule to entities stored in the database if the rule applies."""
@@ -7370,6 +9661,7 @@ class GraphDatabase(SQLBase):
 
     def _refresh_rules_python_entity(self, session: Session, entity: PythonPackageVersionEntity) -> None:
         """Add all rules that applies to the given entity stored in the database."""
+        self._written_package_names(session).add(entity.package_name)
         version = parse_version(entity.package_version)
 
         rules = self.get_python_rule_all(package_name=entity.package_name, index_url=None, count=None)
@@ -7391,6 +9683,18 @@ class GraphDatabase(SQLBase):
                     python_package_version_entity_rule_id=rule["id"],
                 )
 
+    @staticmethod
+    def _written_package_names(session: Session) -> Set[str]:
+        """Get names of packages whose entities were written in the given session."""
+        return session.info.setdefault("written_package_names", set())
+
+    def _invalidate_python_package_version_entities(self, package_names: Iterable[str]) -> None:
+        """Invalidate cached results reading entities of the given packages and rules assigned to them."""
+        if package_names:
+            self.cache_invalidate(
+                ("python_package_version_entity", "python_package_version_entity_rules_association"), package_names
+            )
+
     def _rule_to_dict(self, rule: PythonPackageVersionEntityRule) -> Dict[str, Any]:
         """Convert a rule model to a dict representation."""
         rule_dict = rule.to_dict(without_id=False)
@@ -7398,6 +9702,10 @@ class GraphDatabase(SQLBase):
         rule_dict["index_url"] = self.get_index_url_from_id(index_id) if index_id else None
         return rule_dict
 
+    @invalidates_cache(
+        tables=("python_package_version_entity_rule", "python_package_version_entity_rules_association"),
+        key_argument="package_name",
+    )
     def create_python_rule(
         self,
         package_name: str,
@@ -7455,6 +9763,7 @@ class GraphDatabase(SQLBase):
             self._refresh_python_entities_rule(session, rule)
             return self._rule_to_dict(rule)
 
+    @invalidates_cache(tables=("python_package_version_entity_rule", "python_package_version_entity_rules_association"))
     def delete_python_rule(self, rule_id: int) -> int:
         """Delete the given Python rule."""
         with self._session_scope() as session:
@@ -7510,7 +9819,16 @@ class GraphDatabase(SQLBase):
 
             return result
 
-    @lru_cache(maxsize=_GET_PYTHON_PYTHON_PACKAGE_VERSION_SOLVER_RULES_CACHE_SIZE)
+    @lru_cache(
+        maxsize=_GET_PYTHON_PYTHON_PACKAGE_VERSION_SOLVER_RULES_CACHE_SIZE,
+        tables=(
+            "python_package_version_entity",
+            "python_package_index",
+            "python_package_version_entity_rule",
+            "python_package_version_entity_rules_association",
+        ),
+        key_argument="package_name",
+    )
     def get_python_package_version_solver_rules_all(
         self,
         package_name: str,
@@ -7550,7 +9868,11 @@ class GraphDatabase(SQLBase):
                 .all()
             ]
 
-    @lru_cache(maxsize=_GET_RPM_PACKAGE_VERSION_CACHE_SIZE)
+    @lru_cache(
+        maxsize=_GET_RPM_PACKAGE_VERSION_CACHE_SIZE,
+        tables=("package_extract_run", "found_rpm", "rpm_package_version"),
+        key_argument="analysis_document_id",
+    )
     def get_rpm_package_version_all(self, analysis_document_id: str) -> List[Dict[str, str]]:
         """Retrieve RPM package information for the given container image analysis."""
         with self._session_scope() as session:
@@ -7564,7 +9886,11 @@ class GraphDatabase(SQLBase):
 
             return [i.to_dict() for i in query.all()]
 
-    @lru_cache(maxsize=_GET_RPM_PACKAGE_VERSION_CACHE_SIZE)
+    @lru_cache(
+        maxsize=_GET_RPM_PACKAGE_VERSION_CACHE_SIZE,
+        tables=("package_extract_run", "identified", "python_package_version_entity"),
+        key_argument="analysis_document_id",
+    )
     def get_python_package_version_all(self, analysis_document_id: str) -> List[Dict[str, str]]:
         """Retrieve Python package information for the given container image analysis."""
         with self._session_scope() as session:
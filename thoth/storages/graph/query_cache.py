@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A second-level cache of query results shared across processes using the graph database adapter.
+
+Entries are stored in versioned namespaces, bumping version of a namespace (for example once new solver
+data are synced) invalidates all the entries stored in the namespace in all the processes sharing the cache.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urlparse
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# URL of the shared cache of query results (file:///path/to/directory or redis://host:port/db), not used if not set.
+_QUERY_CACHE_URL = os.getenv("THOTH_STORAGE_QUERY_CACHE")
+# Time to live of cached query results in seconds, 0 for no expiration.
+_QUERY_CACHE_TTL = int(os.getenv("THOTH_STORAGE_QUERY_CACHE_TTL", 3600))
+# Interval in seconds for checking namespace versions bumped by other processes.
+_QUERY_CACHE_VERSION_CHECK_INTERVAL = float(os.getenv("THOTH_STORAGE_QUERY_CACHE_VERSION_CHECK_INTERVAL", 5))
+
+# Expiration timestamp stored in front of each cached entry in the file backend.
+_EXPIRATION = struct.Struct(">d")
+
+
+def _canonicalize(value: Any) -> Any:
+    """Convert the given value to a JSON serializable representation which is the same across processes."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, (set, frozenset)):
+        return ["set", sorted((_canonicalize(item) for item in value), key=json.dumps)]
+    elif isinstance(value, (list, tuple)):
+        return ["list", [_canonicalize(item) for item in value]]
+    elif isinstance(value, dict):
+        return ["dict", sorted(([_canonicalize(k), _canonicalize(v)] for k, v in value.items()), key=json.dumps)]
+
+    raise TypeError(f"Cannot construct cache key out of value of type {type(value)!r}: {value!r}")
+
+
+def _serialize(value: Any) -> Any:
+    """Convert the given query result to a JSON serializable representation keeping tuples and dictionary keys."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, list):
+        return [_serialize(item) for item in value]
+    elif isinstance(value, tuple):
+        return {"tuple": [_serialize(item) for item in value]}
+    elif isinstance(value, dict):
+        return {"dict": [[_serialize(k), _serialize(v)] for k, v in value.items()]}
+
+    raise TypeError(f"Cannot store query result of type {type(value)!r} in query cache: {value!r}")
+
+
+def _deserialize(value: Any) -> Any:
+    """Convert the given representation created by _serialize back to the query result."""
+    if isinstance(value, list):
+        return [_deserialize(item) for item in value]
+    elif isinstance(value, dict) and value.keys() == {"tuple"}:
+        return tuple(_deserialize(item) for item in value["tuple"])
+    elif isinstance(value, dict) and value.keys() == {"dict"}:
+        return {_deserialize(k): _deserialize(v) for k, v in value["dict"]}
+    elif isinstance(value, dict):
+        raise ValueError(f"Unknown query result representation: {value!r}")
+
+    return value
+
+
+class QueryCacheBase:
+    """A base class for second-level caches of query results, subclasses implement storage of entries."""
+
+    backend = None
+
+    def __init__(self, prefix: str = "thoth-storages", ttl: Optional[int] = None) -> None:
+        """Initialize the cache, entries are stored under the given prefix."""
+        self.prefix = prefix
+        self.ttl = ttl if ttl is not None else _QUERY_CACHE_TTL
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "errors": 0})
+        self._lock = threading.Lock()
+
+    def _get(self, namespace: str, version: int, key: str) -> Optional[bytes]:
+        """Get the given entry from the cache, None if not cached or expired."""
+        raise NotImplementedError
+
+    def _set(self, namespace: str, version: int, key: str, blob: bytes, ttl: int) -> None:
+        """Store the given entry in the cache."""
+        raise NotImplementedError
+
+    def _get_version(self, namespace: str) -> int:
+        """Get the current version of the given namespace."""
+        raise NotImplementedError
+
+    def _bump_version(self, namespace: str) -> int:
+        """Bump version of the given namespace, return the new version."""
+        raise NotImplementedError
+
+    def get_version(self, namespace: str) -> int:
+        """Get version of the given namespace, versions bumped by other processes are checked periodically."""
+        version, checked = self._versions.get(namespace, (None, 0.0))
+        now = time.monotonic()
+        if version is None or now - checked > _QUERY_CACHE_VERSION_CHECK_INTERVAL:
+            version = self._get_version(f"{self.prefix}:{namespace}")
+            self._versions[namespace] = (version, now)
+
+        return version
+
+    def invalidate(self, namespace: str) -> None:
+        """Invalidate all the entries stored in the given namespace."""
+        try:
+            version = self._bump_version(f"{self.prefix}:{namespace}")
+        except Exception as exc:
+            _LOGGER.warning("Failed to invalidate namespace %r of query cache: %s", namespace, str(exc))
+            self._versions.pop(namespace, None)
+            return
+
+        self._versions[namespace] = (version, time.monotonic())
+        _LOGGER.debug("Query cache namespace %r invalidated, new version is %d", namespace, version)
+
+    def _count(self, method_name: str, counter: str) -> None:
+        """Increment the given counter of the given method."""
+        with self._lock:
+            self._stats[method_name][counter] += 1
+
+    def lookup(
+        self,
+        namespace: str,
+        method_name: str,
+        args: tuple,
+        kwargs: Dict[str, Any],
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+    ) -> Any:
+        """Get result of the given method call from the cache, compute it and cache it if not cached.
+
+        Failures of the cache backend and arguments which cannot be used in a cache key are logged and the
+        result is computed as if the cache was not used. Results are stored as JSON, only results built out
+        of lists, tuples, dictionaries and primitive values are cached.
+        """
+        try:
+            key_content = json.dumps([method_name, _canonicalize(args), _canonicalize(kwargs)])
+            key = hashlib.sha256(key_content.encode()).hexdigest()
+            version = self.get_version(namespace)
+            blob = self._get(f"{self.prefix}:{namespace}", version, key)
+        except Exception as exc:
+            _LOGGER.warning("Failed to retrieve %r result from query cache: %s", method_name, str(exc))
+            self._count(method_name, "errors")
+            return compute()
+
+        if blob is not None:
+            try:
+                result = _deserialize(json.loads(blob))
+            except (ValueError, TypeError) as exc:
+                # For example entries stored by older versions, they are overwritten.
+                _LOGGER.warning("Failed to decode %r result retrieved from query cache: %s", method_name, str(exc))
+                self._count(method_name, "errors")
+            else:
+                self._count(method_name, "hits")
+                return result
+
+        self._count(method_name, "misses")
+        result = compute()
+
+        try:
+            self._set(
+                f"{self.prefix}:{namespace}",
+                version,
+                key,
+                json.dumps(_serialize(result), separators=(",", ":")).encode(),
+                ttl if ttl is not None else self.ttl,
+            )
+        except Exception as exc:
+            _LOGGER.warning("Failed to store %r result in query cache: %s", method_name, str(exc))
+            self._count(method_name, "errors")
+
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get statistics of the cache per cached method."""
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "methods": {method_name: dict(stats) for method_name, stats in self._stats.items()},
+                "namespace_versions": {namespace: version for namespace, (version, _) in self._versions.items()},
+            }
+
+
+class FileQueryCache(QueryCacheBase):
+    """A cache storing entries in a local directory, shared by processes on the same host (e.g. /dev/shm)."""
+
+    backend = "file"
+
+    def __init__(self, directory: str, prefix: str = "thoth-storages", ttl: Optional[int] = None) -> None:
+        """Initialize the cache stored in the given directory."""
+        super().__init__(prefix, ttl)
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _get_namespace_directory(self, namespace: str) -> str:
+        """Get directory holding the given namespace."""
+        return os.path.join(self.directory, hashlib.sha256(namespace.encode()).hexdigest())
+
+    def _get(self, namespace: str, version: int, key: str) -> Optional[bytes]:
+        """Get the given entry from the cache, None if not cached or expired."""
+        path = os.path.join(self._get_namespace_directory(namespace), str(version), key)
+        try:
+            with open(path, "rb") as entry_file:
+                content = entry_file.read()
+        except FileNotFoundError:
+            return None
+
+        (expiration,) = _EXPIRATION.unpack_from(content)
+        if expiration and expiration < time.time():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+
+        return content[_EXPIRATION.size :]  # Ignore PycodestyleBear (E203)
+
+    def _set(self, namespace: str, version: int, key: str, blob: bytes, ttl: int) -> None:
+        """Store the given entry in the cache."""
+        directory = os.path.join(self._get_namespace_directory(namespace), str(version))
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".")
+        with os.fdopen(fd, "wb") as entry_file:
+            entry_file.write(_EXPIRATION.pack(time.time() + ttl if ttl else 0.0))
+            entry_file.write(blob)
+
+        os.replace(tmp_path, os.path.join(directory, key))
+
+    def _get_version(self, namespace: str) -> int:
+        """Get the current version of the given namespace."""
+        try:
+            with open(os.path.join(self._get_namespace_directory(namespace), "version")) as version_file:
+                return int(version_file.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _bump_version(self, namespace: str) -> int:
+        """Bump version of the given namespace, entries of the previous version are removed."""
+        directory = self._get_namespace_directory(namespace)
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, "version"), "a+") as version_file:
+            fcntl.flock(version_file, fcntl.LOCK_EX)
+            version_file.seek(0)
+            old_version = int(version_file.read() or 0)
+            version_file.seek(0)
+            version_file.truncate()
+            version_file.write(str(old_version + 1))
+
+        shutil.rmtree(os.path.join(directory, str(old_version)), ignore_errors=True)
+        return old_version + 1
+
+
+class RedisQueryCache(QueryCacheBase):
+    """A cache storing entries in Redis (or any server speaking its protocol), shared by processes on all hosts."""
+
+    backend = "redis"
+
+    def __init__(self, client: Any, prefix: str = "thoth-storages", ttl: Optional[int] = None) -> None:
+        """Initialize the cache using the given client, any object providing get, set and incr is accepted."""
+        super().__init__(prefix, ttl)
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "thoth-storages", ttl: Optional[int] = None) -> "RedisQueryCache":
+        """Create a cache connecting to the given Redis URL."""
+        if redis is None:
+            raise ValueError("Cannot use Redis query cache, redis library is not installed")
+
+        return cls(redis.Redis.from_url(url), prefix, ttl)
+
+    def _get(self, namespace: str, version: int, key: str) -> Optional[bytes]:
+        """Get the given entry from the cache, None if not cached or expired."""
+        return self.client.get(f"{namespace}:{version}:{key}")
+
+    def _set(self, namespace: str, version: int, key: str, blob: bytes, ttl: int) -> None:
+        """Store the given entry in the cache, entries of old versions are removed once they expire."""
+        self.client.set(f"{namespace}:{version}:{key}", blob, ex=ttl or None)
+
+    def _get_version(self, namespace: str) -> int:
+        """Get the current version of the given namespace."""
+        return int(self.client.get(f"{namespace}:version") or 0)
+
+    def _bump_version(self, namespace: str) -> int:
+        """Bump version of the given namespace."""
+        return int(self.client.incr(f"{namespace}:version"))
+
+
+def get_query_cache(url: Optional[str] = None, prefix: str = "thoth-storages") -> Optional[QueryCacheBase]:
+    """Create a query cache based on the given URL (defaults to THOTH_STORAGE_QUERY_CACHE), None if not configured."""
+    url = url if url is not None else _QUERY_CACHE_URL
+    if not url:
+        return None
+
+    scheme = urlparse(url).scheme
+    if scheme == "file":
+        return FileQueryCache(urlparse(url).path, prefix)
+    elif scheme in ("redis", "rediss", "unix"):
+        return RedisQueryCache.from_url(url, prefix)
+
+    raise ValueError(f"Unknown query cache URL scheme {scheme!r}, supported are file, redis, rediss and unix")
@@ -0,0 +1,960 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""An immutable snapshot of the Python dependency graph stored in a memory mapped file.
+
+The snapshot is exported out of the graph database and serves dependency queries done by resolvers without any
+database round trip. All the strings are interned and kept sorted so that ids preserve their order. Package
+version records are sorted by package name and version, dependencies of each record are stored in compressed
+sparse row arrays. Processes opening the same snapshot share its pages using the page cache.
+
+A snapshot directory keeps a base snapshot and delta snapshots layered over it, listed in a manifest which is
+replaced atomically on each refresh. Delta snapshots store records of packages written since the previous refresh,
+they override records of older layers and are periodically compacted into a new base snapshot.
+"""
+
+import bisect
+import contextlib
+import fcntl
+import functools
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from collections import namedtuple
+from datetime import datetime
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from thoth.common import map_os_name
+from thoth.common.helpers import normalize_os_version
+
+from .postgres import GraphDatabase
+from ..exceptions import NotFoundError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Identifies snapshot files and version of their format.
+_SNAPSHOT_MAGIC = b"THOTHDG\x00"
+_SNAPSHOT_FORMAT_VERSION = 1
+# Magic, format version, byte order and number of sections.
+_HEADER = struct.Struct("<8sI1s3xI")
+# Name, array type code, offset and number of items of a section.
+_SECTION = struct.Struct("<16s1s7xQQ")
+# An id used for strings which are not set (None).
+_NONE = 0xFFFFFFFF
+
+# Maximum number of delta snapshots layered over the base snapshot, deltas are compacted into a new base once exceeded.
+_SNAPSHOT_MAX_DELTAS = int(os.getenv("THOTH_STORAGE_GRAPH_SNAPSHOT_MAX_DELTAS", 8))
+
+# Name of the file listing the base snapshot and deltas layered over it in a snapshot directory.
+_MANIFEST_FILE_NAME = "manifest.json"
+# Number of attempts to open a snapshot directory which is refreshed concurrently.
+_OPEN_ATTEMPTS = 3
+
+# Flags of package version records.
+_RECORD_IS_MISSING = 0x1
+# Flags of dependency edges.
+_EDGE_MARKER_EVALUATION_RESULT = 0x1
+
+_Record = namedtuple(
+    "_Record",
+    [
+        "package_name",
+        "package_version",
+        "index_url",
+        "os_name",
+        "os_version",
+        "python_version",
+        "is_missing",
+        "position",
+    ],
+)
+
+
+class DependencyGraphSnapshotWriter:
+    """Collect package version records with their dependencies and write them into a snapshot file."""
+
+    def __init__(self) -> None:
+        """Initialize an empty snapshot."""
+        self._strings: Dict[str, int] = {}
+        self._environments: Dict[Tuple[int, int, int], int] = {}
+        self._records: Dict[int, Tuple[int, int, int, int, int]] = {}
+        self._edges: Dict[int, set] = {}
+
+    def _intern(self, value: Optional[str]) -> int:
+        """Intern the given string, return its temporary id."""
+        if value is None:
+            return _NONE
+
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings[value] = string_id
+
+        return string_id
+
+    def add_record(
+        self,
+        record_id: int,
+        package_name: str,
+        package_version: Optional[str],
+        index_url: Optional[str],
+        *,
+        os_name: str,
+        os_version: str,
+        python_version: str,
+        is_missing: bool,
+    ) -> None:
+        """Add a package version record, the record id is used only to refer to the record when adding dependencies."""
+        environment = (self._intern(os_name), self._intern(os_version), self._intern(python_version))
+        environment_id = self._environments.setdefault(environment, len(self._environments))
+        self._records[record_id] = (
+            self._intern(package_name),
+            self._intern(package_version),
+            self._intern(index_url),
+            environment_id,
+            _RECORD_IS_MISSING if is_missing else 0,
+        )
+
+    def add_dependency(
+        self,
+        record_id: int,
+        dependency_name: str,
+        dependency_version: Optional[str],
+        *,
+        extra: Optional[str],
+        marker_evaluation_result: bool,
+    ) -> None:
+        """Add a dependency of the given package version record."""
+        self._edges.setdefault(record_id, set()).add(
+            (
+                self._intern(extra),
+                self._intern(dependency_name),
+                self._intern(dependency_version),
+                _EDGE_MARKER_EVALUATION_RESULT if marker_evaluation_result else 0,
+            )
+        )
+
+    def write(self, path: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Write the snapshot to the given path atomically, return metadata stored in the snapshot.
+
+        Processes having the previous snapshot opened keep using it until they open the snapshot again.
+        """
+        strings = sorted(self._strings, key=lambda string: string.encode())
+        remap = array("I", bytes(4 * len(strings)))
+        for string_id, string in enumerate(strings):
+            remap[self._strings[string]] = string_id
+
+        def _remap(string_id: int) -> int:
+            return remap[string_id] if string_id != _NONE else _NONE
+
+        environments = sorted((tuple(map(_remap, key)), value) for key, value in self._environments.items())
+        environment_remap = {old_id: new_id for new_id, (_, old_id) in enumerate(environments)}
+
+        records = sorted(
+            (
+                (_remap(name), _remap(version), _remap(index), environment_remap[environment], flags),
+                record_id,
+            )
+            for record_id, (name, version, index, environment, flags) in self._records.items()
+        )
+
+        sections: Dict[str, array] = {
+            "string_offsets": array("Q", [0]),
+            "string_data": array("B"),
+            "env_os_name": array("I", (environment[0] for environment, _ in environments)),
+            "env_os_version": array("I", (environment[1] for environment, _ in environments)),
+            "env_python": array("I", (environment[2] for environment, _ in environments)),
+            "record_name": array("I"),
+            "record_version": array("I"),
+            "record_index": array("I"),
+            "record_env": array("I"),
+            "record_flags": array("B"),
+            "record_edges": array("Q", [0]),
+            "edge_extra": array("I"),
+            "edge_name": array("I"),
+            "edge_version": array("I"),
+            "edge_flags": array("B"),
+        }
+
+        for string in strings:
+            sections["string_data"].frombytes(string.encode())
+            sections["string_offsets"].append(len(sections["string_data"]))
+
+        for (name, version, index, environment, flags), record_id in records:
+            sections["record_name"].append(name)
+            sections["record_version"].append(version)
+            sections["record_index"].append(index)
+            sections["record_env"].append(environment)
+            sections["record_flags"].append(flags)
+
+            edges = sorted(
+                (_remap(extra), _remap(dependency_name), _remap(dependency_version), edge_flags)
+                for extra, dependency_name, dependency_version, edge_flags in self._edges.get(record_id, ())
+            )
+            for extra, dependency_name, dependency_version, edge_flags in edges:
+                sections["edge_extra"].append(extra)
+                sections["edge_name"].append(dependency_name)
+                sections["edge_version"].append(dependency_version)
+                sections["edge_flags"].append(edge_flags)
+
+            sections["record_edges"].append(len(sections["edge_name"]))
+
+        metadata = dict(metadata or {})
+        metadata.setdefault("created_at", datetime.utcnow().isoformat())
+        metadata.update({"strings": len(strings), "records": len(records), "dependencies": len(sections["edge_name"])})
+        sections["metadata"] = array("B", json.dumps(metadata).encode())
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as snapshot_file:
+                offset = _HEADER.size + _SECTION.size * len(sections)
+                entries = []
+                for name, section in sections.items():
+                    offset += -offset % 8
+                    entries.append((name, section, offset))
+                    offset += len(section) * section.itemsize
+
+                snapshot_file.write(
+                    _HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_FORMAT_VERSION, sys.byteorder[0].encode(), len(sections))
+                )
+                for name, section, offset in entries:
+                    snapshot_file.write(_SECTION.pack(name.encode(), section.typecode.encode(), offset, len(section)))
+
+                for _, section, offset in entries:
+                    snapshot_file.write(bytes(offset - snapshot_file.tell()))
+                    section.tofile(snapshot_file)
+
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        _LOGGER.debug("Dependency graph snapshot written to %r: %r", path, metadata)
+        return metadata
+
+
+def _get_string(
+    snapshot_mmap: mmap.mmap, string_offsets: memoryview, string_data_offset: int, string_id: int
+) -> Optional[str]:
+    """Get string with the given id out of a mapped snapshot file."""
+    if string_id == _NONE:
+        return None
+
+    start = string_data_offset + string_offsets[string_id]
+    end = string_data_offset + string_offsets[string_id + 1]
+    return snapshot_mmap[start:end].decode()
+
+
+class _SnapshotFile:
+    """A memory mapped snapshot file, queries are answered directly from mapped arrays."""
+
+    def __init__(self, path: str) -> None:
+        """Map the given snapshot file into memory."""
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            self._mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, format_version, byte_order, section_count = _HEADER.unpack_from(self._mmap)
+        if magic != _SNAPSHOT_MAGIC or format_version != _SNAPSHOT_FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"File {path!r} is not a dependency graph snapshot in format {_SNAPSHOT_FORMAT_VERSION}")
+
+        if byte_order != sys.byteorder[0].encode():
+            self._mmap.close()
+            raise ValueError(f"Dependency graph snapshot {path!r} was created on a platform with different byte order")
+
+        self._view = memoryview(self._mmap)
+        self._sections: Dict[str, memoryview] = {}
+        self._string_data_offset = 0
+        for idx in range(section_count):
+            name, typecode, offset, count = _SECTION.unpack_from(self._mmap, _HEADER.size + idx * _SECTION.size)
+            name = name.rstrip(b"\x00").decode()
+            typecode = typecode.decode()
+            end = offset + count * array(typecode).itemsize
+            self._sections[name] = self._view[offset:end].cast(typecode)
+            if name == "string_data":
+                self._string_data_offset = offset
+
+        self.metadata = json.loads(self._sections["metadata"].tobytes())
+        # The cached function does not reference the instance, a reference cycle would keep the file mapped.
+        self.get_string = functools.lru_cache(maxsize=65536)(
+            functools.partial(_get_string, self._mmap, self._sections["string_offsets"], self._string_data_offset)
+        )
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self.get_string.cache_clear()
+        for section in self._sections.values():
+            section.release()
+
+        self._sections.clear()
+        self._view.release()
+        self._mmap.close()
+
+    def find_string(self, string: str) -> Optional[int]:
+        """Find id of the given string using binary search, None if the string is not present in the snapshot."""
+        string_offsets = self._sections["string_offsets"]
+        encoded = string.encode()
+        lo, hi = 0, len(string_offsets) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._string_data_offset + string_offsets[mid]
+            end = self._string_data_offset + string_offsets[mid + 1]
+            if self._mmap[start:end] < encoded:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < len(string_offsets) - 1 and self.get_string(lo) == string:
+            return lo
+
+        return None
+
+    def find_records(
+        self, package_name: str, package_version: Optional[str], *, any_version: bool = False
+    ) -> List[_Record]:
+        """Find package version records of the given package, optionally regardless of package version."""
+        record_name = self._sections["record_name"]
+        record_version = self._sections["record_version"]
+
+        name_id = self.find_string(package_name)
+        if name_id is None:
+            return []
+
+        lo = bisect.bisect_left(record_name, name_id)
+        hi = bisect.bisect_right(record_name, name_id, lo)
+        if not any_version:
+            version_id = self.find_string(package_version) if package_version is not None else _NONE
+            if version_id is None:
+                return []
+
+            lo = bisect.bisect_left(record_version, version_id, lo, hi)
+            hi = bisect.bisect_right(record_version, version_id, lo, hi)
+
+        return [self.get_record(position) for position in range(lo, hi)]
+
+    def get_record(self, position: int) -> _Record:
+        """Get package version record at the given position."""
+        environment = self._sections["record_env"][position]
+        return _Record(
+            package_name=self.get_string(self._sections["record_name"][position]),
+            package_version=self.get_string(self._sections["record_version"][position]),
+            index_url=self.get_string(self._sections["record_index"][position]),
+            os_name=self.get_string(self._sections["env_os_name"][environment]),
+            os_version=self.get_string(self._sections["env_os_version"][environment]),
+            python_version=self.get_string(self._sections["env_python"][environment]),
+            is_missing=bool(self._sections["record_flags"][position] & _RECORD_IS_MISSING),
+            position=position,
+        )
+
+    def iter_records(self) -> Iterator[_Record]:
+        """Iterate over all the package version records stored in the snapshot file."""
+        for position in range(len(self._sections["record_name"])):
+            yield self.get_record(position)
+
+    def get_dependencies(self, position: int) -> List[Tuple[Optional[str], str, Optional[str], bool]]:
+        """Get dependencies of the record at the given position - extra, package name, version and marker result."""
+        edge_extra = self._sections["edge_extra"]
+        edge_name = self._sections["edge_name"]
+        edge_version = self._sections["edge_version"]
+        edge_flags = self._sections["edge_flags"]
+        record_edges = self._sections["record_edges"]
+
+        return [
+            (
+                self.get_string(edge_extra[idx]),
+                self.get_string(edge_name[idx]),
+                self.get_string(edge_version[idx]),
+                bool(edge_flags[idx] & _EDGE_MARKER_EVALUATION_RESULT),
+            )
+            for idx in range(record_edges[position], record_edges[position + 1])
+        ]
+
+
+def _get_record_key(record: _Record) -> Tuple[str, Optional[str], Optional[str], str, str, str]:
+    """Get key identifying a package version record across snapshot layers."""
+    return (
+        record.package_name,
+        record.package_version,
+        record.index_url,
+        record.os_name,
+        record.os_version,
+        record.python_version,
+    )
+
+
+def _iter_layered_records(
+    layers: Tuple[_SnapshotFile, ...], records: Callable[[_SnapshotFile], Iterable[_Record]]
+) -> Iterator[Tuple[_Record, _SnapshotFile]]:
+    """Iterate over records of the given layers, records of newer layers override records of older ones."""
+    overridden: Set[Tuple[str, Optional[str], Optional[str], str, str, str]] = set()
+    for layer in reversed(layers):
+        keys = set()
+        for record in records(layer):
+            key = _get_record_key(record)
+            if key in overridden:
+                continue
+
+            keys.add(key)
+            yield record, layer
+
+        overridden.update(keys)
+
+
+def _read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    """Read manifest of the given snapshot directory, None if no snapshot was created in the directory."""
+    try:
+        with open(os.path.join(directory, _MANIFEST_FILE_NAME)) as manifest_file:
+            return json.load(manifest_file)
+    except FileNotFoundError:
+        return None
+
+
+def _write_manifest(directory: str, manifest: Dict[str, Any]) -> None:
+    """Replace manifest of the given snapshot directory atomically."""
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".")
+    with os.fdopen(fd, "w") as manifest_file:
+        json.dump(manifest, manifest_file)
+
+    os.replace(tmp_path, os.path.join(directory, _MANIFEST_FILE_NAME))
+
+
+def _compact(layers: Tuple[_SnapshotFile, ...], path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Write records visible in the given layers into a single snapshot file."""
+    writer = DependencyGraphSnapshotWriter()
+    for record_id, (record, layer) in enumerate(_iter_layered_records(layers, _SnapshotFile.iter_records)):
+        writer.add_record(
+            record_id,
+            record.package_name,
+            record.package_version,
+            record.index_url,
+            os_name=record.os_name,
+            os_version=record.os_version,
+            python_version=record.python_version,
+            is_missing=record.is_missing,
+        )
+        for extra, dependency_name, dependency_version, marker_evaluation_result in layer.get_dependencies(
+            record.position
+        ):
+            writer.add_dependency(
+                record_id,
+                dependency_name,
+                dependency_version,
+                extra=extra,
+                marker_evaluation_result=marker_evaluation_result,
+            )
+
+    return writer.write(path, metadata)
+
+
+def refresh_dependency_graph_snapshot(
+    graph: "GraphDatabase", directory: str, *, max_deltas: Optional[int] = None, full: bool = False
+) -> Dict[str, Any]:
+    """Refresh dependency graph snapshot kept in the given directory, return manifest of the refreshed snapshot.
+
+    Only records of packages written or solved since the last refresh are exported into a delta snapshot. Once there
+    are more deltas than allowed, all layers are compacted into a new base snapshot. A full export is done if
+    requested or if there is no snapshot yet - removals of records are reflected only after a full export, schedule
+    full exports periodically. Files not referenced by the new manifest are removed, processes having them opened keep
+    using them until they refresh.
+    """
+    max_deltas = max_deltas if max_deltas is not None else _SNAPSHOT_MAX_DELTAS
+    os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(directory, ".lock"), "a") as lock_file:
+        # Serialize refreshes of the same directory.
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        manifest = _read_manifest(directory)
+        generation = manifest["generation"] + 1 if manifest is not None else 0
+
+        # Watermarks of snapshots exported by older versions are solver run datetimes, they are not comparable.
+        if manifest is None or full or not isinstance(manifest["watermark"], int):
+            base = f"snapshot-{generation:08d}-base.bin"
+            metadata = graph.export_dependency_graph_snapshot(os.path.join(directory, base))
+            new_manifest = {"generation": generation, "base": base, "deltas": [], "watermark": metadata["watermark"]}
+        else:
+            delta = f"snapshot-{generation:08d}-delta.bin"
+            metadata = graph.export_dependency_graph_snapshot(
+                os.path.join(directory, delta), since=manifest["watermark"]
+            )
+
+            if not metadata["records"]:
+                os.remove(os.path.join(directory, delta))
+                if metadata["watermark"] != manifest["watermark"]:
+                    # Readers do not need to reopen the same layers, the generation is kept.
+                    manifest = {**manifest, "watermark": metadata["watermark"]}
+                    _write_manifest(directory, manifest)
+
+                _LOGGER.debug("Nothing written since the last refresh, snapshot %r is up to date", directory)
+                return manifest
+
+            new_manifest = {
+                "generation": generation,
+                "base": manifest["base"],
+                "deltas": manifest["deltas"] + [delta],
+                "watermark": metadata["watermark"],
+            }
+
+            if len(new_manifest["deltas"]) > max_deltas:
+                base = f"snapshot-{generation:08d}-base.bin"
+                layers = tuple(
+                    _SnapshotFile(os.path.join(directory, name))
+                    for name in (new_manifest["base"], *new_manifest["deltas"])
+                )
+                try:
+                    _compact(layers, os.path.join(directory, base), {"watermark": new_manifest["watermark"]})
+                finally:
+                    for layer in layers:
+                        layer.close()
+
+                new_manifest["base"] = base
+                new_manifest["deltas"] = []
+
+        _write_manifest(directory, new_manifest)
+
+        referenced = {new_manifest["base"], *new_manifest["deltas"]}
+        for file_name in os.listdir(directory):
+            if file_name.startswith("snapshot-") and file_name not in referenced:
+                os.remove(os.path.join(directory, file_name))
+
+    _LOGGER.debug("Dependency graph snapshot %r refreshed: %r", directory, new_manifest)
+    return new_manifest
+
+
+class _Layers:
+    """Snapshot files layered over each other together with number of queries using them."""
+
+    def __init__(self, files: Tuple[_SnapshotFile, ...]) -> None:
+        """Keep the given snapshot files, the first one is the base snapshot."""
+        self.files = files
+        self.users = 0
+        self.superseded = False
+
+    def close(self) -> None:
+        """Unmap the snapshot files."""
+        for snapshot_file in self.files:
+            snapshot_file.close()
+
+
+class DependencyGraphSnapshot:
+    """A read-only graph database adapter answering dependency queries from a snapshot file or directory.
+
+    Methods provided mirror their counterparts in GraphDatabase, see GraphDatabase.export_dependency_graph_snapshot
+    and GraphDatabase.refresh_dependency_graph_snapshot for creating snapshots.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open the given snapshot file or the current snapshot in the given snapshot directory."""
+        self.path = path
+        self.manifest: Optional[Dict[str, Any]] = None
+        self._layers = _Layers(())
+        # Guards replacing layers and counting queries using them.
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Open the current snapshot if the snapshot directory was refreshed since it was opened, return True if so.
+
+        Each query uses layers which were current once the query started, concurrent queries are not affected.
+        Files of layers superseded are closed once queries using them finish.
+        """
+        if not os.path.isdir(self.path):
+            if self._layers.files:
+                return False
+
+            self._replace_layers(_Layers((_SnapshotFile(self.path),)))
+            return True
+
+        for attempt in range(_OPEN_ATTEMPTS):
+            manifest = _read_manifest(self.path)
+            if manifest is None:
+                raise FileNotFoundError(f"No dependency graph snapshot found in {self.path!r}")
+
+            if self.manifest is not None and manifest["generation"] == self.manifest["generation"]:
+                return False
+
+            layers = []
+            try:
+                for file_name in (manifest["base"], *manifest["deltas"]):
+                    layers.append(_SnapshotFile(os.path.join(self.path, file_name)))
+            except FileNotFoundError:
+                for layer in layers:
+                    layer.close()
+
+                if attempt == _OPEN_ATTEMPTS - 1:
+                    raise
+
+                # Removed by a concurrent refresh, use the new manifest.
+                continue
+
+            self._replace_layers(_Layers(tuple(layers)))
+            self.manifest = manifest
+            return True
+
+        return False  # pragma: no cover
+
+    def __enter__(self) -> "DependencyGraphSnapshot":
+        """Use the snapshot as a context manager, the snapshot is closed on exit."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the snapshot."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the snapshot, unmap its files once queries in progress finish."""
+        self._replace_layers(_Layers(()))
+
+    def _replace_layers(self, layers: _Layers) -> None:
+        """Use the given layers for new queries, close the superseded ones if they are not used by any query."""
+        with self._lock:
+            superseded = self._layers
+            self._layers = layers
+            superseded.superseded = True
+            unused = superseded.users == 0
+
+        if unused:
+            superseded.close()
+
+    @contextlib.contextmanager
+    def _acquire_layers(self) -> Iterator[Tuple[_SnapshotFile, ...]]:
+        """Use current layers in a query, the layers are not closed until the query finishes."""
+        with self._lock:
+            layers = self._layers
+            layers.users += 1
+
+        try:
+            yield layers.files
+        finally:
+            with self._lock:
+                layers.users -= 1
+                unused = layers.superseded and layers.users == 0
+
+            if unused:
+                layers.close()
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Get metadata of the base snapshot - time of its creation, watermark and number of entries stored."""
+        return self._layers.files[0].metadata
+
+    def stats(self) -> Dict[str, Any]:
+        """Get statistics for this adapter."""
+        with self._acquire_layers() as layers:
+            return {
+                "path": self.path,
+                "generation": self.manifest["generation"] if self.manifest is not None else None,
+                "layers": [
+                    {
+                        "metadata": layer.metadata,
+                        "string_cache_info": dict(layer.get_string.cache_info()._asdict()),
+                    }
+                    for layer in layers
+                ],
+            }
+
+    @staticmethod
+    def _find_records(
+        layers: Tuple[_SnapshotFile, ...],
+        package_name: str,
+        package_version: Optional[str],
+        *,
+        any_version: bool = False,
+    ) -> List[Tuple[_Record, _SnapshotFile]]:
+        """Find package version records of the given (normalized) package together with files storing them."""
+        return list(
+            _iter_layered_records(
+                layers, lambda layer: layer.find_records(package_name, package_version, any_version=any_version)
+            )
+        )
+
+    @staticmethod
+    def _normalize_environment(
+        os_name: Optional[str], os_version: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Normalize operating system name and version the same way the graph database adapter does."""
+        if os_name is not None:
+            os_name = map_os_name(os_name)
+
+        if os_version is not None:
+            os_version = normalize_os_version(os_name, os_version)
+
+        return os_name, os_version
+
+    @staticmethod
+    def _matches_environment(
+        record: _Record, os_name: Optional[str], os_version: Optional[str], python_version: Optional[str]
+    ) -> bool:
+        """Check if the given record matches the given environment, environment parts not set match any record."""
+        return (
+            (os_name is None or record.os_name == os_name)
+            and (os_version is None or record.os_version == os_version)
+            and (python_version is None or record.python_version == python_version)
+        )
+
+    @staticmethod
+    def _collect_dependencies(
+        records: List[Tuple[_Record, _SnapshotFile]],
+        extras: Optional[FrozenSet[Optional[str]]],
+        marker_evaluation_result: Optional[bool],
+    ) -> Dict[Optional[str], List[Tuple[str, Optional[str]]]]:
+        """Collect distinct dependencies of the given records grouped by extras."""
+        result: Dict[Optional[str], List[Tuple[str, Optional[str]]]] = {}
+        seen = set()
+        for record, snapshot_file in records:
+            for (
+                extra,
+                dependency_name,
+                dependency_version,
+                edge_marker_evaluation_result,
+            ) in snapshot_file.get_dependencies(record.position):
+                if extras and extra not in extras:
+                    continue
+
+                if marker_evaluation_result is not None and edge_marker_evaluation_result != marker_evaluation_result:
+                    continue
+
+                if (extra, dependency_name, dependency_version) in seen:
+                    continue
+
+                seen.add((extra, dependency_name, dependency_version))
+                result.setdefault(extra, []).append((dependency_name, dependency_version))
+
+        return result
+
+    def get_depends_on(
+        self,
+        package_name: str,
+        package_version: Optional[str] = None,
+        index_url: Optional[str] = None,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        extras: Optional[FrozenSet[Optional[str]]] = None,
+        marker_evaluation_result: Optional[bool] = None,
+        is_missing: Optional[bool] = None,
+    ) -> Dict[Optional[str], List[Tuple[str, Optional[str]]]]:
+        """Get dependencies for the given Python package respecting environment and extras.
+
+        See GraphDatabase.get_depends_on for semantics of arguments.
+
+        @raises NotFoundError: if the given package has no record in the snapshot
+        """
+        package_name = GraphDatabase.normalize_python_package_name(package_name)
+
+        if package_version is not None:
+            package_version = GraphDatabase.normalize_python_package_version(package_version)
+
+        if index_url is not None:
+            index_url = GraphDatabase.normalize_python_index_url(index_url)
+
+        os_name, os_version = self._normalize_environment(os_name, os_version)
+
+        with self._acquire_layers() as layers:
+            records = [
+                (record, snapshot_file)
+                for record, snapshot_file in self._find_records(
+                    layers, package_name, package_version, any_version=package_version is None
+                )
+                if self._matches_environment(record, os_name, os_version, python_version)
+                and (is_missing is None or record.is_missing == is_missing)
+                and (index_url is None or record.index_url == index_url)
+            ]
+
+            if not records:
+                package_requested = {
+                    "package_name": package_name,
+                    "package_version": package_version,
+                    "index_url": index_url,
+                    "os_name": os_name,
+                    "os_version": os_version,
+                    "python_version": python_version,
+                    "extras": extras,
+                    "marker_evaluation_result": marker_evaluation_result,
+                    "is_missing": is_missing,
+                }
+                raise NotFoundError(f"No package record for {package_requested!r} found")
+
+            return self._collect_dependencies(records, extras, marker_evaluation_result)
+
+    def _get_configurations(
+        self,
+        layers: Tuple[_SnapshotFile, ...],
+        package_name: str,
+        package_version: str,
+        index_url: Optional[str],
+        *,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+    ) -> Dict[Tuple[str, str, str, str, str, str], List[Tuple[_Record, _SnapshotFile]]]:
+        """Get records of the given (normalized) package hosted on an index, grouped by index and environment."""
+        result: Dict[Tuple[str, str, str, str, str, str], List[Tuple[_Record, _SnapshotFile]]] = {}
+        for record, snapshot_file in self._find_records(layers, package_name, package_version):
+            if record.index_url is None or (index_url is not None and record.index_url != index_url):
+                continue
+
+            if not self._matches_environment(record, os_name, os_version, python_version):
+                continue
+
+            configuration = (
+                record.package_name,
+                record.package_version,
+                record.index_url,
+                record.os_name,
+                record.os_version,
+                record.python_version,
+            )
+            result.setdefault(configuration, []).append((record, snapshot_file))
+
+        return result
+
+    def get_python_package_version_records(
+        self,
+        package_name: str,
+        package_version: str,
+        index_url: Union[str, None],
+        *,
+        os_name: Union[str, None],
+        os_version: Union[str, None],
+        python_version: Union[str, None],
+    ) -> List[dict]:
+        """Get records for the given package regardless of index_url."""
+        package_name = GraphDatabase.normalize_python_package_name(package_name)
+        package_version = GraphDatabase.normalize_python_package_version(package_version)
+        os_name, os_version = self._normalize_environment(os_name, os_version)
+        if index_url is not None:
+            index_url = GraphDatabase.normalize_python_index_url(index_url)
+
+        with self._acquire_layers() as layers:
+            configurations = self._get_configurations(
+                layers,
+                package_name,
+                package_version,
+                index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+            )
+
+        return [
+            {
+                "package_name": configuration[0],
+                "package_version": configuration[1],
+                "index_url": configuration[2],
+                "os_name": configuration[3],
+                "os_version": configuration[4],
+                "python_version": configuration[5],
+            }
+            for configuration in configurations
+        ]
+
+    def retrieve_transitive_dependencies_python(
+        self,
+        package_name: str,
+        package_version: str,
+        index_url: str,
+        *,
+        os_name: Optional[str] = None,
+        os_version: Optional[str] = None,
+        python_version: Optional[str] = None,
+        extras: Optional[FrozenSet[Optional[str]]] = None,
+        marker_evaluation_result: Optional[bool] = None,
+    ) -> List[Tuple[Tuple[str, str, str], Tuple[str, str, Optional[str]]]]:
+        """Get all transitive dependencies for the given package by traversing dependency graph.
+
+        The very same dependency tuples as in GraphDatabase.retrieve_transitive_dependencies_python are returned.
+        """
+        index_url = GraphDatabase.normalize_python_index_url(index_url)
+        package_name = GraphDatabase.normalize_python_package_name(package_name)
+        package_version = GraphDatabase.normalize_python_package_version(package_version)
+        os_name, os_version = self._normalize_environment(os_name, os_version)
+
+        result = []
+        stack = [(extras, package_name, package_version, index_url)]
+        seen_tuples = {(package_name, package_version, index_url)}
+        # Records of dependencies in environments already looked up.
+        resolved: Dict[Tuple[str, Optional[str], str, str, str], Dict[Tuple[str, str, str, str, str, str], Any]] = {}
+        # Use the same layers during the whole traversal even if the snapshot is refreshed concurrently.
+        with self._acquire_layers() as layers:
+            while stack:
+                extras, package_name, package_version, index_url = stack.pop()
+                package_tuple = (package_name, package_version, index_url)
+
+                configurations = self._get_configurations(
+                    layers,
+                    package_name,
+                    package_version,
+                    index_url,
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version,
+                )
+
+                for configuration, records in configurations.items():
+                    dependencies = self._collect_dependencies(records, extras, marker_evaluation_result)
+                    for dependency_name, dependency_version in (
+                        dependency for extra_dependencies in dependencies.values() for dependency in extra_dependencies
+                    ):
+                        dependency_key = (dependency_name, dependency_version, *configuration[3:])
+                        dependency_records = resolved.get(dependency_key)
+                        if dependency_records is None:
+                            dependency_records = self._get_configurations(
+                                layers,
+                                dependency_name,
+                                dependency_version,
+                                None,  # Do cross-index resolution...
+                                os_name=configuration[3],
+                                os_version=configuration[4],
+                                python_version=configuration[5],
+                            )
+                            resolved[dependency_key] = dependency_records
+
+                        if not dependency_records:
+                            # Not resolved yet.
+                            result.append((package_tuple, (dependency_name, dependency_version, None)))
+                            continue
+
+                        for dependency_configuration in dependency_records:
+                            dependency_tuple = dependency_configuration[:3]
+                            result.append((package_tuple, dependency_tuple))
+
+                            if dependency_tuple not in seen_tuples:
+                                # Explicitly set extras to None as we do not have direct dependency anymore.
+                                stack.append((None, *dependency_tuple))
+                                seen_tuples.add(dependency_tuple)
+
+        return result
@@ -0,0 +1,815 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Generate synthetic documents of all the kinds synced into the graph database, of a realistic scale.
+
+Packages are ordered by their popularity - the package with index 0 is the most popular one. Dependencies, user
+stacks and packages found in container images are skewed towards popular packages as in real-world data. The
+dependency graph is acyclic as packages depend only on packages more popular than themselves.
+
+Documents generated are deterministic for the given configuration (including the seed) so that results of
+benchmarks run on them can be compared.
+"""
+
+import random
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import attr
+from thoth.common.enums import ThothAdviserIntegrationEnum
+
+from .bulk_load import BulkLoader
+from .postgres import GraphDatabase
+
+# Solver environments as (os_name, os_version, python_version) used by default.
+DEFAULT_SOLVER_ENVIRONMENTS = (("rhel", "8", "3.8"), ("rhel", "8", "3.6"))
+
+_OS_RELEASE = {
+    "rhel": {
+        "distribution": {
+            "codename": "Ootpa",
+            "id": "rhel",
+            "like": "fedora",
+            "version": "8.3",
+            "version_parts": {"build_number": "", "major": "8", "minor": "3"},
+        },
+        "os_release": {
+            "id": "rhel",
+            "name": "Red Hat Enterprise Linux",
+            "platform_id": "platform:el8",
+            "version": "8.3 (Ootpa)",
+            "version_id": "8.3",
+        },
+    },
+    "ubuntu": {
+        "distribution": {
+            "codename": "focal",
+            "id": "ubuntu",
+            "like": "debian",
+            "version": "20.04",
+            "version_parts": {"build_number": "", "major": "20", "minor": "04"},
+        },
+        "os_release": {
+            "id": "ubuntu",
+            "name": "Ubuntu",
+            "platform_id": "",
+            "version": "20.04.3 LTS (Focal Fossa)",
+            "version_id": "20.04",
+        },
+    },
+}
+_LICENSES = (
+    ("MIT License", "MIT", "UNKNOWN"),
+    ("Apache License 2.0", "Apache-2.0", "2.0"),
+    ('BSD 3-Clause "New" or "Revised" License', "BSD-3-Clause", "UNKNOWN"),
+    ("GNU General Public License v3.0 only", "GPL-3.0-only", "3.0"),
+)
+_CLASSIFIERS = (
+    "Development Status :: 5 - Production/Stable",
+    "Intended Audience :: Developers",
+    "Operating System :: OS Independent",
+    "Programming Language :: Python :: 3",
+    "Programming Language :: Python :: 3.8",
+    "Topic :: Software Development :: Libraries",
+)
+_HARDWARE = (
+    {"cpu_family": 6, "cpu_model": 85, "cpu_model_name": "Intel(R) Xeon(R) Gold 6130 CPU @ 2.10GHz"},
+    {"cpu_family": 6, "cpu_model": 79, "cpu_model_name": "Intel(R) Xeon(R) CPU E5-2680 v4 @ 2.40GHz"},
+    {"cpu_family": 23, "cpu_model": 49, "cpu_model_name": "AMD EPYC 7742 64-Core Processor"},
+)
+# Kebechet runs update installations which are not part of the synthetic data.
+_SOURCE_TYPES = tuple(e.name.lower() for e in ThothAdviserIntegrationEnum if e != ThothAdviserIntegrationEnum.KEBECHET)
+_RECOMMENDATION_TYPES = ("stable", "testing", "latest", "performance", "security")
+_MARKERS = ('python_version < "3.7"', 'sys_platform == "win32"', 'platform_machine == "x86_64"')
+
+
+@attr.s(slots=True)
+class SyntheticDataGenerator:
+    """Generate synthetic documents as produced by Thoth components."""
+
+    seed = attr.ib(type=int, default=42)
+    packages = attr.ib(type=int, default=1000)
+    versions = attr.ib(type=int, default=5)
+    # Average number of direct dependencies of a package version.
+    dependencies = attr.ib(type=int, default=5)
+    # The higher the skew is, the more dependencies, user stacks and images point to the most popular packages.
+    skew = attr.ib(type=float, default=2.0)
+    adviser_runs = attr.ib(type=int, default=1000)
+    package_extracts = attr.ib(type=int, default=100)
+    inspections = attr.ib(type=int, default=100)
+    # Number of provenance-checker, dependency-monkey, reverse solver and security-indicator documents each.
+    other_runs = attr.ib(type=int, default=100)
+    # Documents are spread over the given number of days preceding the end datetime.
+    days = attr.ib(type=int, default=30)
+    end_datetime = attr.ib(type=datetime, default=datetime(2026, 1, 1))
+    solver_environments = attr.ib(type=Tuple[Tuple[str, str, str], ...], default=DEFAULT_SOLVER_ENVIRONMENTS)
+    index_url = attr.ib(type=str, default="https://pypi.org/simple")
+    # Ratio of solver and adviser runs which fail.
+    error_ratio = attr.ib(type=float, default=0.05)
+
+    _dependency_graph = attr.ib(type=Optional[Dict[Tuple[int, int], List[Dict[str, Any]]]], default=None, init=False)
+    _solver_errors = attr.ib(type=Optional[Set[Tuple[int, int, int]]], default=None, init=False)
+
+    def _random(self, purpose: str) -> random.Random:
+        """Get a random number generator for the given purpose, generators are independent of each other."""
+        return random.Random(f"{self.seed}:{purpose}")
+
+    def _popular_package(self, rng: random.Random, below: Optional[int] = None) -> int:
+        """Pick a package, popular packages are picked more often."""
+        return int((self.packages if below is None else below) * rng.random() ** self.skew)
+
+    @staticmethod
+    def package_name(package: int) -> str:
+        """Get name of the given package."""
+        return f"package-{package}"
+
+    @staticmethod
+    def package_version(version: int) -> str:
+        """Get the given version of a package."""
+        return f"{version}.0.0"
+
+    def _datetime(self, rng: random.Random) -> datetime:
+        """Pick a datetime within the configured time window."""
+        return self.end_datetime - timedelta(seconds=int(rng.random() * self.days * 24 * 3600))
+
+    def _metadata(
+        self,
+        rng: random.Random,
+        document_id: str,
+        document_datetime: datetime,
+        analyzer: str,
+        analyzer_version: str,
+        arguments: Dict[str, Any],
+        os_name: str = "rhel",
+    ) -> Dict[str, Any]:
+        """Create metadata of a document as stated by Thoth components."""
+        python_version = rng.choice(self.solver_environments)[2]
+        return {
+            "analyzer": analyzer,
+            "analyzer_version": analyzer_version,
+            "arguments": arguments,
+            "datetime": document_datetime.isoformat(),
+            **_OS_RELEASE[os_name],
+            "document_id": document_id,
+            "duration": rng.randint(1, 600),
+            "hostname": f"{document_id}-{rng.getrandbits(32)}",
+            "python": {
+                "api_version": 1013,
+                "implementation_name": "cpython",
+                "major": int(python_version.split(".")[0]),
+                "micro": rng.randint(0, 12),
+                "minor": int(python_version.split(".")[1]),
+                "releaselevel": "final",
+                "serial": 0,
+            },
+            "thoth_deployment_name": "synthetic",
+            "timestamp": int(document_datetime.timestamp()),
+        }
+
+    @staticmethod
+    def _document_id(prefix: str, rng: random.Random, document_datetime: datetime) -> str:
+        """Create a document id in the format used by Thoth components."""
+        return f"{prefix}-{document_datetime.strftime('%y%m%d%H%M%S')}-{rng.getrandbits(64):016x}"
+
+    @staticmethod
+    def _sha256(rng: random.Random) -> str:
+        """Create a random SHA-256 digest."""
+        return f"{rng.getrandbits(256):064x}"
+
+    def get_dependencies(self, package: int, version: int) -> List[Dict[str, Any]]:
+        """Get direct dependencies of the given package version as stated in solver documents."""
+        if self._dependency_graph is None:
+            rng = self._random("dependencies")
+            self._dependency_graph = {}
+            for p in range(self.packages):
+                for v in range(self.versions):
+                    dependencies: Dict[int, Dict[str, Any]] = {}
+                    for _ in range(rng.randint(0, 2 * self.dependencies) if p else 0):
+                        dependency = self._popular_package(rng, below=p)
+                        minimal_version = rng.randrange(self.versions)
+                        marker = rng.choice(_MARKERS) if rng.random() < 0.1 else None
+                        dependencies[dependency] = {
+                            "extra": ["test"] if rng.random() < 0.05 else [],
+                            "marker": marker,
+                            "marker_evaluation_result": marker is None or rng.random() < 0.5,
+                            "normalized_package_name": self.package_name(dependency),
+                            "package_name": self.package_name(dependency),
+                            "required_version": f">={self.package_version(minimal_version)}",
+                            "resolved_versions": [
+                                {
+                                    "index": self.index_url,
+                                    "versions": [
+                                        self.package_version(dependency_version)
+                                        for dependency_version in range(minimal_version, self.versions)
+                                    ],
+                                }
+                            ],
+                        }
+
+                    self._dependency_graph[(p, v)] = list(dependencies.values())
+
+        return self._dependency_graph[(package, version)]
+
+    def is_solver_error(self, package: int, version: int, environment: int) -> bool:
+        """Check if the given package version fails to be solved in the given solver environment."""
+        if self._solver_errors is None:
+            rng = self._random("solver-errors")
+            self._solver_errors = {
+                (p, v, e)
+                for p in range(self.packages)
+                for v in range(self.versions)
+                for e in range(len(self.solver_environments))
+                if rng.random() < self.error_ratio
+            }
+
+        return (package, version, environment) in self._solver_errors
+
+    def _solver_tree_entry(self, rng: random.Random, package: int, version: int) -> Dict[str, Any]:
+        """Create an entry of a solver tree for the given package version."""
+        package_name = self.package_name(package)
+        package_version = self.package_version(version)
+        dependencies = self.get_dependencies(package, version)
+        license_name, license_identifier, license_version = _LICENSES[package % len(_LICENSES)]
+
+        metadata: Dict[str, Any] = {
+            "Author": f"Author {package}",
+            "Author-email": f"author-{package}@example.com",
+            "Classifier": rng.sample(_CLASSIFIERS, rng.randint(1, len(_CLASSIFIERS))),
+            "Home-page": f"https://github.com/synthetic/{package_name}",
+            "License": license_identifier,
+            "Metadata-Version": "2.1",
+            "Name": package_name,
+            "Requires-Python": ">=3.6",
+            "Summary": f"Synthetic package {package_name}",
+            "Version": package_version,
+        }
+        if dependencies:
+            metadata["Requires-Dist"] = [
+                f"{dependency['package_name']} ({dependency['required_version']})" for dependency in dependencies
+            ]
+        if any(dependency["extra"] for dependency in dependencies):
+            metadata["Provides-Extra"] = ["test"]
+
+        return {
+            "dependencies": dependencies,
+            "importlib_metadata": {"metadata": metadata, "requires": metadata.get("Requires-Dist", [])},
+            "index_url": self.index_url,
+            "package_license": {
+                "license": {"full_name": license_name, "identifier_spdx": license_identifier},
+                "license_version": license_version,
+                "warning": rng.random() < 0.01,
+            },
+            "package_name": package_name,
+            "package_version": package_version,
+            "package_version_requested": package_version,
+            "packages": [package_name.replace("-", "_")],
+            "sha256": [self._sha256(rng) for _ in range(rng.randint(1, 3))],
+        }
+
+    def iter_solver_documents(self) -> Iterator[Dict[str, Any]]:
+        """Generate solver documents, one for each package version in each solver environment."""
+        rng = self._random("solver")
+        for environment, (os_name, os_version, python_version) in enumerate(self.solver_environments):
+            solver_name = f"solver-{os_name}-{os_version}-py{python_version.replace('.', '')}"
+            for package in range(self.packages):
+                for version in range(self.versions):
+                    document_datetime = self._datetime(rng)
+                    document_id = self._document_id(solver_name, rng, document_datetime)
+                    requirement = f"{self.package_name(package)}==={self.package_version(version)}"
+                    result: Dict[str, Any] = {
+                        "environment": {
+                            "os_name": os_name,
+                            "os_version": os_version,
+                            "python_version": python_version,
+                        },
+                        "errors": [],
+                        "platform": "linux-x86_64",
+                        "tree": [],
+                        "unparsed": [],
+                        "unresolved": [],
+                    }
+
+                    if self.is_solver_error(package, version, environment):
+                        result["errors"].append(
+                            {
+                                "details": {"message": "Failed to build the package"},
+                                "index_url": self.index_url,
+                                "is_provided_package_version": True,
+                                "package_name": self.package_name(package),
+                                "package_version": self.package_version(version),
+                                "type": "command_error",
+                            }
+                        )
+                    else:
+                        result["tree"].append(self._solver_tree_entry(rng, package, version))
+
+                    arguments = {
+                        "python": {
+                            "index": self.index_url,
+                            "no_transitive": True,
+                            "output": f"http://result-api/api/v1/solver-result/{document_id}",
+                            "requirements": requirement,
+                        }
+                    }
+                    yield {
+                        "metadata": self._metadata(
+                            rng, document_id, document_datetime, "thoth-solver", "1.10.0", arguments
+                        ),
+                        "result": result,
+                    }
+
+    def _pick_packages(self, rng: random.Random, count: int) -> List[int]:
+        """Pick distinct packages, popular packages are picked more often."""
+        count = min(count, self.packages)
+        packages: Dict[int, None] = {}
+        while len(packages) < count:
+            packages[self._popular_package(rng)] = None
+
+        return list(packages)
+
+    def _runtime_environment(self, rng: random.Random, environment: int) -> Dict[str, Any]:
+        """Create a runtime environment matching the given solver environment."""
+        os_name, os_version, python_version = self.solver_environments[environment]
+        return {
+            "cuda_version": None,
+            "hardware": {"cpu_cores": rng.choice((2, 4, 8)), **rng.choice(_HARDWARE)},
+            "name": f"{os_name}:{os_version}",
+            "operating_system": {"name": os_name, "version": os_version},
+            "python_version": python_version,
+        }
+
+    def _requirements(
+        self, rng: random.Random, packages: List[int], environment: int
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Create Pipfile and Pipfile.lock of the given packages locked to versions solved in the environment."""
+        source = [{"name": "pypi", "url": self.index_url, "verify_ssl": True}]
+        python_version = self.solver_environments[environment][2]
+        requirements = {
+            "dev-packages": {},
+            "packages": {self.package_name(package): "*" for package in packages},
+            "requires": {"python_version": python_version},
+            "source": source,
+        }
+
+        locked = {}
+        for package in packages:
+            versions = [v for v in range(self.versions) if not self.is_solver_error(package, v, environment)]
+            if not versions:
+                continue
+
+            version = max(versions) if rng.random() < 0.7 else rng.choice(versions)
+            locked[self.package_name(package)] = {
+                "hashes": [f"sha256:{self._sha256(rng)}"],
+                "index": "pypi",
+                "version": f"=={self.package_version(version)}",
+            }
+
+        requirements_locked = {
+            "_meta": {
+                "hash": {"sha256": self._sha256(rng)},
+                "pipfile-spec": 6,
+                "requires": {"python_version": python_version},
+                "sources": source,
+            },
+            "default": locked,
+            "develop": {},
+        }
+        return requirements, requirements_locked
+
+    def iter_adviser_documents(self) -> Iterator[Dict[str, Any]]:
+        """Generate adviser documents, some of the runs fail and are re-run later."""
+        rng = self._random("adviser")
+        failed_runs: List[str] = []
+        for _ in range(self.adviser_runs):
+            environment = rng.randrange(len(self.solver_environments))
+            runtime_environment = self._runtime_environment(rng, environment)
+            packages = self._pick_packages(rng, rng.randint(1, 10))
+            requirements, requirements_locked = self._requirements(rng, packages, environment)
+            document_datetime = self._datetime(rng)
+            document_id = self._document_id("adviser", rng, document_datetime)
+            source_type = rng.choice(_SOURCE_TYPES)
+            error = rng.random() < self.error_ratio
+
+            re_run_adviser_id = None
+            if failed_runs and not error and rng.random() < 0.5:
+                re_run_adviser_id = failed_runs.pop(0)
+
+            report: Dict[str, Any] = {"products": [], "stack_info": []}
+            if error:
+                report["_ERROR_DETAILS"] = {"unresolved": [self.package_name(rng.choice(packages))]}
+                failed_runs.append(document_id)
+            else:
+                justification: List[Dict[str, Any]] = [{"message": "Synthetic justification", "type": "INFO"}]
+                if rng.random() < 0.2:
+                    justification.append({"performance_score": round(rng.random(), 4), "type": "INFO"})
+
+                report["products"].append(
+                    {
+                        "justification": justification,
+                        "project": {
+                            "requirements": requirements,
+                            "requirements_locked": requirements_locked,
+                            "runtime_environment": runtime_environment,
+                        },
+                        "score": round(rng.random(), 4),
+                    }
+                )
+
+            parameters = {
+                "count": 1,
+                "limit": 10000,
+                "limit_latest_versions": -1,
+                "project": {
+                    "requirements": requirements,
+                    "requirements_locked": requirements_locked if rng.random() < 0.5 else None,
+                    "runtime_environment": runtime_environment,
+                },
+                "recommendation_type": rng.choice(_RECOMMENDATION_TYPES),
+                "requirements_format": "pipenv",
+            }
+            arguments = {
+                "thoth-adviser": {
+                    "metadata": {
+                        "is_s2i": source_type == "s2i",
+                        "origin": f"https://github.com/synthetic/project-{rng.randrange(self.adviser_runs)}"
+                        if rng.random() < 0.5
+                        else None,
+                        "re_run_adviser_id": re_run_adviser_id,
+                        "source_type": source_type,
+                    },
+                    "verbose": False,
+                }
+            }
+            yield {
+                "metadata": self._metadata(rng, document_id, document_datetime, "thoth-adviser", "0.40.0", arguments),
+                "result": {
+                    "error": error,
+                    "error_msg": "Resolver failed to resolve the software stack" if error else None,
+                    "parameters": parameters,
+                    "report": report,
+                    "stack_info": [],
+                },
+            }
+
+    def iter_analysis_documents(self) -> Iterator[Dict[str, Any]]:
+        """Generate package-extract documents of Thoth images and of external (user) images."""
+        rng = self._random("package-extract")
+        for idx in range(self.package_extracts):
+            is_external = idx % 2 == 1
+            document_datetime = self._datetime(rng)
+            document_id = self._document_id("package-extract", rng, document_datetime)
+            os_name = "ubuntu" if is_external and rng.random() < 0.5 else "rhel"
+            python_version = rng.choice(self.solver_environments)[2]
+            python_suffix = f"py{python_version.replace('.', '')}"
+
+            if is_external:
+                image = f"quay.io/synthetic/application-{idx}:latest"
+                env_vars = [f"IMAGE_NAME=application-{idx}", "IMAGE_TAG=latest"]
+            else:
+                image = f"quay.io/thoth-station/s2i-thoth-ubi8-{python_suffix}:v0.{idx}.0"
+                env_vars = [f"THOTH_S2I_NAME=s2i-thoth-ubi8-{python_suffix}", f"THOTH_S2I_VERSION=0.{idx}.0"]
+
+            site_packages = f"/opt/app-root/lib/python{python_version}/site-packages"
+            python_packages = []
+            for package in self._pick_packages(rng, rng.randint(5, 50)):
+                python_packages.append(
+                    {
+                        "location": site_packages,
+                        "package_name": self.package_name(package),
+                        "package_version": self.package_version(rng.randrange(self.versions)),
+                    }
+                )
+
+            rpm_dependencies = []
+            deb_dependencies = []
+            for package in self._pick_packages(rng, rng.randint(20, 200)):
+                if os_name == "ubuntu":
+                    deb_dependencies.append(
+                        {
+                            "arch": "amd64",
+                            "depends": [
+                                {"name": f"lib{dependency}", "version": ">= 1.0"}
+                                for dependency in self._pick_packages(rng, rng.randint(0, 3))
+                            ],
+                            "name": f"lib{package}",
+                            "pre-depends": [{"name": "libc6"}] if rng.random() < 0.1 else [],
+                            "replaces": [],
+                            "version": f"1.{package % 7}.0-1",
+                        }
+                    )
+                else:
+                    rpm_dependencies.append(
+                        {
+                            "arch": "x86_64",
+                            "dependencies": [
+                                f"lib{dependency}.so.1()(64bit)"
+                                for dependency in self._pick_packages(rng, rng.randint(0, 5))
+                            ],
+                            "epoch": None,
+                            "name": f"lib{package}",
+                            "package_identifier": f"lib{package}-1.{package % 7}.0-1.el8.x86_64",
+                            "release": "1.el8",
+                            "src": False,
+                            "version": f"1.{package % 7}.0",
+                        }
+                    )
+
+            # Symbols are related to a single software environment in the schema, libraries are image specific.
+            system_symbols = {
+                f"/usr/lib64/libsynthetic-{idx}-{library}.so": [
+                    f"GLIBC_2.{symbol}" for symbol in sorted(rng.sample(range(40), rng.randint(1, 10)))
+                ]
+                for library in range(rng.randint(1, 5))
+            }
+
+            arguments = {
+                "extract-image": {"image": image, "no_tls_verify": False, "timeout": 0},
+                "thoth-package-extract": {
+                    "metadata": {"environment_type": "runtime", "is_external": is_external, "origin": None},
+                    "verbose": False,
+                },
+            }
+            yield {
+                "metadata": self._metadata(
+                    rng, document_id, document_datetime, "thoth-package-extract", "2.0.0", arguments, os_name=os_name
+                ),
+                "result": {
+                    "deb-dependencies": deb_dependencies,
+                    "image_size": rng.randint(200, 2000) * 1024 * 1024,
+                    "layers": [f"sha256:{self._sha256(rng)}" for _ in range(rng.randint(3, 10))],
+                    "operating-system": {
+                        "id": os_name,
+                        "version_id": _OS_RELEASE[os_name]["os_release"]["version_id"],
+                    },
+                    "python-files": [
+                        {"filepath": f"{site_packages}/synthetic/module_{i}.py", "sha256": self._sha256(rng)}
+                        for i in range(rng.randint(0, 20))
+                    ],
+                    "python-interpreters": [
+                        {
+                            "link": "/usr/bin/python3",
+                            "path": f"/usr/bin/python{python_version}",
+                            "version": f"{python_version}.{rng.randint(0, 12)}",
+                        }
+                    ],
+                    "python-packages": python_packages,
+                    "rpm-dependencies": rpm_dependencies,
+                    "skopeo-inspect": {"Env": ["PATH=/usr/local/bin:/usr/bin"] + env_vars},
+                    "system-symbols": system_symbols,
+                },
+            }
+
+    def iter_inspection_documents(self) -> Iterator[Dict[str, Any]]:
+        """Generate inspection documents, an inspection has one or more results.
+
+        Inspection documents do not carry metadata as they are stored by Amun, they do not state any
+        performance indicator run.
+        """
+        rng = self._random("inspection")
+        for _ in range(self.inspections):
+            environment = rng.randrange(len(self.solver_environments))
+            runtime_environment = self._runtime_environment(rng, environment)
+            requirements, requirements_locked = self._requirements(rng, self._pick_packages(rng, 3), environment)
+            document_datetime = self._datetime(rng)
+            document_id = f"inspection-synthetic-{rng.getrandbits(64):016x}"
+            python_suffix = f"py{runtime_environment['python_version'].replace('.', '')}"
+            specification = {
+                "@created": document_datetime.isoformat(),
+                "base": f"quay.io/thoth-station/s2i-thoth-ubi8-{python_suffix}",
+                "build": {"requests": {"cpu": "500m", "hardware": rng.choice(_HARDWARE), "memory": "1Gi"}},
+                "identifier": "synthetic",
+                "python": {"requirements": requirements, "requirements_locked": requirements_locked},
+                "run": {"requests": {"cpu": rng.choice(("500m", "1", "2")), "memory": rng.choice(("1Gi", "2Gi"))}},
+            }
+            for result_number in range(rng.randint(1, 3)):
+                yield {
+                    "document_id": document_id,
+                    "result_number": result_number,
+                    # Copies as the sync adjusts the runtime environment of the document.
+                    "specification": dict(specification),
+                    "result": {
+                        "exit_code": 0,
+                        "runtime_environment": dict(runtime_environment),
+                        "stderr": "",
+                        "stdout": {},
+                    },
+                }
+
+    def _pick_solved(self, rng: random.Random) -> Tuple[int, int]:
+        """Pick a package version solved without an error in one of the solver environments."""
+        while True:
+            package, version = self._popular_package(rng), rng.randrange(self.versions)
+            environment = rng.randrange(len(self.solver_environments))
+            if not self.is_solver_error(package, version, environment):
+                return package, version
+
+    def iter_provenance_checker_documents(self) -> Iterator[Dict[str, Any]]:
+        """Generate provenance-checker documents, some of them report packages missing on the index."""
+        rng = self._random("provenance-checker")
+        for _ in range(self.other_runs):
+            environment = rng.randrange(len(self.solver_environments))
+            packages = self._pick_packages(rng, rng.randint(1, 10))
+            requirements, requirements_locked = self._requirements(rng, packages, environment)
+            document_datetime = self._datetime(rng)
+            document_id = self._document_id("provenance-checker", rng, document_datetime)
+
+            report = []
+            if rng.random() < 0.1:
+                report.append(
+                    {
+                        "id": "MISSING-PACKAGE",
+                        "package_name": self.package_name(rng.choice(packages)),
+                        "package_version": f"=={self.package_version(self.versions)}",
+                        "source": {"name": "pypi", "url": self.index_url, "verify_ssl": True},
+                        "type": "ERROR",
+                    }
+                )
+
+            arguments = {
+                "thoth-adviser": {
+                    "metadata": {"origin": f"https://github.com/synthetic/project-{rng.randrange(self.other_runs)}"},
+                    "verbose": False,
+                }
+            }
+            yield {
+                "metadata": self._metadata(rng, document_id, document_datetime, "thoth-adviser", "0.40.0", arguments),
+                "result": {
+                    "error": bool(report),
+                    "parameters": {
+                        "project": {"requirements": requirements, "requirements_locked": requirements_locked},
+                        "whitelisted_sources": None,
+                    },
+                    "report": report,
+                },
+            }
+
+    def iter_dependency_monkey_documents(self) -> Iterator[Dict[str, Any]]:
+        """Generate dependency-monkey documents, each stack generated is submitted to inspections."""
+        rng = self._random("dependency-monkey")
+        for _ in range(self.other_runs):
+            environment = rng.randrange(len(self.solver_environments))
+            requirements, _ = self._requirements(rng, self._pick_packages(rng, rng.randint(1, 10)), environment)
+            document_datetime = self._datetime(rng)
+            document_id = self._document_id("dependency-monkey", rng, document_datetime)
+            count = rng.randint(1, 3)
+            arguments = {"thoth-adviser": {"metadata": None, "verbose": False}}
+            yield {
+                "metadata": self._metadata(rng, document_id, document_datetime, "thoth-adviser", "0.40.0", arguments),
+                "result": {
+                    "error": False,
+                    "parameters": {
+                        "count": count,
+                        "decision_type": rng.choice(("random", "all")),
+                        "limit_latest_versions": -1,
+                        "project": {
+                            "requirements": requirements,
+                            "runtime_environment": self._runtime_environment(rng, environment),
+                        },
+                        "seed": rng.getrandbits(31),
+                    },
+                    "report": {
+                        "responses": [
+                            {"response": f"inspection-synthetic-{rng.getrandbits(64):016x}"}
+                            for _ in range(rng.randint(1, 5))
+                        ],
+                    },
+                },
+            }
+
+    def iter_revsolver_documents(self) -> Iterator[Dict[str, Any]]:
+        """Generate reverse solver documents for new releases of packages, listing package versions depending on them.
+
+        New releases get the version following the versions solved.
+        """
+        rng = self._random("revsolver")
+        dependents: Dict[int, List[Tuple[int, int, Dict[str, Any]]]] = {}
+        for package in range(self.packages):
+            for version in range(self.versions):
+                for dependency in self.get_dependencies(package, version):
+                    dependency_package = int(dependency["package_name"].rsplit("-", maxsplit=1)[1])
+                    dependents.setdefault(dependency_package, []).append((package, version, dependency))
+
+        for _ in range(self.other_runs):
+            package = self._popular_package(rng)
+            document_datetime = self._datetime(rng)
+            document_id = self._document_id("revsolver", rng, document_datetime)
+
+            result = []
+            for dependent_package, dependent_version, dependency in dependents.get(package, []):
+                for environment, (os_name, os_version, python_version) in enumerate(self.solver_environments):
+                    if self.is_solver_error(dependent_package, dependent_version, environment):
+                        continue
+
+                    result.append(
+                        {
+                            "extra": dependency["extra"][0] if dependency["extra"] else None,
+                            "index_url": self.index_url,
+                            "marker": dependency["marker"],
+                            "marker_evaluation_result": dependency["marker_evaluation_result"],
+                            "os_name": os_name,
+                            "os_version": os_version,
+                            "package_name": self.package_name(dependent_package),
+                            "package_version": self.package_version(dependent_version),
+                            "python_version": python_version,
+                            "version_range": dependency["required_version"],
+                        }
+                    )
+
+            arguments = {
+                "app.py": {
+                    "package_name": self.package_name(package),
+                    "package_version": self.package_version(self.versions),
+                }
+            }
+            yield {
+                "metadata": self._metadata(rng, document_id, document_datetime, "thoth-solver", "1.10.0", arguments),
+                "result": result,
+            }
+
+    def iter_security_indicator_documents(self) -> Iterator[Dict[str, Any]]:
+        """Generate aggregated security-indicator documents of package versions solved."""
+        rng = self._random("security-indicator")
+        for _ in range(self.other_runs):
+            package, version = self._pick_solved(rng)
+            document_datetime = self._datetime(rng)
+            document_id = self._document_id("security-indicator", rng, document_datetime)
+            files = rng.randint(1, 200)
+            lines = {"blank": rng.randint(0, 5000), "comment": rng.randint(0, 5000), "code": rng.randint(1, 50000)}
+            result: Dict[str, Any] = {
+                f"SEVERITY.{severity}__CONFIDENCE.{confidence}": rng.randint(0, 5)
+                for severity in ("HIGH", "MEDIUM", "LOW")
+                for confidence in ("HIGH", "MEDIUM", "LOW", "UNDEFINED")
+            }
+            result.update(
+                {
+                    "number_of_analyzed_files": files,
+                    "number_of_files_total": files,
+                    "number_of_files_with_severities": rng.randint(0, files),
+                    "number_of_filtered_files": 0,
+                    "Python.nFiles": files,
+                    **{f"Python.{kind}": count for kind, count in lines.items()},
+                    "SUM.nFiles": files,
+                    "SUM.n_lines": sum(lines.values()),
+                    **{f"SUM.{kind}": count for kind, count in lines.items()},
+                }
+            )
+            arguments = {
+                "app.py": {
+                    "package_index": self.index_url,
+                    "package_name": self.package_name(package),
+                    "package_version": self.package_version(version),
+                }
+            }
+            yield {
+                "metadata": self._metadata(
+                    rng, document_id, document_datetime, "security-indicators", "0.1.0", arguments
+                ),
+                "result": result,
+            }
+
+    def iter_documents(self) -> Iterator[Dict[str, Any]]:
+        """Generate documents loaded in bulk, solver documents come first as advised stacks require solved packages.
+
+        Provenance-checker, dependency-monkey, reverse solver and security-indicator documents are generated
+        using their own methods, they are synced after solver documents.
+        """
+        yield from self.iter_solver_documents()
+        yield from self.iter_analysis_documents()
+        yield from self.iter_adviser_documents()
+        yield from self.iter_inspection_documents()
+
+    def load(self, graph: GraphDatabase) -> Dict[str, int]:
+        """Load all the documents generated into an empty database using COPY.
+
+        Number of rows copied per table is returned.
+        """
+        loader = BulkLoader()
+        try:
+            loader.prepare(graph)
+            for document in self.iter_documents():
+                loader.add_document(document)
+
+            return loader.load(graph)
+        finally:
+            loader.close()
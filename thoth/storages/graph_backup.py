@@ -66,13 +66,18 @@ class GraphBackupStore(ResultStorageBase):
             backup_files_maintained.append((datetime_obj, backup_file))
 
         backup_files_maintained.sort(key=operator.itemgetter(0), reverse=True)
-        for _, backup_file in backup_files_maintained[self.GRAPH_BACKUP_STORE_ROTATE :]:
+        backup_files_removed = [
+            backup_file for _, backup_file in backup_files_maintained[self.GRAPH_BACKUP_STORE_ROTATE :]
+        ]
+        for backup_file in backup_files_removed:
             _LOGGER.info(
                 "Removing backup file %r based on rotation configuration (keeping %d dumps)",
                 backup_file,
                 self.GRAPH_BACKUP_STORE_ROTATE,
             )
-            self.ceph.delete(backup_file[1])
+
+        for backup_file, error in self.delete_many(backup_files_removed).items():
+            _LOGGER.error("Failed to remove backup file %r: %s", backup_file, error)
 
     def store_dump(self, dump_file_path: str) -> str:
         """Store the given dump, maintain a fixed set of dumps ."""
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2026 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A local on-disk read-through cache of blobs retrieved from Ceph."""
+
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .exceptions import NotFoundError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Directory with blobs cached locally, the local cache is not used if not set.
+_LOCAL_CACHE_DIR = os.getenv("THOTH_CEPH_LOCAL_CACHE_DIR")
+# Maximum size of the local cache in bytes, least recently used blobs are evicted.
+_LOCAL_CACHE_SIZE = int(os.getenv("THOTH_CEPH_LOCAL_CACHE_SIZE", 1 << 30))
+# Validate cached blobs against ETag of remote objects, turn off if objects are never overwritten.
+_LOCAL_CACHE_VALIDATE = bool(int(os.getenv("THOTH_CEPH_LOCAL_CACHE_VALIDATE", 1)))
+
+# A fetch function gets ETag of the cached blob (if any) and returns None if the remote object was not
+# modified, otherwise the blob together with its ETag.
+FetchType = Callable[[Optional[str]], Optional[Tuple[bytes, str]]]
+
+
+class LocalCache:
+    """A size-bounded LRU cache of blobs kept in a local directory.
+
+    Each entry is a file named after a digest of bucket, prefix and object key. The file stores ETag
+    of the remote object on the first line, the blob follows. The least recently used order is kept
+    in file modification times so that the cache can be reused across process runs.
+    """
+
+    _SHARED: Dict[str, "LocalCache"] = {}
+    _SHARED_LOCK = threading.Lock()
+
+    def __init__(self, directory: str, max_size: Optional[int] = None, *, validate: Optional[bool] = None) -> None:
+        """Initialize the cache, load entries already present in the cache directory."""
+        self.directory = directory
+        self.max_size = max_size if max_size is not None else _LOCAL_CACHE_SIZE
+        self.validate = validate if validate is not None else _LOCAL_CACHE_VALIDATE
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    @classmethod
+    def get_shared(cls) -> Optional["LocalCache"]:
+        """Get a cache configured using environment variables, shared in the process; None if not configured."""
+        if not _LOCAL_CACHE_DIR:
+            return None
+
+        with cls._SHARED_LOCK:
+            cache = cls._SHARED.get(_LOCAL_CACHE_DIR)
+            if cache is None:
+                cache = cls(_LOCAL_CACHE_DIR)
+                cls._SHARED[_LOCAL_CACHE_DIR] = cache
+
+        return cache
+
+    @staticmethod
+    def get_key(bucket: str, prefix: str, object_key: str) -> str:
+        """Get key of a cache entry for the given object."""
+        return hashlib.sha256(f"{bucket}/{prefix}{object_key}".encode()).hexdigest()
+
+    def _load(self) -> None:
+        """Load entries present in the cache directory, oldest first."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+
+            if entry.name.startswith("."):
+                # A leftover of an interrupted write.
+                os.remove(entry.path)
+                continue
+
+            stat = entry.stat()
+            entries.append((stat.st_mtime, entry.name, stat.st_size))
+
+        with self._lock:
+            for _, key, size in sorted(entries):
+                self._entries[key] = size
+                self._size += size
+
+            self._evict()
+
+        _LOGGER.debug(
+            "Loaded %d entries (%d bytes) from local cache %r", len(self._entries), self._size, self.directory
+        )
+
+    def _evict(self) -> None:
+        """Evict least recently used entries so that the cache fits its size, to be called with lock held."""
+        while self._size > self.max_size and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self.directory, key))
+            except FileNotFoundError:
+                pass
+
+    def _get_etag(self, key: str) -> Optional[str]:
+        """Get ETag of the cached blob, None if the blob is not cached."""
+        if key not in self._entries:
+            return None
+
+        try:
+            with open(os.path.join(self.directory, key), "rb") as cache_file:
+                return cache_file.readline().rstrip(b"\n").decode()
+        except FileNotFoundError:
+            self.invalidate(key)
+            return None
+
+    def _read(self, key: str) -> Optional[memoryview]:
+        """Read the cached blob using a memory mapped file, None if the blob is not cached.
+
+        The blob is not copied, the returned view keeps the file mapped until it is released. Entries are
+        replaced and removed by renaming and unlinking files so a view stays valid even if its entry is gone.
+        """
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, "rb") as cache_file:
+                mapped = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+            # The mapping cannot be closed explicitly while exported, it is closed once the view is released.
+            blob = memoryview(mapped)[mapped.find(b"\n") + 1 :]
+            # Mark the entry as the most recently used one, also for subsequent runs.
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            # ValueError is raised by mmap on an empty file.
+            self.invalidate(key)
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+
+        return blob
+
+    def store(self, key: str, blob: bytes, etag: str) -> None:
+        """Store the given blob in the cache."""
+        size = len(etag) + 1 + len(blob)
+        if size > self.max_size:
+            _LOGGER.debug("Blob of size %d does not fit into local cache of size %d", size, self.max_size)
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".")
+        with os.fdopen(fd, "wb") as cache_file:
+            cache_file.write(etag.encode() + b"\n")
+            cache_file.write(blob)
+
+        with self._lock:
+            os.replace(tmp_path, os.path.join(self.directory, key))
+            self._size += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+
+    def invalidate(self, key: str) -> None:
+        """Remove the given entry from the cache."""
+        with self._lock:
+            size = self._entries.pop(key, None)
+            if size is None:
+                return
+
+            self._size -= size
+            try:
+                os.remove(os.path.join(self.directory, key))
+            except FileNotFoundError:
+                pass
+
+    def retrieve(self, key: str, fetch: FetchType) -> Union[bytes, memoryview]:
+        """Retrieve the given blob from the cache, fetch it (and cache it) if it is not cached or it is stale.
+
+        Blobs served from the cache are memoryviews of memory mapped files, blobs fetched are returned as bytes.
+        """
+        if not self.validate:
+            cached = self._read(key)
+            if cached is not None:
+                return cached
+            etag = None
+        else:
+            etag = self._get_etag(key)
+
+        try:
+            result = fetch(etag)
+            if result is None:
+                cached = self._read(key)
+                if cached is not None:
+                    return cached
+
+                # Evicted in the meantime, retrieve it again.
+                result = fetch(None)
+        except NotFoundError:
+            self.invalidate(key)
+            raise
+
+        assert result is not None
+        blob, etag = result
+        with self._lock:
+            self.misses += 1
+
+        self.store(key, blob, etag)
+        return blob
+
+    def stats(self) -> Dict[str, Any]:
+        """Get statistics of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+                "max_size": self.max_size,
+            }
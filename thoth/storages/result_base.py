@@ -17,19 +17,35 @@
 
 """Adapter for storing analysis results onto a persistence remote store."""
 
+import logging
 import os
 import typing
 from datetime import date
+from datetime import datetime
+from itertools import chain
 from datetime import timedelta
 
 
 from .base import StorageBase
 from .ceph import CephStore
 from .result_schema import RESULT_SCHEMA
+from .exceptions import NotFoundError
 from .exceptions import SchemaError
 from .exceptions import NoDocumentIdError
 from typing import Optional
 
+_LOGGER = logging.getLogger(__name__)
+
+# Maintain a date-partitioned index of stored documents, documents are listed and counted using the index.
+_LISTING_INDEX = bool(int(os.getenv("THOTH_CEPH_LISTING_INDEX", 0)))
+# Markers of documents stored, one per document, are kept under the journal prefix until compacted.
+_LISTING_INDEX_JOURNAL = "journal/"
+# One object per day listing documents stored on the given day.
+_LISTING_INDEX_DAYS = "days/"
+# Markers of documents deleted or moved away, one per document, are kept until compacted.
+_LISTING_INDEX_REMOVED = "removed/"
+_LISTING_INDEX_DATE_FORMAT = "%y%m%d"
+
 
 class ResultStorageBase(StorageBase):
     """Adapter base for storing results."""
@@ -49,6 +65,7 @@ class ResultStorageBase(StorageBase):
         bucket: Optional[str] = None,
         region: Optional[str] = None,
         prefix: Optional[str] = None,
+        listing_index: Optional[bool] = None,
     ):
         """Initialize result storage database.
 
@@ -66,6 +83,16 @@ class ResultStorageBase(StorageBase):
         self.ceph = CephStore(
             self.prefix, host=host, key_id=key_id, secret_key=secret_key, bucket=bucket, region=region
         )
+        self.listing_index: Optional[CephStore] = None
+        if listing_index if listing_index is not None else _LISTING_INDEX:
+            self.listing_index = CephStore(
+                f"{self.prefix}-listing-index",
+                host=host,
+                key_id=key_id,
+                secret_key=secret_key,
+                bucket=bucket,
+                region=region,
+            )
 
     @classmethod
     def get_document_id(cls, document: dict) -> str:
@@ -87,6 +114,8 @@ class ResultStorageBase(StorageBase):
     def connect(self) -> None:
         """Connect the given storage adapter."""
         self.ceph.connect()
+        if self.listing_index is not None:
+            self.listing_index.connect()
 
     @staticmethod
     def _iter_dates_prefix_addition(
@@ -124,8 +153,22 @@ class ResultStorageBase(StorageBase):
 
         Additional parameters can filter results. If start_date is supplied
         and no end_date is supplied explicitly, the current date is
-        considered as end_date (inclusively).
+        considered as end_date (inclusively). Documents are listed using
+        the listing index if configured.
         """
+        if self.listing_index is not None and not only_requests:
+            days = None
+            if start_date:
+                days = [
+                    prefix_addition[1:]
+                    for prefix_addition in self._iter_dates_prefix_addition(
+                        start_date=start_date, end_date=end_date, include_end_date=include_end_date
+                    )
+                ]
+
+            yield from self._iter_listing_index(self.listing_index, days)
+            return
+
         if start_date:
             for prefix_addition in self._iter_dates_prefix_addition(
                 start_date=start_date, end_date=end_date, include_end_date=include_end_date
@@ -162,8 +205,172 @@ class ResultStorageBase(StorageBase):
         if document_id is None:
             document_id = self.get_document_id(document)
         self.ceph.store_document(document, document_id)
+
+        if self.listing_index is not None:
+            day = datetime.utcnow().strftime(_LISTING_INDEX_DATE_FORMAT)
+            self.listing_index.store_blob(b"", f"{_LISTING_INDEX_JOURNAL}{day}/{document_id}")
+            # The document could be deleted or moved away before, markers are rare so check before deleting.
+            removed_key = f"{_LISTING_INDEX_REMOVED}{document_id}"
+            if self.listing_index.document_exists(removed_key):
+                self.listing_index.delete(removed_key)
+
         return document_id
 
+    @staticmethod
+    def _get_listing_index_journal(
+        listing_index: CephStore, days: typing.Optional[typing.List[str]] = None
+    ) -> typing.Dict[str, typing.Set[str]]:
+        """Get document ids of markers in the listing index journal per day, list only the given days if any."""
+        prefixes = [_LISTING_INDEX_JOURNAL] if days is None else [f"{_LISTING_INDEX_JOURNAL}{day}/" for day in days]
+        journal: typing.Dict[str, typing.Set[str]] = {}
+        for key in chain.from_iterable(listing_index.get_document_listing(prefix) for prefix in prefixes):
+            day, document_id = key[len(_LISTING_INDEX_JOURNAL) :].split("/", maxsplit=1)
+            journal.setdefault(day, set()).add(document_id)
+
+        return journal
+
+    @staticmethod
+    def _get_listing_index_removed(listing_index: CephStore) -> typing.Set[str]:
+        """Get document ids of markers of documents removed."""
+        return {
+            key[len(_LISTING_INDEX_REMOVED) :] for key in listing_index.get_document_listing(_LISTING_INDEX_REMOVED)
+        }
+
+    @classmethod
+    def _iter_listing_index(
+        cls, listing_index: CephStore, days: typing.Optional[typing.List[str]]
+    ) -> typing.Generator[str, None, None]:
+        """Iterate over documents stored on the given days (all if None) using the listing index.
+
+        Documents removed are not listed, documents stored on multiple days are listed once on the first day.
+        """
+        journal = cls._get_listing_index_journal(listing_index, days)
+        compacted: typing.Optional[typing.Set[str]] = None
+        if days is None:
+            compacted = {
+                key[len(_LISTING_INDEX_DAYS) :] for key in listing_index.get_document_listing(_LISTING_INDEX_DAYS)
+            }
+            days = list(compacted | journal.keys())
+
+        seen = cls._get_listing_index_removed(listing_index)
+        for day in sorted(days):
+            document_ids = journal.get(day, set())
+            # Listing objects of the given days are retrieved directly instead of listing all of them.
+            if compacted is None or day in compacted:
+                try:
+                    document_ids = document_ids.union(
+                        listing_index.retrieve_document(f"{_LISTING_INDEX_DAYS}{day}")["document_ids"]
+                    )
+                except NotFoundError:
+                    pass
+
+            document_ids = document_ids - seen
+            seen.update(document_ids)
+            yield from sorted(document_ids)
+
+    def _remove_from_listing_index(self, document_ids: typing.Iterable[str]) -> None:
+        """Mark the given documents as removed in the listing index, if configured."""
+        if self.listing_index is None:
+            return
+
+        for document_id in document_ids:
+            self.listing_index.store_blob(b"", f"{_LISTING_INDEX_REMOVED}{document_id}")
+
+    def compact_listing_index(self) -> int:
+        """Compact markers of documents stored before today into one listing object per day.
+
+        Return number of days compacted, run it periodically to keep the journal small.
+        """
+        listing_index = self.listing_index
+        if listing_index is None:
+            raise ValueError("Listing index is not configured for the adapter")
+
+        today = datetime.utcnow().strftime(_LISTING_INDEX_DATE_FORMAT)
+        journal = {
+            day: document_ids
+            for day, document_ids in self._get_listing_index_journal(listing_index).items()
+            if day < today
+        }
+
+        removed = self._get_listing_index_removed(listing_index)
+        for day, document_ids in sorted(journal.items()):
+            key = f"{_LISTING_INDEX_DAYS}{day}"
+            try:
+                compacted = listing_index.retrieve_document(key)["document_ids"]
+            except NotFoundError:
+                compacted = []
+
+            listing_index.store_document({"document_ids": sorted(document_ids.union(compacted) - removed)}, key)
+            errors = listing_index.delete_many(
+                f"{_LISTING_INDEX_JOURNAL}{day}/{document_id}" for document_id in document_ids
+            )
+            for marker, error in errors.items():
+                _LOGGER.warning("Failed to delete compacted listing index marker %r: %s", marker, error)
+
+        if removed:
+            self._purge_listing_index_removed(listing_index, removed, skip_days=journal.keys())
+
+        return len(journal)
+
+    @staticmethod
+    def _purge_listing_index_removed(
+        listing_index: CephStore, removed: typing.Set[str], skip_days: typing.Iterable[str] = ()
+    ) -> None:
+        """Drop documents removed from listing objects and journal, delete their markers afterwards."""
+        skip_days = set(skip_days)
+        for key in listing_index.get_document_listing(_LISTING_INDEX_DAYS):
+            if key[len(_LISTING_INDEX_DAYS) :] in skip_days:
+                continue
+
+            document_ids = listing_index.retrieve_document(key)["document_ids"]
+            kept = [document_id for document_id in document_ids if document_id not in removed]
+            if len(kept) != len(document_ids):
+                listing_index.store_document({"document_ids": kept}, key)
+
+        stale = [f"{_LISTING_INDEX_REMOVED}{document_id}" for document_id in removed]
+        for day, markers in ResultStorageBase._get_listing_index_journal(listing_index).items():
+            stale.extend(f"{_LISTING_INDEX_JOURNAL}{day}/{document_id}" for document_id in markers & removed)
+
+        for key, error in listing_index.delete_many(stale).items():
+            _LOGGER.warning("Failed to delete listing index marker of a removed document %r: %s", key, error)
+
+    def rebuild_listing_index(self) -> int:
+        """Rebuild the listing index out of documents stored, return number of documents indexed.
+
+        Documents are assigned to days based on their last modification.
+        """
+        listing_index = self.listing_index
+        if listing_index is None:
+            raise ValueError("Listing index is not configured for the adapter")
+
+        days: typing.Dict[str, typing.List[str]] = {}
+        for document_id, last_modified in self.ceph.get_document_listing_last_modified():
+            if not document_id.endswith(".request"):
+                days.setdefault(last_modified.strftime(_LISTING_INDEX_DATE_FORMAT), []).append(document_id)
+
+        stale = [
+            key
+            for key in listing_index.get_document_listing(_LISTING_INDEX_DAYS)
+            if key[len(_LISTING_INDEX_DAYS) :] not in days
+        ]
+        for day, document_ids in days.items():
+            listing_index.store_document({"document_ids": sorted(document_ids)}, f"{_LISTING_INDEX_DAYS}{day}")
+
+        # Documents of markers written before today were listed, markers written today are kept unless removed.
+        today = datetime.utcnow().strftime(_LISTING_INDEX_DATE_FORMAT)
+        removed = self._get_listing_index_removed(listing_index)
+        for day, markers in self._get_listing_index_journal(listing_index).items():
+            if day >= today:
+                markers = markers & removed
+            stale.extend(f"{_LISTING_INDEX_JOURNAL}{day}/{document_id}" for document_id in markers)
+
+        stale.extend(f"{_LISTING_INDEX_REMOVED}{document_id}" for document_id in removed)
+
+        for key, error in listing_index.delete_many(stale).items():
+            _LOGGER.warning("Failed to delete stale listing index object %r: %s", key, error)
+
+        return sum(len(document_ids) for document_ids in days.values())
+
     def store_request(self, document_id: str, request: typing.Dict[str, typing.Any]) -> str:
         """Store the given request.
 
@@ -181,6 +388,11 @@ class ResultStorageBase(StorageBase):
         """Check if a request exists for the given document id."""
         return self.ceph.document_exists(f"{document_id}.request")
 
+    def requests_exist(self, document_ids: typing.Iterable[str]) -> typing.Dict[str, bool]:
+        """Check if requests exist for the given document ids, requests are listed instead of checked one by one."""
+        exist = self.ceph.exists_many(f"{document_id}.request" for document_id in document_ids)
+        return {request_id[: -len(".request")]: request_exists for request_id, request_exists in exist.items()}
+
     def store_file(self, file_path: str, file_id: str) -> str:
         """Store the given file in Ceph."""
         self.ceph.store_file(file_path, file_id)
@@ -211,6 +423,64 @@ class ResultStorageBase(StorageBase):
         else:
             yield from self.ceph.iterate_results()
 
+    async def iterate_results_async(
+        self,
+        *,
+        start_date: typing.Optional[date] = None,
+        end_date: typing.Optional[date] = None,
+        include_end_date: bool = False,
+        concurrency: typing.Optional[int] = None,
+    ) -> typing.AsyncGenerator[tuple, None]:
+        """Iterate over results available in the Ceph, retrieve them concurrently.
+
+        Documents are yielded as their retrieval completes, see iterate_results for filtering parameters.
+        """
+        listing: typing.Iterable[str]
+        if start_date:
+            listing = chain.from_iterable(
+                self.ceph.get_document_listing(prefix_addition)
+                for prefix_addition in self._iter_dates_prefix_addition(
+                    start_date=start_date, end_date=end_date, include_end_date=include_end_date
+                )
+            )
+        else:
+            listing = self.ceph.get_document_listing()
+
+        async for item in self.ceph.retrieve_documents_async(listing, concurrency=concurrency):
+            yield item
+
     def document_exists(self, document_id: str) -> bool:
         """Check if the there is an object with the given key in bucket."""
         return self.ceph.document_exists(document_id)
+
+    def exists_many(self, document_ids: typing.Iterable[str]) -> typing.Dict[str, bool]:
+        """Check if there are objects with the given keys in bucket, objects are listed instead of issuing HEADs."""
+        return self.ceph.exists_many(document_ids)
+
+    def delete_document(self, document_id: str) -> None:
+        """Delete the given document, the document is removed from the listing index if configured."""
+        self.ceph.delete(document_id)
+        self._remove_from_listing_index([document_id])
+
+    def delete_many(self, document_ids: typing.Iterable[str]) -> typing.Dict[str, str]:
+        """Delete the given documents in batched requests, return error messages of documents not deleted."""
+        document_ids = list(document_ids)
+        errors = self.ceph.delete_many(document_ids)
+        self._remove_from_listing_index(document_id for document_id in document_ids if document_id not in errors)
+        return errors
+
+    def move_many(
+        self, document_ids: typing.Iterable[str], target: CephStore, *, concurrency: Optional[int] = None
+    ) -> typing.Dict[str, Exception]:
+        """Move the given documents to the target store server-side, return errors of documents not moved.
+
+        Documents moved or not found are removed from the listing index if configured.
+        """
+        document_ids = list(document_ids)
+        errors = self.ceph.move_many(document_ids, target, concurrency=concurrency)
+        self._remove_from_listing_index(
+            document_id
+            for document_id in document_ids
+            if document_id not in errors or isinstance(errors[document_id], NotFoundError)
+        )
+        return errors
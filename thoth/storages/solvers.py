@@ -53,15 +53,23 @@ class SolverResultsStore(ResultStorageBase):
 
         Additional parameters can filter results. If start_date is supplied
         and no end_date is supplied explicitly, the current date is
-        considered as end_date (inclusively).
+        considered as end_date (inclusively). Documents are listed using
+        the listing index if configured.
         """
         if solver_info is None and start_date is not None:
             raise ValueError("Date filter can be used only when specific solvers are requested")
+        prefix_solver = ""
         if solver_info:
             _s = solver_info
             prefix_solver = f"-{_s['os_name']}-{_s['os_version']}-py{_s['python_version'].replace('.', '')}"
 
-        if start_date is not None:
+        if self.listing_index is not None and not only_requests:
+            for document_id in super().get_document_listing(
+                start_date=start_date, end_date=end_date, include_end_date=include_end_date
+            ):
+                if document_id.startswith(prefix_solver):
+                    yield document_id
+        elif start_date is not None:
             for prefix_date in self._iter_dates_prefix_addition(
                 start_date=start_date, end_date=end_date, include_end_date=include_end_date
             ):
@@ -21,11 +21,22 @@ import logging
 import json
 import os
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from queue import Full
+from queue import Queue
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Iterable
+from typing import Iterator
 from typing import Optional
+from typing import Set
 from typing import Tuple
+from itertools import islice
 from pathlib import Path
 
 from .analyses import AnalysisResultsStore
@@ -37,10 +48,234 @@ from .revsolvers import RevSolverResultsStore
 from .security_indicators import SIAggregatedStore, SecurityIndicatorsResultsStore
 from .solvers import SolverResultsStore
 
+from .exceptions import BulkLoadError
+from .graph import BulkLoader
 from .graph import GraphDatabase
 
 _LOGGER = logging.getLogger(__name__)
 _RANDOMIZE_LISTING = bool(int(os.getenv("THOTH_STORAGES_RANDOMIZE_LISTING", 0)))
+# Number of threads retrieving documents from Ceph and number of threads writing documents into the database.
+_SYNC_FETCH_WORKERS = int(os.getenv("THOTH_STORAGES_SYNC_FETCH_WORKERS", 1))
+_SYNC_WRITE_WORKERS = int(os.getenv("THOTH_STORAGES_SYNC_WRITE_WORKERS", 1))
+# Maximum number of retrieved documents waiting to be written into the database.
+_SYNC_QUEUE_SIZE = int(os.getenv("THOTH_STORAGES_SYNC_QUEUE_SIZE", 32))
+# Number of listed documents checked at once for being already synced.
+_SYNC_LISTING_CHUNK_SIZE = int(os.getenv("THOTH_STORAGES_SYNC_LISTING_CHUNK_SIZE", 1000))
+# Document types loaded in bulk, in the order they are loaded.
+_BULK_SYNC_DOCUMENT_TYPES = ("solver", "package", "adviser", "inspection")
+
+
+class _SyncStageStats:
+    """Throughput statistics of a single stage of the sync pipeline."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize statistics for the given stage."""
+        self.name = name
+        self.count = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float) -> None:
+        """Record a single document processed in the stage."""
+        with self._lock:
+            self.count += 1
+            self.elapsed += elapsed
+
+    def log(self, document_type: str, wall_time: float) -> None:
+        """Report throughput of the stage."""
+        _LOGGER.info(
+            "Sync of %s documents - %s stage: %d documents in %.2fs (%.2f documents/s, %.3fs per document)",
+            document_type,
+            self.name,
+            self.count,
+            wall_time,
+            self.count / wall_time if wall_time else 0.0,
+            self.elapsed / self.count if self.count else 0.0,
+        )
+
+
+def _load_local_document(document_id: str) -> Dict[str, Any]:
+    """Load a document from a local file."""
+    _LOGGER.debug("Loading document from a local file: %r", document_id)
+    with open(document_id, "r") as document_file:
+        return json.loads(document_file.read())
+
+
+def _sync_documents_pipelined(
+    listing: Iterable[str],
+    *,
+    document_type: str,
+    retrieve_document: Callable[[str], Dict[str, Any]],
+    sync_document: Callable[[Dict[str, Any]], None],
+    documents_synced: Optional[Callable[[List[str]], Set[str]]] = None,
+    force: bool = False,
+    graceful: bool = False,
+    fetch_workers: Optional[int] = None,
+    write_workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+) -> Tuple[int, int, int, int]:
+    """Sync documents into graph database, retrieval and writes run concurrently if configured so.
+
+    Documents are retrieved by a pool of fetch workers and placed into a bounded queue consumed by
+    writer workers. Each write is done in its own database session so writers do not share any
+    transaction. If the queue is full, fetch workers wait for writers to keep memory usage bounded.
+
+    The listing is consumed in chunks, documents already synced are filtered out with a single
+    database query per chunk before any document is retrieved.
+    """
+    fetch_workers = fetch_workers or _SYNC_FETCH_WORKERS
+    write_workers = write_workers or _SYNC_WRITE_WORKERS
+    queue_size = queue_size or _SYNC_QUEUE_SIZE
+
+    fetch_stats = _SyncStageStats("fetch")
+    write_stats = _SyncStageStats("write")
+    lock = threading.Lock()
+    processed, synced, skipped, failed = 0, 0, 0, 0
+    start = time.monotonic()
+
+    def _fetch(document_id: str) -> Optional[Dict[str, Any]]:
+        nonlocal failed
+
+        fetch_start = time.monotonic()
+        try:
+            document = retrieve_document(document_id)
+        except Exception:
+            if not graceful:
+                raise
+
+            _LOGGER.exception("Failed to retrieve %s document with id %r", document_type, document_id)
+            with lock:
+                failed += 1
+            return None
+
+        fetch_stats.record(time.monotonic() - fetch_start)
+        return document
+
+    def _write(document_id: str, document: Dict[str, Any]) -> None:
+        nonlocal synced, failed
+
+        write_start = time.monotonic()
+        try:
+            sync_document(document)
+        except Exception:
+            if not graceful:
+                raise
+
+            _LOGGER.exception("Failed to sync %s result with document id %r", document_type, document_id)
+            with lock:
+                failed += 1
+            return
+
+        write_stats.record(time.monotonic() - write_start)
+        with lock:
+            synced += 1
+
+    def _iter_listing() -> Iterable[str]:
+        nonlocal processed, skipped
+
+        listing_iter = iter(listing)
+        while True:
+            chunk = list(islice(listing_iter, _SYNC_LISTING_CHUNK_SIZE))
+            if not chunk:
+                break
+
+            synced_ids: Set[str] = set()
+            if not force and documents_synced is not None:
+                synced_ids = documents_synced([os.path.basename(document_id) for document_id in chunk])
+
+            for document_id in chunk:
+                processed += 1
+                if os.path.basename(document_id) not in synced_ids:
+                    _LOGGER.info("Syncing %s document with id %r to graph", document_type, document_id)
+                    yield document_id
+                else:
+                    _LOGGER.info("Sync of %s document with id %r skipped - already synced", document_type, document_id)
+                    skipped += 1
+
+    if fetch_workers <= 1 and write_workers <= 1:
+        for document_id in _iter_listing():
+            document = _fetch(document_id)
+            if document is not None:
+                _write(document_id, document)
+    else:
+        queue: "Queue[Optional[Tuple[str, Dict[str, Any]]]]" = Queue(maxsize=queue_size)
+        # Limit documents scheduled for retrieval so that the listing is consumed lazily.
+        in_flight = threading.BoundedSemaphore(fetch_workers)
+        abort = threading.Event()
+        errors: List[Exception] = []
+
+        def _fail(exc: Exception) -> None:
+            with lock:
+                errors.append(exc)
+            abort.set()
+
+        def _fetch_worker(document_id: str) -> None:
+            try:
+                if abort.is_set():
+                    return
+
+                document = _fetch(document_id)
+                if document is None:
+                    return
+
+                while not abort.is_set():
+                    try:
+                        queue.put((document_id, document), timeout=0.5)
+                        break
+                    except Full:
+                        continue
+            except Exception as exc:
+                _fail(exc)
+            finally:
+                in_flight.release()
+
+        def _write_worker() -> None:
+            while True:
+                item = queue.get()
+                if item is None:
+                    break
+
+                if abort.is_set():
+                    # Drain the queue so that fetch workers are not blocked.
+                    continue
+
+                try:
+                    _write(*item)
+                except Exception as exc:
+                    _fail(exc)
+
+        writers = [
+            threading.Thread(target=_write_worker, name=f"sync-{document_type}-writer-{i}", daemon=True)
+            for i in range(write_workers)
+        ]
+        for writer in writers:
+            writer.start()
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=fetch_workers, thread_name_prefix=f"sync-{document_type}-fetch"
+            ) as executor:
+                for document_id in _iter_listing():
+                    in_flight.acquire()
+                    if abort.is_set():
+                        in_flight.release()
+                        break
+
+                    executor.submit(_fetch_worker, document_id)
+        finally:
+            for _ in writers:
+                queue.put(None)
+
+            for writer in writers:
+                writer.join()
+
+        if errors:
+            raise errors[0]
+
+    wall_time = time.monotonic() - start
+    fetch_stats.log(document_type, wall_time)
+    write_stats.log(document_type, wall_time)
+    return processed, synced, skipped, failed
 
 
 def sync_adviser_documents(
@@ -69,35 +304,15 @@ def sync_adviser_documents(
     if _RANDOMIZE_LISTING:
         random.shuffle(list(listing))
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in listing:
-        processed += 1
-
-        if force or not graph.adviser_document_id_exist(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    with open(document_id, "r") as document_file:
-                        document = json.loads(document_file.read())
-                else:
-                    _LOGGER.info(
-                        "Syncing adviser document from %r with id %r to graph", adviser_store.ceph.host, document_id
-                    )
-                    document = adviser_store.retrieve_document(document_id)
-
-                graph.sync_adviser_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
-
-                _LOGGER.exception("Failed to sync adviser result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of adviser document with id {document_id!r} skipped - already synced")
-            skipped += 1
-
-    return processed, synced, skipped, failed
+    return _sync_documents_pipelined(
+        listing,
+        document_type="adviser",
+        retrieve_document=_load_local_document if is_local else adviser_store.retrieve_document,
+        sync_document=graph.sync_adviser_result,
+        documents_synced=graph.get_adviser_document_ids_synced,
+        force=force,
+        graceful=graceful,
+    )
 
 
 def sync_solver_documents(
@@ -126,34 +341,18 @@ def sync_solver_documents(
     if _RANDOMIZE_LISTING:
         random.shuffle(list(listing))
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in listing:
-        processed += 1
-        if force or not graph.solver_document_id_exists(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    with open(document_id, "r") as document_file:
-                        document = json.loads(document_file.read())
-                else:
-                    _LOGGER.info(
-                        "Syncing solver document from %r with id %r to graph", solver_store.ceph.host, document_id
-                    )
-                    document = solver_store.retrieve_document(document_id)
-
-                graph.sync_solver_result(document, force=force)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
-
-                _LOGGER.exception("Failed to sync solver result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of solver document with id {document_id!r} skipped - already synced")
-            skipped += 1
+    def _sync_solver_result(document: Dict[str, Any]) -> None:
+        graph.sync_solver_result(document, force=force)  # type: ignore
 
-    return processed, synced, skipped, failed
+    return _sync_documents_pipelined(
+        listing,
+        document_type="solver",
+        retrieve_document=_load_local_document if is_local else solver_store.retrieve_document,
+        sync_document=_sync_solver_result,
+        documents_synced=graph.get_solver_document_ids_synced,
+        force=force,
+        graceful=graceful,
+    )
 
 
 def sync_revsolver_documents(
@@ -182,32 +381,15 @@ def sync_revsolver_documents(
     if _RANDOMIZE_LISTING:
         random.shuffle(list(listing))
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in listing:
-        processed += 1
-        try:
-            if is_local:
-                _LOGGER.debug("Loading document from a local file: %r", document_id)
-                with open(document_id, "r") as document_file:
-                    document = json.loads(document_file.read())
-            else:
-                _LOGGER.info(
-                    "Syncing reverse solver document from %r with id %r to graph",
-                    revsolver_store.ceph.host,
-                    document_id,
-                )
-                document = revsolver_store.retrieve_document(document_id)
-
-            graph.sync_revsolver_result(document)
-            synced += 1
-        except Exception:
-            if not graceful:
-                raise
-
-            _LOGGER.exception("Failed to sync reverse solver result with document id %r", document_id)
-            failed += 1
-
-    return processed, synced, skipped, failed
+    # Reverse solver documents are always synced, there is no check for documents already synced.
+    return _sync_documents_pipelined(
+        listing,
+        document_type="reverse solver",
+        retrieve_document=_load_local_document if is_local else revsolver_store.retrieve_document,
+        sync_document=graph.sync_revsolver_result,
+        force=force,
+        graceful=graceful,
+    )
 
 
 def sync_analysis_documents(
@@ -236,35 +418,15 @@ def sync_analysis_documents(
     if _RANDOMIZE_LISTING:
         random.shuffle(list(listing))
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in listing:
-        processed += 1
-
-        if force or not graph.analysis_document_id_exist(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    with open(document_id, "r") as document_file:
-                        document = json.loads(document_file.read())
-                else:
-                    _LOGGER.info(
-                        "Syncing analysis document from %r with id %r to graph", analysis_store.ceph.host, document_id
-                    )
-                    document = analysis_store.retrieve_document(document_id)
-
-                graph.sync_analysis_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
-
-                _LOGGER.exception("Failed to sync analysis result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of analysis document with id {document_id!r} skipped - already synced")
-            skipped += 1
-
-    return processed, synced, skipped, failed
+    return _sync_documents_pipelined(
+        listing,
+        document_type="analysis",
+        retrieve_document=_load_local_document if is_local else analysis_store.retrieve_document,
+        sync_document=graph.sync_analysis_result,
+        documents_synced=graph.get_analysis_document_ids_synced,
+        force=force,
+        graceful=graceful,
+    )
 
 
 def sync_provenance_checker_documents(
@@ -293,37 +455,15 @@ def sync_provenance_checker_documents(
     if _RANDOMIZE_LISTING:
         random.shuffle(list(listing))
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in listing:
-        processed += 1
-
-        if force or not graph.provenance_checker_document_id_exist(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    with open(document_id, "r") as document_file:
-                        document = json.loads(document_file.read())
-                else:
-                    _LOGGER.info(
-                        "Syncing provenance-checker document from %r with id %r to graph",
-                        provenance_check_store.ceph.host,
-                        document_id,
-                    )
-                    document = provenance_check_store.retrieve_document(document_id)
-
-                graph.sync_provenance_checker_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
-
-                _LOGGER.exception("Failed to sync provenance-checker result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of provenance-checker document with id {document_id!r} skipped - already synced")
-            skipped += 1
-
-    return processed, synced, skipped, failed
+    return _sync_documents_pipelined(
+        listing,
+        document_type="provenance-checker",
+        retrieve_document=_load_local_document if is_local else provenance_check_store.retrieve_document,
+        sync_document=graph.sync_provenance_checker_result,
+        documents_synced=graph.get_provenance_checker_document_ids_synced,
+        force=force,
+        graceful=graceful,
+    )
 
 
 def sync_dependency_monkey_documents(
@@ -352,37 +492,15 @@ def sync_dependency_monkey_documents(
     if _RANDOMIZE_LISTING:
         random.shuffle(list(listing))
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in listing:
-        processed += 1
-
-        if force or not graph.dependency_monkey_document_id_exists(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    with open(document_id, "r") as document_file:
-                        document = json.loads(document_file.read())
-                else:
-                    _LOGGER.info(
-                        f"Syncing dependency monkey report document from "
-                        f"{dependency_monkey_reports_store.ceph.host} with id "
-                        f"{document_id}, to graph"
-                    )
-                    document = dependency_monkey_reports_store.retrieve_document(document_id)
-
-                graph.sync_dependency_monkey_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
-
-                _LOGGER.exception("Failed to sync dependency-monkey result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of dependency-monkey document with id {document_id!r} skipped - already synced")
-            skipped += 1
-
-    return processed, synced, skipped, failed
+    return _sync_documents_pipelined(
+        listing,
+        document_type="dependency-monkey",
+        retrieve_document=_load_local_document if is_local else dependency_monkey_reports_store.retrieve_document,
+        sync_document=graph.sync_dependency_monkey_result,
+        documents_synced=graph.get_dependency_monkey_document_ids_synced,
+        force=force,
+        graceful=graceful,
+    )
 
 
 def sync_inspection_documents(
@@ -420,6 +538,7 @@ def sync_inspection_documents(
             main_repo = Path(f"{inspection_document_id}/results")
             results = [int(repo.name) for repo in main_repo.iterdir()]
             # dir entry should be numbers
+            number_results = len(results)
 
         if number_results > 0:
 
@@ -515,41 +634,20 @@ def sync_security_indicators_documents(
     if _RANDOMIZE_LISTING:
         random.shuffle(list(listing))
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for security_indicator_id in listing:
-
-        processed += 1
-
-        if force or not graph.si_aggregated_document_id_exists(security_indicator_id):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", security_indicator_id)
-                    with open(security_indicator_id, "r") as document_file:
-                        aggregated_document = json.loads(document_file.read())
-                else:
-                    si_aggregated_store = SIAggregatedStore(security_indicator_id=security_indicator_id)
-                    si_aggregated_store.connect()
-                    _LOGGER.info(
-                        "Syncing analysis document from %r with id %r to graph",
-                        si_aggregated_store.ceph.host,
-                        security_indicator_id,
-                    )
-
-                    aggregated_document = si_aggregated_store.retrieve_document()
-
-                graph.sync_security_indicator_aggregated_result(aggregated_document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
-
-                _LOGGER.exception("Failed to sync analysis result with document id %r", security_indicator_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of analysis document with id {security_indicator_id!r} skipped - already synced")
-            skipped += 1
+    def _retrieve_aggregated_document(security_indicator_id: str) -> Dict[str, Any]:
+        si_aggregated_store = SIAggregatedStore(security_indicator_id=security_indicator_id)
+        si_aggregated_store.connect()
+        return si_aggregated_store.retrieve_document()
 
-    return processed, synced, skipped, failed
+    return _sync_documents_pipelined(
+        listing,
+        document_type="security-indicator",
+        retrieve_document=_load_local_document if is_local else _retrieve_aggregated_document,
+        sync_document=graph.sync_security_indicator_aggregated_result,
+        documents_synced=graph.get_si_aggregated_document_ids_synced,
+        force=force,
+        graceful=graceful,
+    )
 
 
 # Corresponding mapping of document prefix (before the actual unique document identifier part) to
@@ -605,3 +703,156 @@ def sync_documents(
             )
 
     return stats
+
+
+def _iter_inspection_results(listing: Iterable[str], is_local: bool) -> Iterator[str]:
+    """Iterate over results of the given inspections, each result is identified by inspection id and its number."""
+    for inspection_document_id in listing:
+        if is_local:
+            results: Iterable[int] = sorted(
+                int(path.name) for path in Path(f"{inspection_document_id}/results").iterdir()
+            )
+        else:
+            inspection_store = InspectionStore(inspection_id=inspection_document_id)
+            inspection_store.connect()
+            results = range(inspection_store.results.get_results_count())
+
+        if not results:
+            _LOGGER.info("inspection_document_id: %r - does not have any results.", inspection_document_id)
+
+        for inspection_result_number in results:
+            yield f"{inspection_document_id}/{inspection_result_number}"
+
+
+def _retrieve_inspection_result(inspection_result_id: str, is_local: bool) -> Dict[str, Any]:
+    """Retrieve the given inspection result together with specification of the inspection."""
+    inspection_document_id, inspection_result_number = inspection_result_id.rsplit("/", maxsplit=1)
+    if is_local:
+        specification = _load_local_document(f"{inspection_document_id}/build/specification")
+        result = _load_local_document(f"{inspection_document_id}/results/{inspection_result_number}/result")
+    else:
+        inspection_store = InspectionStore(inspection_id=inspection_document_id)
+        inspection_store.connect()
+        specification = inspection_store.retrieve_specification()
+        result = inspection_store.results.retrieve_result(int(inspection_result_number))
+
+    return {
+        "document_id": os.path.basename(inspection_document_id),
+        "result_number": int(inspection_result_number),
+        "specification": specification,
+        "result": result,
+    }
+
+
+def bulk_sync_documents(
+    document_ids: Optional[Iterable[str]] = None,
+    graceful: bool = False,
+    graph: Optional[GraphDatabase] = None,
+    is_local: bool = False,
+) -> Dict[str, Tuple[int, int, int, int]]:
+    """Populate an empty database with documents, loading them in bulk using COPY.
+
+    Solver, package-extract, adviser and inspection documents are streamed from their result stores (in this
+    order, so that packages are solved before any software stack locks them), transformed into rows and loaded
+    at once, see BulkLoader. Documents which cannot be loaded in bulk and documents of other types are synced
+    one by one afterwards. If no list of document ids is provided, all documents will be synced.
+    """
+    if is_local and not document_ids:
+        raise ValueError(
+            "Cannot sync documents from local directory without explicitly specifying a list of documents to be synced"
+        )
+
+    if not graph:
+        graph = GraphDatabase()
+        graph.connect()
+
+    handlers: Dict[str, Optional[List[str]]] = dict.fromkeys(HANDLERS_MAPPING, None)
+    if document_ids:
+        handlers = {key: [] for key in HANDLERS_MAPPING.keys()}
+        for doc in document_ids:
+            try:
+                document_type = os.path.basename(doc).split("-", maxsplit=1)[0]
+                handlers[document_type].append(doc)  # type: ignore
+            except KeyError:
+                error_msg = f"No handler defined for document identifier {doc}"
+                if not graceful:
+                    raise ValueError(error_msg)
+                _LOGGER.error(error_msg)
+
+    stores = {"adviser": AdvisersResultsStore, "package": AnalysisResultsStore, "solver": SolverResultsStore}
+    loader = BulkLoader()
+    # Documents which cannot be loaded in bulk, these are synced once the bulk load is done.
+    fallback: Dict[str, List[str]] = {}
+    stats = dict.fromkeys(HANDLERS_MAPPING, (0, 0, 0, 0))
+    try:
+        loader.prepare(graph)
+        for document_type in _BULK_SYNC_DOCUMENT_TYPES:
+            documents = handlers[document_type]
+            if documents == []:
+                continue
+
+            listing: Iterable[str] = documents or []
+            retrieve_document: Callable[[str], Dict[str, Any]] = _load_local_document
+            if document_type == "inspection":
+                listing = _iter_inspection_results(documents or InspectionStore.iter_inspections(), is_local)
+                retrieve_document = partial(_retrieve_inspection_result, is_local=is_local)
+            elif not is_local:
+                store = stores[document_type]()
+                store.connect()
+                listing = documents or store.get_document_listing()
+                retrieve_document = store.retrieve_document
+
+            def add_document(document: Dict[str, Any], document_type: str = document_type) -> None:
+                try:
+                    loader.add_document(document)
+                except BulkLoadError as exc:
+                    if "specification" in document:
+                        document_id = os.path.basename(document["document_id"])
+                    else:
+                        document_id = document["metadata"]["document_id"]
+
+                    _LOGGER.warning("Document %r will be synced after the bulk load: %s", document_id, str(exc))
+                    fallback.setdefault(document_type, []).append(document_id)
+
+            stats[document_type] = _sync_documents_pipelined(
+                listing,
+                document_type=document_type,
+                retrieve_document=retrieve_document,
+                sync_document=add_document,
+                graceful=graceful,
+                # Documents are transformed by a single writer, the loader is not thread-safe.
+                write_workers=1,
+            )
+
+        row_counts = loader.load(graph)
+        _LOGGER.info("Loaded %d rows into %d tables", sum(row_counts.values()), len(row_counts))
+    finally:
+        loader.close()
+
+    for document_type, fallback_ids in fallback.items():
+        if is_local:
+            # Document ids are paths to files of local documents.
+            fallback_ids = [
+                document_id
+                for document_id in handlers[document_type]  # type: ignore
+                if os.path.basename(document_id) in fallback_ids
+            ]
+
+        processed, synced, skipped, failed = stats[document_type]
+        _, fallback_synced, _, fallback_failed = HANDLERS_MAPPING[document_type](
+            list(dict.fromkeys(fallback_ids)), graceful=graceful, graph=graph, is_local=is_local
+        )
+        stats[document_type] = (
+            processed,
+            synced - len(fallback[document_type]) + fallback_synced,
+            skipped,
+            failed + fallback_failed,
+        )
+
+    for document_type, documents in handlers.items():
+        if document_type not in _BULK_SYNC_DOCUMENT_TYPES and documents != []:
+            stats[document_type] = HANDLERS_MAPPING[document_type](
+                documents, graceful=graceful, graph=graph, is_local=is_local
+            )
+
+    return stats